@@ -17,6 +17,8 @@ CREATE TYPE route_status AS ENUM ('PLANNED', 'IN_PROGRESS', 'COMPLETED', 'DELAYE
 
 CREATE TYPE object_type AS ENUM ('VEHICLE', 'CARGO', 'EQUIPMENT', 'OTHER');
 
+CREATE TYPE trip_kind AS ENUM ('TRIP', 'STOP');
+
 CREATE EXTENSION IF NOT EXISTS postgis;
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
@@ -66,6 +68,8 @@ CREATE TABLE sensors (
     updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
     FOREIGN KEY (object_id) REFERENCES objects(id)
 );
+-- Последний обновлённый сенсор объекта (положение объекта на карте и в тайлах)
+CREATE INDEX idx_sensor_object_updated ON sensors (object_id, updated_at DESC);
 
 -- Таблица событий
 CREATE TABLE events (
@@ -81,6 +85,8 @@ CREATE TABLE events (
     updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
     FOREIGN KEY (sensor_id) REFERENCES sensors(id)
 );
+-- Покрывающий индекс для тепловых карт: биннинг по координатам за период без чтения таблицы
+CREATE INDEX idx_event_timestamp_position ON events (timestamp, latitude, longitude);
 
 -- Таблица оповещений
 CREATE TABLE alerts (
@@ -107,6 +113,7 @@ CREATE TABLE zones (
     created_at TIMESTAMP NOT NULL DEFAULT NOW(),
     updated_at TIMESTAMP NOT NULL DEFAULT NOW()
 );
+CREATE INDEX idx_zone_boundary ON zones USING GIST (boundary_polygon);
 
 -- Таблица связи объектов и зон
 CREATE TABLE object_zone (
@@ -118,6 +125,7 @@ CREATE TABLE object_zone (
     FOREIGN KEY (object_id) REFERENCES objects(id),
     FOREIGN KEY (zone_id) REFERENCES zones(id)
 );
+CREATE INDEX idx_object_zone_zone_time ON object_zone (zone_id, entered_at, exited_at);
 
 -- Таблица маршрутов
 CREATE TABLE routes (
@@ -135,6 +143,52 @@ CREATE TABLE routes (
     FOREIGN KEY (object_id) REFERENCES objects(id)
 );
 
+-- Состояние отслеживания маршрутов (прогресс и скорость между положениями объекта)
+CREATE TABLE route_tracking (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    route_id UUID NOT NULL UNIQUE,
+    geometry_key VARCHAR(32),
+    progress FLOAT,
+    fixed_at TIMESTAMP,
+    speed FLOAT,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    FOREIGN KEY (route_id) REFERENCES routes(id) ON DELETE CASCADE
+);
+
+-- Отозванные JWT (выход и ротация токенов обновления), общие для всех экземпляров API
+CREATE TABLE revoked_tokens (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    jti VARCHAR(64) NOT NULL UNIQUE,
+    expires_at TIMESTAMP NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+CREATE INDEX idx_revoked_token_expires ON revoked_tokens (expires_at);
+
+-- Таблица поездок и стоянок (сегменты трека сенсора)
+CREATE TABLE trips (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    sensor_id UUID NOT NULL,
+    kind trip_kind NOT NULL,
+    start_time TIMESTAMP NOT NULL,
+    end_time TIMESTAMP NOT NULL,
+    start_latitude FLOAT NOT NULL,
+    start_longitude FLOAT NOT NULL,
+    end_latitude FLOAT NOT NULL,
+    end_longitude FLOAT NOT NULL,
+    distance FLOAT NOT NULL DEFAULT 0,
+    duration FLOAT NOT NULL DEFAULT 0,
+    max_speed FLOAT,
+    points_count INTEGER NOT NULL DEFAULT 0,
+    is_closed BOOLEAN NOT NULL DEFAULT TRUE,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    FOREIGN KEY (sensor_id) REFERENCES sensors(id)
+);
+CREATE INDEX idx_trip_sensor_start ON trips (sensor_id, start_time);
+CREATE INDEX idx_trip_sensor_open ON trips (sensor_id, is_closed);
+
 
 
 -- Роль администратора: полный доступ ко всем таблицам
@@ -142,22 +196,22 @@ CREATE ROLE admin_user
 WITH
     NOSUPERUSER NOCREATEDB NOCREATEROLE NOINHERIT LOGIN
     CONNECTION LIMIT -1 PASSWORD 'password_admin';
-GRANT SELECT, INSERT, UPDATE, DELETE ON users, objects, userobject, sensors, events, alerts, zones, object_zone, routes TO admin_user;
+GRANT SELECT, INSERT, UPDATE, DELETE ON users, objects, userobject, sensors, events, alerts, zones, object_zone, routes, route_tracking, trips, revoked_tokens TO admin_user;
 
 -- Роль оператора: доступ к объектам, сенсорам, событиям, оповещениям, маршрутам
 CREATE ROLE operator_user
 WITH
     NOSUPERUSER NOCREATEDB NOCREATEROLE NOINHERIT LOGIN
     CONNECTION LIMIT -1 PASSWORD 'password_operator';
-GRANT SELECT ON objects, sensors, events, alerts, routes TO operator_user;
-GRANT INSERT, UPDATE ON events, alerts, routes TO operator_user;
+GRANT SELECT ON objects, sensors, events, alerts, routes, route_tracking, trips TO operator_user;
+GRANT INSERT, UPDATE ON events, alerts, routes, route_tracking TO operator_user;
 
 -- Роль аналитика: только чтение по основным таблицам
 CREATE ROLE analyst_user
 WITH
     NOSUPERUSER NOCREATEDB NOCREATEROLE NOINHERIT LOGIN
     CONNECTION LIMIT -1 PASSWORD 'password_analyst';
-GRANT SELECT ON objects, sensors, events, alerts, zones, routes TO analyst_user;
+GRANT SELECT ON objects, sensors, events, alerts, zones, routes, route_tracking, trips TO analyst_user;
 
 -- Функция-триггер для деактивации пользователя вместо удаления
 CREATE OR REPLACE FUNCTION deactivate_user_instead_of_delete()
@@ -0,0 +1,117 @@
+"""Условные GET-запросы: ETag и Last-Modified по версии таблицы или записи."""
+from __future__ import annotations
+
+import hashlib
+
+from datetime import UTC
+from datetime import datetime
+from email.utils import format_datetime
+from email.utils import parsedate_to_datetime
+
+from fastapi import Request
+from fastapi import Response
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+from src.sensor_track_pro.api.config import api_settings
+from src.sensor_track_pro.business_logic.models.common_types import EntityVersion
+
+
+PUBLIC = "public"
+PRIVATE = "private"
+
+
+def make_etag(version: EntityVersion, *variant: object) -> str:
+    """
+    Слабый ETag из версии и варианта ответа (путь, параметры запроса).
+
+    Тело ответа не участвует: тег вычисляется до чтения и сериализации данных.
+    """
+    updated_at = version.updated_at.isoformat() if version.updated_at is not None else ""
+    key = repr((version.count, updated_at, variant)).encode()
+    return f'W/"{hashlib.blake2b(key, digest_size=12).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Слабое сравнение ETag со списком из If-None-Match."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _utc(value: datetime) -> datetime:
+    # В БД время хранится без зоны в UTC; HTTP-даты имеют точность до секунды
+    value = value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+    return value.replace(microsecond=0)
+
+
+def http_date(value: datetime) -> str:
+    """Форматирует время в HTTP-дату (RFC 9110)."""
+    return format_datetime(_utc(value), usegmt=True)
+
+
+def not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    """True, если ресурс не менялся после даты из If-Modified-Since."""
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    return _utc(last_modified) <= since
+
+
+def conditional_get(
+    request: Request,
+    response: Response,
+    version: EntityVersion | None,
+    *,
+    scope: str = PUBLIC,
+    last_modified: bool = False,
+) -> Response | None:
+    """
+    Проставляет заголовки кэширования и проверяет условия запроса.
+
+    Вызывается до загрузки данных: если копия клиента актуальна, возвращается
+    готовый ответ 304 и эндпоинт завершается, не читая и не сериализуя записи.
+    Иначе ETag, Cache-Control и (при last_modified) Last-Modified записываются
+    в response, который FastAPI объединит с итоговым ответом.
+
+    If-None-Match имеет приоритет над If-Modified-Since. Last-Modified имеет
+    смысл только для одной записи: удаление строки не сдвигает максимальный
+    updated_at, поэтому списки проверяются лишь по ETag.
+
+    Args:
+        request: Текущий запрос
+        response: Ответ-заготовка из параметров эндпоинта
+        version: Версия из get_version; None — записи нет, заголовки не ставятся
+        scope: PUBLIC — ответ можно хранить в nginx, PRIVATE — только у клиента
+        last_modified: Отдавать Last-Modified и учитывать If-Modified-Since
+
+    Returns:
+        Ответ 304 или None, если нужно отдать данные
+    """
+    if version is None:
+        return None
+    headers = {
+        "ETag": make_etag(version, request.url.path, request.url.query),
+        "Cache-Control": f"{scope}, max-age={api_settings.http_cache_max_age}, must-revalidate",
+    }
+    modified = version.updated_at if last_modified else None
+    if modified is not None:
+        headers["Last-Modified"] = http_date(modified)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = etag_matches(if_none_match, headers["ETag"])
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        fresh = (
+            modified is not None
+            and if_modified_since is not None
+            and not_modified_since(if_modified_since, modified)
+        )
+    if fresh:
+        return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
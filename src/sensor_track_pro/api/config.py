@@ -9,11 +9,36 @@ class APISettings(BaseSettings):
     project_name: str = "SensorTrackPro"
     version: str = "1.0.1"
     debug: bool = False
+
+    # Подключаемые версии API: роутеры остальных версий воркер не импортирует
+    api_versions: list[str] = ["v1", "v2"]
+    api_lazy_load: bool = True  # роутеры версий импортируются после импорта приложения
+    preload_versions: bool = True  # собрать версии в lifespan, до приёма трафика
     
     # CORS
     allowed_origins: list[str] = ["*"]
     allowed_methods: list[str] = ["*"]
     allowed_headers: list[str] = ["*"]
+
+    # Сжатие ответов
+    compression_minimum_size: int = 1024  # байт; ответы меньше отдаются без сжатия
+    compression_encodings: list[str] = []  # пусто — все доступные (zstd, br, gzip)
+    compression_gzip_level: int = 6
+
+    # HTTP-кэширование редко меняющихся справочников (зоны, объекты, сенсоры)
+    http_cache_max_age: int = 5  # секунд; после истечения nginx и клиенты перепроверяют по ETag
+
+    # Метрики Prometheus на /metrics (nginx наружу не проксирует)
+    metrics_enabled: bool = True
+
+    # Запись трафика в JSONL; пусто — выключена. {pid} в пути заменяется на PID воркера
+    capture_path: str | None = None
+    capture_sample_rate: float = 1.0  # доля записываемых запросов
+    capture_max_body: int = 65536  # байт; более длинные тела не сохраняются
+
+    # Профилирование для администраторов: /api/v2/profiling/stacks и заголовок X-Profile
+    profiling_enabled: bool = True
+    profiling_max_seconds: float = 60.0  # предел длительности выборочного профилирования
     
     class Config:
         env_prefix = "API_"
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from collections.abc import Coroutine
+from datetime import UTC
+from functools import lru_cache
+from functools import partial
+from typing import Any
+
+from fastapi import Depends
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.security import HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.sensor_track_pro.business_logic.models.user_model import TokenClaims
+from src.sensor_track_pro.business_logic.models.user_model import UserRole
+from src.sensor_track_pro.business_logic.services.token_service import InvalidTokenError
+from src.sensor_track_pro.business_logic.services.token_service import RevocationList
+from src.sensor_track_pro.business_logic.services.token_service import TokenService
+from src.sensor_track_pro.config import get_settings
+from src.sensor_track_pro.data_access.cache import get_repository_cache
+from src.sensor_track_pro.data_access.database import get_async_db
+from src.sensor_track_pro.data_access.database import open_session
+from src.sensor_track_pro.data_access.repositories.revoked_tokens_repo import REVOKED_TOKENS
+from src.sensor_track_pro.data_access.repositories.revoked_tokens_repo import RevokedTokenRepository
+
+
+_bearer = HTTPBearer(auto_error=False)
+_bearer_dep = Depends(_bearer)
+_db_dep = Depends(get_async_db)
+
+
+def jwt_secret_key() -> str:
+    """
+    Общий ключ подписи JWT.
+
+    Raises:
+        RuntimeError: JWT_SECRET_KEY не задан — токены одного воркера или
+            экземпляра не приняли бы другие
+    """
+    secret_key = get_settings().jwt_secret_key
+    if not secret_key:
+        raise RuntimeError("JWT_SECRET_KEY не задан: ключ подписи токенов должен быть общим для всех экземпляров")
+    return secret_key
+
+
+def _apply_revocation(revoked: RevocationList, detail: str) -> None:
+    jti, _, expires_at = detail.partition(" ")
+    revoked.add(jti, float(expires_at))
+
+
+@lru_cache
+def get_revocation_list() -> RevocationList:
+    """Отозванные токены процесса; пополняются по NOTIFY других воркеров и экземпляров."""
+    revoked = RevocationList()
+    get_repository_cache().on_message(REVOKED_TOKENS, partial(_apply_revocation, revoked))
+    return revoked
+
+
+async def load_revocations() -> None:
+    """Загружает из БД отозванные токены, срок которых не истёк (при запуске и после переподключения LISTEN)."""
+    async with open_session() as session:
+        active = await RevokedTokenRepository(session).get_active()
+    get_revocation_list().update((jti, expires_at.replace(tzinfo=UTC).timestamp()) for jti, expires_at in active)
+
+
+def build_token_service(session: AsyncSession | None = None) -> TokenService:
+    """Сервис токенов; без сессии — только выпуск и проверка, без отзыва."""
+    settings = get_settings()
+    return TokenService(
+        jwt_secret_key(),
+        get_revocation_list(),
+        RevokedTokenRepository(session) if session is not None else None,
+        algorithm=settings.jwt_algorithm,
+        access_ttl=settings.jwt_access_ttl,
+        refresh_ttl=settings.jwt_refresh_ttl,
+    )
+
+
+def get_token_service(session: AsyncSession = _db_dep) -> TokenService:
+    return build_token_service(session)
+
+
+def get_token_verifier() -> TokenService:
+    return build_token_service()
+
+
+_token_verifier_dep = Depends(get_token_verifier)
+
+
+async def get_current_user(  # noqa: RUF029 - синхронную зависимость FastAPI выполнил бы в пуле потоков
+    credentials: HTTPAuthorizationCredentials | None = _bearer_dep,
+    tokens: TokenService = _token_verifier_dep,
+) -> TokenClaims:
+    """Пользователь из токена доступа Authorization: Bearer; ни пользователи, ни отзывы из БД не читаются."""
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Требуется токен доступа", headers={"WWW-Authenticate": "Bearer"})
+    try:
+        return tokens.verify(credentials.credentials)
+    except InvalidTokenError as e:
+        raise HTTPException(status_code=401, detail=str(e), headers={"WWW-Authenticate": "Bearer"}) from e
+
+
+def require_roles(*roles: UserRole) -> Callable[..., Coroutine[Any, Any, TokenClaims]]:
+    """Зависимость, пропускающая только пользователей с одной из ролей."""
+    async def dependency(
+        credentials: HTTPAuthorizationCredentials | None = _bearer_dep,
+        tokens: TokenService = _token_verifier_dep,
+    ) -> TokenClaims:
+        claims = await get_current_user(credentials, tokens)
+        if claims.role not in roles:
+            raise HTTPException(status_code=403, detail="Недостаточно прав")
+        return claims
+    return dependency
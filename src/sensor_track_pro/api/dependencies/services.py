@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from functools import lru_cache
+from functools import partial
+
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -8,8 +11,12 @@ from src.sensor_track_pro.business_logic.services.event_service import EventServ
 from src.sensor_track_pro.business_logic.services.object_service import ObjectService
 from src.sensor_track_pro.business_logic.services.route_service import RouteService
 from src.sensor_track_pro.business_logic.services.sensor_service import SensorService
+from src.sensor_track_pro.business_logic.services.tile_service import ZONES_LAYER
+from src.sensor_track_pro.business_logic.services.tile_service import TileCache
 from src.sensor_track_pro.business_logic.services.user_service import UserService
 from src.sensor_track_pro.business_logic.services.zone_service import ZoneService
+from src.sensor_track_pro.config import get_settings
+from src.sensor_track_pro.data_access.cache import get_repository_cache
 from src.sensor_track_pro.data_access.database import get_async_db
 from src.sensor_track_pro.data_access.repositories.alerts_repo import AlertRepository
 from src.sensor_track_pro.data_access.repositories.events_repo import EventRepository
@@ -27,6 +34,19 @@ def get_user_service(session: AsyncSession = db_dep) -> UserService:
     return UserService(UserRepository(session))
 
 
+@lru_cache
+def get_tile_cache() -> TileCache:
+    """
+    Кэш векторных тайлов процесса.
+
+    Слой зон сбрасывается вместе с пространством "zones" кэша репозиториев,
+    то есть по любой записи в зоны в любом воркере и экземпляре API.
+    """
+    cache = TileCache(get_settings().tile_cache_size)
+    get_repository_cache().subscribe("zones", partial(cache.invalidate, ZONES_LAYER))
+    return cache
+
+
 def get_zone_service(session: AsyncSession = db_dep) -> ZoneService:
     return ZoneService(ZoneRepository(session))
 
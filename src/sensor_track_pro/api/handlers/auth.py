@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import contextlib
+
+from typing import Any
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import HTTPException
+from fastapi import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.status import HTTP_204_NO_CONTENT
+
+from src.sensor_track_pro.api.dependencies.auth import get_current_user
+from src.sensor_track_pro.api.dependencies.auth import get_token_service
+from src.sensor_track_pro.business_logic.models.user_model import RefreshRequest
+from src.sensor_track_pro.business_logic.models.user_model import TokenClaims
+from src.sensor_track_pro.business_logic.models.user_model import TokenModel
+from src.sensor_track_pro.business_logic.models.user_model import TokenType
+from src.sensor_track_pro.business_logic.models.user_model import UserAuthData
+from src.sensor_track_pro.business_logic.models.user_model import UserBase
+from src.sensor_track_pro.business_logic.models.user_model import UserModel
+from src.sensor_track_pro.business_logic.services.token_service import InvalidTokenError
+from src.sensor_track_pro.business_logic.services.token_service import TokenService
+from src.sensor_track_pro.business_logic.services.user_service import UserService
+from src.sensor_track_pro.data_access.database import get_async_db
+from src.sensor_track_pro.data_access.repositories.users_repo import UserRepository
+
+
+_db_dep = Depends(get_async_db)
+
+
+def get_user_service(session: AsyncSession = _db_dep) -> UserService:
+    return UserService(UserRepository(session))
+
+
+_user_service_dep = Depends(get_user_service)
+_token_service_dep = Depends(get_token_service)
+_current_user_dep = Depends(get_current_user)
+
+
+def build_router() -> APIRouter:
+    """Регистрация, вход и токены (одинаковы во всех версиях API)."""
+    router = APIRouter()
+
+    @router.post("/register", response_model=UserModel)
+    async def register_user(
+        user_data: UserBase,
+        password: str,
+        service: UserService = _user_service_dep
+    ) -> UserModel:
+        try:
+            return await service.create_user(user_data, password)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @router.post("/login", response_model=TokenModel)
+    async def login_user(
+        auth_data: UserAuthData,
+        service: UserService = _user_service_dep,
+        tokens: TokenService = _token_service_dep
+    ) -> Any:
+        user = await service.authenticate_user(auth_data)
+        if not user or not user.is_active:
+            raise HTTPException(status_code=401, detail="Неверное имя пользователя или пароль")
+        return tokens.issue_tokens(user)
+
+    @router.post("/refresh", response_model=TokenModel)
+    async def refresh_tokens(
+        request: RefreshRequest,
+        service: UserService = _user_service_dep,
+        tokens: TokenService = _token_service_dep
+    ) -> Any:
+        """
+        Выдаёт новую пару токенов по токену обновления; старый токен отзывается.
+
+        Пользователь читается из БД только здесь, чтобы заблокированный
+        пользователь не продлил доступ, а смена роли попала в новый токен.
+        Из параллельных обновлений одним токеном пару получает только первое.
+        """
+        try:
+            claims = tokens.verify(request.refresh_token, TokenType.REFRESH)
+        except InvalidTokenError as e:
+            raise HTTPException(status_code=401, detail=str(e)) from e
+        user = await service.get_user(claims.sub)
+        if not user or not user.is_active:
+            raise HTTPException(status_code=401, detail="Пользователь недоступен")
+        if not await tokens.revoke(claims):
+            raise HTTPException(status_code=401, detail="Токен отозван")
+        return tokens.issue_tokens(user)
+
+    @router.post("/logout", status_code=HTTP_204_NO_CONTENT)
+    async def logout_user(
+        request: RefreshRequest | None = None,
+        claims: TokenClaims = _current_user_dep,
+        tokens: TokenService = _token_service_dep
+    ) -> Response:
+        """Отзывает текущий токен доступа и, если передан, токен обновления."""
+        await tokens.revoke(claims)
+        if request is not None:
+            with contextlib.suppress(InvalidTokenError):
+                await tokens.revoke(tokens.verify(request.refresh_token, TokenType.REFRESH))
+        return Response(status_code=HTTP_204_NO_CONTENT)
+
+    @router.get("/me", response_model=TokenClaims)
+    async def read_current_user(claims: TokenClaims = _current_user_dep) -> TokenClaims:
+        """Утверждения текущего токена доступа (пользователь из БД не читается)."""
+        return claims
+
+    return router
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from enum import Enum
+from uuid import UUID
+
+from fastapi import APIRouter
+from fastapi import Body
+from fastapi import Depends
+from fastapi import HTTPException
+from fastapi import Query
+from fastapi import Request
+from fastapi import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.sensor_track_pro.api.caching import PRIVATE
+from src.sensor_track_pro.api.caching import conditional_get
+from src.sensor_track_pro.business_logic.models.user_model import UserBase
+from src.sensor_track_pro.business_logic.models.user_model import UserModel
+from src.sensor_track_pro.business_logic.services.user_service import UserService
+from src.sensor_track_pro.data_access.database import get_async_db
+from src.sensor_track_pro.data_access.repositories.users_repo import UserRepository
+
+
+_db_dep = Depends(get_async_db)
+
+
+def get_user_service(session: AsyncSession = _db_dep) -> UserService:
+    return UserService(UserRepository(session))
+
+
+_user_service_dep = Depends(get_user_service)
+
+
+class UserAction(str, Enum):
+    activate = "activate"
+    deactivate = "deactivate"
+
+
+def build_router(*, http_caching: bool = False) -> APIRouter:
+    """
+    Общие эндпоинты пользователей; список и удаление различаются по версиям
+    и объявляются в адаптерах.
+
+    При http_caching карточка пользователя поддерживает условные запросы,
+    кэшируется только клиентом (Cache-Control: private).
+    """
+    router = APIRouter()
+
+    @router.post("/", response_model=UserModel)
+    async def create_user(
+        user_data: UserBase,
+        password: str,
+        service: UserService = _user_service_dep
+    ) -> UserModel:
+        return await service.create_user(user_data, password)
+
+    @router.get("/{user_id}", response_model=UserModel)
+    async def get_user(
+        user_id: UUID,
+        request: Request,
+        response: Response,
+        service: UserService = _user_service_dep
+    ) -> UserModel | Response:
+        if http_caching:
+            # Учётные данные не должны попадать в общий кэш nginx
+            version = await service.get_version(user_id)
+            not_modified = conditional_get(request, response, version, scope=PRIVATE, last_modified=True)
+            if not_modified is not None:
+                return not_modified
+        user = await service.get_user(user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        return user
+
+    @router.put("/{user_id}", response_model=UserModel)
+    async def update_user(
+        user_id: UUID,
+        user_data: UserBase = Body(..., example={
+            "email": "user@example.com",
+            "username": "test",
+            "is_active": True,
+            "role": "admin"
+        }),
+        service: UserService = _user_service_dep
+    ) -> UserModel:
+        user = await service.update_user(user_id, user_data.model_dump(exclude_unset=True))
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        return user
+
+    @router.patch("/{user_id}/status")
+    async def set_user_status(
+        user_id: UUID,
+        action: UserAction = Query(..., description="'activate' or 'deactivate'"),
+        service: UserService = _user_service_dep
+    ) -> dict[str, str]:
+        if action == UserAction.activate:
+            ok = await service.activate_user(user_id)
+        else:
+            ok = await service.deactivate_user(user_id)
+
+        if not ok:
+            raise HTTPException(status_code=404, detail="User not found")
+        return {"status": "success"}
+
+    return router
@@ -1,42 +1,118 @@
 from __future__ import annotations
 
+import asyncio
 import os
+import sys
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from typing import AsyncIterator
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse
 from fastapi import Request
-
-# Импорты для v1
-from src.sensor_track_pro.api.routers.v1 import alerts as alerts_v1
-from src.sensor_track_pro.api.routers.v1 import auth as auth_v1
-from src.sensor_track_pro.api.routers.v1 import events as events_v1
-from src.sensor_track_pro.api.routers.v1 import objects as objects_v1
-from src.sensor_track_pro.api.routers.v1 import routes as routes_v1
-from src.sensor_track_pro.api.routers.v1 import sensors as sensors_v1
-from src.sensor_track_pro.api.routers.v1 import users as users_v1
-from src.sensor_track_pro.api.routers.v1 import zones as zones_v1
-
-# Импорты для v2
-from src.sensor_track_pro.api.routers.v2 import alerts as alerts_v2
-from src.sensor_track_pro.api.routers.v2 import auth as auth_v2
-from src.sensor_track_pro.api.routers.v2 import events as events_v2
-from src.sensor_track_pro.api.routers.v2 import objects as objects_v2
-from src.sensor_track_pro.api.routers.v2 import routes as routes_v2
-from src.sensor_track_pro.api.routers.v2 import sensors as sensors_v2
-from src.sensor_track_pro.api.routers.v2 import users as users_v2
-from src.sensor_track_pro.api.routers.v2 import zones as zones_v2
+from fastapi import Response
+from prometheus_client import CONTENT_TYPE_LATEST
+from prometheus_client import REGISTRY
+from prometheus_client import generate_latest
 
 from src.sensor_track_pro.api.config import api_settings
+from src.sensor_track_pro.api.dependencies.auth import jwt_secret_key
+from src.sensor_track_pro.api.dependencies.auth import load_revocations
+from src.sensor_track_pro.api.middleware.capture import TrafficCaptureMiddleware
+from src.sensor_track_pro.api.middleware.compression import CompressionMiddleware
+from src.sensor_track_pro.api.middleware.metrics import MetricsMiddleware
+from src.sensor_track_pro.api.middleware.profiling import ProfilingMiddleware
+from src.sensor_track_pro.api.middleware.tracing import TracingMiddleware
+from src.sensor_track_pro.api.startup import StartupReport
+from src.sensor_track_pro.api.versions import mount_versions
+from src.sensor_track_pro.api.versions import preload_versions
+from src.sensor_track_pro.compute import get_compute_pool
+from src.sensor_track_pro.config import get_settings
+from src.sensor_track_pro.data_access.cache import CacheInvalidationListener
+from src.sensor_track_pro.data_access.cache import get_repository_cache
+from src.sensor_track_pro.data_access.database import dispose_engine
+from src.sensor_track_pro.data_access.database import get_async_engine
+from src.sensor_track_pro.data_access.database import get_asyncpg_dsn
+from src.sensor_track_pro.data_access.database import warm_up_pool
+from src.sensor_track_pro.metrics import POOL_COLLECTOR
+from src.sensor_track_pro.metrics import multiprocess_dir
+from src.sensor_track_pro.metrics import multiprocess_registry
+from src.sensor_track_pro.tracing import get_tracer
+from src.sensor_track_pro.workers import WorkerHeartbeat
+from src.sensor_track_pro.workers import read_worker_states
+
+
+if TYPE_CHECKING:
+    from fastapi.templating import Jinja2Templates
+
+
+startup_report = StartupReport()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    startup_report.begin()
+    settings = get_settings()
+    # Без общего ключа токены одного воркера не примут другие — не запускаемся
+    jwt_secret_key()
+    # Движок создаётся здесь, а не при импорте; пул соединений и процессы для
+    # геометрии запускаются параллельно со сборкой под-приложений версий,
+    # чтобы первые запросы не ждали ни того, ни другого
+    with startup_report.phase("engine"):
+        get_async_engine()
+    compute = get_compute_pool()
+    warmups = [
+        startup_report.timed("pool", warm_up_pool(settings.db_pool_warmup)),
+        startup_report.timed("compute", compute.start()),
+    ]
+    if api_settings.preload_versions:
+        warmups.append(startup_report.timed("versions", asyncio.to_thread(preload_versions, version_apps)))
+    await asyncio.gather(*warmups)
+    # Отзыв токенов проверяется в памяти процесса: до первых запросов — из БД
+    await load_revocations()
+
+    # Инвалидация кэша репозиториев и новые отзывы токенов по уведомлениям
+    # других экземпляров; после переподключения отзывы перечитываются
+    listener = None
+    if settings.repository_cache_listen:
+        listener = CacheInvalidationListener(
+            get_repository_cache(),
+            settings.repository_cache_listen_dsn or get_asyncpg_dsn(),
+            on_connect=load_revocations,
+        )
+        listener.start()
+    startup_report.publish()
+
+    # Пульс для супервизора serve.py; первый пульс означает готовность воркера
+    heartbeat = None
+    if settings.worker_state_dir:
+        heartbeat = WorkerHeartbeat(
+            settings.worker_state_dir,
+            settings.worker_heartbeat_interval,
+            on_beat=POOL_COLLECTOR.publish if multiprocess_dir() else None,
+        )
+        await heartbeat.start()
+    yield
+    if heartbeat is not None:
+        await heartbeat.stop()
+    if listener is not None:
+        await listener.stop()
+    await compute.stop()
+    await dispose_engine()
+
 
 app = FastAPI(
+    lifespan=lifespan,
     title=api_settings.project_name,
     description=f"API для системы мониторинга объектов (version {api_settings.version})",
     version=api_settings.version,
     docs_url=None,  # disable root docs to avoid collision with mounted apps
     redoc_url=None,
     openapi_url=None,
+    default_response_class=ORJSONResponse,
 )
 
 # add instance header so responses indicate which container served the request
@@ -52,18 +128,18 @@ async def add_instance_header(request: Request, call_next):
     return response
 
 # Handle database permission errors (e.g. write attempted on read-only user/replica)
-try:
-    import asyncpg
-    _AsyncPGError = asyncpg.PostgresError
-except Exception:
-    _AsyncPGError = None
+def _asyncpg_error_type() -> type[Exception] | None:
+    # asyncpg загружается вместе с движком; пока его нет, ошибок asyncpg быть не может
+    asyncpg = sys.modules.get("asyncpg")
+    return getattr(asyncpg, "PostgresError", None)
 
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     # If this is a postgres permission error, return a friendly 'write to read-only' response
     msg = str(exc)
-    if _AsyncPGError is not None and isinstance(exc, _AsyncPGError):
+    asyncpg_error = _asyncpg_error_type()
+    if asyncpg_error is not None and isinstance(exc, asyncpg_error):
         lower = msg.lower()
         if "permission denied" in lower or "read-only" in lower or "insufficient" in lower:
             return JSONResponse(status_code=403, content={"detail": "Write attempted on read-only DB instance"})
@@ -77,25 +153,6 @@ async def general_exception_handler(request: Request, exc: Exception):
     # otherwise propagate as 500
     return JSONResponse(status_code=500, content={"detail": "Internal server error"})
 
-# Create sub-applications for v1 and v2 so each has its own documentation pages
-app_v1 = FastAPI(
-    title=f"{api_settings.project_name} API v1",
-    description=f"API v1 для системы мониторинга объектов (version {api_settings.version})",
-    version=api_settings.version,
-    docs_url=f"/docs",
-    redoc_url=f"/redoc",
-    openapi_url=f"/openapi.json",
-)
-
-app_v2 = FastAPI(
-    title=f"{api_settings.project_name} API v2",
-    description=f"API v2 для системы мониторинга объектов (version {api_settings.version})",
-    version=api_settings.version,
-    docs_url=f"/docs",
-    redoc_url=f"/redoc",
-    openapi_url=f"/openapi.json",
-)
-
 # CORS middleware
 # Apply CORS to root app so static/templates are accessible; sub-apps inherit middleware when mounted
 app.add_middleware(
@@ -106,30 +163,47 @@ app.add_middleware(
     allow_headers=api_settings.allowed_headers,
 )
 
-# Подключаем роутеры к под-приложениям
-# v1 routers
-app_v1.include_router(users_v1.router, prefix="/users", tags=["users-v1"])
-app_v1.include_router(zones_v1.router, prefix="/zones", tags=["zones-v1"])
-app_v1.include_router(sensors_v1.router, prefix="/sensors", tags=["sensors-v1"])
-app_v1.include_router(routes_v1.router, prefix="/routes", tags=["routes-v1"])
-app_v1.include_router(objects_v1.router, prefix="/objects", tags=["objects-v1"])
-app_v1.include_router(events_v1.router, prefix="/events", tags=["events-v1"])
-app_v1.include_router(alerts_v1.router, prefix="/alerts", tags=["alerts-v1"])
-
-# v2 routers
-app_v2.include_router(users_v2.router, prefix="/users", tags=["users-v2"])
-app_v2.include_router(zones_v2.router, prefix="/zones", tags=["zones-v2"])
-app_v2.include_router(sensors_v2.router, prefix="/sensors", tags=["sensors-v2"])
-app_v2.include_router(routes_v2.router, prefix="/routes", tags=["routes-v2"])
-app_v2.include_router(objects_v2.router, prefix="/objects", tags=["objects-v2"])
-app_v2.include_router(events_v2.router, prefix="/events", tags=["events-v2"])
-app_v2.include_router(alerts_v2.router, prefix="/alerts", tags=["alerts-v2"])
+# Профиль одного запроса администратора по заголовку X-Profile (отчёт вместо ответа)
+if api_settings.profiling_enabled:
+    app.add_middleware(ProfilingMiddleware)
 
+# Сжатие ответов (в том числе потоковых) на стороне приложения
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=api_settings.compression_minimum_size,
+    encodings=api_settings.compression_encodings or None,
+    gzip_level=api_settings.compression_gzip_level,
+)
+
+# Метрики Prometheus по шаблонам маршрутов; снимаются с /metrics
+if api_settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware, statements_warn=get_settings().sql_request_statements_warn)
+
+# Трассировка запросов (TRACING_EXPORTER): спаны обработчика, сервисов,
+# репозиториев и SQL выгружаются в файл или коллектор OTLP
+if get_tracer().enabled:
+    app.add_middleware(TracingMiddleware)
+
+# Запись трафика для воспроизведения (tests/load_tests/replay.py); внешний слой,
+# чтобы длительность включала сжатие ответа
+if api_settings.capture_path:
+    app.add_middleware(
+        TrafficCaptureMiddleware,
+        path=api_settings.capture_path,
+        sample_rate=api_settings.capture_sample_rate,
+        max_body=api_settings.capture_max_body,
+    )
 
 # Получаем абсолютный путь к директории проекта
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-templates = Jinja2Templates(directory=os.path.join(BASE_DIR, "templates"))
+
+
+@lru_cache
+def get_templates() -> Jinja2Templates:
+    # jinja2 нужен только странице /interface, не загружаем его при запуске
+    from fastapi.templating import Jinja2Templates
+    return Jinja2Templates(directory=os.path.join(BASE_DIR, "templates"))
 
 
 @app.get("/", include_in_schema=False)
@@ -140,21 +214,42 @@ async def root() -> dict[str, str]:
 @app.get("/interface", response_class=HTMLResponse, include_in_schema=False)
 async def interface(request: Request) -> HTMLResponse:
     # Передаём префикс API в шаблон, чтобы фронтенд использовал корректный путь (например, /api/v1)
-    return templates.TemplateResponse("index.html", {"request": request, "api_prefix": api_settings.api_v1_prefix})
-
-
-# Mount sub-applications so their docs are available at /api/v1/docs and /api/v2/docs
-# Health endpoints for mounted sub-applications. These return 200 for
-# <prefix>/health (used by proxies and healthchecks). When the mirror
-# proxy preserves the prefix, /mirror/api/v1/health will reach this
-# handler and return ok instead of 404.
-@app_v1.get("/health", include_in_schema=False)
-async def health_v1() -> dict[str, str]:
-    return {"status": "ok"}
-
-@app_v2.get("/health", include_in_schema=False)
-async def health_v2() -> dict[str, str]:
-    return {"status": "ok"}
-
-app.mount(api_settings.api_v1_prefix, app_v1)
-app.mount(api_settings.api_v2_prefix, app_v2)
+    context = {"request": request, "api_prefix": api_settings.api_v1_prefix}
+    return get_templates().TemplateResponse("index.html", context)
+
+
+if api_settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        # При нескольких воркерах — сумма по всем процессам, а не только по ответившему
+        registry = multiprocess_registry() if multiprocess_dir() else REGISTRY
+        return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.get("/health/workers", include_in_schema=False)
+async def health_workers() -> JSONResponse:
+    """Пульс воркеров контейнера; 503, если хотя бы один воркер не отвечает."""
+    settings = get_settings()
+    if not settings.worker_state_dir:
+        return JSONResponse({"status": "ok", "workers": [{"pid": os.getpid(), "healthy": True}]})
+    timeout = settings.worker_heartbeat_timeout
+    workers = [
+        {
+            "pid": state.pid,
+            "healthy": state.is_healthy(timeout),
+            "uptime": round(time.time() - state.started, 1),
+            "heartbeat_age": round(state.age(), 1),
+            "loop_lag": round(state.loop_lag, 3),
+        }
+        for state in read_worker_states(settings.worker_state_dir)
+    ]
+    healthy = bool(workers) and all(worker["healthy"] for worker in workers)
+    return JSONResponse(
+        {"status": "ok" if healthy else "degraded", "workers": workers},
+        status_code=200 if healthy else 503,
+    )
+
+
+# Под-приложения версий со своими /docs (/api/v1/docs, /api/v2/docs) и /health;
+# роутеры версий импортируются в lifespan или при первом запросе (api/versions.py)
+version_apps = mount_versions(app, api_settings.api_versions, lazy=api_settings.api_lazy_load)
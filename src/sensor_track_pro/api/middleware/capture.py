@@ -0,0 +1,222 @@
+"""ASGI-middleware записи трафика в JSONL для последующего воспроизведения."""
+from __future__ import annotations
+
+import atexit
+import base64
+import os
+import queue
+import random
+import threading
+import time
+
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+
+# Заголовки, влияющие на обработку запроса. Authorization и cookie намеренно не
+# пишутся: журнал не должен содержать учётных данных
+CAPTURED_HEADERS = (
+    "content-type",
+    "accept",
+    "accept-encoding",
+    "if-none-match",
+    "if-modified-since",
+)
+# Тела запросов к /auth/ (логин, регистрация, обновление и отзыв токенов) не
+# пишутся целиком: в них пароли и refresh-токены
+SKIP_BODY_SEGMENTS = ("/auth/",)
+# Поля с учётными данными, которые заменяются в JSON-телах остальных запросов
+REDACTED_FIELDS = frozenset({"password", "refresh_token", "access_token"})
+REDACTED = "***"
+
+
+class JsonlWriter:
+    """
+    Дописывает записи в JSONL-файл из отдельного потока.
+
+    Запрос только кладёт запись в очередь: сериализация и запись на диск не
+    задерживают цикл событий. Файл сбрасывается, когда очередь опустела.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._queue: queue.SimpleQueue[dict[str, Any] | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="traffic-capture", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, record: dict[str, Any]) -> None:
+        self._queue.put(record)
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        with self.path.open("ab") as file:
+            while True:
+                record = self._queue.get()
+                if record is None:
+                    return
+                file.write(orjson.dumps(record) + b"\n")
+                if self._queue.empty():
+                    file.flush()
+
+
+def encode_body(body: bytes) -> tuple[str, str]:
+    """Тело запроса для JSON: текст как есть, двоичные данные — в base64."""
+    try:
+        return body.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError:
+        return base64.b64encode(body).decode("ascii"), "base64"
+
+
+def decode_body(body: str, encoding: str) -> bytes:
+    return base64.b64decode(body) if encoding == "base64" else body.encode("utf-8")
+
+
+def _redact(value: Any) -> bool:
+    """Заменяет на месте значения полей с учётными данными; True, если что-то заменено."""
+    found = False
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in REDACTED_FIELDS:
+                value[key] = REDACTED
+                found = True
+            else:
+                found = _redact(item) or found
+    elif isinstance(value, list):
+        for item in value:
+            found = _redact(item) or found
+    return found
+
+
+def redact_body(body: bytes) -> bytes | None:
+    """JSON-тело с заменёнными учётными данными; None, если тело не JSON или заменять нечего."""
+    try:
+        data = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return None
+    return orjson.dumps(data) if _redact(data) else None
+
+
+class TrafficCaptureMiddleware:
+    """
+    Пишет запросы к API в JSONL: время прихода, метод, путь, строку запроса,
+    значимые заголовки, тело, статус, длительность и размер ответа.
+
+    Длительность — от получения запроса до отправки последней части ответа.
+    Тела длиннее max_body не сохраняются (запись помечается body_truncated):
+    такие запросы нельзя воспроизвести точно. Учётные данные в журнал не
+    попадают: тела запросов к /auth/ не пишутся, а поля password,
+    refresh_token и access_token в JSON-телах заменяются; такие записи
+    помечаются body_redacted. sample_rate задаёт долю
+    записываемых запросов. В пути файла можно указать {pid}, чтобы каждый
+    воркер писал в свой файл.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        path: str,
+        sample_rate: float = 1.0,
+        max_body: int = 65536,
+        include_prefixes: Sequence[str] = ("/api/",),
+        writer: JsonlWriter | None = None,
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.max_body = max_body
+        self.include_prefixes = tuple(include_prefixes)
+        self.writer = writer or JsonlWriter(path.format(pid=os.getpid()))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not scope["path"].startswith(self.include_prefixes)
+            or (self.sample_rate < 1.0 and random.random() >= self.sample_rate)
+        ):
+            await self.app(scope, receive, send)
+            return
+        exchange = _CapturedExchange(scope, receive, send, self.max_body)
+        try:
+            await self.app(scope, exchange.receive, exchange.send)
+        finally:
+            self.writer.write(exchange.record())
+
+
+class _CapturedExchange:
+    """Обёртки receive/send одного запроса, накапливающие данные для записи."""
+
+    def __init__(self, scope: Scope, receive: Receive, send: Send, max_body: int):
+        self._scope = scope
+        self._receive = receive
+        self._send = send
+        self._max_body = max_body
+        self._body = bytearray()
+        self._truncated = False
+        self._skip_body = any(segment in scope["path"] for segment in SKIP_BODY_SEGMENTS)
+        self._status = 0
+        self._response_bytes = 0
+        self._ts = time.time()
+        self._started = time.perf_counter()
+        self._finished: float | None = None
+
+    async def receive(self) -> Message:
+        message = await self._receive()
+        if message["type"] == "http.request" and not self._truncated and not self._skip_body:
+            self._body += message.get("body", b"")
+            if len(self._body) > self._max_body:
+                self._truncated = True
+                self._body.clear()
+        return message
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._status = message["status"]
+        elif message["type"] == "http.response.body":
+            self._response_bytes += len(message.get("body", b""))
+            if not message.get("more_body", False):
+                self._finished = time.perf_counter()
+        await self._send(message)
+
+    def record(self) -> dict[str, Any]:
+        finished = self._finished if self._finished is not None else time.perf_counter()
+        headers: dict[str, str] = {}
+        for name, value in self._scope["headers"]:
+            key = name.decode("latin-1").lower()
+            if key in CAPTURED_HEADERS:
+                headers[key] = value.decode("latin-1")
+        record = {
+            "ts": self._ts,
+            "method": self._scope["method"],
+            "path": self._scope["path"],
+            "query": self._scope["query_string"].decode("latin-1"),
+            "headers": headers,
+            "status": self._status,
+            "duration_ms": round((finished - self._started) * 1000, 3),
+            "response_bytes": self._response_bytes,
+        }
+        if self._skip_body:
+            record["body_redacted"] = True
+        elif self._truncated:
+            record["body_truncated"] = True
+        elif self._body:
+            body = bytes(self._body)
+            redacted = redact_body(body)
+            if redacted is not None:
+                body = redacted
+                record["body_redacted"] = True
+            record["body"], record["body_encoding"] = encode_body(body)
+        return record
@@ -0,0 +1,235 @@
+"""ASGI-middleware сжатия ответов: gzip, а при наличии библиотек — brotli и zstd."""
+from __future__ import annotations
+
+import zlib
+
+from collections.abc import Callable
+from collections.abc import Sequence
+from typing import Protocol
+
+from starlette.datastructures import Headers
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+
+try:
+    import brotli
+except ImportError:  # необязательная зависимость
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # необязательная зависимость
+    zstandard = None
+
+
+GZIP = "gzip"
+BROTLI = "br"
+ZSTD = "zstd"
+
+# Уже сжатые форматы: повторное сжатие только тратит CPU
+_INCOMPRESSIBLE_PREFIXES = ("image/", "video/", "audio/")
+_INCOMPRESSIBLE_TYPES = {
+    "application/gzip",
+    "application/x-gzip",
+    "application/zip",
+    "application/zstd",
+}
+
+
+class _Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Кодировки, для которых установлены библиотеки, в порядке предпочтения сервера."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append(ZSTD)
+    if brotli is not None:
+        encodings.append(BROTLI)
+    encodings.append(GZIP)
+    return tuple(encodings)
+
+
+def select_encoding(accept_encoding: str, supported: Sequence[str]) -> str | None:
+    """
+    Выбирает кодировку по Accept-Encoding.
+
+    Из принятых клиентом (q > 0) берётся первая в порядке supported; `*`
+    разрешает любую кодировку, явно не запрещённую через q=0.
+    """
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, *params = (item.strip() for item in part.split(";"))
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+    for coding in supported:
+        if accepted.get(coding, wildcard) > 0:
+            return coding
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Сжимает ответы потоково, не собирая тело целиком.
+
+    Ответ из одного сообщения короче minimum_size отдаётся как есть. Потоковые
+    ответы (more_body) сжимаются по мере поступления частей: после каждой части
+    выполняется flush, чтобы клиент получал данные без задержки, а
+    Content-Length убирается. Уже закодированные ответы и сжатые форматы не
+    трогаются.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        encodings: Sequence[str] | None = None,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        available = available_encodings()
+        self.encodings = tuple(e for e in (encodings or available) if e in available)
+        self._factories: dict[str, Callable[[], _Compressor]] = {
+            GZIP: lambda: _GzipCompressor(gzip_level),
+            BROTLI: lambda: _BrotliCompressor(brotli_quality),
+            ZSTD: lambda: _ZstdCompressor(zstd_level),
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = select_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(send, encoding, self._factories[encoding], self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Обёртка над send одного ответа: решает, сжимать ли, по первой части тела."""
+
+    def __init__(self, send: Send, encoding: str, factory: Callable[[], _Compressor], minimum_size: int):
+        self._send = send
+        self._encoding = encoding
+        self._factory = factory
+        self._minimum_size = minimum_size
+        self._start: Message | None = None
+        self._compressor: _Compressor | None = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Заголовки придерживаются до первой части тела
+            self._start = message
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+        if self._compressor is None:
+            await self._begin(message)
+            return
+        body = self._compressor.compress(message.get("body", b""))
+        more_body = message.get("more_body", False)
+        body += self._compressor.flush() if more_body else self._compressor.finish()
+        await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    async def _begin(self, message: Message) -> None:
+        start = self._start
+        assert start is not None
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        headers = MutableHeaders(raw=start["headers"])
+        if (
+            not self._compressible(headers)
+            or (not more_body and len(body) < self._minimum_size)
+        ):
+            self._passthrough = True
+            await self._send(start)
+            await self._send(message)
+            return
+
+        self._compressor = self._factory()
+        body = self._compressor.compress(body)
+        body += self._compressor.flush() if more_body else self._compressor.finish()
+        headers["Content-Encoding"] = self._encoding
+        headers.add_vary_header("Accept-Encoding")
+        if more_body:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(body))
+        await self._send(start)
+        await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    @staticmethod
+    def _compressible(headers: MutableHeaders) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return not (content_type.startswith(_INCOMPRESSIBLE_PREFIXES) or content_type in _INCOMPRESSIBLE_TYPES)
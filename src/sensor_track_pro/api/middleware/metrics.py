@@ -0,0 +1,103 @@
+"""ASGI-middleware метрик Prometheus: длительность и число SQL-запросов по шаблону маршрута."""
+from __future__ import annotations
+
+import logging
+import time
+
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+from src.sensor_track_pro.data_access.profiling import StatementStats
+from src.sensor_track_pro.data_access.profiling import track_statements
+from src.sensor_track_pro.metrics import HTTP_REQUEST_DB_STATEMENTS
+from src.sensor_track_pro.metrics import HTTP_REQUEST_DURATION
+from src.sensor_track_pro.metrics import HTTP_REQUESTS_IN_PROGRESS
+from src.sensor_track_pro.metrics import UNMATCHED_ROUTE
+
+
+logger = logging.getLogger(__name__)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Шаблон маршрута запроса, например /api/v2/zones/{zone_id}.
+
+    Роутер FastAPI кладёт найденный маршрут в scope, а монтирование
+    под-приложения дописывает свой префикс в root_path. Запросы без
+    маршрута сводятся к одной метке, чтобы произвольные пути не
+    раздували число рядов.
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path is None:
+        return UNMATCHED_ROUTE
+    return scope.get("root_path", "") + path
+
+
+class MetricsMiddleware:
+    """
+    Учитывает каждый HTTP-запрос в http_request_duration_seconds
+    (метод, шаблон маршрута, статус), http_requests_in_progress и
+    http_request_db_statements (число SQL-запросов).
+
+    Длительность — до отправки последней части ответа. Необработанное
+    исключение учитывается как 500. Запрос, выполнивший не меньше
+    statements_warn SQL-запросов, пишется в журнал вместе с самым частым
+    запросом — так проявляются циклы запросов по одному (N+1).
+    """
+
+    def __init__(self, app: ASGIApp, statements_warn: int = 20):
+        self.app = app
+        self.statements_warn = statements_warn
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        status = 500
+        finished: float | None = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, finished
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                finished = time.perf_counter()
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        with track_statements() as statements:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                in_progress.dec()
+                duration = (finished if finished is not None else time.perf_counter()) - started
+                route = route_template(scope)
+                HTTP_REQUEST_DURATION.labels(method, route, str(status)).observe(duration)
+                HTTP_REQUEST_DB_STATEMENTS.labels(route).observe(statements.count)
+                if 0 < self.statements_warn <= statements.count:
+                    self._log_statements(method, route, statements)
+
+    @staticmethod
+    def _log_statements(method: str, route: str, statements: StatementStats) -> None:
+        repeated = statements.most_repeated()
+        if repeated is None:
+            return
+        operation, statement, repeats = repeated
+        logger.warning(
+            "%s %s: %d SQL-запросов за %.1f мс (строк: %d); чаще всего %d раз в %s: %s",
+            method,
+            route,
+            statements.count,
+            statements.duration * 1000,
+            statements.rows,
+            repeats,
+            operation,
+            " ".join(statement.split())[:500],
+        )
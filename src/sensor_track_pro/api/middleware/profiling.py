@@ -0,0 +1,94 @@
+"""ASGI-middleware профилирования одного запроса по заголовку X-Profile."""
+from __future__ import annotations
+
+import logging
+import time
+
+from starlette.datastructures import Headers
+from starlette.datastructures import MutableHeaders
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+from src.sensor_track_pro.api.dependencies.auth import build_token_service
+from src.sensor_track_pro.business_logic.models.user_model import UserRole
+from src.sensor_track_pro.business_logic.services.token_service import InvalidTokenError
+from src.sensor_track_pro.business_logic.services.token_service import TokenService
+from src.sensor_track_pro.profiler import format_stats
+from src.sensor_track_pro.profiler import profile_calls
+
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+
+
+class ProfilingMiddleware:
+    """
+    Выполняет запрос администратора с заголовком X-Profile под cProfile и
+    вместо ответа возвращает отчёт pstats (text/plain).
+
+    Значение заголовка — ключ сортировки: cumulative (по умолчанию, также
+    «1»), tottime или calls. Исходный статус ответа — в X-Profiled-Status.
+    Заголовок от остальных пользователей игнорируется; если профилировщик
+    процесса занят, запрос выполняется как обычно с X-Profile: busy.
+    """
+
+    def __init__(self, app: ASGIApp, tokens: TokenService | None = None, limit: int = 60):
+        self.app = app
+        self.tokens = tokens
+        self.limit = limit
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        sort = headers.get(PROFILE_HEADER)
+        if sort is None or not self._is_admin(headers.get("authorization")):
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def discard_response(message: Message) -> None:  # noqa: RUF029 - send в ASGI должен быть awaitable
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        with profile_calls() as profiler:
+            if profiler is None:
+                await self.app(scope, receive, _with_header(send, "X-Profile", "busy"))
+                return
+            await self.app(scope, receive, discard_response)
+        duration_ms = (time.perf_counter() - started) * 1000
+        logger.info("Профиль запроса %s %s: %d, %.1f мс", scope["method"], scope["path"], status, duration_ms)
+        report = (
+            f"# {scope['method']} {scope['path']} -> {status} за {duration_ms:.1f} мс\n"
+            + format_stats(profiler, "cumulative" if sort == "1" else sort, self.limit)
+        )
+        response = PlainTextResponse(report, headers={"X-Profiled-Status": str(status)})
+        await response(scope, receive, send)
+
+    def _is_admin(self, authorization: str | None) -> bool:
+        scheme, _, token = (authorization or "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+        tokens = self.tokens if self.tokens is not None else build_token_service()
+        try:
+            claims = tokens.verify(token)
+        except InvalidTokenError:
+            return False
+        return claims.role == UserRole.ADMIN
+
+
+def _with_header(send: Send, name: str, value: str) -> Send:
+    async def wrapper(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            MutableHeaders(scope=message)[name] = value
+        await send(message)
+    return wrapper
@@ -0,0 +1,68 @@
+"""ASGI-middleware трассировки: корневой спан HTTP-запроса и заголовок X-Trace-Id."""
+from __future__ import annotations
+
+from starlette.datastructures import Headers
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+from src.sensor_track_pro.api.middleware.metrics import route_template
+from src.sensor_track_pro.tracing import TRACEPARENT
+from src.sensor_track_pro.tracing import Tracer
+from src.sensor_track_pro.tracing import get_tracer
+
+
+TRACE_ID_HEADER = "X-Trace-Id"
+REQUEST_ID_HEADER = "x-request-id"
+
+
+class TracingMiddleware:
+    """
+    Открывает спан SERVER на каждый HTTP-запрос; спаны зависимостей,
+    сервисов, репозиториев и SQL становятся его потомками.
+
+    Контекст берётся из traceparent, иначе trace_id — X-Request-ID, который
+    проставляет nginx, так что запрос находится по строке журнала балансировщика.
+    По завершении спан называется «МЕТОД шаблон-маршрута» и получает статус
+    и имя обработчика. Идентификатор трассы возвращается в X-Trace-Id.
+    """
+
+    def __init__(self, app: ASGIApp, tracer: Tracer | None = None):
+        self.app = app
+        self.tracer = tracer or get_tracer()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        headers = Headers(scope=scope)
+        attributes = {"http.request.method": method, "url.path": scope["path"]}
+        with self.tracer.start_request_span(
+            f"{method} {scope['path']}",
+            traceparent=headers.get(TRACEPARENT),
+            request_id=headers.get(REQUEST_ID_HEADER),
+            attributes=attributes,
+        ) as span:
+            if span is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    MutableHeaders(scope=message)[TRACE_ID_HEADER] = span.trace_id
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = route_template(scope)
+                span.name = f"{method} {route}"
+                span.set_attribute("http.route", route)
+                endpoint = scope.get("endpoint")
+                if endpoint is not None:
+                    span.set_attribute("code.function", getattr(endpoint, "__qualname__", repr(endpoint)))
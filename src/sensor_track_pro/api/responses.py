@@ -0,0 +1,123 @@
+"""Классы и помощники для быстрой сериализации ответов API."""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+import orjson
+
+from pydantic import BaseModel
+from starlette.responses import Response
+
+from src.sensor_track_pro.business_logic.analytics.telemetry_columns import encode_arrow
+from src.sensor_track_pro.business_logic.analytics.telemetry_columns import encode_msgpack
+from src.sensor_track_pro.business_logic.analytics.telemetry_columns import to_columns
+
+
+__all__ = [
+    "ARROW_STREAM_MEDIA_TYPE",
+    "MSGPACK_MEDIA_TYPE",
+    "TELEMETRY_RESPONSES",
+    "ModelJSONResponse",
+    "model_response",
+    "negotiate_columnar",
+    "telemetry_response",
+]
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+_COLUMNAR_MEDIA_TYPES = {
+    ARROW_STREAM_MEDIA_TYPE: ARROW_STREAM_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE: MSGPACK_MEDIA_TYPE,
+    "application/x-msgpack": MSGPACK_MEDIA_TYPE,
+    "application/vnd.msgpack": MSGPACK_MEDIA_TYPE,
+}
+_JSON_MEDIA_TYPES = {"application/json", "application/*", "*/*"}
+
+# Описание альтернативных тел ответа для OpenAPI
+TELEMETRY_RESPONSES: dict[int | str, dict[str, Any]] = {
+    200: {"content": {ARROW_STREAM_MEDIA_TYPE: {}, MSGPACK_MEDIA_TYPE: {}}},
+}
+
+
+class ModelJSONResponse(Response):
+    """
+    JSON-ответ из уже готовой Pydantic-модели.
+
+    Модель сериализуется напрямую в байты средствами pydantic-core, без
+    повторной проверки по response_model и без промежуточного jsonable_encoder.
+    Всё остальное (словари, списки) отдаётся через orjson.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            # to_json сразу отдаёт bytes, без промежуточной str как у model_dump_json
+            return content.__pydantic_serializer__.to_json(content, by_alias=True)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def model_response[T: BaseModel](model_type: type[T], **fields: Any) -> ModelJSONResponse:
+    """
+    Собирает ответ из доверенных данных без валидации.
+
+    Поля (например, items — список моделей из репозитория) уже проверены при
+    чтении, поэтому обёртка создаётся через model_construct.
+    """
+    return ModelJSONResponse(model_type.model_construct(**fields))
+
+
+def negotiate_columnar(accept: str | None) -> str | None:
+    """
+    Выбирает колоночный формат по заголовку Accept.
+
+    Диапазоны перебираются по убыванию q (при равенстве — в порядке заголовка);
+    возвращается первый поддерживаемый бинарный тип или None, если раньше
+    встретился JSON, либо ничего подходящего нет.
+    """
+    if not accept:
+        return None
+    ranges = []
+    for position, part in enumerate(accept.split(",")):
+        media_type, *params = (item.strip() for item in part.split(";"))
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            ranges.append((-quality, position, media_type.lower()))
+    for _, _, media_type in sorted(ranges):
+        if media_type in _COLUMNAR_MEDIA_TYPES:
+            return _COLUMNAR_MEDIA_TYPES[media_type]
+        if media_type in _JSON_MEDIA_TYPES:
+            return None
+    return None
+
+
+def telemetry_response[T: BaseModel](
+    accept: str | None,
+    points: Sequence[Any],
+    model_type: type[T],
+    **fields: Any,
+) -> Response:
+    """
+    Ответ с телеметрией в формате, согласованном по Accept.
+
+    Для Arrow и msgpack тело — колонки timestamp/latitude/longitude/speed из
+    points, иначе JSON из model_type и fields (как model_response).
+    """
+    media_type = negotiate_columnar(accept)
+    if media_type is None:
+        response: Response = model_response(model_type, **fields)
+    else:
+        columns = to_columns(points)
+        body = encode_arrow(columns) if media_type == ARROW_STREAM_MEDIA_TYPE else encode_msgpack(columns)
+        response = Response(content=body, media_type=media_type)
+    response.headers["Vary"] = "Accept"
+    return response
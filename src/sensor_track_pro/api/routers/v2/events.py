@@ -1,132 +1,173 @@
+"""
+События v2: к общим эндпоинтам добавлены тепловая карта и трек сенсора,
+список отдаётся колонками по Accept.
+"""
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Optional
+from typing import Literal
 from uuid import UUID
 
 from fastapi import APIRouter
 from fastapi import Depends
+from fastapi import Header
 from fastapi import HTTPException
 from fastapi import Query
-from fastapi import Body
-from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Response
-from starlette.status import HTTP_204_NO_CONTENT
+from pydantic import BaseModel
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.sensor_track_pro.business_logic.models.event_model import EventBase
-from src.sensor_track_pro.business_logic.models.event_model import EventModel
+from src.sensor_track_pro.api.handlers import events
+from src.sensor_track_pro.api.handlers.events import EventsResponse
+from src.sensor_track_pro.api.handlers.events import get_event_service
+from src.sensor_track_pro.api.responses import TELEMETRY_RESPONSES
+from src.sensor_track_pro.api.responses import telemetry_response
+from src.sensor_track_pro.business_logic.analytics.heatmap import encode_heatmap
+from src.sensor_track_pro.business_logic.models.event_model import EventType
+from src.sensor_track_pro.business_logic.models.heatmap_model import MAX_HEATMAP_SIZE
+from src.sensor_track_pro.business_logic.models.heatmap_model import HeatmapGrid
+from src.sensor_track_pro.business_logic.models.heatmap_model import HeatmapModel
 from src.sensor_track_pro.business_logic.services.event_service import EventService
+from src.sensor_track_pro.business_logic.services.heatmap_service import HeatmapService
 from src.sensor_track_pro.data_access.database import get_async_db
 from src.sensor_track_pro.data_access.repositories.events_repo import EventRepository
-from pydantic import BaseModel
 
 
-class EventsResponse(BaseModel):
-    items: list[EventModel]
-    total: int | None = None
+__all__ = ["EventsResponse", "TrackResponse", "get_event_service", "get_heatmap_service", "router"]
 
 
-_db_dep = Depends(get_async_db)
-
-router = APIRouter()
+class TrackResponse(BaseModel):
+    """Трек сенсора в колоночном виде: i-я точка — i-е значения всех списков."""
+    sensor_id: UUID
+    total: int
+    timestamp: list[datetime]
+    latitude: list[float]
+    longitude: list[float]
+    speed: list[float | None]
 
 
-def get_event_service(session: AsyncSession = _db_dep) -> EventService:
-    return EventService(EventRepository(session))
-
+router = APIRouter()
 
+_db_dep = Depends(get_async_db)
 _event_service_dep = Depends(get_event_service)
 
 
-@router.post("/", response_model=EventModel)
-async def create_event(
-    event_data: EventBase,
-    service: EventService = _event_service_dep
-) -> EventModel:
-    return await service.create_event(event_data)
-
-
-
-@router.get("/{event_id}", response_model=EventModel)
-async def get_event(
-    event_id: UUID,
-    service: EventService = _event_service_dep
-) -> EventModel:
-    event = await service.get_event(event_id)
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    return event
-
+def get_heatmap_service(session: AsyncSession = _db_dep) -> HeatmapService:
+    return HeatmapService(EventRepository(session))
+
+
+_heatmap_service_dep = Depends(get_heatmap_service)
+
+
+class HeatmapPeriod(BaseModel):
+    """Период тепловой карты; границы не обязательны."""
+    start_time: datetime | None = None
+    end_time: datetime | None = None
+
+
+def get_heatmap_grid(
+    min_latitude: float = Query(..., description="Южная граница bbox"),
+    min_longitude: float = Query(..., description="Западная граница bbox"),
+    max_latitude: float = Query(..., description="Северная граница bbox"),
+    max_longitude: float = Query(..., description="Восточная граница bbox"),
+    width: int = Query(256, ge=1, le=MAX_HEATMAP_SIZE, description="Количество ячеек по долготе"),
+    height: int = Query(256, ge=1, le=MAX_HEATMAP_SIZE, description="Количество ячеек по широте"),
+) -> HeatmapGrid:
+    try:
+        return HeatmapGrid(
+            min_latitude=min_latitude,
+            min_longitude=min_longitude,
+            max_latitude=max_latitude,
+            max_longitude=max_longitude,
+            width=width,
+            height=height,
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+def get_heatmap_period(
+    start_time: datetime | None = Query(None, description="Start time in ISO format"),
+    end_time: datetime | None = Query(None, description="End time in ISO format"),
+) -> HeatmapPeriod:
+    return HeatmapPeriod(start_time=start_time, end_time=end_time)
+
+
+_heatmap_grid_dep = Depends(get_heatmap_grid)
+_heatmap_period_dep = Depends(get_heatmap_period)
+
+
+@router.get(
+    "/heatmap",
+    response_model=HeatmapModel,
+    responses={200: {"content": {"application/octet-stream": {}}}},
+)
+async def get_events_heatmap(
+    grid: HeatmapGrid = _heatmap_grid_dep,
+    period: HeatmapPeriod = _heatmap_period_dep,
+    event_type: EventType | None = Query(None),
+    output: Literal["json", "binary"] = Query(
+        "json", alias="format", description="json или binary (application/octet-stream)"
+    ),
+    service: HeatmapService = _heatmap_service_dep
+) -> HeatmapModel | Response:
+    """
+    Плотность событий на регулярной сетке внутри bbox.
 
-@router.get("/", response_model=EventsResponse)
-async def get_events(
+    Возвращаются только непустые ячейки: rows/cols/counts. В формате binary тело —
+    rows (uint16) | cols (uint16) | counts (uint32), little-endian, параметры
+    сетки передаются в заголовках X-Heatmap-*.
+    """
+    try:
+        heatmap = await service.get_heatmap(grid, period.start_time, period.end_time, event_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    if output == "json":
+        return heatmap
+    return Response(
+        content=encode_heatmap(heatmap),
+        media_type="application/octet-stream",
+        headers={
+            "X-Heatmap-Bbox": f"{grid.min_latitude},{grid.min_longitude},{grid.max_latitude},{grid.max_longitude}",
+            "X-Heatmap-Size": f"{grid.width}x{grid.height}",
+            "X-Heatmap-Cells": str(len(heatmap.counts)),
+            "X-Heatmap-Total": str(heatmap.total),
+            "X-Heatmap-Max": str(heatmap.max_count),
+        },
+    )
+
+
+@router.get("/track", response_model=TrackResponse, responses=TELEMETRY_RESPONSES)
+async def get_track(
+    sensor_id: UUID = Query(...),
+    since: datetime | None = Query(None, description="Start time in ISO format"),
     skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1),
-    # параметры для объединённых фильтров
-    start_time: Optional[str] = Query(None, description="Start time in ISO format"),
-    end_time: Optional[str] = Query(None, description="End time in ISO format"),
-    sensor_id: UUID | None = Query(None),
-    latitude: float | None = Query(None),
-    longitude: float | None = Query(None),
-    radius: float | None = Query(None),
+    limit: int = Query(5000, ge=1, le=50000),
+    simplify: float | None = Query(None, gt=0, description="Simplification tolerance in meters"),
+    accept: str | None = Header(None, include_in_schema=False),
     service: EventService = _event_service_dep
-    ) -> EventsResponse:
-    """
-    Получить события. Поддерживаются фильтры (в порядке приоритета):
-    - timerange (start_time & end_time)
-    - sensor_id
-    - coordinates (latitude, longitude, radius)
-    Иначе возвращается общий список с пагинацией.
-    Возвращает объект {items: [...], total: n}
+) -> Response:
     """
-    # timerange
-    if start_time is not None or end_time is not None:
-        try:
-            start_dt = datetime.fromisoformat(start_time) if start_time is not None else None
-            end_dt = datetime.fromisoformat(end_time) if end_time is not None else None
-        except Exception:
-            raise HTTPException(status_code=400, detail="Invalid datetime format. Use ISO format.")
-        items = await service.get_events_by_timerange(start_dt, end_dt)
-        return EventsResponse(items=items, total=len(items))
-
-    if sensor_id is not None:
-        items = await service.get_events_by_sensor(sensor_id)
-        return EventsResponse(items=items, total=len(items))
-
-    if latitude is not None and longitude is not None and radius is not None:
-        items = await service.get_events_by_coordinates(latitude, longitude, radius)
-        return EventsResponse(items=items, total=len(items))
-
-    items = await service.get_events(skip=skip, limit=limit)
-    return EventsResponse(items=items, total=len(items))
-
-
-@router.put("/{event_id}", response_model=EventModel)
-async def update_event(
-    event_id: UUID,
-    event_data: EventBase = Body(..., example={
-        "id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
-        "sensor_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
-        "timestamp": "2025-10-11T09:57:06.684Z",
-        "latitude": 0,
-        "longitude": 0,
-        "speed": 0,
-        "event_type": "move",
-        "details": "string",
-    }),
-    service: EventService = _event_service_dep
-) -> EventModel:
-    event = await service.update_event(event_id, event_data)
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    return event
-
+    Траектория сенсора: время, координаты и скорость по возрастанию времени.
 
-@router.delete("/{event_id}", status_code=HTTP_204_NO_CONTENT, responses={404: {"description": "Alert not found"}})
-async def delete_event(
-    event_id: UUID,
-    service: EventService = _event_service_dep
-) -> Response:
-    if not await service.delete_event(event_id):
-        raise HTTPException(status_code=404, detail="Event not found")
-    return Response(status_code=HTTP_204_NO_CONTENT)
+    При Accept: application/vnd.apache.arrow.stream или application/msgpack
+    тело отдаётся колонками в бинарном виде вместо JSON. С simplify точки,
+    отклоняющиеся от упрощённой линии меньше чем на simplify метров, опускаются.
+    """
+    points = await service.get_track(sensor_id, since, skip, limit, simplify)
+    return telemetry_response(
+        accept,
+        points,
+        TrackResponse,
+        sensor_id=sensor_id,
+        total=len(points),
+        timestamp=[p.timestamp for p in points],
+        latitude=[p.latitude for p in points],
+        longitude=[p.longitude for p in points],
+        speed=[p.speed for p in points],
+    )
+
+
+# /heatmap и /track объявлены раньше общих маршрутов, иначе их перехватит /{event_id}
+router.include_router(events.build_router(columnar=True))
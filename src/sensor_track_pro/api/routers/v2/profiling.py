@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import os
+import socket
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import HTTPException
+from fastapi import Query
+from fastapi.responses import PlainTextResponse
+
+from src.sensor_track_pro.api.config import api_settings
+from src.sensor_track_pro.api.dependencies.auth import require_roles
+from src.sensor_track_pro.business_logic.models.user_model import TokenClaims
+from src.sensor_track_pro.business_logic.models.user_model import UserRole
+from src.sensor_track_pro.profiler import ProfilerBusyError
+from src.sensor_track_pro.profiler import sample_stacks
+
+
+router = APIRouter()
+
+_admin_dep = Depends(require_roles(UserRole.ADMIN))
+
+
+@router.get("/stacks", response_class=PlainTextResponse)
+async def get_stack_profile(
+    seconds: float = Query(10.0, gt=0, le=api_settings.profiling_max_seconds, description="Длительность записи"),
+    interval_ms: float = Query(5.0, ge=1, le=1000, description="Интервал между снимками стеков"),
+    idle: bool = Query(False, description="Учитывать потоки в ожидании (select, очереди)"),
+    _admin: TokenClaims = _admin_dep,
+) -> PlainTextResponse:
+    """
+    Выборочное профилирование воркера, принявшего запрос: стеки всех
+    потоков раз в interval_ms в течение seconds секунд.
+
+    Ответ — collapsed stacks для flamegraph.pl / speedscope; экземпляр и PID
+    воркера — в имени файла.
+    """
+    try:
+        sampler = await sample_stacks(seconds, interval_ms / 1000, include_idle=idle)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    instance = os.environ.get("INSTANCE_NAME") or socket.gethostname()
+    return PlainTextResponse(
+        sampler.collapsed(),
+        headers={
+            "Content-Disposition": f'attachment; filename="{instance}-{os.getpid()}.collapsed"',
+            "X-Profile-Samples": str(sampler.samples),
+        },
+    )
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import HTTPException
+from fastapi import Query
+from fastapi import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.sensor_track_pro.api.dependencies.services import get_tile_cache
+from src.sensor_track_pro.business_logic.services.tile_service import OBJECTS_LAYER
+from src.sensor_track_pro.business_logic.services.tile_service import ZONES_LAYER
+from src.sensor_track_pro.business_logic.services.tile_service import TileService
+from src.sensor_track_pro.config import get_settings
+from src.sensor_track_pro.data_access.database import get_async_db
+from src.sensor_track_pro.data_access.repositories.tiles_repo import TileRepository
+
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+router = APIRouter()
+
+_db_dep = Depends(get_async_db)
+
+
+def get_tile_service(session: AsyncSession = _db_dep) -> TileService:
+    settings = get_settings()
+    return TileService(
+        TileRepository(session),
+        get_tile_cache(),
+        zones_ttl=settings.tile_zones_ttl,
+        objects_ttl=settings.tile_objects_ttl,
+    )
+
+
+_tile_service_dep = Depends(get_tile_service)
+
+
+@router.get(
+    "/{z}/{x}/{y}.mvt",
+    response_class=Response,
+    responses={200: {"content": {MVT_MEDIA_TYPE: {}}}},
+)
+async def get_tile(
+    z: int,
+    x: int,
+    y: int,
+    layers: str = Query(f"{ZONES_LAYER},{OBJECTS_LAYER}", description="Слои через запятую: zones, objects"),
+    service: TileService = _tile_service_dep
+) -> Response:
+    """
+    Векторный тайл (Mapbox Vector Tile) с зонами и последними положениями объектов.
+
+    Слои собираются в PostGIS (ST_AsMVT) и кэшируются в процессе: слой зон — до
+    изменения любой зоны, слой объектов — на несколько секунд.
+    """
+    try:
+        tile = await service.get_tile(z, x, y, tuple(layer.strip() for layer in layers.split(",") if layer.strip()))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    if not tile:
+        return Response(status_code=204)
+    return Response(content=tile, media_type=MVT_MEDIA_TYPE)
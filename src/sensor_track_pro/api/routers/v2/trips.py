@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import Query
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.sensor_track_pro.business_logic.analytics.trip_segmentation import SegmentationConfig
+from src.sensor_track_pro.business_logic.models.trip_model import TripKind
+from src.sensor_track_pro.business_logic.models.trip_model import TripModel
+from src.sensor_track_pro.business_logic.models.trip_model import TripRefreshResult
+from src.sensor_track_pro.business_logic.services.trip_service import TripService
+from src.sensor_track_pro.config import get_settings
+from src.sensor_track_pro.data_access.database import get_async_db
+from src.sensor_track_pro.data_access.repositories.events_repo import EventRepository
+from src.sensor_track_pro.data_access.repositories.trips_repo import TripRepository
+
+
+class TripsResponse(BaseModel):
+    items: list[TripModel]
+    total: int | None = None
+
+
+router = APIRouter()
+
+_db_dep = Depends(get_async_db)
+
+
+def get_trip_service(session: AsyncSession = _db_dep) -> TripService:
+    settings = get_settings()
+    config = SegmentationConfig(
+        speed_threshold=settings.trip_speed_threshold,
+        stop_radius=settings.trip_stop_radius,
+        min_stop_duration=settings.trip_min_stop_duration,
+        max_gap=settings.trip_max_gap,
+    )
+    return TripService(TripRepository(session), EventRepository(session), config)
+
+
+_trip_service_dep = Depends(get_trip_service)
+
+
+@router.get("/", response_model=TripsResponse)
+async def get_trips(
+    sensor_id: UUID = Query(...),
+    start_time: datetime | None = Query(None, description="Start time in ISO format"),
+    end_time: datetime | None = Query(None, description="End time in ISO format"),
+    kind: TripKind | None = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1),
+    service: TripService = _trip_service_dep
+) -> TripsResponse:
+    """
+    Получить поездки и стоянки сенсора за период.
+
+    Только чтение (GET может попасть на экземпляр с репликой): новые события
+    досегментируются через POST /{sensor_id}/refresh.
+    """
+    items = await service.get_trips(sensor_id, start_time, end_time, kind, skip, limit)
+    return TripsResponse(items=items, total=len(items))
+
+
+@router.post("/{sensor_id}/refresh", response_model=TripRefreshResult)
+async def refresh_trips(
+    sensor_id: UUID,
+    service: TripService = _trip_service_dep
+) -> TripRefreshResult:
+    """Досегментирует события, пришедшие после последнего сохранённого сегмента."""
+    return await service.refresh_trips(sensor_id)
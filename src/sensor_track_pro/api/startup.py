@@ -0,0 +1,76 @@
+"""Отчёт о запуске воркера: длительность этапов от импорта до приёма трафика."""
+from __future__ import annotations
+
+import logging
+import os
+import time
+
+from collections.abc import Awaitable
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from src.sensor_track_pro.metrics import APP_STARTUP_SECONDS
+
+
+logger = logging.getLogger(__name__)
+
+
+def process_uptime() -> float | None:
+    """Секунды с запуска процесса по /proc (Linux); None, если недоступно."""
+    try:
+        with open("/proc/self/stat", encoding="ascii") as f:
+            stat = f.read()
+        with open("/proc/uptime", encoding="ascii") as f:
+            uptime = float(f.read().split()[0])
+    except OSError:
+        return None
+    # Поле 22 (starttime) — такты с загрузки системы; имя процесса в скобках может содержать пробелы
+    start_ticks = int(stat.rsplit(")", 1)[1].split()[19])
+    return max(uptime - start_ticks / os.sysconf("SC_CLK_TCK"), 0.0)
+
+
+class StartupReport:
+    """
+    Собирает длительности этапов запуска; этапы могут идти параллельно.
+
+    Отсчёт ведётся от запуска процесса (если он известен) или от создания
+    отчёта; этап import — от начала отсчёта до begin().
+    """
+
+    def __init__(self) -> None:
+        uptime = process_uptime()
+        self.started = time.perf_counter() - (uptime or 0.0)
+        self.phases: dict[str, float] = {}
+
+    def begin(self) -> None:
+        """Конец импорта: интерпретатор, сервер и модули приложения загружены."""
+        self.record("import", time.perf_counter() - self.started)
+
+    def record(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    async def timed[T](self, name: str, awaitable: Awaitable[T]) -> T:
+        with self.phase(name):
+            return await awaitable
+
+    def publish(self) -> float:
+        """Пишет отчёт в лог и метрику app_startup_seconds; возвращает total."""
+        total = time.perf_counter() - self.started
+        self.record("total", total)
+        for phase, seconds in self.phases.items():
+            APP_STARTUP_SECONDS.labels(phase).set(seconds)
+        logger.info(
+            "Воркер %d готов за %.0f мс (%s)",
+            os.getpid(),
+            total * 1000,
+            ", ".join(f"{phase} {seconds * 1000:.0f} мс" for phase, seconds in self.phases.items() if phase != "total"),
+        )
+        return total
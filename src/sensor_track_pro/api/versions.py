@@ -0,0 +1,149 @@
+"""
+Под-приложения версий API.
+
+Роутеры версии импортируются внутри её фабрики, поэтому воркер загружает
+только подключённые версии (API_API_VERSIONS), а при API_LAZY_LOAD — в
+lifespan параллельно с прогревом пула (API_PRELOAD_VERSIONS) или при первом
+запросе к версии. Обработчики общие (api/handlers), модули routers/v1 и
+routers/v2 лишь задают различия версий.
+"""
+from __future__ import annotations
+
+import threading
+
+from collections.abc import Callable
+
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+from src.sensor_track_pro.api.config import api_settings
+
+
+def _version_app(version: str) -> FastAPI:
+    # Отдельное под-приложение, чтобы у каждой версии были свои страницы документации
+    app = FastAPI(
+        title=f"{api_settings.project_name} API {version}",
+        description=f"API {version} для системы мониторинга объектов (version {api_settings.version})",
+        version=api_settings.version,
+        docs_url="/docs",
+        redoc_url="/redoc",
+        openapi_url="/openapi.json",
+        default_response_class=ORJSONResponse,
+    )
+
+    # <prefix>/health для прокси и healthcheck; через зеркало с сохранённым
+    # префиксом (/mirror/api/v1/health) запрос тоже попадает сюда
+    @app.get("/health", include_in_schema=False)
+    async def health() -> dict[str, str]:
+        return {"status": "ok"}
+
+    return app
+
+
+def create_v1_app() -> FastAPI:
+    from src.sensor_track_pro.api.routers.v1 import alerts
+    from src.sensor_track_pro.api.routers.v1 import events
+    from src.sensor_track_pro.api.routers.v1 import objects
+    from src.sensor_track_pro.api.routers.v1 import routes
+    from src.sensor_track_pro.api.routers.v1 import sensors
+    from src.sensor_track_pro.api.routers.v1 import users
+    from src.sensor_track_pro.api.routers.v1 import zones
+
+    app = _version_app("v1")
+    app.include_router(users.router, prefix="/users", tags=["users-v1"])
+    app.include_router(zones.router, prefix="/zones", tags=["zones-v1"])
+    app.include_router(sensors.router, prefix="/sensors", tags=["sensors-v1"])
+    app.include_router(routes.router, prefix="/routes", tags=["routes-v1"])
+    app.include_router(objects.router, prefix="/objects", tags=["objects-v1"])
+    app.include_router(events.router, prefix="/events", tags=["events-v1"])
+    app.include_router(alerts.router, prefix="/alerts", tags=["alerts-v1"])
+    return app
+
+
+def create_v2_app() -> FastAPI:
+    from src.sensor_track_pro.api.routers.v2 import alerts
+    from src.sensor_track_pro.api.routers.v2 import events
+    from src.sensor_track_pro.api.routers.v2 import objects
+    from src.sensor_track_pro.api.routers.v2 import profiling
+    from src.sensor_track_pro.api.routers.v2 import routes
+    from src.sensor_track_pro.api.routers.v2 import sensors
+    from src.sensor_track_pro.api.routers.v2 import tiles
+    from src.sensor_track_pro.api.routers.v2 import trips
+    from src.sensor_track_pro.api.routers.v2 import users
+    from src.sensor_track_pro.api.routers.v2 import zones
+
+    app = _version_app("v2")
+    app.include_router(users.router, prefix="/users", tags=["users-v2"])
+    app.include_router(zones.router, prefix="/zones", tags=["zones-v2"])
+    app.include_router(sensors.router, prefix="/sensors", tags=["sensors-v2"])
+    app.include_router(routes.router, prefix="/routes", tags=["routes-v2"])
+    app.include_router(objects.router, prefix="/objects", tags=["objects-v2"])
+    app.include_router(events.router, prefix="/events", tags=["events-v2"])
+    app.include_router(alerts.router, prefix="/alerts", tags=["alerts-v2"])
+    app.include_router(trips.router, prefix="/trips", tags=["trips-v2"])
+    app.include_router(tiles.router, prefix="/tiles", tags=["tiles-v2"])
+    if api_settings.profiling_enabled:
+        app.include_router(profiling.router, prefix="/profiling", tags=["profiling-v2"])
+    return app
+
+
+# Версия -> (префикс монтирования, фабрика под-приложения)
+VERSIONS: dict[str, tuple[str, Callable[[], FastAPI]]] = {
+    "v1": (api_settings.api_v1_prefix, create_v1_app),
+    "v2": (api_settings.api_v2_prefix, create_v2_app),
+}
+
+
+class LazyApp:
+    """
+    ASGI-приложение, которое собирается фабрикой при первом обращении.
+
+    load() можно вызвать заранее, например при прогреве воркера.
+    """
+
+    def __init__(self, factory: Callable[[], ASGIApp]):
+        self.factory = factory
+        self._app: ASGIApp | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._app is not None
+
+    def load(self) -> ASGIApp:
+        if self._app is None:
+            with self._lock:
+                if self._app is None:
+                    self._app = self.factory()
+        return self._app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.load()(scope, receive, send)
+
+
+def mount_versions(app: FastAPI, versions: list[str], lazy: bool = True) -> dict[str, ASGIApp]:
+    """
+    Монтирует под-приложения перечисленных версий по их префиксам.
+
+    Raises:
+        ValueError: Неизвестная версия API
+    """
+    mounted: dict[str, ASGIApp] = {}
+    for version in versions:
+        if version not in VERSIONS:
+            raise ValueError(f"Неизвестная версия API: {version}")
+        prefix, factory = VERSIONS[version]
+        mounted[version] = LazyApp(factory) if lazy else factory()
+        app.mount(prefix, mounted[version])
+    return mounted
+
+
+def preload_versions(mounted: dict[str, ASGIApp]) -> None:
+    """Собирает ещё не загруженные под-приложения (импорт роутеров версий)."""
+    for version_app in mounted.values():
+        if isinstance(version_app, LazyApp):
+            version_app.load()
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+
+EARTH_RADIUS_M = 6371008.8  # средний радиус Земли в метрах
+WGS84_RADIUS_M = 6378137.0  # экваториальный радиус WGS 84 в метрах
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Расстояние по большому кругу между двумя точками (в метрах)."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def tile_bounds(z: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """Границы тайла XYZ (Web Mercator) в градусах: (запад, юг, восток, север)."""
+    n = 2 ** z
+
+    def lat(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return x / n * 360.0 - 180.0, lat(y + 1), (x + 1) / n * 360.0 - 180.0, lat(y)
+
+
+def circle_ring(
+    latitude: float, longitude: float, radius: float, num_points: int = 64
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Вершины круга радиусом radius метров вокруг центра: (долготы, широты).
+
+    Перевод метров в градусы грубый (равнопромежуточная проекция), пригоден
+    для малых радиусов.
+    """
+    angle = 2 * np.pi * np.arange(num_points) / num_points
+    dlat = math.degrees(radius / WGS84_RADIUS_M) * np.sin(angle)
+    dlon = math.degrees(radius / (WGS84_RADIUS_M * math.cos(math.radians(latitude)))) * np.cos(angle)
+    return longitude + dlon, latitude + dlat
+
+
+def ring_wkt(longitudes: np.ndarray, latitudes: np.ndarray) -> str:
+    """WKT полигона по вершинам кольца; кольцо замыкается, если первая и последняя точки различаются."""
+    if longitudes[0] != longitudes[-1] or latitudes[0] != latitudes[-1]:
+        longitudes = np.append(longitudes, longitudes[0])
+        latitudes = np.append(latitudes, latitudes[0])
+    points = ", ".join(f"{x} {y}" for x, y in zip(longitudes.tolist(), latitudes.tolist(), strict=True))
+    return f"POLYGON(({points}))"
@@ -0,0 +1,48 @@
+"""Упаковка тепловой карты в компактные числовые массивы."""
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from src.sensor_track_pro.business_logic.models.heatmap_model import HeatmapModel
+
+
+# Формат бинарного ответа: rows[n] uint16 | cols[n] uint16 | counts[n] uint32, little-endian
+INDEX_DTYPE = np.dtype("<u2")
+COUNT_DTYPE = np.dtype("<u4")
+
+
+def to_arrays(cells: Sequence[tuple[int, int, int]]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Раскладывает ячейки (строка, столбец, количество) в три массива, упорядоченных построчно."""
+    if not cells:
+        empty = np.empty(0, dtype=INDEX_DTYPE)
+        return empty, empty.copy(), np.empty(0, dtype=COUNT_DTYPE)
+    data = np.asarray(cells, dtype=np.int64)
+    order = np.lexsort((data[:, 1], data[:, 0]))
+    data = data[order]
+    return data[:, 0].astype(INDEX_DTYPE), data[:, 1].astype(INDEX_DTYPE), data[:, 2].astype(COUNT_DTYPE)
+
+
+def encode_heatmap(heatmap: HeatmapModel) -> bytes:
+    """Кодирует разреженную тепловую карту в бинарный вид (8 байт на непустую ячейку)."""
+    rows = np.asarray(heatmap.rows, dtype=INDEX_DTYPE)
+    cols = np.asarray(heatmap.cols, dtype=INDEX_DTYPE)
+    counts = np.asarray(heatmap.counts, dtype=COUNT_DTYPE)
+    return rows.tobytes() + cols.tobytes() + counts.tobytes()
+
+
+def decode_heatmap(payload: bytes) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Обратное преобразование к encode_heatmap."""
+    n = len(payload) // (2 * INDEX_DTYPE.itemsize + COUNT_DTYPE.itemsize)
+    rows = np.frombuffer(payload, dtype=INDEX_DTYPE, count=n)
+    cols = np.frombuffer(payload, dtype=INDEX_DTYPE, count=n, offset=n * INDEX_DTYPE.itemsize)
+    counts = np.frombuffer(payload, dtype=COUNT_DTYPE, count=n, offset=2 * n * INDEX_DTYPE.itemsize)
+    return rows, cols, counts
+
+
+def to_dense(heatmap: HeatmapModel) -> np.ndarray:
+    """Разворачивает разреженную карту в плотную матрицу height x width."""
+    dense = np.zeros((heatmap.grid.height, heatmap.grid.width), dtype=COUNT_DTYPE)
+    dense[np.asarray(heatmap.rows, dtype=np.intp), np.asarray(heatmap.cols, dtype=np.intp)] = heatmap.counts
+    return dense
@@ -0,0 +1,256 @@
+"""Сопоставление положения объекта с плановым маршрутом и прогноз прибытия."""
+from __future__ import annotations
+
+import hashlib
+import math
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import UTC
+from datetime import datetime
+from uuid import UUID
+
+import numpy as np
+
+from src.sensor_track_pro.business_logic.analytics.geo import EARTH_RADIUS_M
+from src.sensor_track_pro.business_logic.models.route_model import RouteModel
+from src.sensor_track_pro.business_logic.models.route_model import RoutePositionFix
+from src.sensor_track_pro.business_logic.models.route_model import RouteProgress
+from src.sensor_track_pro.business_logic.models.route_model import RouteStatus
+from src.sensor_track_pro.business_logic.models.route_model import RouteTrackingState
+from src.sensor_track_pro.business_logic.models.route_model import WaypointEta
+
+
+MIN_ROUTE_POINTS = 2
+TRACKED_STATUSES = frozenset({RouteStatus.IN_PROGRESS, RouteStatus.DELAYED})
+
+
+@dataclass(frozen=True)
+class RouteTrackingConfig:
+    """Пороговые значения отслеживания маршрута."""
+    delay_threshold: float = 300.0  # с: отставание, после которого маршрут задержан
+    recover_threshold: float = 120.0  # с: отставание, ниже которого задержка снимается
+    off_route_distance: float = 200.0  # м: отклонение, после которого объект считается сошедшим
+    backtrack_tolerance: float = 250.0  # м: насколько можно "откатиться" назад по маршруту
+    min_eta_speed: float = 1.0  # м/с: ниже — ETA по скорости не считается
+    speed_smoothing: float = 0.3  # коэффициент экспоненциального сглаживания скорости
+    max_cached_routes: int = 10000
+
+
+def _to_epoch(value: datetime | None) -> float:
+    if value is None:
+        return math.nan
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
+
+
+def _from_epoch(value: float) -> datetime | None:
+    if math.isnan(value):
+        return None
+    return datetime.fromtimestamp(value, UTC).replace(tzinfo=None)
+
+
+class RouteGeometry:
+    """
+    Предвычисленная геометрия маршрута.
+
+    Вершины проецируются в локальную равнопромежуточную систему координат
+    (метры относительно первой точки), после чего для всех отрезков заранее
+    считаются направления, квадраты длин и накопленное расстояние. Привязка
+    положения к маршруту — одна векторная операция по всем отрезкам.
+    """
+
+    def __init__(self, route: RouteModel) -> None:
+        if len(route.points) < MIN_ROUTE_POINTS:
+            raise ValueError(f"Для отслеживания маршрута требуется минимум {MIN_ROUTE_POINTS} точки")
+        self.route_id = route.id
+        self.version = route.updated_at
+        lat = np.array([p.point.latitude for p in route.points], dtype=np.float64)
+        lon = np.array([p.point.longitude for p in route.points], dtype=np.float64)
+        self._lat0 = float(lat[0])
+        self._lon0 = float(lon[0])
+        self._kx = math.radians(1.0) * EARTH_RADIUS_M * math.cos(math.radians(self._lat0))
+        self._ky = math.radians(1.0) * EARTH_RADIUS_M
+        xy = self._project(lat, lon)
+
+        self.start = xy[:-1]
+        self.direction = xy[1:] - xy[:-1]
+        self.length2 = np.einsum("ij,ij->i", self.direction, self.direction)
+        self.length = np.sqrt(self.length2)
+        # Вырожденные отрезки (повтор точки) не должны давать деление на ноль
+        self.length2 = np.where(self.length2 > 0, self.length2, 1.0)
+        self.cumulative = np.concatenate(([0.0], np.cumsum(self.length)))
+        self.total_length = float(self.cumulative[-1])
+
+        self.names = [p.name for p in route.points]
+        self.planned = np.array(
+            [_to_epoch(p.arrival_time or p.departure_time) for p in route.points], dtype=np.float64
+        )
+        self._has_schedule = int(np.count_nonzero(~np.isnan(self.planned))) >= MIN_ROUTE_POINTS
+        # Отпечаток точек и графика: накопленное состояние действительно только для этой геометрии
+        self.key = hashlib.blake2b(np.concatenate((lat, lon, self.planned)).tobytes(), digest_size=8).hexdigest()
+
+    def _project(self, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        return np.column_stack(((lon - self._lon0) * self._kx, (lat - self._lat0) * self._ky))
+
+    def snap(self, latitude: float, longitude: float, min_progress: float | None = None) -> tuple[int, float, float]:
+        """
+        Привязывает точку к ближайшему отрезку маршрута.
+
+        Returns:
+            (индекс отрезка, поперечное отклонение со знаком, пройденное расстояние)
+        """
+        p = self._project(np.array([latitude]), np.array([longitude]))[0]
+        rel = p - self.start
+        t = np.clip(np.einsum("ij,ij->i", rel, self.direction) / self.length2, 0.0, 1.0)
+        offset = rel - t[:, None] * self.direction
+        dist2 = np.einsum("ij,ij->i", offset, offset)
+        if min_progress is not None:
+            # Ищем в первую очередь впереди последней известной позиции — иначе петли и
+            # встречные участки маршрута "перетягивают" привязку назад
+            ahead = self.cumulative[1:] >= min_progress
+            if ahead.any():
+                dist2 = np.where(ahead, dist2, np.inf)
+        i = int(np.argmin(dist2))
+        cross = float(self.direction[i, 0] * rel[i, 1] - self.direction[i, 1] * rel[i, 0])
+        cross_track = math.copysign(math.sqrt(float(dist2[i])), cross)
+        progress = float(self.cumulative[i] + t[i] * self.length[i])
+        return i, cross_track, progress
+
+    def planned_time_at(self, progress: float) -> float:
+        """Плановое время прохождения точки маршрута на расстоянии progress (NaN, если графика нет)."""
+        if not self._has_schedule:
+            return math.nan
+        known = ~np.isnan(self.planned)
+        return float(np.interp(progress, self.cumulative[known], self.planned[known]))
+
+
+class RouteTracker:
+    """
+    Движок отслеживания маршрутов IN_PROGRESS/DELAYED.
+
+    Держит только кэш геометрии маршрутов (пересчитывается при изменении
+    updated_at) и обрабатывает каждое положение за O(число отрезков) векторных
+    операций. Состояние последней привязки (RouteTrackingState) хранится в БД
+    и передаётся в update: положения одного маршрута могут приходить в разные
+    воркеры и экземпляры API.
+    """
+
+    def __init__(self, config: RouteTrackingConfig | None = None) -> None:
+        self._config = config or RouteTrackingConfig()
+        self._geometry: OrderedDict[UUID, RouteGeometry] = OrderedDict()
+
+    def geometry(self, route: RouteModel) -> RouteGeometry:
+        geometry = self._geometry.get(route.id)
+        if geometry is None or geometry.version != route.updated_at:
+            geometry = RouteGeometry(route)
+            self._geometry[route.id] = geometry
+            while len(self._geometry) > self._config.max_cached_routes:
+                self._geometry.popitem(last=False)
+        self._geometry.move_to_end(route.id)
+        return geometry
+
+    def touch(self, route_id: UUID, version: datetime) -> None:
+        """Отмечает актуальность геометрии после изменения маршрута, не затрагивающего точки."""
+        geometry = self._geometry.get(route_id)
+        if geometry is not None:
+            geometry.version = version
+
+    def forget(self, route_id: UUID) -> None:
+        self._geometry.pop(route_id, None)
+
+    def update(self, route: RouteModel, fix: RoutePositionFix, state: RouteTrackingState) -> RouteProgress:
+        """
+        Обрабатывает новое положение объекта на маршруте.
+
+        state обновляется на месте; состояние другой геометрии (точки маршрута
+        изменились) сбрасывается.
+        """
+        geometry = self.geometry(route)
+        if state.geometry_key != geometry.key:
+            state.progress = state.fixed_at = state.speed = None
+            state.geometry_key = geometry.key
+        now = _to_epoch(fix.timestamp)
+
+        min_progress = None
+        if state.progress is not None:
+            min_progress = state.progress - self._config.backtrack_tolerance
+        segment, cross_track, progress = geometry.snap(fix.latitude, fix.longitude, min_progress)
+        off_route = abs(cross_track) > self._config.off_route_distance
+        if off_route and state.progress is not None:
+            # Сошедший с маршрута объект не двигает прогресс
+            progress = state.progress
+        self._update_speed(state, fix, progress, now)
+
+        planned_now = geometry.planned_time_at(progress)
+        delay = None if math.isnan(planned_now) else now - planned_now
+        status = self._next_status(route.status, delay)
+        waypoints = self._waypoint_etas(geometry, progress, now, delay, state.speed)
+
+        return RouteProgress(
+            route_id=route.id,
+            timestamp=fix.timestamp,
+            segment_index=segment,
+            cross_track_error=cross_track,
+            progress=progress,
+            progress_fraction=progress / geometry.total_length if geometry.total_length > 0 else 1.0,
+            delay=delay,
+            off_route=off_route,
+            status=status,
+            previous_status=route.status,
+            waypoints=waypoints,
+        )
+
+    def _update_speed(self, state: RouteTrackingState, fix: RoutePositionFix, progress: float, now: float) -> None:
+        last = _to_epoch(state.fixed_at)
+        if fix.speed is not None:
+            measured = fix.speed / 3.6
+        elif state.progress is not None and now > last:
+            measured = max(progress - state.progress, 0.0) / (now - last)
+        else:
+            measured = None
+        if measured is not None:
+            alpha = self._config.speed_smoothing
+            state.speed = measured if state.speed is None else alpha * measured + (1 - alpha) * state.speed
+        state.progress = max(progress, state.progress) if state.progress is not None else progress
+        state.fixed_at = _from_epoch(now)
+
+    def _next_status(self, status: RouteStatus, delay: float | None) -> RouteStatus:
+        if delay is None:
+            return status
+        if status == RouteStatus.IN_PROGRESS and delay > self._config.delay_threshold:
+            return RouteStatus.DELAYED
+        if status == RouteStatus.DELAYED and delay < self._config.recover_threshold:
+            return RouteStatus.IN_PROGRESS
+        return status
+
+    def _waypoint_etas(
+        self,
+        geometry: RouteGeometry,
+        progress: float,
+        now: float,
+        delay: float | None,
+        speed: float | None,
+    ) -> list[WaypointEta]:
+        remaining = geometry.cumulative - progress
+        ahead = np.flatnonzero(remaining > 0)
+        if ahead.size == 0:
+            return []
+        # Точки с графиком сдвигаются на текущее отставание, без графика — оценка по скорости
+        etas = np.full(ahead.size, np.nan)
+        if delay is not None:
+            etas = geometry.planned[ahead] + delay
+        if speed is not None and speed >= self._config.min_eta_speed:
+            by_speed = now + remaining[ahead] / speed
+            etas = np.where(np.isnan(etas), by_speed, etas)
+        return [
+            WaypointEta(
+                index=int(i),
+                name=geometry.names[i],
+                distance_remaining=float(remaining[i]),
+                planned_time=_from_epoch(float(geometry.planned[i])),
+                eta=_from_epoch(float(eta)),
+            )
+            for i, eta in zip(ahead, etas)
+        ]
@@ -0,0 +1,90 @@
+"""Колоночное представление телеметрии (время, координаты, скорость) для бинарных ответов."""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import msgpack
+import numpy as np
+
+from src.sensor_track_pro.business_logic.models.common_types import naive_utc
+
+
+# Время — миллисекунды от эпохи UTC (int64), остальные колонки — float64, little-endian
+TIMESTAMP_UNIT = "ms"
+TIMESTAMP_DTYPE = np.dtype("<i8")
+VALUE_DTYPE = np.dtype("<f8")
+COLUMN_NAMES = ("timestamp", "latitude", "longitude", "speed")
+
+
+@dataclass(frozen=True)
+class TelemetryColumns:
+    """Колонки трека; отсутствующая скорость хранится как NaN."""
+    timestamp: np.ndarray
+    latitude: np.ndarray
+    longitude: np.ndarray
+    speed: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+
+def to_columns(points: Sequence[Any]) -> TelemetryColumns:
+    """
+    Раскладывает точки (TrackPoint, EventModel — всё, у чего есть timestamp,
+    latitude, longitude и speed) в четыре массива одинаковой длины.
+    """
+    count = len(points)
+    timestamp = np.array([naive_utc(p.timestamp) for p in points], dtype="datetime64[ms]")
+    return TelemetryColumns(
+        timestamp=timestamp.view(TIMESTAMP_DTYPE) if count else np.empty(0, dtype=TIMESTAMP_DTYPE),
+        latitude=np.fromiter((p.latitude for p in points), dtype=VALUE_DTYPE, count=count),
+        longitude=np.fromiter((p.longitude for p in points), dtype=VALUE_DTYPE, count=count),
+        speed=np.fromiter((np.nan if p.speed is None else p.speed for p in points), dtype=VALUE_DTYPE, count=count),
+    )
+
+
+def encode_msgpack(columns: TelemetryColumns) -> bytes:
+    """
+    Кодирует колонки в msgpack: {count, timestamp_unit, columns: {имя: {dtype, data}}}.
+
+    data — сырые байты массива, клиент читает их через numpy.frombuffer без копирования.
+    """
+    return msgpack.packb({
+        "count": len(columns),
+        "timestamp_unit": TIMESTAMP_UNIT,
+        "columns": {
+            name: {"dtype": getattr(columns, name).dtype.str, "data": getattr(columns, name).tobytes()}
+            for name in COLUMN_NAMES
+        },
+    })
+
+
+def decode_msgpack(payload: bytes) -> TelemetryColumns:
+    """Обратное преобразование к encode_msgpack."""
+    columns = msgpack.unpackb(payload)["columns"]
+    return TelemetryColumns(**{
+        name: np.frombuffer(columns[name]["data"], dtype=np.dtype(columns[name]["dtype"]))
+        for name in COLUMN_NAMES
+    })
+
+
+def encode_arrow(columns: TelemetryColumns) -> bytes:
+    """
+    Кодирует колонки в Arrow IPC stream: timestamp[ms, UTC], latitude, longitude,
+    speed (double, NaN превращается в null).
+    """
+    # pyarrow импортируется при первом бинарном запросе, а не при старте приложения
+    import pyarrow as pa
+
+    table = pa.table({
+        "timestamp": pa.array(columns.timestamp, type=pa.timestamp(TIMESTAMP_UNIT, tz="UTC")),
+        "latitude": pa.array(columns.latitude),
+        "longitude": pa.array(columns.longitude),
+        "speed": pa.array(columns.speed, from_pandas=True),
+    })
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
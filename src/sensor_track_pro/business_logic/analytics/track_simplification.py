@@ -0,0 +1,65 @@
+"""Упрощение трека сенсора (Дуглас — Пекер) для отрисовки длинных траекторий."""
+from __future__ import annotations
+
+import math
+
+from collections.abc import Sequence
+from functools import partial
+
+import numpy as np
+
+from src.sensor_track_pro.business_logic.analytics.geo import EARTH_RADIUS_M
+from src.sensor_track_pro.business_logic.models.trip_model import TrackPoint
+from src.sensor_track_pro.compute import ComputePool
+
+
+def simplify_indices(latitudes: np.ndarray, longitudes: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Индексы точек, оставшихся после упрощения с допуском tolerance метров.
+
+    Первая и последняя точки сохраняются всегда, поэтому куски трека можно
+    упрощать независимо, если соседние куски делят граничную точку.
+    Расстояния считаются в локальной равнопромежуточной проекции вокруг
+    первой точки.
+    """
+    n = len(latitudes)
+    if n <= 2:  # noqa: PLR2004
+        return np.arange(n)
+    ky = math.radians(1.0) * EARTH_RADIUS_M
+    kx = ky * math.cos(math.radians(float(latitudes[0])))
+    x = (np.asarray(longitudes, dtype=np.float64) - longitudes[0]) * kx
+    y = (np.asarray(latitudes, dtype=np.float64) - latitudes[0]) * ky
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:  # noqa: PLR2004
+            continue
+        dx = x[last] - x[first]
+        dy = y[last] - y[first]
+        px = x[first + 1:last] - x[first]
+        py = y[first + 1:last] - y[first]
+        length2 = dx * dx + dy * dy
+        # Расстояние до отрезка, а не до прямой: трек может возвращаться назад
+        t = np.clip((px * dx + py * dy) / length2, 0.0, 1.0) if length2 > 0 else 0.0
+        distance = np.hypot(px - t * dx, py - t * dy)
+        farthest = int(np.argmax(distance))
+        if distance[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return np.flatnonzero(keep)
+
+
+async def simplify_track(points: Sequence[TrackPoint], tolerance: float, pool: ComputePool) -> list[TrackPoint]:
+    """Упрощает трек; длинные треки делятся на куски и упрощаются в пуле процессов."""
+    if len(points) <= 2:  # noqa: PLR2004
+        return list(points)
+    latitudes = np.fromiter((p.latitude for p in points), dtype=np.float64, count=len(points))
+    longitudes = np.fromiter((p.longitude for p in points), dtype=np.float64, count=len(points))
+    chunks = await pool.map_chunks(partial(simplify_indices, tolerance=tolerance), latitudes, longitudes, overlap=1)
+    keep = np.unique(np.concatenate([offset + indices for offset, indices in chunks]))
+    return [points[i] for i in keep.tolist()]
@@ -0,0 +1,231 @@
+"""Сегментация потока событий сенсора на поездки и стоянки."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+from uuid import UUID
+
+from src.sensor_track_pro.business_logic.analytics.geo import haversine_m
+from src.sensor_track_pro.business_logic.models.trip_model import TrackPoint
+from src.sensor_track_pro.business_logic.models.trip_model import TripBase
+from src.sensor_track_pro.business_logic.models.trip_model import TripKind
+
+
+@dataclass(frozen=True)
+class SegmentationConfig:
+    """Пороговые значения сегментации."""
+    speed_threshold: float = 3.0  # км/ч: ниже — точка считается неподвижной
+    stop_radius: float = 50.0  # м: радиус, в пределах которого объект "стоит"
+    min_stop_duration: float = 180.0  # с: минимальное время стоянки
+    max_gap: float = 1800.0  # с: разрыв в данных, после которого сегмент закрывается
+
+
+class _Accumulator:
+    """Накопитель характеристик одного сегмента."""
+
+    __slots__ = ("distance", "end", "kind", "max_speed", "points_count", "start")
+
+    def __init__(self, kind: TripKind, point: TrackPoint, speed: float | None) -> None:
+        self.kind = kind
+        self.start = point
+        self.end = point
+        self.distance = 0.0
+        self.max_speed = speed
+        self.points_count = 1
+
+    def extend(self, point: TrackPoint, speed: float | None, step: float) -> None:
+        self.distance += step
+        self.end = point
+        self.points_count += 1
+        self._update_speed(speed)
+
+    def merge(self, other: _Accumulator) -> None:
+        """Присоединяет следующий за текущим сегмент (он может начинаться в последней точке текущего)."""
+        if other.start is self.end:
+            self.points_count += other.points_count - 1
+        else:
+            self.distance += haversine_m(
+                self.end.latitude, self.end.longitude, other.start.latitude, other.start.longitude
+            )
+            self.points_count += other.points_count
+        self.distance += other.distance
+        self.end = other.end
+        self._update_speed(other.max_speed)
+
+    def copy(self) -> _Accumulator:
+        clone = _Accumulator(self.kind, self.start, self.max_speed)
+        clone.end = self.end
+        clone.distance = self.distance
+        clone.points_count = self.points_count
+        return clone
+
+    def _update_speed(self, speed: float | None) -> None:
+        if speed is not None and (self.max_speed is None or speed > self.max_speed):
+            self.max_speed = speed
+
+    @property
+    def duration(self) -> float:
+        return (self.end.timestamp - self.start.timestamp).total_seconds()
+
+    def to_trip(self, sensor_id: UUID, is_closed: bool) -> TripBase:
+        return TripBase(
+            sensor_id=sensor_id,
+            kind=self.kind,
+            start_time=self.start.timestamp,
+            end_time=self.end.timestamp,
+            start_latitude=self.start.latitude,
+            start_longitude=self.start.longitude,
+            end_latitude=self.end.latitude,
+            end_longitude=self.end.longitude,
+            distance=self.distance,
+            duration=self.duration,
+            max_speed=self.max_speed,
+            points_count=self.points_count,
+            is_closed=is_closed,
+        )
+
+
+class TripSegmenter:
+    """
+    Инкрементальный сегментатор трека одного сенсора.
+
+    Точки подаются в порядке времени через feed(); завершённые сегменты
+    возвращаются сразу, незавершённый хвост доступен через open_segment().
+    Точка считается неподвижной, если её скорость ниже порога и она лежит
+    в пределах stop_radius от начала предполагаемой стоянки. Серия
+    неподвижных точек длительностью не меньше min_stop_duration становится
+    стоянкой, более короткая — остаётся частью поездки.
+    """
+
+    def __init__(self, sensor_id: UUID, config: SegmentationConfig | None = None) -> None:
+        self._sensor_id = sensor_id
+        self._config = config or SegmentationConfig()
+        self._current: _Accumulator | None = None
+        self._pending: _Accumulator | None = None  # кандидат в стоянку внутри поездки
+        self._last: TrackPoint | None = None
+
+    def feed(self, point: TrackPoint) -> list[TripBase]:
+        """Обрабатывает очередную точку и возвращает закрытые ею сегменты."""
+        last = self._last
+        self._last = point
+        if last is None or self._current is None:
+            self._start(point, point.speed)
+            return []
+
+        dt = (point.timestamp - last.timestamp).total_seconds()
+        if dt < 0:
+            # Точки вне порядка не переписывают уже построенную историю
+            self._last = last
+            return []
+        step = haversine_m(last.latitude, last.longitude, point.latitude, point.longitude)
+        speed = point.speed if point.speed is not None else (step / dt * 3.6 if dt > 0 else 0.0)
+
+        if dt > self._config.max_gap:
+            return self._on_gap(last, point, speed, step)
+        if self._current.kind == TripKind.STOP:
+            return self._on_stop(last, point, speed, step)
+        return self._on_trip(point, speed, step)
+
+    def feed_many(self, points: Iterable[TrackPoint]) -> list[TripBase]:
+        closed: list[TripBase] = []
+        for point in points:
+            closed.extend(self.feed(point))
+        return closed
+
+    def open_segment(self) -> TripBase | None:
+        """Снимок незавершённого сегмента (поездка вместе с кандидатом в стоянку)."""
+        if self._current is None:
+            return None
+        if self._pending is None:
+            return self._current.to_trip(self._sensor_id, is_closed=False)
+        snapshot = self._current.copy()
+        snapshot.merge(self._pending)
+        return snapshot.to_trip(self._sensor_id, is_closed=False)
+
+    def _start(self, point: TrackPoint, speed: float | None) -> None:
+        stationary = speed is None or speed < self._config.speed_threshold
+        self._current = _Accumulator(TripKind.TRIP, point, speed)
+        self._pending = _Accumulator(TripKind.STOP, point, speed) if stationary else None
+
+    def _is_stationary(self, anchor: TrackPoint, point: TrackPoint, speed: float) -> bool:
+        if speed >= self._config.speed_threshold:
+            return False
+        radius = haversine_m(anchor.latitude, anchor.longitude, point.latitude, point.longitude)
+        return radius <= self._config.stop_radius
+
+    def _on_trip(self, point: TrackPoint, speed: float, step: float) -> list[TripBase]:
+        assert self._current is not None
+        pending = self._pending
+        if pending is not None and self._is_stationary(pending.start, point, speed):
+            pending.extend(point, speed, step)
+            if pending.duration < self._config.min_stop_duration:
+                return []
+            # Серия неподвижных точек достаточно длинная: поездка заканчивается в начале стоянки
+            closed = self._close_trip()
+            self._current, self._pending = pending, None
+            return closed
+
+        if pending is not None:
+            # Кандидат в стоянку не подтвердился — возвращаем его точки в поездку
+            self._current.merge(pending)
+            self._pending = None
+        self._current.extend(point, speed, step)
+        if speed < self._config.speed_threshold:
+            self._pending = _Accumulator(TripKind.STOP, point, speed)
+        return []
+
+    def _on_stop(self, last: TrackPoint, point: TrackPoint, speed: float, step: float) -> list[TripBase]:
+        assert self._current is not None
+        if self._is_stationary(self._current.start, point, speed):
+            self._current.extend(point, speed, step)
+            return []
+        closed = [self._current.to_trip(self._sensor_id, is_closed=True)]
+        self._current = _Accumulator(TripKind.TRIP, last, None)
+        self._current.extend(point, speed, step)
+        self._pending = _Accumulator(TripKind.STOP, point, speed) if speed < self._config.speed_threshold else None
+        return closed
+
+    def _on_gap(self, last: TrackPoint, point: TrackPoint, speed: float, step: float) -> list[TripBase]:
+        assert self._current is not None
+        current = self._current
+        if current.kind == TripKind.STOP:
+            anchor = current.start
+        else:
+            anchor = self._pending.start if self._pending is not None else last
+        if haversine_m(anchor.latitude, anchor.longitude, point.latitude, point.longitude) <= self._config.stop_radius:
+            # Объект простоял весь разрыв на месте — стоянка продолжается либо начинается в anchor
+            if current.kind == TripKind.STOP:
+                current.extend(point, speed, step)
+                return []
+            stop = self._pending or _Accumulator(TripKind.STOP, last, None)
+            stop.extend(point, speed, step)
+            closed = self._close_trip()
+            self._current, self._pending = stop, None
+            return closed
+
+        # За время разрыва объект переместился: закрываем хвост и начинаем трек заново
+        tail = self.open_segment()
+        closed = [tail.model_copy(update={"is_closed": True})] if tail is not None else []
+        self._start(point, speed)
+        return closed
+
+    def _close_trip(self) -> list[TripBase]:
+        """Закрывает текущую поездку, если в ней есть хотя бы одно перемещение."""
+        assert self._current is not None
+        if self._current.points_count < 2:  # noqa: PLR2004
+            return []
+        return [self._current.to_trip(self._sensor_id, is_closed=True)]
+
+
+def segment_track(
+    sensor_id: UUID,
+    points: Iterable[TrackPoint],
+    config: SegmentationConfig | None = None,
+) -> list[TripBase]:
+    """Сегментирует трек целиком: закрытые сегменты и, если есть, открытый хвост."""
+    segmenter = TripSegmenter(sensor_id, config)
+    segments = segmenter.feed_many(points)
+    tail = segmenter.open_segment()
+    if tail is not None:
+        segments.append(tail)
+    return segments
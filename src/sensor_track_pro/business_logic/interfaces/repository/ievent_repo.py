@@ -8,6 +8,9 @@ from uuid import UUID
 
 from src.sensor_track_pro.business_logic.models.event_model import EventBase
 from src.sensor_track_pro.business_logic.models.event_model import EventModel
+from src.sensor_track_pro.business_logic.models.event_model import EventType
+from src.sensor_track_pro.business_logic.models.heatmap_model import HeatmapGrid
+from src.sensor_track_pro.business_logic.models.trip_model import TrackPoint
 
 
 class IEventRepository(ABC):
@@ -147,3 +150,45 @@ class IEventRepository(ABC):
         Returns:
             Список событий в заданном радиусе
         """
+
+    @abstractmethod
+    async def get_track(
+            self,
+            sensor_id: UUID,
+            since: datetime | None = None,
+            skip: int = 0,
+            limit: int = 5000
+    ) -> list[TrackPoint]:
+        """
+        Получает трек сенсора (время, координаты, скорость) в хронологическом порядке.
+        
+        Args:
+            sensor_id: UUID идентификатор сенсора
+            since: Время, начиная с которого (включительно) нужны точки
+            skip: Количество пропускаемых точек
+            limit: Максимальное количество возвращаемых точек
+            
+        Returns:
+            Список точек трека
+        """
+
+    @abstractmethod
+    async def get_density(
+            self,
+            grid: HeatmapGrid,
+            start_time: datetime | None = None,
+            end_time: datetime | None = None,
+            event_type: EventType | None = None
+    ) -> list[tuple[int, int, int]]:
+        """
+        Считает количество событий в ячейках сетки внутри bbox.
+        
+        Args:
+            grid: Сетка и bbox
+            start_time: Начало периода
+            end_time: Конец периода
+            event_type: Тип событий
+            
+        Returns:
+            Непустые ячейки в виде (строка, столбец, количество)
+        """
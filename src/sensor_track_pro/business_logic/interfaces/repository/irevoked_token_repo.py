@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from abc import ABC
+from abc import abstractmethod
+from datetime import datetime
+
+
+class IRevokedTokenRepository(ABC):
+    """Интерфейс репозитория отозванных токенов (общий для всех экземпляров API)."""
+
+    @abstractmethod
+    async def get_active(self) -> list[tuple[str, datetime]]:
+        """
+        Возвращает отозванные токены, срок которых ещё не истёк.
+
+        Returns:
+            Пары (jti, время истечения в UTC без часового пояса)
+        """
+
+    @abstractmethod
+    async def revoke(self, jti: str, expires_at: datetime) -> bool:
+        """
+        Отзывает токен до истечения его срока; записи об истёкших токенах удаляются.
+        Другие процессы узнают об отзыве по уведомлению после фиксации.
+
+        Args:
+            jti: Идентификатор токена
+            expires_at: Время истечения токена (UTC без часового пояса)
+
+        Returns:
+            True если токен отозван этим вызовом, False если он уже был отозван
+        """
@@ -9,6 +9,7 @@ from uuid import UUID
 from src.sensor_track_pro.business_logic.models.route_model import RouteBase
 from src.sensor_track_pro.business_logic.models.route_model import RouteModel
 from src.sensor_track_pro.business_logic.models.route_model import RouteStatus
+from src.sensor_track_pro.business_logic.models.route_model import RouteTrackingState
 
 
 class IRouteRepository(ABC):
@@ -161,3 +162,46 @@ class IRouteRepository(ABC):
         Returns:
             Список маршрутов за указанный период
         """
+
+    @abstractmethod
+    async def lock_route(self, route_id: UUID) -> None:
+        """
+        Блокирует отслеживание маршрута до конца текущей транзакции.
+
+        Положения одного маршрута обрабатываются по очереди, поэтому каждое
+        видит состояние, сохранённое предыдущим.
+
+        Args:
+            route_id: UUID идентификатор маршрута
+        """
+
+    @abstractmethod
+    async def get_tracking_state(self, route_id: UUID) -> RouteTrackingState | None:
+        """
+        Получает сохранённое состояние отслеживания маршрута.
+
+        Args:
+            route_id: UUID идентификатор маршрута
+
+        Returns:
+            Состояние, если маршрут уже отслеживался, иначе None
+        """
+
+    @abstractmethod
+    async def save_tracking_state(
+            self,
+            route_id: UUID,
+            state: RouteTrackingState,
+            status: RouteStatus | None = None
+    ) -> RouteModel | None:
+        """
+        Сохраняет состояние отслеживания и, при необходимости, новый статус одним коммитом.
+
+        Args:
+            route_id: UUID идентификатор маршрута
+            state: Состояние после обработки положения
+            status: Новый статус маршрута или None, если статус не изменился
+
+        Returns:
+            Обновленный маршрут, если изменён статус, иначе None
+        """
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from abc import ABC
+from abc import abstractmethod
+
+
+class ITileRepository(ABC):
+    """Интерфейс репозитория векторных тайлов (Mapbox Vector Tile)."""
+
+    @abstractmethod
+    async def get_zones_tile(self, z: int, x: int, y: int) -> bytes:
+        """
+        Строит слой зон тайла.
+
+        Args:
+            z: Уровень масштаба
+            x: Номер столбца тайла
+            y: Номер строки тайла
+
+        Returns:
+            Слой "zones" в формате MVT (пустой, если зон в тайле нет)
+        """
+
+    @abstractmethod
+    async def get_objects_tile(self, z: int, x: int, y: int) -> bytes:
+        """
+        Строит слой последних положений объектов тайла.
+
+        Args:
+            z: Уровень масштаба
+            x: Номер столбца тайла
+            y: Номер строки тайла
+
+        Returns:
+            Слой "objects" в формате MVT (пустой, если объектов в тайле нет)
+        """
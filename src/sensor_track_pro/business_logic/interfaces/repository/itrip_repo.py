@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from abc import ABC
+from abc import abstractmethod
+from datetime import datetime
+from uuid import UUID
+
+from src.sensor_track_pro.business_logic.models.trip_model import TripBase
+from src.sensor_track_pro.business_logic.models.trip_model import TripKind
+from src.sensor_track_pro.business_logic.models.trip_model import TripModel
+
+
+class ITripRepository(ABC):
+    """Интерфейс репозитория для работы с поездками и стоянками."""
+
+    @abstractmethod
+    async def get_by_sensor_id(
+            self,
+            sensor_id: UUID,
+            start_time: datetime | None = None,
+            end_time: datetime | None = None,
+            kind: TripKind | None = None,
+            skip: int = 0,
+            limit: int = 100
+    ) -> list[TripModel]:
+        """
+        Получает сегменты трека сенсора, пересекающиеся с временным периодом.
+
+        Args:
+            sensor_id: UUID идентификатор сенсора
+            start_time: Начало временного периода (необязательно)
+            end_time: Конец временного периода (необязательно)
+            kind: Тип сегмента (поездка/стоянка), необязательно
+            skip: Количество пропускаемых сегментов
+            limit: Максимальное количество возвращаемых сегментов
+
+        Returns:
+            Список сегментов, упорядоченный по времени начала
+        """
+
+    @abstractmethod
+    async def lock_sensor(self, sensor_id: UUID) -> None:
+        """
+        Блокирует пересегментацию сенсора до конца текущей транзакции.
+
+        Параллельные пересчёты одного сенсора выполняются по очереди, поэтому
+        второй видит сегменты, сохранённые первым, и не дублирует их.
+
+        Args:
+            sensor_id: UUID идентификатор сенсора
+        """
+
+    @abstractmethod
+    async def get_last_segment(self, sensor_id: UUID) -> TripModel | None:
+        """
+        Получает последний сохранённый сегмент сенсора (открытый, если он есть).
+
+        Args:
+            sensor_id: UUID идентификатор сенсора
+
+        Returns:
+            Последний сегмент или None, если сегментов ещё нет
+        """
+
+    @abstractmethod
+    async def replace_open_segments(self, sensor_id: UUID, segments: list[TripBase]) -> None:
+        """
+        Удаляет открытые сегменты сенсора и сохраняет новые в одной транзакции.
+
+        Args:
+            sensor_id: UUID идентификатор сенсора
+            segments: Новые сегменты (закрытые и, возможно, один открытый)
+        """
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from abc import ABC
+from abc import abstractmethod
+from datetime import datetime
+from uuid import UUID
+
+from src.sensor_track_pro.business_logic.models.zone_analytics_model import ZoneDwellTime
+from src.sensor_track_pro.business_logic.models.zone_analytics_model import ZoneOccupancyPoint
+from src.sensor_track_pro.business_logic.models.zone_analytics_model import ZoneOccupancySummary
+
+
+class IZoneAnalyticsRepository(ABC):
+    """Интерфейс репозитория аналитики пребывания объектов в зонах (таблица object_zone)."""
+
+    @abstractmethod
+    async def get_dwell_times(
+            self,
+            start_time: datetime,
+            end_time: datetime,
+            zone_id: UUID | None = None,
+            object_id: UUID | None = None,
+            skip: int = 0,
+            limit: int = 100
+    ) -> list[ZoneDwellTime]:
+        """
+        Считает суммарное время пребывания каждого объекта в каждой зоне за период.
+
+        Интервалы пребывания обрезаются границами периода.
+
+        Args:
+            start_time: Начало периода
+            end_time: Конец периода
+            zone_id: Ограничить одной зоной
+            object_id: Ограничить одним объектом
+            skip: Количество пропускаемых записей
+            limit: Максимальное количество возвращаемых записей
+
+        Returns:
+            Список пар зона-объект, по убыванию времени пребывания внутри зоны
+        """
+
+    @abstractmethod
+    async def get_occupancy(
+            self,
+            start_time: datetime,
+            end_time: datetime,
+            zone_id: UUID | None = None
+    ) -> list[ZoneOccupancyPoint]:
+        """
+        Строит ступенчатую функцию заполненности зон за период.
+
+        Args:
+            start_time: Начало периода
+            end_time: Конец периода
+            zone_id: Ограничить одной зоной
+
+        Returns:
+            Моменты изменения количества объектов, упорядоченные по зоне и времени
+        """
+
+    @abstractmethod
+    async def get_occupancy_summary(
+            self,
+            start_time: datetime,
+            end_time: datetime,
+            zone_id: UUID | None = None
+    ) -> list[ZoneOccupancySummary]:
+        """
+        Считает пиковую и среднюю заполненность зон за период.
+
+        Args:
+            start_time: Начало периода
+            end_time: Конец периода
+            zone_id: Ограничить одной зоной
+
+        Returns:
+            Сводка по каждой зоне, в которой были объекты
+        """
@@ -1,6 +1,20 @@
 from __future__ import annotations
 
+from datetime import UTC
+from datetime import datetime
 from typing import Any
+from typing import NamedTuple
 
 
 type FilterParams = dict[str, Any]
+
+
+class EntityVersion(NamedTuple):
+    """Версия таблицы или записи: число строк и время последнего изменения."""
+    count: int
+    updated_at: datetime | None
+
+
+def naive_utc(value: datetime) -> datetime:
+    """Приводит время к виду, в котором оно хранится в БД: UTC без часового пояса."""
+    return value.astimezone(UTC).replace(tzinfo=None) if value.tzinfo is not None else value
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import BaseModel
+from pydantic import Field
+from pydantic import model_validator
+
+from src.sensor_track_pro.business_logic.models.event_model import EventType
+
+
+MAX_HEATMAP_SIZE = 1024
+
+
+class HeatmapGrid(BaseModel):
+    """Регулярная сетка, натянутая на прямоугольник (bbox) в градусах."""
+    min_latitude: float = Field(..., ge=-90.0, le=90.0, description="Южная граница")
+    min_longitude: float = Field(..., ge=-180.0, le=180.0, description="Западная граница")
+    max_latitude: float = Field(..., ge=-90.0, le=90.0, description="Северная граница")
+    max_longitude: float = Field(..., ge=-180.0, le=180.0, description="Восточная граница")
+    width: int = Field(256, ge=1, le=MAX_HEATMAP_SIZE, description="Количество ячеек по долготе")
+    height: int = Field(256, ge=1, le=MAX_HEATMAP_SIZE, description="Количество ячеек по широте")
+
+    @model_validator(mode="after")
+    def validate_bbox(self) -> HeatmapGrid:
+        if self.min_latitude >= self.max_latitude or self.min_longitude >= self.max_longitude:
+            raise ValueError("Границы bbox заданы неверно: min должен быть меньше max")
+        return self
+
+    @property
+    def cell_width(self) -> float:
+        """Ширина ячейки в градусах долготы."""
+        return (self.max_longitude - self.min_longitude) / self.width
+
+    @property
+    def cell_height(self) -> float:
+        """Высота ячейки в градусах широты."""
+        return (self.max_latitude - self.min_latitude) / self.height
+
+
+class HeatmapModel(BaseModel):
+    """
+    Плотность событий на сетке в разреженном виде.
+
+    Для каждой непустой ячейки i: rows[i] — номер строки (от южной границы),
+    cols[i] — номер столбца (от западной границы), counts[i] — число событий.
+    """
+    grid: HeatmapGrid = Field(..., description="Параметры сетки")
+    start_time: datetime | None = Field(None, description="Начало периода")
+    end_time: datetime | None = Field(None, description="Конец периода")
+    event_type: EventType | None = Field(None, description="Тип событий")
+    total: int = Field(0, description="Общее количество событий в bbox")
+    max_count: int = Field(0, description="Максимальное количество событий в ячейке")
+    rows: list[int] = Field(default=[], description="Номера строк непустых ячеек")
+    cols: list[int] = Field(default=[], description="Номера столбцов непустых ячеек")
+    counts: list[int] = Field(default=[], description="Количество событий в непустых ячейках")
@@ -52,3 +52,47 @@ class RouteModel(RouteBase):
 
     # Поле route_metadata (при внешнем виде "metadata") наследуется
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+class RoutePositionFix(BaseModel):
+    """Текущее положение объекта на маршруте."""
+    timestamp: datetime = Field(..., description="Время фиксации положения")
+    latitude: float = Field(..., ge=-90.0, le=90.0, description="Широта")
+    longitude: float = Field(..., ge=-180.0, le=180.0, description="Долгота")
+    speed: float | None = Field(None, description="Скорость (км/ч)")
+
+
+class WaypointEta(BaseModel):
+    """Прогноз прибытия в точку маршрута."""
+    index: int = Field(..., description="Порядковый номер точки маршрута")
+    name: str | None = Field(None, description="Название точки маршрута")
+    distance_remaining: float = Field(..., description="Оставшееся расстояние до точки (в метрах)")
+    planned_time: datetime | None = Field(None, description="Планируемое время прибытия")
+    eta: datetime | None = Field(None, description="Прогнозируемое время прибытия")
+
+
+class RouteProgress(BaseModel):
+    """Результат сопоставления положения объекта с плановым маршрутом."""
+    route_id: UUID = Field(..., description="ID маршрута")
+    timestamp: datetime = Field(..., description="Время фиксации положения")
+    segment_index: int = Field(..., description="Индекс ближайшего отрезка маршрута")
+    cross_track_error: float = Field(..., description="Отклонение от маршрута (в метрах, слева — положительное)")
+    progress: float = Field(..., description="Пройденное вдоль маршрута расстояние (в метрах)")
+    progress_fraction: float = Field(..., description="Доля пройденного маршрута (0..1)")
+    delay: float | None = Field(None, description="Отставание от графика (в секундах, опережение — отрицательное)")
+    off_route: bool = Field(False, description="Объект сошёл с маршрута")
+    status: RouteStatus = Field(..., description="Статус маршрута после обработки положения")
+    previous_status: RouteStatus = Field(..., description="Статус маршрута до обработки положения")
+    waypoints: list[WaypointEta] = Field(default=[], description="Прогнозы по оставшимся точкам маршрута")
+
+    @property
+    def status_changed(self) -> bool:
+        return self.status != self.previous_status
+
+
+class RouteTrackingState(BaseModel):
+    """Состояние отслеживания маршрута между положениями объекта (хранится в БД)."""
+    geometry_key: str | None = Field(None, description="Отпечаток геометрии, для которой накоплено состояние")
+    progress: float | None = Field(None, description="Наибольшее пройденное расстояние (в метрах)")
+    fixed_at: datetime | None = Field(None, description="Время последнего обработанного положения")
+    speed: float | None = Field(None, description="Сглаженная скорость (м/с)")
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from datetime import datetime
+from enum import StrEnum
+from typing import NamedTuple
+from uuid import UUID
+
+from pydantic import BaseModel
+from pydantic import ConfigDict
+from pydantic import Field
+
+
+class TripKind(StrEnum):
+    """Тип сегмента трека."""
+    TRIP = "trip"  # Поездка
+    STOP = "stop"  # Стоянка
+
+
+class TrackPoint(NamedTuple):
+    """Точка трека сенсора (лёгкая проекция строки events)."""
+    timestamp: datetime
+    latitude: float
+    longitude: float
+    speed: float | None
+
+
+class TripBase(BaseModel):
+    """Базовые поля сегмента трека (поездки или стоянки)."""
+    sensor_id: UUID = Field(..., description="ID сенсора")
+    kind: TripKind = Field(..., description="Тип сегмента")
+    start_time: datetime = Field(..., description="Время начала сегмента")
+    end_time: datetime = Field(..., description="Время окончания сегмента")
+    start_latitude: float = Field(..., description="Широта начала сегмента")
+    start_longitude: float = Field(..., description="Долгота начала сегмента")
+    end_latitude: float = Field(..., description="Широта окончания сегмента")
+    end_longitude: float = Field(..., description="Долгота окончания сегмента")
+    distance: float = Field(0.0, ge=0, description="Пройденное расстояние (в метрах)")
+    duration: float = Field(0.0, ge=0, description="Длительность сегмента (в секундах)")
+    max_speed: float | None = Field(None, description="Максимальная скорость (км/ч)")
+    points_count: int = Field(0, ge=0, description="Количество точек в сегменте")
+    is_closed: bool = Field(True, description="Сегмент завершён (False — ещё может продолжиться)")
+
+
+class TripModel(TripBase):
+    """Полная модель сегмента трека."""
+    id: UUID = Field(..., description="Уникальный идентификатор сегмента")
+    created_at: datetime = Field(..., description="Дата и время создания записи")
+    updated_at: datetime = Field(..., description="Дата и время последнего обновления")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TripRefreshResult(BaseModel):
+    """Результат инкрементального пересчёта поездок сенсора."""
+    sensor_id: UUID = Field(..., description="ID сенсора")
+    processed_points: int = Field(..., description="Количество обработанных точек")
+    closed_segments: int = Field(..., description="Количество новых завершённых сегментов")
@@ -39,13 +39,48 @@ class UserModel(UserBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserPublic(UserBase):
+    """Данные пользователя для ответов API (без хэша пароля)."""
+
+    id: UUID
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class TokenModel(BaseModel):
     """Модель для токена аутентификации."""
 
     access_token: str = Field(..., description="Токен доступа")
     token_type: str = Field(default="bearer", description="Тип токена")
     expires_in: int = Field(..., description="Время жизни токена в секундах")
-    user: UserModel = Field(..., description="Данные пользователя")
+    refresh_token: str = Field(..., description="Токен обновления")
+    refresh_expires_in: int = Field(..., description="Время жизни токена обновления в секундах")
+    user: UserPublic = Field(..., description="Данные пользователя")
+
+
+class TokenType(StrEnum):
+    """Назначение JWT."""
+
+    ACCESS = "access"  # Доступ к API
+    REFRESH = "refresh"  # Получение новой пары токенов
+
+
+class TokenClaims(BaseModel):
+    """Проверенные утверждения JWT: достаточно для авторизации без чтения пользователя из БД."""
+
+    sub: UUID = Field(..., description="Идентификатор пользователя")
+    username: str = Field(..., description="Имя пользователя")
+    role: UserRole = Field(..., description="Роль пользователя")
+    type: TokenType = Field(..., description="Назначение токена")
+    jti: str = Field(..., description="Уникальный идентификатор токена")
+    iat: int = Field(..., description="Время выпуска (секунды от эпохи)")
+    exp: int = Field(..., description="Время истечения (секунды от эпохи)")
+
+
+class RefreshRequest(BaseModel):
+    """Запрос на обновление или отзыв токена обновления."""
+
+    refresh_token: str = Field(..., description="Токен обновления")
 
 
 class UserAuthData(BaseModel):
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+from pydantic import Field
+
+
+class ZoneDwellTime(BaseModel):
+    """Суммарное время пребывания объекта в зоне за период."""
+    zone_id: UUID = Field(..., description="ID зоны")
+    object_id: UUID = Field(..., description="ID объекта")
+    visits: int = Field(..., description="Количество посещений, пересекающихся с периодом")
+    dwell_time: float = Field(..., description="Суммарное время пребывания в пределах периода (в секундах)")
+    first_entered_at: datetime = Field(..., description="Время первого входа (с учётом начала периода)")
+    last_exited_at: datetime | None = Field(None, description="Время последнего выхода (None — объект ещё в зоне)")
+
+
+class ZoneOccupancyPoint(BaseModel):
+    """Изменение заполненности зоны: с момента timestamp в зоне находится occupancy объектов."""
+    zone_id: UUID = Field(..., description="ID зоны")
+    timestamp: datetime = Field(..., description="Момент изменения заполненности")
+    occupancy: int = Field(..., description="Количество объектов в зоне начиная с этого момента")
+
+
+class ZoneOccupancySummary(BaseModel):
+    """Сводка по заполненности зоны за период."""
+    zone_id: UUID = Field(..., description="ID зоны")
+    peak_occupancy: int = Field(..., description="Максимальное одновременное количество объектов")
+    peak_at: datetime = Field(..., description="Первый момент достижения максимума")
+    average_occupancy: float = Field(..., description="Среднее по времени количество объектов")
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 from typing import Any
 from typing import TypeVar
+from uuid import UUID
 
+from src.sensor_track_pro.business_logic.models.common_types import EntityVersion
 from src.sensor_track_pro.business_logic.models.common_types import FilterParams
+from src.sensor_track_pro.tracing import traced_service_methods
 
 
 T = TypeVar("T")
@@ -12,8 +15,17 @@ T = TypeVar("T")
 class BaseService[T]:
     """Базовый класс для всех сервисов."""
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # Вызовы методов сервиса видны в трассировке запроса отдельными спанами
+        traced_service_methods(cls)
+
     def __init__(self, repository: Any) -> None:
         self._repository = repository
 
     async def get_all(self, skip: int = 0, limit: int = 100, **filters: FilterParams) -> list[T]:
         return await self._repository.get_all(skip, limit, **filters)
+
+    async def get_version(self, instance_id: UUID | None = None) -> EntityVersion | None:
+        """Версия таблицы (или одной записи) для ETag; None, если записи нет."""
+        return await self._repository.get_version(instance_id)
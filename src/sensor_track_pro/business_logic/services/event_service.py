@@ -4,17 +4,22 @@ from datetime import datetime
 from typing import Any
 from uuid import UUID
 
+from src.sensor_track_pro.business_logic.analytics.track_simplification import simplify_track
 from src.sensor_track_pro.business_logic.interfaces.repository.ievent_repo import IEventRepository
 from src.sensor_track_pro.business_logic.models.common_types import FilterParams
 from src.sensor_track_pro.business_logic.models.event_model import EventBase
 from src.sensor_track_pro.business_logic.models.event_model import EventModel
+from src.sensor_track_pro.business_logic.models.trip_model import TrackPoint
 from src.sensor_track_pro.business_logic.services.base_service import BaseService
+from src.sensor_track_pro.compute import ComputePool
+from src.sensor_track_pro.compute import get_compute_pool
 
 
 class EventService(BaseService[EventModel]):
-    def __init__(self, event_repository: IEventRepository):
+    def __init__(self, event_repository: IEventRepository, compute: ComputePool | None = None):
         super().__init__(event_repository)
         self._event_repository = event_repository
+        self._compute = compute
 
     async def create_event(self, event_data: EventBase) -> EventModel:
         return await self._event_repository.create(event_data)
@@ -39,3 +44,17 @@ class EventService(BaseService[EventModel]):
 
     async def get_events_by_coordinates(self, latitude: float, longitude: float, radius: float, skip: int = 0, limit: int = 100) -> list[EventModel]:
         return await self._event_repository.get_by_coordinates(latitude, longitude, radius, skip, limit)
+
+    async def get_track(
+        self,
+        sensor_id: UUID,
+        since: datetime | None = None,
+        skip: int = 0,
+        limit: int = 5000,
+        tolerance: float | None = None,
+    ) -> list[TrackPoint]:
+        """Трек сенсора; при tolerance (метры) — упрощённый, без точек, отклоняющихся меньше допуска."""
+        points = await self._event_repository.get_track(sensor_id, since, skip, limit)
+        if tolerance is None:
+            return points
+        return await simplify_track(points, tolerance, self._compute or get_compute_pool())
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from src.sensor_track_pro.business_logic.analytics.heatmap import to_arrays
+from src.sensor_track_pro.business_logic.interfaces.repository.ievent_repo import IEventRepository
+from src.sensor_track_pro.business_logic.models.common_types import naive_utc
+from src.sensor_track_pro.business_logic.models.event_model import EventType
+from src.sensor_track_pro.business_logic.models.heatmap_model import HeatmapGrid
+from src.sensor_track_pro.business_logic.models.heatmap_model import HeatmapModel
+from src.sensor_track_pro.tracing import traced_service_methods
+
+
+@traced_service_methods
+class HeatmapService:
+    def __init__(self, event_repository: IEventRepository):
+        self._event_repository = event_repository
+
+    async def get_heatmap(
+        self,
+        grid: HeatmapGrid,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        event_type: EventType | None = None,
+    ) -> HeatmapModel:
+        """Строит тепловую карту плотности событий по сетке."""
+        # Границы периода с часовым поясом сравниваются с наивными временами событий в UTC
+        start_time = naive_utc(start_time) if start_time is not None else None
+        end_time = naive_utc(end_time) if end_time is not None else None
+        if start_time is not None and end_time is not None and start_time > end_time:
+            raise ValueError("Начало периода должно быть раньше его конца")
+        cells = await self._event_repository.get_density(grid, start_time, end_time, event_type)
+        rows, cols, counts = to_arrays(cells)
+        return HeatmapModel(
+            grid=grid,
+            start_time=start_time,
+            end_time=end_time,
+            event_type=event_type,
+            total=int(counts.sum()),
+            max_count=int(counts.max()) if counts.size else 0,
+            rows=rows.tolist(),
+            cols=cols.tolist(),
+            counts=counts.tolist(),
+        )
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from src.sensor_track_pro.business_logic.analytics.route_tracking import TRACKED_STATUSES
+from src.sensor_track_pro.business_logic.analytics.route_tracking import RouteTracker
+from src.sensor_track_pro.business_logic.interfaces.repository.irout_repo import IRouteRepository
+from src.sensor_track_pro.business_logic.models.route_model import RoutePositionFix
+from src.sensor_track_pro.business_logic.models.route_model import RouteProgress
+from src.sensor_track_pro.business_logic.models.route_model import RouteTrackingState
+from src.sensor_track_pro.tracing import traced_service_methods
+
+
+@traced_service_methods
+class RouteTrackingService:
+    def __init__(self, route_repository: IRouteRepository, tracker: RouteTracker):
+        self._route_repository = route_repository
+        self._tracker = tracker
+
+    async def track_position(self, route_id: UUID, fix: RoutePositionFix) -> RouteProgress | None:
+        """
+        Сопоставляет положение объекта с маршрутом и обновляет статус маршрута.
+
+        Состояние отслеживания читается из БД и сохраняется обратно под
+        блокировкой маршрута, поэтому положения могут обрабатываться любым
+        воркером. Статус меняется только при переходе IN_PROGRESS <-> DELAYED.
+
+        Returns:
+            Прогресс по маршруту или None, если маршрут не найден
+        """
+        await self._route_repository.lock_route(route_id)
+        route = await self._route_repository.get_by_id(route_id)
+        if route is None:
+            return None
+        if route.status not in TRACKED_STATUSES:
+            raise ValueError(f"Маршрут {route_id} не отслеживается в статусе {route.status}")
+        state = await self._route_repository.get_tracking_state(route.id) or RouteTrackingState()
+        progress = self._tracker.update(route, fix, state)
+        status = progress.status if progress.status_changed else None
+        updated = await self._route_repository.save_tracking_state(route.id, state, status)
+        if updated is not None:
+            # Смена статуса меняет updated_at, но не геометрию — кэш геометрии сохраняем
+            self._tracker.touch(route.id, updated.updated_at)
+        return progress
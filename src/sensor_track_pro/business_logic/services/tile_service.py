@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import time
+
+from collections import OrderedDict
+
+from src.sensor_track_pro.business_logic.interfaces.repository.itile_repo import ITileRepository
+from src.sensor_track_pro.tracing import traced_service_methods
+
+
+MAX_ZOOM = 22
+ZONES_LAYER = "zones"
+OBJECTS_LAYER = "objects"
+
+TileKey = tuple[str, int, int, int]
+
+
+class TileCache:
+    """
+    LRU-кэш готовых слоёв MVT с временем жизни записей.
+
+    Для каждого слоя ведётся номер поколения: инвалидация слоя увеличивает его,
+    и результат, посчитанный до инвалидации, уже не попадёт в кэш.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[TileKey, tuple[float, bytes]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+
+    def generation(self, layer: str) -> int:
+        return self._generations.get(layer, 0)
+
+    def get(self, key: TileKey) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, tile = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return tile
+
+    def put(self, key: TileKey, tile: bytes, ttl: float, generation: int) -> None:
+        if ttl <= 0 or generation != self.generation(key[0]):
+            return
+        self._entries[key] = (time.monotonic() + ttl, tile)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, layer: str) -> None:
+        """Сбрасывает все тайлы слоя."""
+        self._generations[layer] = self.generation(layer) + 1
+        for key in [key for key in self._entries if key[0] == layer]:
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@traced_service_methods
+class TileService:
+    def __init__(
+        self,
+        tile_repository: ITileRepository,
+        cache: TileCache,
+        zones_ttl: float = 300.0,
+        objects_ttl: float = 5.0,
+    ):
+        self._tile_repository = tile_repository
+        self._cache = cache
+        self._ttl = {ZONES_LAYER: zones_ttl, OBJECTS_LAYER: objects_ttl}
+
+    @staticmethod
+    def validate_tile(z: int, x: int, y: int) -> None:
+        if not 0 <= z <= MAX_ZOOM:
+            raise ValueError(f"Уровень масштаба должен быть от 0 до {MAX_ZOOM}")
+        n = 2 ** z
+        if not (0 <= x < n and 0 <= y < n):
+            raise ValueError(f"Координаты тайла вне диапазона 0..{n - 1} для уровня {z}")
+
+    async def _layer(self, layer: str, z: int, x: int, y: int) -> bytes:
+        key = (layer, z, x, y)
+        tile = self._cache.get(key)
+        if tile is not None:
+            return tile
+        generation = self._cache.generation(layer)
+        if layer == ZONES_LAYER:
+            tile = await self._tile_repository.get_zones_tile(z, x, y)
+        else:
+            tile = await self._tile_repository.get_objects_tile(z, x, y)
+        self._cache.put(key, tile, self._ttl[layer], generation)
+        return tile
+
+    async def get_tile(self, z: int, x: int, y: int, layers: tuple[str, ...] = (ZONES_LAYER, OBJECTS_LAYER)) -> bytes:
+        """
+        Собирает тайл MVT из слоёв.
+
+        Тайл с несколькими слоями — конкатенация слоёв, поэтому каждый слой
+        кэшируется отдельно: зоны надолго (до изменения зоны), объекты — на
+        несколько секунд.
+        """
+        self.validate_tile(z, x, y)
+        unknown = set(layers) - set(self._ttl)
+        if unknown:
+            raise ValueError(f"Неизвестные слои: {', '.join(sorted(unknown))}")
+        return b"".join([await self._layer(layer, z, x, y) for layer in layers])
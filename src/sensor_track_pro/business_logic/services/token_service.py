@@ -0,0 +1,153 @@
+"""Выпуск и проверка JWT доступа и обновления; отозванные токены — в БД и в памяти процесса."""
+from __future__ import annotations
+
+import time
+import uuid
+
+from collections.abc import Iterable
+from datetime import UTC
+from datetime import datetime
+
+from jose import JWTError
+from jose import jwt
+from pydantic import ValidationError
+
+from src.sensor_track_pro.business_logic.interfaces.repository.irevoked_token_repo import IRevokedTokenRepository
+from src.sensor_track_pro.business_logic.models.user_model import TokenClaims
+from src.sensor_track_pro.business_logic.models.user_model import TokenModel
+from src.sensor_track_pro.business_logic.models.user_model import TokenType
+from src.sensor_track_pro.business_logic.models.user_model import UserModel
+from src.sensor_track_pro.business_logic.models.user_model import UserPublic
+
+
+class InvalidTokenError(ValueError):
+    """Токен не прошёл проверку: подпись, срок, назначение или отзыв."""
+
+
+class RevocationList:
+    """
+    Отозванные токены в памяти процесса: jti -> срок истечения (Unix time).
+
+    Проверка — поиск в словаре, без обращения к БД. Записи истёкших токенов
+    периодически удаляются: такие токены не пройдут и проверку срока.
+    """
+
+    def __init__(self, prune_interval: float = 60.0):
+        self._expires: dict[str, float] = {}
+        self._prune_interval = prune_interval
+        self._next_prune = 0.0
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def __contains__(self, jti: object) -> bool:
+        self._prune()
+        return jti in self._expires
+
+    def add(self, jti: str, expires_at: float) -> None:
+        self._expires[jti] = expires_at
+
+    def update(self, entries: Iterable[tuple[str, float]]) -> None:
+        """Добавляет записи; уже известные отзывы не сбрасываются."""
+        self._expires.update(entries)
+
+    def _prune(self) -> None:
+        now = time.time()
+        if now < self._next_prune:
+            return
+        self._next_prune = now + self._prune_interval
+        self._expires = {jti: expires_at for jti, expires_at in self._expires.items() if expires_at > now}
+
+
+class TokenService:
+    """
+    Подписанные JWT с ролью пользователя.
+
+    Проверка токена — только вычисления: подпись, срок, назначение и поиск jti
+    в RevocationList процесса. Ни пользователь, ни отозванные токены из БД не
+    читаются. Таблица отозванных токенов остаётся источником истины: отзыв
+    записывается в неё, а другие воркеры и экземпляры узнают о нём по NOTIFY
+    и при запуске (см. api.dependencies.auth).
+    """
+
+    def __init__(
+        self,
+        secret_key: str,
+        revoked: RevocationList,
+        revocations: IRevokedTokenRepository | None = None,
+        algorithm: str = "HS256",
+        access_ttl: int = 900,
+        refresh_ttl: int = 7 * 24 * 3600,
+    ):
+        self._secret_key = secret_key
+        self._revoked = revoked
+        self._revocations = revocations
+        self._algorithm = algorithm
+        self._access_ttl = access_ttl
+        self._refresh_ttl = refresh_ttl
+
+    def issue_tokens(self, user: UserModel) -> TokenModel:
+        """Выпускает пару токенов доступа и обновления для пользователя."""
+        return TokenModel(
+            access_token=self._encode(user, TokenType.ACCESS, self._access_ttl),
+            expires_in=self._access_ttl,
+            refresh_token=self._encode(user, TokenType.REFRESH, self._refresh_ttl),
+            refresh_expires_in=self._refresh_ttl,
+            user=UserPublic.model_validate(user),
+        )
+
+    def verify(self, token: str, token_type: TokenType = TokenType.ACCESS) -> TokenClaims:
+        """
+        Проверяет токен и возвращает его утверждения.
+
+        Args:
+            token: Строка JWT
+            token_type: Ожидаемое назначение токена
+
+        Returns:
+            Утверждения токена
+
+        Raises:
+            InvalidTokenError: Подпись или срок недействительны, токен другого
+                назначения или отозван
+        """
+        try:
+            payload = jwt.decode(token, self._secret_key, algorithms=[self._algorithm])
+            claims = TokenClaims.model_validate(payload)
+        except (JWTError, ValidationError) as e:
+            raise InvalidTokenError("Недействительный токен") from e
+        if claims.type != token_type:
+            raise InvalidTokenError("Неверный тип токена")
+        if claims.jti in self._revoked:
+            raise InvalidTokenError("Токен отозван")
+        return claims
+
+    async def revoke(self, claims: TokenClaims) -> bool:
+        """
+        Отзывает токен до истечения его срока.
+
+        Returns:
+            False, если токен уже был отозван (например, параллельной ротацией)
+
+        Raises:
+            RuntimeError: Сервис создан без репозитория (только для проверки)
+        """
+        if self._revocations is None:
+            raise RuntimeError("Отзыв токенов требует репозитория")
+        expires_at = datetime.fromtimestamp(claims.exp, UTC).replace(tzinfo=None)
+        revoked = await self._revocations.revoke(claims.jti, expires_at)
+        self._revoked.add(claims.jti, claims.exp)
+        return revoked
+
+    def _encode(self, user: UserModel, token_type: TokenType, ttl: int) -> str:
+        issued_at = int(time.time())
+        claims = {
+            "sub": str(user.id),
+            "username": user.username,
+            "role": str(user.role),
+            "type": str(token_type),
+            "jti": uuid.uuid4().hex,
+            "iat": issued_at,
+            "exp": issued_at + ttl,
+        }
+        return jwt.encode(claims, self._secret_key, algorithm=self._algorithm)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from src.sensor_track_pro.business_logic.analytics.trip_segmentation import SegmentationConfig
+from src.sensor_track_pro.business_logic.analytics.trip_segmentation import TripSegmenter
+from src.sensor_track_pro.business_logic.interfaces.repository.ievent_repo import IEventRepository
+from src.sensor_track_pro.business_logic.interfaces.repository.itrip_repo import ITripRepository
+from src.sensor_track_pro.business_logic.models.trip_model import TripBase
+from src.sensor_track_pro.business_logic.models.trip_model import TripKind
+from src.sensor_track_pro.business_logic.models.trip_model import TripModel
+from src.sensor_track_pro.business_logic.models.trip_model import TripRefreshResult
+from src.sensor_track_pro.tracing import traced_service_methods
+
+
+TRACK_BATCH_SIZE = 5000
+
+
+@traced_service_methods
+class TripService:
+    def __init__(
+        self,
+        trip_repository: ITripRepository,
+        event_repository: IEventRepository,
+        config: SegmentationConfig | None = None,
+    ):
+        self._trip_repository = trip_repository
+        self._event_repository = event_repository
+        self._config = config or SegmentationConfig()
+
+    async def refresh_trips(self, sensor_id: UUID) -> TripRefreshResult:
+        """
+        Досегментирует трек сенсора, начиная с последнего сохранённого сегмента.
+
+        Открытый сегмент пересчитывается заново с момента своего начала,
+        поэтому повторно читаются только события хвоста, а не весь трек.
+        Параллельные пересчёты одного сенсора сериализуются блокировкой.
+        """
+        await self._trip_repository.lock_sensor(sensor_id)
+        last = await self._trip_repository.get_last_segment(sensor_id)
+        since: datetime | None = None
+        if last is not None:
+            since = last.end_time if last.is_closed else last.start_time
+
+        segmenter = TripSegmenter(sensor_id, self._config)
+        segments: list[TripBase] = []
+        processed = 0
+        skip = 0
+        while True:
+            points = await self._event_repository.get_track(sensor_id, since, skip, TRACK_BATCH_SIZE)
+            segments.extend(segmenter.feed_many(points))
+            processed += len(points)
+            skip += len(points)
+            if len(points) < TRACK_BATCH_SIZE:
+                break
+
+        if last is not None and last.is_closed and processed <= 1:
+            # Новых точек после закрытого сегмента нет
+            return TripRefreshResult(sensor_id=sensor_id, processed_points=processed, closed_segments=0)
+
+        closed_count = len(segments)
+        tail = segmenter.open_segment()
+        if tail is not None:
+            segments.append(tail)
+        await self._trip_repository.replace_open_segments(sensor_id, segments)
+        return TripRefreshResult(sensor_id=sensor_id, processed_points=processed, closed_segments=closed_count)
+
+    async def get_trips(
+        self,
+        sensor_id: UUID,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        kind: TripKind | None = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> list[TripModel]:
+        return await self._trip_repository.get_by_sensor_id(sensor_id, start_time, end_time, kind, skip, limit)
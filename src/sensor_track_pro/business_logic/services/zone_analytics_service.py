@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from src.sensor_track_pro.business_logic.interfaces.repository.izone_analytics_repo import IZoneAnalyticsRepository
+from src.sensor_track_pro.business_logic.models.common_types import naive_utc
+from src.sensor_track_pro.business_logic.models.zone_analytics_model import ZoneDwellTime
+from src.sensor_track_pro.business_logic.models.zone_analytics_model import ZoneOccupancyPoint
+from src.sensor_track_pro.business_logic.models.zone_analytics_model import ZoneOccupancySummary
+from src.sensor_track_pro.tracing import traced_service_methods
+
+
+@traced_service_methods
+class ZoneAnalyticsService:
+    def __init__(self, zone_analytics_repository: IZoneAnalyticsRepository):
+        self._zone_analytics_repository = zone_analytics_repository
+
+    @staticmethod
+    def _window(start_time: datetime, end_time: datetime | None) -> tuple[datetime, datetime]:
+        """Проверяет период; незавершённые посещения считаются не дальше текущего момента."""
+        now = datetime.utcnow()
+        start_time = naive_utc(start_time)
+        end_time = min(naive_utc(end_time), now) if end_time is not None else now
+        if start_time >= end_time:
+            raise ValueError("Начало периода должно быть раньше его конца")
+        return start_time, end_time
+
+    async def get_dwell_times(
+        self,
+        start_time: datetime,
+        end_time: datetime | None = None,
+        zone_id: UUID | None = None,
+        object_id: UUID | None = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> list[ZoneDwellTime]:
+        start_time, end_time = self._window(start_time, end_time)
+        return await self._zone_analytics_repository.get_dwell_times(
+            start_time, end_time, zone_id, object_id, skip, limit
+        )
+
+    async def get_occupancy(
+        self,
+        start_time: datetime,
+        end_time: datetime | None = None,
+        zone_id: UUID | None = None,
+    ) -> list[ZoneOccupancyPoint]:
+        start_time, end_time = self._window(start_time, end_time)
+        return await self._zone_analytics_repository.get_occupancy(start_time, end_time, zone_id)
+
+    async def get_occupancy_summary(
+        self,
+        start_time: datetime,
+        end_time: datetime | None = None,
+        zone_id: UUID | None = None,
+    ) -> list[ZoneOccupancySummary]:
+        start_time, end_time = self._window(start_time, end_time)
+        return await self._zone_analytics_repository.get_occupancy_summary(start_time, end_time, zone_id)
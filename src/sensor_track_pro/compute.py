@@ -0,0 +1,106 @@
+"""
+Пул процессов для CPU-ёмкой работы с геометрией.
+
+Чистые функции над массивами (numpy) выполняются в отдельных процессах,
+поэтому большой запрос не останавливает цикл событий и остальные запросы
+воркера. Пул общий на процесс, запускается и останавливается в lifespan.
+Функции и аргументы передаются через pickle: это должны быть функции уровня
+модуля (или functools.partial от них) и массивы, а не модели с сессиями.
+"""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+
+from collections.abc import Callable
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+
+from src.sensor_track_pro.config import get_settings
+
+
+class ComputePool:
+    """
+    Ограниченный пул процессов с порогом выноса работы.
+
+    Работа объёмом меньше chunk_size выполняется сразу в цикле событий:
+    на малых данных передача между процессами дороже самого расчёта.
+    Без запущенного пула (workers=0, тесты, скрипты) работа уходит в поток.
+    """
+
+    def __init__(self, workers: int = 2, chunk_size: int = 20000):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    async def start(self) -> None:
+        """Создаёт пул и дожидается запуска всех процессов."""
+        if self.workers <= 0 or self._executor is not None:
+            return
+        # fork из процесса с циклом событий и потоками небезопасен
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context(method))
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, os.getpid) for _ in range(self.workers)))
+
+    async def stop(self) -> None:
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    async def run[T](self, fn: Callable[..., T], *args: Any, size: int | None = None) -> T:
+        """
+        Выполняет fn(*args) вне цикла событий.
+
+        Args:
+            fn: Функция уровня модуля
+            args: Аргументы (передаются в процесс через pickle)
+            size: Объём работы (число точек); меньше chunk_size — расчёт сразу на месте
+        """
+        if size is not None and size < self.chunk_size:
+            return fn(*args)
+        if self._executor is None:
+            return await asyncio.to_thread(fn, *args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def map_chunks[R](
+        self,
+        fn: Callable[..., R],
+        *arrays: Sequence[Any] | np.ndarray,
+        chunk_size: int | None = None,
+        overlap: int = 0,
+    ) -> list[tuple[int, R]]:
+        """
+        Делит массивы одинаковой длины на куски и считает fn(*куски) параллельно.
+
+        Соседние куски пересекаются на overlap элементов (например, общая
+        граничная точка при упрощении трека).
+
+        Returns:
+            (смещение начала куска, результат fn) в порядке кусков
+        """
+        size = chunk_size or self.chunk_size
+        total = len(arrays[0])
+        if total <= size:
+            return [(0, await self.run(fn, *arrays, size=total))]
+        starts = range(0, total - overlap, size)
+        results = await asyncio.gather(
+            *(self.run(fn, *(array[start:start + size + overlap] for array in arrays)) for start in starts)
+        )
+        return list(zip(starts, results, strict=True))
+
+
+@lru_cache
+def get_compute_pool() -> ComputePool:
+    """Пул процессов воркера для геометрии (запускается в lifespan)."""
+    settings = get_settings()
+    return ComputePool(workers=settings.compute_workers, chunk_size=settings.compute_chunk_size)
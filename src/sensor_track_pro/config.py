@@ -17,11 +17,96 @@ class Settings(BaseSettings):
     db_user: str = Field(default="mihailmamaev", description="Database user")
     db_password: str = Field(default="", description="Database password")
     db_name: str = Field(default="sensor", description="Database name")
+    db_pool_size: int = Field(default=5, description="Persistent connections in the pool")
+    db_max_overflow: int = Field(default=10, description="Connections opened above the pool size under load")
+    db_pool_warmup: int = Field(default=2, description="Pool connections opened at startup before taking traffic")
     
     # Application settings
     debug: bool = Field(default=False, description="Debug mode")
     api_prefix: str = Field(default="/api", description="API prefix")
     
+    # Trip segmentation settings
+    trip_speed_threshold: float = Field(default=3.0, description="Speed below which a fix is stationary (km/h)")
+    trip_stop_radius: float = Field(default=50.0, description="Radius of a stop (meters)")
+    trip_min_stop_duration: float = Field(default=180.0, description="Minimum stop duration (seconds)")
+    trip_max_gap: float = Field(default=1800.0, description="Data gap that closes a segment (seconds)")
+    
+    # Route tracking settings
+    route_delay_threshold: float = Field(default=300.0, description="Delay that marks a route as delayed (seconds)")
+    route_recover_threshold: float = Field(
+        default=120.0, description="Delay below which a delayed route recovers (seconds)"
+    )
+    route_off_route_distance: float = Field(
+        default=200.0, description="Cross-track error that marks an object off route (meters)"
+    )
+    
+    # Vector tile settings
+    tile_cache_size: int = Field(default=10000, description="Maximum number of cached tile layers")
+    tile_zones_ttl: float = Field(default=300.0, description="Zones tile layer TTL (seconds)")
+    tile_objects_ttl: float = Field(default=5.0, description="Objects tile layer TTL (seconds)")
+    
+    # Repository read cache settings
+    repository_cache_size: int = Field(default=4096, description="Maximum number of cached repository reads")
+    repository_cache_ttl: float = Field(default=60.0, description="Zones/objects/sensors read cache TTL (seconds)")
+    repository_cache_positions_ttl: float = Field(
+        default=5.0, description="Objects map (sensor positions) cache TTL (seconds)"
+    )
+    repository_cache_listen: bool = Field(
+        default=True, description="Listen for cache invalidations from other instances"
+    )
+    repository_cache_listen_dsn: str = Field(
+        default="",
+        description="asyncpg DSN of the primary for LISTEN (a hot standby rejects it); empty — the app database",
+    )
+    
+    # JWT settings
+    jwt_secret_key: str = Field(default="", description="JWT signing key shared by all instances; required")
+    jwt_algorithm: str = Field(default="HS256", description="JWT signing algorithm")
+    jwt_access_ttl: int = Field(default=900, description="Access token lifetime (seconds)")
+    jwt_refresh_ttl: int = Field(default=604800, description="Refresh token lifetime (seconds)")
+    
+    # Password hashing settings
+    password_bcrypt_rounds: int = Field(default=12, description="bcrypt cost factor (log2 of rounds)")
+    password_hash_workers: int = Field(default=4, description="Threads for password hashing")
+    credential_cache_ttl: float = Field(default=300.0, description="Verified credential cache TTL (seconds)")
+    credential_cache_size: int = Field(default=10000, description="Maximum number of cached verified credentials")
+    
+    # CPU-heavy geometry work (process pool per worker)
+    compute_workers: int = Field(default=2, description="Processes for geometry work per worker (0 — a thread instead)")
+    compute_chunk_size: int = Field(
+        default=20000, description="Items per pool task; smaller inputs are processed on the event loop"
+    )
+    
+    # SQL profiling settings
+    sql_slow_query_ms: float = Field(default=200.0, description="Log SQL statements slower than this (milliseconds)")
+    sql_log_parameters: bool = Field(
+        default=False, description="Include bound parameters in the slow query log (may contain personal data)"
+    )
+    sql_request_statements_warn: int = Field(
+        default=20, description="Log HTTP requests issuing at least this many SQL statements"
+    )
+    
+    # Tracing settings
+    tracing_exporter: str = Field(default="none", description='Span exporter: "none", "file" or "otlp"')
+    tracing_file_path: str = Field(default="traces/spans-{pid}.jsonl", description="Span file ({pid} — worker PID)")
+    tracing_otlp_endpoint: str = Field(
+        default="http://localhost:4318/v1/traces", description="Collector OTLP/HTTP endpoint"
+    )
+    tracing_sample_ratio: float = Field(default=1.0, description="Share of requests traced without traceparent")
+    tracing_service_name: str = Field(default="sensor-track-pro", description="service.name of exported spans")
+    
+    # Serving settings (python -m src.sensor_track_pro.serve)
+    host: str = Field(default="0.0.0.0", description="Address the server listens on")
+    port: int = Field(default=8000, description="Port the server listens on")
+    workers: int = Field(default=1, description="Worker processes per container (0 — one per available CPU)")
+    db_connection_budget: int = Field(
+        default=0, description="Database connections per container split between workers (0 — pool settings per worker)"
+    )
+    worker_state_dir: str = Field(default="", description="Directory for worker heartbeats (set by the server)")
+    worker_heartbeat_interval: float = Field(default=5.0, description="Worker heartbeat interval (seconds)")
+    worker_heartbeat_timeout: float = Field(default=30.0, description="Heartbeat age after which a worker is restarted")
+    worker_startup_timeout: float = Field(default=60.0, description="Time a new worker has to become ready (seconds)")
+    
     # Additional settings can be added here
     
     model_config = SettingsConfigDict(
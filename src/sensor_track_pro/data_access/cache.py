@@ -0,0 +1,223 @@
+"""Кэш чтения справочных таблиц (зоны, объекты, сенсоры) в памяти процесса."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+import uuid
+
+from collections import OrderedDict
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Hashable
+from functools import lru_cache
+from typing import Any
+
+from src.sensor_track_pro.config import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+# Канал PostgreSQL LISTEN/NOTIFY, по которому экземпляры сообщают о записи
+INVALIDATION_CHANNEL = "repository_cache"
+
+MISSING = object()
+
+type CacheKey = tuple[str, Hashable]
+
+
+class RepositoryCache:
+    """
+    LRU-кэш бизнес-моделей с временем жизни записей, разбитый на пространства
+    имён (по одному на таблицу).
+
+    Как и TileCache, для каждого пространства ведётся номер поколения:
+    инвалидация увеличивает его, и значение, прочитанное из БД до записи, уже
+    не попадёт в кэш. Значения отдаются без копирования — изменять их нельзя.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl: float = 60.0):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: OrderedDict[CacheKey, tuple[float, Any]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._subscribers: dict[str, list[Callable[[], None]]] = {}
+        self._message_handlers: dict[str, list[Callable[[str], None]]] = {}
+        # Метка экземпляра: свои уведомления уже применены локально
+        self.instance_id = uuid.uuid4().hex
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def get(self, namespace: str, key: Hashable) -> Any:
+        """Значение из кэша или MISSING."""
+        entry = self._entries.get((namespace, key))
+        if entry is None:
+            return MISSING
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[namespace, key]
+            return MISSING
+        self._entries.move_to_end((namespace, key))
+        return value
+
+    def put(self, namespace: str, key: Hashable, value: Any, generation: int, ttl: float | None = None) -> None:
+        ttl = self._ttl if ttl is None else ttl
+        if ttl <= 0 or generation != self.generation(namespace):
+            return
+        self._entries[namespace, key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end((namespace, key))
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def subscribe(self, namespace: str, callback: Callable[[], None]) -> None:
+        """
+        Вызывает callback при каждой инвалидации пространства имён.
+
+        Так производные кэши (например, тайлы зон) сбрасываются и по записи в
+        этом процессе, и по NOTIFY от других воркеров и экземпляров.
+        """
+        self._subscribers.setdefault(namespace, []).append(callback)
+
+    def on_message(self, namespace: str, handler: Callable[[str], None]) -> None:
+        """
+        Передаёт handler текст уведомлений пространства имён вместо инвалидации.
+
+        Так по тому же каналу расходятся данные, которые процесс держит сам
+        (например, отозванные токены).
+        """
+        self._message_handlers.setdefault(namespace, []).append(handler)
+
+    def invalidate(self, namespace: str) -> None:
+        """Сбрасывает все записи пространства имён."""
+        self._generations[namespace] = self.generation(namespace) + 1
+        for key in [key for key in self._entries if key[0] == namespace]:
+            del self._entries[key]
+        for callback in self._subscribers.get(namespace, ()):
+            callback()
+
+    def clear(self) -> None:
+        """Сбрасывает весь кэш (например, после потери канала уведомлений)."""
+        for namespace in {key[0] for key in self._entries} | set(self._generations):
+            self._generations[namespace] = self.generation(namespace) + 1
+        self._entries.clear()
+        for callbacks in self._subscribers.values():
+            for callback in callbacks:
+                callback()
+
+    def notification(self, namespace: str, detail: str = "") -> str:
+        """Текст NOTIFY о записи в пространство имён."""
+        if detail:
+            return f"{self.instance_id} {namespace} {detail}"
+        return f"{self.instance_id} {namespace}"
+
+    def apply_notification(self, payload: str) -> None:
+        """Применяет уведомление другого экземпляра."""
+        instance_id, _, message = payload.partition(" ")
+        namespace, _, detail = message.partition(" ")
+        if instance_id == self.instance_id or not namespace:
+            return
+        handlers = self._message_handlers.get(namespace)
+        if handlers is None:
+            self.invalidate(namespace)
+            return
+        for handler in handlers:
+            handler(detail)
+
+
+class CacheInvalidationListener:
+    """
+    Подписка на INVALIDATION_CHANNEL через отдельное соединение asyncpg.
+
+    Репозитории отправляют NOTIFY в той же транзакции, что и запись, поэтому
+    уведомление приходит только после фиксации. Пока соединения нет,
+    уведомления теряются, так что после каждого (пере)подключения кэш
+    сбрасывается целиком, а on_connect перечитывает то, что процесс держит
+    сам (например, отозванные токены). Слушать нужно основной сервер: горячий резерв
+    LISTEN не выполняет. Неудачные попытки повторяются с растущей паузой.
+    """
+
+    def __init__(
+        self,
+        cache: RepositoryCache,
+        dsn: str,
+        reconnect_delay: float = 5.0,
+        max_reconnect_delay: float = 60.0,
+        on_connect: Callable[[], Awaitable[None]] | None = None,
+    ):
+        self._cache = cache
+        self._on_connect = on_connect
+        self._dsn = dsn
+        self._reconnect_delay = reconnect_delay
+        self._max_reconnect_delay = max_reconnect_delay
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def _on_notification(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        self._cache.apply_notification(payload)
+
+    async def _run(self) -> None:
+        delay = self._reconnect_delay
+        while True:
+            if await self._listen():
+                delay = self._reconnect_delay
+            self._cache.clear()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self._max_reconnect_delay)
+
+    async def _listen(self) -> bool:
+        """
+        Подписывается на канал и ждёт потери соединения.
+
+        Returns:
+            False, если подключиться или выполнить LISTEN не удалось
+        """
+        import asyncpg
+
+        try:
+            connection = await asyncpg.connect(self._dsn)
+        except (OSError, asyncpg.PostgresError) as e:
+            logger.warning("Кэш репозиториев: нет соединения для LISTEN: %s", e)
+            return False
+        lost = asyncio.Event()
+        connection.add_termination_listener(lambda _: lost.set())
+        try:
+            try:
+                await connection.add_listener(INVALIDATION_CHANNEL, self._on_notification)
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("Кэш репозиториев: LISTEN не выполнен: %s", e)
+                return False
+            self._cache.clear()
+            if self._on_connect is not None:
+                try:
+                    await self._on_connect()
+                except Exception as e:
+                    logger.warning("Кэш репозиториев: синхронизация после подключения не удалась: %s", e)
+                    return False
+            await lost.wait()
+            logger.warning("Кэш репозиториев: соединение LISTEN потеряно, переподключение")
+            return True
+        finally:
+            if not connection.is_closed():
+                await connection.close()
+
+
+@lru_cache
+def get_repository_cache() -> RepositoryCache:
+    """Кэш репозиториев процесса (общий для всех сессий)."""
+    settings = get_settings()
+    return RepositoryCache(settings.repository_cache_size, settings.repository_cache_ttl)
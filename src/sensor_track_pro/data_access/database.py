@@ -1,47 +1,94 @@
+"""
+Движок и сессии БД.
+
+Движок создаётся при первом обращении (в приложении — в lifespan), а не при
+импорте модуля, поэтому импорт не загружает драйвер asyncpg.
+"""
 from __future__ import annotations
 
+import asyncio
+import logging
+
+from contextlib import AsyncExitStack
+from typing import Any
 from typing import AsyncGenerator
 
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import QueuePool
 
 from src.sensor_track_pro.config import get_settings
+from src.sensor_track_pro.data_access.profiling import StatementProfiler
+from src.sensor_track_pro.data_access.profiling import instrument_engine
+
 
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
 _engine = None
 
+# Привязывается к движку при его создании (get_async_engine)
+AsyncSessionLocal = async_sessionmaker(
+    expire_on_commit=False,
+    autoflush=False,
+    class_=AsyncSession
+)
+
+
+def pool_limits(settings: Any) -> tuple[int, int]:
+    """
+    Размер пула и допустимое превышение для одного воркера.
+
+    При DB_CONNECTION_BUDGET бюджет соединений контейнера делится между
+    WORKERS воркерами с сохранением соотношения DB_POOL_SIZE и DB_MAX_OVERFLOW;
+    иначе каждый воркер получает пул из настроек.
+    """
+    pool_size, max_overflow = settings.db_pool_size, settings.db_max_overflow
+    if settings.db_connection_budget <= 0:
+        return pool_size, max_overflow
+    per_worker = max(settings.db_connection_budget // max(settings.workers, 1), 1)
+    size = max(per_worker * pool_size // max(pool_size + max_overflow, 1), 1)
+    return size, max(per_worker - size, 0)
+
 
 def get_async_engine() -> AsyncEngine:
     global _engine
     if (_engine is None):
         # include password if provided
         password_segment = f":{settings.db_password}" if settings.db_password else ""
+        pool_size, max_overflow = pool_limits(settings)
         _engine = create_async_engine(
             f"postgresql+asyncpg://{settings.db_user}{password_segment}@{settings.db_host}:{settings.db_port}/{settings.db_name}",
             echo=settings.debug,
             pool_pre_ping=True,
-            pool_size=5,
-            max_overflow=10
+            pool_size=pool_size,
+            max_overflow=max_overflow
         )
+        instrument_engine(_engine, StatementProfiler(
+            slow_threshold_ms=settings.sql_slow_query_ms,
+            log_parameters=settings.sql_log_parameters,
+        ))
+        AsyncSessionLocal.configure(bind=_engine)
     return _engine
 
 
-async_engine = get_async_engine()
+def get_asyncpg_dsn() -> str:
+    """DSN той же базы для прямого соединения asyncpg (LISTEN/NOTIFY)."""
+    return get_async_engine().url.set(drivername="postgresql").render_as_string(hide_password=False)
 
-AsyncSessionLocal = async_sessionmaker(
-    bind=async_engine,
-    expire_on_commit=False,
-    autoflush=False,
-    class_=AsyncSession
-)
+
+def open_session() -> AsyncSession:
+    """Новая сессия; движок создаётся, если его ещё нет."""
+    get_async_engine()
+    return AsyncSessionLocal()
 
 
 async def get_async_db() -> AsyncGenerator[AsyncSession]:
-    async with AsyncSessionLocal() as session:
+    async with open_session() as session:
         try:
             yield session
         finally:
@@ -50,7 +97,7 @@ async def get_async_db() -> AsyncGenerator[AsyncSession]:
 
 async def init_models() -> None:
     from src.sensor_track_pro.data_access.models.base import Base
-    async with async_engine.begin() as conn:
+    async with get_async_engine().begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 
@@ -58,4 +105,33 @@ async def dispose_engine() -> None:
     global _engine
     if _engine is not None:
         await _engine.dispose()
-        _engine = None
\ No newline at end of file
+        _engine = None
+
+
+async def warm_up_pool(connections: int, engine: AsyncEngine | None = None) -> int:
+    """
+    Открывает до connections соединений пула заранее, чтобы первые запросы
+    не ждали подключения к БД. Возвращает число открытых соединений.
+
+    Ошибка подключения не прерывает запуск: соединения откроются по запросу.
+    Пулы без постоянных соединений (NullPool) не прогреваются.
+    """
+    engine = engine or get_async_engine()
+    if not isinstance(engine.pool, QueuePool):
+        return 0
+    connections = min(connections, engine.pool.size())
+    if connections <= 0:
+        return 0
+    # Держим все соединения одновременно, иначе пул выдаст одно и то же
+    async with AsyncExitStack() as stack:
+        results = await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(connections)),
+            return_exceptions=True,
+        )
+    errors = [result for result in results if isinstance(result, BaseException)]
+    for error in errors:
+        if not isinstance(error, (OSError, SQLAlchemyError)):
+            raise error
+    if errors:
+        logger.warning("Не удалось прогреть пул соединений: %s", errors[0])
+    return connections - len(errors)
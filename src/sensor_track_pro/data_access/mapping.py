@@ -0,0 +1,149 @@
+"""Доверенное преобразование строк БД в бизнес-модели без полной валидации."""
+from __future__ import annotations
+
+import types
+
+from collections.abc import Callable
+from collections.abc import Iterable
+from datetime import date
+from datetime import datetime
+from datetime import time
+from datetime import timedelta
+from enum import Enum
+from functools import cache
+from typing import Any
+from typing import Union
+from typing import get_args
+from typing import get_origin
+from uuid import UUID
+
+from pydantic import BaseModel
+from pydantic import TypeAdapter
+
+
+__all__ = ["to_model", "to_models"]
+
+# Типы, которые драйвер БД уже возвращает в нужном виде
+_TRUSTED_TYPES = (str, int, float, bool, bytes, UUID, datetime, date, time, timedelta)
+
+_MISSING = object()
+
+_NO_STATE: dict[str, Any] = {}
+
+_new_object = object.__new__
+_set_attribute = object.__setattr__
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    """Снимает `X | None`; None в колонке не преобразуется."""
+    if get_origin(annotation) in {Union, types.UnionType}:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _enum_coercer(enum_type: type[Enum]) -> Callable[[Any], Any]:
+    def coerce(value: Any) -> Any:
+        if value is None or isinstance(value, enum_type):
+            return value
+        return enum_type(value)
+    return coerce
+
+
+def _field_coercer(annotation: Any) -> Callable[[Any], Any] | None:
+    """
+    Подбирает преобразование значения колонки в тип поля.
+
+    None означает, что значение из БД подходит как есть. Перечисления
+    приводятся конструктором, вложенные структуры (JSON-колонки с точками
+    маршрута, координатами зоны и т.п.) проверяются адаптером только этого поля.
+    """
+    inner = _unwrap_optional(annotation)
+    if inner is Any or inner in _TRUSTED_TYPES:
+        return None
+    if isinstance(inner, type) and issubclass(inner, Enum):
+        return _enum_coercer(inner)
+    if get_origin(inner) is dict and get_args(inner)[1:] in {(), (Any,)}:
+        return None
+    return TypeAdapter(annotation).validate_python
+
+
+class _ModelPlan:
+    """Заранее разобранные поля модели: откуда брать значения и как их приводить."""
+
+    def __init__(self, model_type: type[BaseModel]):
+        self.lookups: list[tuple[str, tuple[str, ...]]] = []
+        self.coercers: list[tuple[str, Callable[[Any], Any]]] = []
+        for name, field in model_type.model_fields.items():
+            self.lookups.append((name, (name,) if field.alias in {None, name} else (name, field.alias)))
+            coerce = _field_coercer(field.annotation)
+            if coerce is not None:
+                self.coercers.append((name, coerce))
+        self.fields_set = frozenset(model_type.model_fields)
+        # Приватные атрибуты требуют полной инициализации через model_construct
+        self.direct = not model_type.__private_attributes__
+
+
+@cache
+def _plan(model_type: type[BaseModel]) -> _ModelPlan:
+    return _ModelPlan(model_type)
+
+
+def to_model[T: BaseModel](model_type: type[T], source: Any) -> T:
+    """
+    Собирает модель из ORM-объекта или строки результата без повторной валидации.
+
+    Данные из собственной БД уже прошли проверку при записи, поэтому поля
+    берутся как есть (по имени поля, затем по алиасу): у ORM-объекта — прямо из
+    загруженного состояния, у Row — по меткам колонок. Валидаторы модели не
+    вызываются; отсутствующие атрибуты получают значения по умолчанию.
+
+    Args:
+        model_type: Класс бизнес-модели
+        source: ORM-объект, Row или любой объект с атрибутами-полями
+
+    Returns:
+        Экземпляр бизнес-модели
+    """
+    plan = _plan(model_type)
+    # Загруженное состояние ORM-объекта или отображение колонок Row
+    loaded = getattr(source, "__dict__", None)
+    if loaded is None:
+        loaded = getattr(source, "_mapping", _NO_STATE)
+    values = {}
+    for name, attrs in plan.lookups:
+        for attr in attrs:
+            value = loaded.get(attr, _MISSING)
+            if value is _MISSING:
+                value = getattr(source, attr, _MISSING)
+            if value is not _MISSING:
+                values[name] = value
+                break
+    for name, coerce in plan.coercers:
+        value = values.get(name)
+        if value is not None:
+            values[name] = coerce(value)
+    if not plan.direct or len(values) != len(plan.fields_set):
+        return model_type.model_construct(**values)
+    # То же, что делает model_construct, без разбора алиасов и значений по умолчанию
+    model = _new_object(model_type)
+    _set_attribute(model, "__dict__", values)
+    _set_attribute(model, "__pydantic_fields_set__", set(plan.fields_set))
+    _set_attribute(model, "__pydantic_extra__", None)
+    _set_attribute(model, "__pydantic_private__", None)
+    return model
+
+
+def to_models[T: BaseModel](model_type: type[T], sources: Iterable[Any]) -> list[T]:
+    """
+    Собирает список моделей из ORM-объектов или строк результата.
+
+    Args:
+        model_type: Класс бизнес-модели
+        sources: ORM-объекты или строки результата
+
+    Returns:
+        Список экземпляров бизнес-модели
+    """
+    return [to_model(model_type, source) for source in sources]
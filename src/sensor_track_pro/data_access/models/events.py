@@ -44,4 +44,5 @@ class Event(Base):
 
     __table_args__ = (
         Index("idx_event_sensor_timestamp", "sensor_id", "timestamp"),
+        Index("idx_event_timestamp_position", "timestamp", "latitude", "longitude"),
     )
\ No newline at end of file
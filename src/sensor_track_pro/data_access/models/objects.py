@@ -2,9 +2,13 @@ from __future__ import annotations
 
 import uuid
 
+from datetime import datetime
+
 from sqlalchemy import Column  # добавлено
+from sqlalchemy import DateTime
 from sqlalchemy import Enum
 from sqlalchemy import ForeignKey  # добавлено
+from sqlalchemy import Index
 
 # --- добавьте определение таблицы object_zone ---
 from sqlalchemy import String
@@ -26,7 +30,9 @@ object_zone = Table(
     metadata,
     Column("object_id", UUID(as_uuid=True), ForeignKey("objects.id", ondelete="CASCADE"), primary_key=True),
     Column("zone_id", UUID(as_uuid=True), ForeignKey("zones.id", ondelete="CASCADE"), primary_key=True),
-    Column("exited_at", String, nullable=True),  # добавлено поле exited_at (используйте DateTime если нужно)
+    Column("entered_at", DateTime, nullable=False, default=datetime.utcnow),
+    Column("exited_at", DateTime, nullable=True),
+    Index("idx_object_zone_zone_time", "zone_id", "entered_at", "exited_at"),
 )
 
 
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import Column
+from sqlalchemy import DateTime
+from sqlalchemy import Index
+from sqlalchemy import String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.declarative import declared_attr
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from src.sensor_track_pro.data_access.models.base import Base
+
+
+class RevokedToken(Base):
+    """Модель отозванного JWT в базе данных (до истечения срока токена)."""
+
+    @declared_attr.directive
+    def __tablename__(self) -> str:
+        return "revoked_tokens"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    jti = Column(String(64), nullable=False, unique=True)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("idx_revoked_token_expires", "expires_at"),
+    )
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import Column
+from sqlalchemy import DateTime
+from sqlalchemy import Float
+from sqlalchemy import ForeignKey
+from sqlalchemy import String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.declarative import declared_attr
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from src.sensor_track_pro.data_access.models.base import Base
+
+
+class RouteTracking(Base):
+    """Модель состояния отслеживания маршрута в базе данных (одна строка на маршрут)."""
+
+    @declared_attr.directive
+    def __tablename__(self) -> str:
+        return "route_tracking"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    route_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("routes.id", ondelete="CASCADE"), nullable=False, unique=True
+    )
+    geometry_key = Column(String(32), nullable=True)
+    progress = Column(Float, nullable=True)
+    fixed_at = Column(DateTime, nullable=True)
+    speed = Column(Float, nullable=True)
@@ -4,7 +4,10 @@ import uuid
 
 from sqlalchemy import Column
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import String
+from sqlalchemy import column
+from sqlalchemy import desc
 from sqlalchemy.dialects.postgresql import UUID as pgUUID
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
@@ -43,3 +46,7 @@ class Sensor(Base):
     # Связи
     object = relationship("Object", back_populates="sensors")
     events = relationship("Event", back_populates="sensor", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index("idx_sensor_object_updated", "object_id", desc(column("updated_at"))),
+    )
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import Boolean
+from sqlalchemy import Column
+from sqlalchemy import DateTime
+from sqlalchemy import Enum
+from sqlalchemy import Float
+from sqlalchemy import ForeignKey
+from sqlalchemy import Index
+from sqlalchemy import Integer
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.declarative import declared_attr
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+from sqlalchemy.orm import relationship
+
+from src.sensor_track_pro.business_logic.models.trip_model import TripKind
+from src.sensor_track_pro.data_access.models.base import Base
+
+
+class Trip(Base):
+    """Модель сегмента трека (поездка или стоянка) в базе данных."""
+
+    @declared_attr.directive
+    def __tablename__(self) -> str:
+        return "trips"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    sensor_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("sensors.id"), nullable=False)
+    kind: Mapped[TripKind] = mapped_column(Enum(TripKind, name="trip_kind", create_constraint=False), nullable=False)
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+    start_latitude = Column(Float, nullable=False)
+    start_longitude = Column(Float, nullable=False)
+    end_latitude = Column(Float, nullable=False)
+    end_longitude = Column(Float, nullable=False)
+    distance = Column(Float, nullable=False, default=0.0)
+    duration = Column(Float, nullable=False, default=0.0)
+    max_speed = Column(Float, nullable=True)
+    points_count = Column(Integer, nullable=False, default=0)
+    is_closed = Column(Boolean, nullable=False, default=True)
+
+    # Связи
+    sensor = relationship("Sensor")
+
+    __table_args__ = (
+        Index("idx_trip_sensor_start", "sensor_id", "start_time"),
+        Index("idx_trip_sensor_open", "sensor_id", "is_closed"),
+    )
@@ -0,0 +1,106 @@
+"""Хеширование и проверка паролей: bcrypt в пуле потоков и кэш проверенных учётных данных."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import secrets
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from uuid import UUID
+
+from passlib.context import CryptContext
+
+from src.sensor_track_pro.config import get_settings
+from src.sensor_track_pro.data_access.cache import MISSING
+from src.sensor_track_pro.data_access.cache import RepositoryCache
+
+
+_CREDENTIALS = "credentials"
+
+
+class PasswordHasher:
+    """
+    Солёный bcrypt с настраиваемой стоимостью.
+
+    Хеши вычисляются в отдельном ограниченном пуле потоков (bcrypt отпускает
+    GIL), так что волна входов не блокирует цикл событий и не занимает
+    общий пул исполнителя. Старые несолёные SHA-256 хеши ещё принимаются, но
+    помечаются устаревшими: после успешной проверки возвращается новый хеш.
+
+    Успешные проверки запоминаются на короткое время по ключу (пользователь,
+    сохранённый хеш): повторный вход с тем же паролем сверяется по HMAC от
+    пароля со случайным ключом процесса, без повторного bcrypt. Смена пароля
+    меняет хеш, а значит, и ключ кэша.
+    """
+
+    def __init__(
+        self,
+        rounds: int = 12,
+        workers: int = 4,
+        cache_ttl: float = 300.0,
+        cache_size: int = 10000,
+    ):
+        self._context = CryptContext(
+            schemes=["bcrypt", "hex_sha256"],
+            deprecated=["hex_sha256"],
+            bcrypt__rounds=rounds,
+        )
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-kdf")
+        self._verified = RepositoryCache(cache_size, cache_ttl)
+        self._cache_key = secrets.token_bytes(32)
+
+    async def hash(self, password: str) -> str:
+        """Новый солёный хеш пароля."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._context.hash, password)
+
+    async def verify(self, user_id: UUID, password: str, password_hash: str) -> tuple[bool, str | None]:
+        """
+        Проверяет пароль.
+
+        Args:
+            user_id: Идентификатор пользователя (часть ключа кэша)
+            password: Введённый пароль
+            password_hash: Сохранённый хеш
+
+        Returns:
+            (совпал ли пароль, новый хеш для сохранения или None)
+        """
+        key = (user_id, password_hash)
+        digest = self._digest(password)
+        cached = self._verified.get(_CREDENTIALS, key)
+        if cached is not MISSING and hmac.compare_digest(cached, digest):
+            return True, None
+        generation = self._verified.generation(_CREDENTIALS)
+        loop = asyncio.get_running_loop()
+        try:
+            verified, new_hash = await loop.run_in_executor(
+                self._executor, self._context.verify_and_update, password, password_hash
+            )
+        except ValueError:
+            # Хеш в неизвестном формате
+            return False, None
+        if verified and new_hash is None:
+            self._verified.put(_CREDENTIALS, key, digest, generation)
+        return verified, new_hash
+
+    def forget(self) -> None:
+        """Сбрасывает кэш проверенных учётных данных."""
+        self._verified.clear()
+
+    def _digest(self, password: str) -> bytes:
+        return hmac.new(self._cache_key, password.encode("utf-8"), hashlib.sha256).digest()
+
+
+@lru_cache
+def get_password_hasher() -> PasswordHasher:
+    """Хешер паролей процесса (общий пул потоков и кэш)."""
+    settings = get_settings()
+    return PasswordHasher(
+        rounds=settings.password_bcrypt_rounds,
+        workers=settings.password_hash_workers,
+        cache_ttl=settings.credential_cache_ttl,
+        cache_size=settings.credential_cache_size,
+    )
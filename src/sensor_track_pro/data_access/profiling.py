@@ -0,0 +1,235 @@
+"""
+Профилирование SQL на событиях движка SQLAlchemy.
+
+Каждый запрос учитывается по методу репозитория, из которого он выполнен
+(время и число строк, метрики Prometheus), запросы дольше порога пишутся в
+журнал с параметрами, а в пределах HTTP-запроса ведётся счётчик SQL-запросов:
+повторяющийся в цикле запрос (N+1) виден и в журнале, и в метриках.
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import logging
+import time
+
+from collections import Counter
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.sensor_track_pro.metrics import DB_SLOW_STATEMENTS
+from src.sensor_track_pro.metrics import DB_STATEMENT_DURATION
+from src.sensor_track_pro.metrics import DB_STATEMENT_ROWS
+from src.sensor_track_pro.metrics import POOL_COLLECTOR
+from src.sensor_track_pro.tracing import Span
+from src.sensor_track_pro.tracing import SpanKind
+from src.sensor_track_pro.tracing import Tracer
+from src.sensor_track_pro.tracing import current_tracer
+from src.sensor_track_pro.tracing import traced
+
+
+logger = logging.getLogger(__name__)
+
+OTHER_OPERATION = "other"
+
+# Метод репозитория, выполняющийся в текущей задаче. SQLAlchemy выполняет
+# запросы в greenlet с тем же контекстом, поэтому значение видно в событиях движка
+_repository_operation: ContextVar[str | None] = ContextVar("repository_operation", default=None)
+
+
+@contextmanager
+def repository_operation(name: str) -> Iterator[None]:
+    """
+    Относит SQL-запросы внутри блока к методу репозитория name.
+
+    Вложенные вызовы не переопределяют внешний: запросы метода, вызванного
+    из другого метода репозитория, учитываются на вызвавшем.
+    """
+    if _repository_operation.get() is not None:
+        yield
+        return
+    token = _repository_operation.set(name)
+    try:
+        yield
+    finally:
+        _repository_operation.reset(token)
+
+
+def current_repository_operation() -> str:
+    return _repository_operation.get() or OTHER_OPERATION
+
+
+def instrument_repository_methods[C: type](cls: C) -> C:
+    """
+    Оборачивает публичные корутины класса репозитория в repository_operation
+    и спан трассировки с именем «Класс.метод». Унаследованные методы получают
+    имя подкласса.
+    """
+    for name in dir(cls):
+        if name.startswith("_"):
+            continue
+        method = inspect.getattr_static(cls, name)
+        if not inspect.iscoroutinefunction(method):
+            continue
+        method = getattr(method, "_repository_method", method)
+        setattr(cls, name, _with_operation(method, f"{cls.__name__}.{name}"))
+    return cls
+
+
+def _with_operation(method: Callable[..., Any], operation: str) -> Callable[..., Any]:
+    traced_method = traced(method, operation, layer="repository")
+
+    @functools.wraps(method)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with repository_operation(operation):
+            return await traced_method(*args, **kwargs)
+    wrapper._repository_method = method  # type: ignore[attr-defined]
+    return wrapper
+
+
+@dataclass
+class StatementStats:
+    """SQL-запросы, выполненные в рамках одного HTTP-запроса."""
+
+    count: int = 0
+    duration: float = 0.0
+    rows: int = 0
+    operations: Counter[str] = field(default_factory=Counter)
+    statements: Counter[tuple[str, str]] = field(default_factory=Counter)
+
+    def add(self, operation: str, statement: str, duration: float, rows: int) -> None:
+        self.count += 1
+        self.duration += duration
+        self.rows += max(rows, 0)
+        self.operations[operation] += 1
+        self.statements[operation, statement] += 1
+
+    def most_repeated(self) -> tuple[str, str, int] | None:
+        """Чаще всего повторявшийся запрос: (метод, текст, число выполнений)."""
+        if not self.statements:
+            return None
+        (operation, statement), count = self.statements.most_common(1)[0]
+        return operation, statement, count
+
+
+_request_statements: ContextVar[StatementStats | None] = ContextVar("request_statements", default=None)
+
+
+@contextmanager
+def track_statements() -> Iterator[StatementStats]:
+    """Собирает SQL-запросы, выполненные внутри блока (в том числе в дочерних задачах)."""
+    stats = StatementStats()
+    token = _request_statements.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_statements.reset(token)
+
+
+def _statement_span_name(statement: str) -> str:
+    words = statement.split(None, 1)
+    return words[0].upper() if words else "SQL"
+
+
+def _truncate(value: str, limit: int) -> str:
+    return value if len(value) <= limit else value[:limit] + "…"
+
+
+class StatementProfiler:
+    """
+    Обработчики before/after_cursor_execute.
+
+    Время запроса — от передачи драйверу до возврата курсора; для asyncpg
+    строки уже получены, поэтому сюда входит и их передача. Число строк —
+    rowcount курсора (для SELECT драйвер берёт его из статуса команды).
+    В трассируемом запросе каждый SQL-запрос — дочерний спан (CLIENT) с
+    текстом запроса, но без параметров.
+    """
+
+    def __init__(self, slow_threshold_ms: float = 200.0, log_parameters: bool = False, max_log_length: int = 2000):
+        self.slow_threshold = slow_threshold_ms / 1000
+        self.log_parameters = log_parameters
+        self.max_log_length = max_log_length
+
+    def before_cursor_execute(
+        self, conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        tracer = current_tracer()
+        span = None
+        if tracer is not None:
+            span = tracer.child_span(
+                _statement_span_name(statement),
+                SpanKind.CLIENT,
+                {
+                    "db.system": "postgresql",
+                    "db.statement": _truncate(statement, self.max_log_length),
+                    "app.operation": current_repository_operation(),
+                },
+            )
+        conn.info.setdefault("query_spans", []).append((tracer, span) if span is not None else None)
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def after_cursor_execute(
+        self, conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        duration = time.perf_counter() - conn.info["query_started"].pop()
+        operation = current_repository_operation()
+        rows = getattr(cursor, "rowcount", -1)
+        self._end_span(conn, rows=rows)
+        DB_STATEMENT_DURATION.labels(operation).observe(duration)
+        if rows is not None and rows >= 0:
+            DB_STATEMENT_ROWS.labels(operation).observe(rows)
+        stats = _request_statements.get()
+        if stats is not None:
+            stats.add(operation, statement, duration, rows or 0)
+        if duration >= self.slow_threshold:
+            DB_SLOW_STATEMENTS.labels(operation).inc()
+            self._log_slow(operation, statement, parameters, duration, rows)
+
+    def handle_error(self, context: Any) -> None:
+        # Запрос завершился ошибкой: after_cursor_execute не будет вызван
+        connection = context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
+            self._end_span(connection, error=getattr(context, "original_exception", None))
+
+    @staticmethod
+    def _end_span(conn: Any, rows: int | None = None, error: BaseException | None = None) -> None:
+        spans: list[tuple[Tracer, Span] | None] = conn.info.get("query_spans", [])
+        traced = spans.pop() if spans else None
+        if traced is None:
+            return
+        tracer, span = traced
+        if rows is not None and rows >= 0:
+            span.set_attribute("db.rows", rows)
+        tracer.end(span, error)
+
+    def _log_slow(self, operation: str, statement: str, parameters: Any, duration: float, rows: int | None) -> None:
+        shown = _truncate(repr(parameters), self.max_log_length) if self.log_parameters else "<скрыты>"
+        logger.warning(
+            "Медленный SQL-запрос %.1f мс в %s (строк: %s): %s; параметры: %s",
+            duration * 1000,
+            operation,
+            rows,
+            _truncate(" ".join(statement.split()), self.max_log_length),
+            shown,
+        )
+
+
+def instrument_engine(engine: AsyncEngine, profiler: StatementProfiler | None = None) -> StatementProfiler:
+    """Подключает профилирование SQL-запросов и учёт пула соединений к движку."""
+    profiler = profiler or StatementProfiler()
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", profiler.before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", profiler.after_cursor_execute)
+    event.listen(sync_engine, "handle_error", profiler.handle_error)
+    POOL_COLLECTOR.track(lambda: sync_engine.pool)
+    return profiler
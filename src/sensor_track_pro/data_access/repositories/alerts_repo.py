@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.sensor_track_pro.business_logic.interfaces.repository.ialert_repo import IAlertRepository
@@ -27,11 +27,14 @@ class AlertRepository(BaseRepository[Alert], IAlertRepository):  # type: ignore[
         created_alert = await super().create(db_alert)
         return await self.get_by_id(created_alert.id)
 
+    async def get_all(self, skip: int = 0, limit: int = 100, **filters: Any) -> list[AlertModel]:  # type: ignore[override]
+        """Получает оповещения с пагинацией и фильтрацией."""
+        return await self._get_all_projected(AlertModel, skip, limit, filters)
+
     async def get_by_event_id(self, event_id: UUID) -> list[AlertModel]:
         """Получает оповещения по ID события."""
-        query = select(Alert).filter(Alert.event_id == event_id)
-        result = await self._session.execute(query)
-        return [AlertModel.model_validate(alert) for alert in result.scalars().all()]
+        query = self._select_projected(AlertModel).filter(Alert.event_id == event_id)
+        return await self._fetch_projected(AlertModel, query)
 
     async def get_by_severity(
         self, 
@@ -40,9 +43,8 @@ class AlertRepository(BaseRepository[Alert], IAlertRepository):  # type: ignore[
         limit: int = 100
     ) -> list[AlertModel]:
         """Получает оповещения по уровню важности."""
-        query = select(Alert).filter(Alert.severity == severity).offset(skip).limit(limit)
-        result = await self._session.execute(query)
-        return [AlertModel.model_validate(alert) for alert in result.scalars().all()]
+        query = self._select_projected(AlertModel).filter(Alert.severity == severity).offset(skip).limit(limit)
+        return await self._fetch_projected(AlertModel, query)
 
     async def get_by_type(
         self,
@@ -51,9 +53,8 @@ class AlertRepository(BaseRepository[Alert], IAlertRepository):  # type: ignore[
         limit: int = 100
     ) -> list[AlertModel]:
         """Получает оповещения по типу."""
-        query = select(Alert).filter(Alert.alert_type == alert_type).offset(skip).limit(limit)
-        result = await self._session.execute(query)
-        return [AlertModel.model_validate(alert) for alert in result.scalars().all()]
+        query = self._select_projected(AlertModel).filter(Alert.alert_type == alert_type).offset(skip).limit(limit)
+        return await self._fetch_projected(AlertModel, query)
 
     async def get_by_time_range(
         self,
@@ -64,10 +65,9 @@ class AlertRepository(BaseRepository[Alert], IAlertRepository):  # type: ignore[
     ) -> list[AlertModel]:
         """Получает оповещения за временной период."""
         query = (
-            select(Alert)
+            self._select_projected(AlertModel)
             .filter(Alert.timestamp.between(start_time, end_time))
             .offset(skip)
             .limit(limit)
         )
-        result = await self._session.execute(query)
-        return [AlertModel.model_validate(alert) for alert in result.scalars().all()]
+        return await self._fetch_projected(AlertModel, query)
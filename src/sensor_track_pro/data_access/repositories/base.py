@@ -1,32 +1,69 @@
 # ruff: noqa: UP046
 from __future__ import annotations
 
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Hashable
 from datetime import datetime
+from functools import cache
 from typing import Any
 from typing import Generator
 from typing import Generic
 from typing import TypeVar
 from uuid import UUID
 
+from pydantic import BaseModel
+from sqlalchemy import Select
 from sqlalchemy import delete
 from sqlalchemy import exists
+from sqlalchemy import func
 from sqlalchemy import insert
 from sqlalchemy import select
 from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import Label
 
+from src.sensor_track_pro.business_logic.models.common_types import EntityVersion
+from src.sensor_track_pro.data_access.cache import INVALIDATION_CHANNEL
+from src.sensor_track_pro.data_access.cache import MISSING
+from src.sensor_track_pro.data_access.cache import RepositoryCache
+from src.sensor_track_pro.data_access.mapping import to_models
 from src.sensor_track_pro.data_access.models.base import Base
+from src.sensor_track_pro.data_access.profiling import instrument_repository_methods
 
 
 ModelType = TypeVar("ModelType", bound=Base)
 
 
+@cache
+def _projected_columns(orm_model: type[Base], model_type: type[BaseModel]) -> tuple[Label[Any], ...]:
+    """Колонки ORM-модели, соответствующие полям бизнес-модели, с метками по имени поля."""
+    column_keys = orm_model.__mapper__.columns.keys()
+    columns = []
+    for name, field in model_type.model_fields.items():
+        for attr in (name, field.alias):
+            if attr is not None and attr in column_keys:
+                columns.append(getattr(orm_model, attr).label(name))
+                break
+    return tuple(columns)
+
+
 class BaseRepository(Generic[ModelType]):
     """Базовый класс для всех репозиториев."""
 
-    def __init__(self, session: AsyncSession, model: type[ModelType]):
+    # Пространство имён кэша чтения и пространства, которые сбрасывает запись
+    _cache_namespace: str | None = None
+    _cache_invalidates: tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # SQL-запросы учитываются по методу репозитория (профилирование и метрики)
+        instrument_repository_methods(cls)
+
+    def __init__(self, session: AsyncSession, model: type[ModelType], cache: RepositoryCache | None = None):
         self._session = session
         self._model = model
+        self._cache = cache
 
     async def create(self, instance: ModelType) -> ModelType:
         """
@@ -52,7 +89,9 @@ class BaseRepository(Generic[ModelType]):
             stmt = insert(self._model).values(**data).returning(*self._model.__table__.columns)
             result = await self._session.execute(stmt)
             row = result.fetchone()
+            await self._notify_write()
             await self._session.commit()
+            self._invalidate_cache()
             if row is None:
                 raise Exception("Insert failed")
             pk = next(iter(self._model.__table__.primary_key)).name  # изменено
@@ -98,16 +137,69 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             Список записей
         """
-        query = select(self._model)
-        
+        query = self._apply_filters(select(self._model), filters)
+        query = query.offset(skip).limit(limit)
+        result = await self._session.execute(query)
+        return list(result.scalars().all())
+
+    def _apply_filters(self, query: Select[Any], filters: dict[str, Any] | None) -> Select[Any]:
+        """Добавляет к запросу условия равенства по известным полям модели."""
         if filters:
             for field, value in filters.items():
                 if hasattr(self._model, field):
                     query = query.where(getattr(self._model, field) == value)
-                
-        query = query.offset(skip).limit(limit)
+        return query
+
+    def _select_projected(self, model_type: type[BaseModel]) -> Select[Any]:
+        """
+        Запрос только тех колонок, которые нужны бизнес-модели.
+
+        Строки приходят Row-кортежами: ORM-сущности не создаются и не попадают
+        в identity map сессии, а лишние колонки (например, геометрия) не читаются.
+
+        Args:
+            model_type: Класс бизнес-модели, под которую выбираются колонки
+
+        Returns:
+            Запрос select по колонкам модели
+        """
+        return select(*_projected_columns(self._model, model_type))
+
+    async def _fetch_projected[T: BaseModel](self, model_type: type[T], query: Select[Any]) -> list[T]:
+        """
+        Выполняет запрос из _select_projected и собирает модели из строк.
+
+        Args:
+            model_type: Класс бизнес-модели
+            query: Запрос, построенный через _select_projected
+
+        Returns:
+            Список экземпляров бизнес-модели
+        """
         result = await self._session.execute(query)
-        return list(result.scalars().all())
+        return to_models(model_type, result.all())
+
+    async def _get_all_projected[T: BaseModel](
+        self,
+        model_type: type[T],
+        skip: int = 0,
+        limit: int = 100,
+        filters: dict[str, Any] | None = None
+    ) -> list[T]:
+        """
+        То же, что get_all, но сразу в бизнес-модели через выборку колонок.
+
+        Args:
+            model_type: Класс бизнес-модели
+            skip: Количество пропускаемых записей
+            limit: Максимальное количество возвращаемых записей
+            filters: Словарь параметров фильтрации
+
+        Returns:
+            Список экземпляров бизнес-модели
+        """
+        query = self._apply_filters(self._select_projected(model_type), filters)
+        return await self._fetch_projected(model_type, query.offset(skip).limit(limit))
 
     async def update(self, instance_id: UUID, values: dict[str, Any]) -> ModelType | None:
         """
@@ -138,7 +230,9 @@ class BaseRepository(Generic[ModelType]):
             )
             result = await self._session.execute(stmt)
             await self._session.flush()
+            await self._notify_write()
             await self._session.commit()  # добавлено commit
+            self._invalidate_cache()
             return result.scalar_one_or_none()
         except Exception as e:
             raise Exception(
@@ -159,7 +253,9 @@ class BaseRepository(Generic[ModelType]):
             stmt = delete(self._model).where(self._model.id == instance_id)
             await self._session.execute(stmt)
             await self._session.flush()
+            await self._notify_write()
             await self._session.commit()
+            self._invalidate_cache()
             return True
         except Exception as e:
             raise Exception(
@@ -180,6 +276,92 @@ class BaseRepository(Generic[ModelType]):
         result = await self._session.execute(query)
         return bool(result.scalar())  # изменено
 
+    async def _get_by_id_projected[T: BaseModel](self, model_type: type[T], instance_id: UUID) -> T | None:
+        """Получает запись по идентификатору сразу в бизнес-модели через выборку колонок."""
+        query = self._select_projected(model_type).where(self._model.id == instance_id)
+        models = await self._fetch_projected(model_type, query)
+        return models[0] if models else None
+
+    async def _cached[T](self, key: Hashable, load: Callable[[], Awaitable[T]], ttl: float | None = None) -> T:
+        """
+        Чтение через кэш репозитория.
+
+        При промахе значение загружается из БД и кладётся в кэш, если за время
+        чтения пространство имён не было инвалидировано. None не кэшируется.
+
+        Args:
+            key: Ключ внутри пространства имён репозитория
+            load: Загрузка значения из БД
+            ttl: Время жизни записи; None — значение по умолчанию кэша
+
+        Returns:
+            Значение из кэша или из БД
+        """
+        namespace = self._cache_namespace
+        if self._cache is None or namespace is None:
+            return await load()
+        value = self._cache.get(namespace, key)
+        if value is not MISSING:
+            return value
+        generation = self._cache.generation(namespace)
+        value = await load()
+        if value is not None:
+            self._cache.put(namespace, key, value, generation, ttl)
+        return value
+
+    async def _advisory_lock(self, instance_id: UUID) -> None:
+        """Транзакционная advisory-блокировка записи; снимается при commit/rollback."""
+        # Ключ блокировки — bigint, берём старшие 8 байт UUID
+        key = int.from_bytes(instance_id.bytes[:8], "big", signed=True)
+        await self._session.execute(select(func.pg_advisory_xact_lock(key)))
+
+    def _written_namespaces(self) -> tuple[str, ...]:
+        if self._cache_namespace is None:
+            return self._cache_invalidates
+        return (self._cache_namespace, *self._cache_invalidates)
+
+    async def _notify_write(self) -> None:
+        """
+        Сообщает другим экземплярам о записи через NOTIFY.
+
+        Выполняется в транзакции записи: уведомление доставляется только при
+        её фиксации и пропадает при откате.
+        """
+        if self._cache is None:
+            return
+        for namespace in self._written_namespaces():
+            payload = self._cache.notification(namespace)
+            await self._session.execute(select(func.pg_notify(INVALIDATION_CHANNEL, payload)))
+
+    def _invalidate_cache(self) -> None:
+        """Сбрасывает локальный кэш после зафиксированной записи."""
+        if self._cache is None:
+            return
+        for namespace in self._written_namespaces():
+            self._cache.invalidate(namespace)
+
+    async def get_version(self, instance_id: UUID | None = None) -> EntityVersion | None:
+        """
+        Возвращает версию таблицы или одной записи для условных запросов.
+
+        Версия — число строк и максимальный updated_at: вставка и обновление
+        сдвигают время, удаление уменьшает число строк. Сами записи не читаются.
+
+        Args:
+            instance_id: UUID записи; None — версия всей таблицы
+
+        Returns:
+            Версия или None, если запись с instance_id не найдена
+        """
+        query = select(func.count(), func.max(self._model.updated_at))
+        if instance_id is not None:
+            query = query.where(self._model.id == instance_id)
+        result = await self._session.execute(query)
+        count, updated_at = result.one()
+        if instance_id is not None and not count:
+            return None
+        return EntityVersion(count, updated_at)
+
     def __await__(self) -> Generator[Any, None, BaseRepository[ModelType]]:  # изменено
         # Позволяет ожидать экземпляр репозитория, возвращая self
         yield from ()
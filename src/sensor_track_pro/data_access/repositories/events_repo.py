@@ -4,14 +4,20 @@ from datetime import datetime
 from typing import Any
 from uuid import UUID
 
+from sqlalchemy import Integer
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.sensor_track_pro.business_logic.interfaces.repository.ievent_repo import IEventRepository
 from src.sensor_track_pro.business_logic.models.event_model import EventBase
 from src.sensor_track_pro.business_logic.models.event_model import EventModel
+from src.sensor_track_pro.business_logic.models.event_model import EventType
+from src.sensor_track_pro.business_logic.models.heatmap_model import HeatmapGrid
+from src.sensor_track_pro.business_logic.models.trip_model import TrackPoint
+from src.sensor_track_pro.data_access.mapping import to_model
 from src.sensor_track_pro.data_access.models.events import Event
 from src.sensor_track_pro.data_access.repositories.base import BaseRepository
+from src.sensor_track_pro.metrics import EVENTS_INGESTED
 
 
 class EventRepository(BaseRepository[Event], IEventRepository):  # type: ignore[misc]
@@ -24,13 +30,13 @@ class EventRepository(BaseRepository[Event], IEventRepository):  # type: ignore[
         """Создает новое событие."""
         db_event = Event(**event_data.model_dump())
         created_event = await super().create(db_event)
+        EVENTS_INGESTED.inc()
         return await self.get_by_id(created_event.id)
 
     async def get_by_sensor_id(self, sensor_id: UUID, skip: int = 0, limit: int = 100) -> list[EventModel]:
         """Получает события по ID сенсора."""
-        query = select(Event).filter(Event.sensor_id == sensor_id).offset(skip).limit(limit)
-        result = await self._session.execute(query)
-        return [EventModel.model_validate(event) for event in result.scalars().all()]
+        query = self._select_projected(EventModel).filter(Event.sensor_id == sensor_id).offset(skip).limit(limit)
+        return await self._fetch_projected(EventModel, query)
 
     async def get_by_time_range(
         self,
@@ -41,23 +47,73 @@ class EventRepository(BaseRepository[Event], IEventRepository):  # type: ignore[
     ) -> list[EventModel]:
         """Получает события за временной период."""
         query = (
-            select(Event)
+            self._select_projected(EventModel)
             .filter(Event.timestamp >= start_time, Event.timestamp <= end_time)
             .offset(skip)
             .limit(limit)
         )
+        return await self._fetch_projected(EventModel, query)
+
+    async def get_track(
+        self,
+        sensor_id: UUID,
+        since: datetime | None = None,
+        skip: int = 0,
+        limit: int = 5000
+    ) -> list[TrackPoint]:
+        """Получает трек сенсора: только нужные колонки, без ORM-сущностей."""
+        query = select(Event.timestamp, Event.latitude, Event.longitude, Event.speed).filter(
+            Event.sensor_id == sensor_id
+        )
+        if since is not None:
+            query = query.filter(Event.timestamp >= since)
+        query = query.order_by(Event.timestamp, Event.id).offset(skip).limit(limit)
         result = await self._session.execute(query)
-        return [EventModel.model_validate(event) for event in result.scalars().all()]
+        return [TrackPoint(*row) for row in result.all()]
+
+    async def get_density(
+        self,
+        grid: HeatmapGrid,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        event_type: EventType | None = None
+    ) -> list[tuple[int, int, int]]:
+        """Биннинг событий по сетке на стороне БД: в Python приходят только непустые ячейки."""
+        # Точки на северной/восточной границе попадают в последнюю строку/столбец
+        row = func.least(
+            func.floor((Event.latitude - grid.min_latitude) / grid.cell_height), grid.height - 1
+        ).cast(Integer).label("cell_row")
+        col = func.least(
+            func.floor((Event.longitude - grid.min_longitude) / grid.cell_width), grid.width - 1
+        ).cast(Integer).label("cell_col")
+        query = select(row, col).filter(
+            Event.latitude.between(grid.min_latitude, grid.max_latitude),
+            Event.longitude.between(grid.min_longitude, grid.max_longitude),
+        )
+        if start_time is not None:
+            query = query.filter(Event.timestamp >= start_time)
+        if end_time is not None:
+            query = query.filter(Event.timestamp <= end_time)
+        if event_type is not None:
+            query = query.filter(Event.event_type == event_type)
+        cells = query.subquery("cells")
+        query = select(cells.c.cell_row, cells.c.cell_col, func.count()).group_by(cells.c.cell_row, cells.c.cell_col)
+        result = await self._session.execute(query)
+        return [tuple(r) for r in result.all()]
+
+    async def get_all(self, skip: int = 0, limit: int = 100, **filters: Any) -> list[EventModel]:  # type: ignore[override]
+        """Получает события с пагинацией и фильтрацией."""
+        return await self._get_all_projected(EventModel, skip, limit, filters)
 
     async def get_by_id(self, event_id: UUID) -> EventModel | None:  # type: ignore[override]
         """Получает событие по ID."""
         db_event = await super().get_by_id(event_id)
-        return EventModel.model_validate(db_event) if db_event else None
+        return to_model(EventModel, db_event) if db_event else None
 
     async def update(self, event_id: UUID, event_data: dict[str, Any]) -> EventModel | None:  # type: ignore[override]
         """Обновляет событие по ID."""
         db_event = await super().update(event_id, event_data)
-        return EventModel.model_validate(db_event) if db_event else None
+        return to_model(EventModel, db_event) if db_event else None
 
     async def delete(self, event_id: UUID) -> bool:
         """Удаляет событие по ID."""
@@ -77,9 +133,8 @@ class EventRepository(BaseRepository[Event], IEventRepository):  # type: ignore[
         # Примерно: 1 градус ~ 111 км, для небольших радиусов можно использовать приближение
         lat_delta = radius / 111.0
         lon_delta = radius / (111.0 * abs(func.cos(func.radians(latitude))))
-        query = select(Event).filter(
+        query = self._select_projected(EventModel).filter(
             Event.latitude.between(latitude - lat_delta, latitude + lat_delta),
             Event.longitude.between(longitude - lon_delta, longitude + lon_delta)
         ).offset(skip).limit(limit)
-        result = await self._session.execute(query)
-        return [EventModel.model_validate(event) for event in result.scalars().all()]
+        return await self._fetch_projected(EventModel, query)
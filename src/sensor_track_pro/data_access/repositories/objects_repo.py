@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from typing import Any
+from uuid import UUID
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -9,6 +10,11 @@ from src.sensor_track_pro.business_logic.interfaces.repository.iobject_repo impo
 from src.sensor_track_pro.business_logic.models.object_model import ObjectModel
 from src.sensor_track_pro.business_logic.models.object_model import ObjectBase
 from src.sensor_track_pro.business_logic.models.object_model import ObjectType
+from src.sensor_track_pro.config import get_settings
+from src.sensor_track_pro.data_access.cache import RepositoryCache
+from src.sensor_track_pro.data_access.cache import get_repository_cache
+from src.sensor_track_pro.data_access.mapping import to_model
+from src.sensor_track_pro.data_access.mapping import to_models
 from src.sensor_track_pro.data_access.models.objects import Object
 from src.sensor_track_pro.data_access.repositories.base import BaseRepository
 
@@ -16,8 +22,10 @@ from src.sensor_track_pro.data_access.repositories.base import BaseRepository
 class ObjectRepository(BaseRepository[Object], IObjectRepository):  # type: ignore[misc]
     """Репозиторий для работы с объектами."""
 
-    def __init__(self, session: AsyncSession):
-        super().__init__(session, Object)
+    _cache_namespace = "objects"
+
+    def __init__(self, session: AsyncSession, cache: RepositoryCache | None = None):
+        super().__init__(session, Object, cache if cache is not None else get_repository_cache())
 
     async def create(self, object_data: ObjectBase) -> ObjectModel:  # type: ignore[override]
         """Создает новый объект."""
@@ -31,7 +39,11 @@ class ObjectRepository(BaseRepository[Object], IObjectRepository):  # type: igno
                 db_object_dict["object_type"] = str(obj_type).lower()
         db_object = Object(**db_object_dict)
         created_instance = await super().create(db_object)
-        return ObjectModel.model_validate(created_instance)
+        return to_model(ObjectModel, created_instance)
+
+    async def get_by_id(self, object_id: UUID) -> ObjectModel | None:  # type: ignore[override]
+        """Получает объект по идентификатору (через кэш)."""
+        return await self._cached(("id", object_id), lambda: self._get_by_id_projected(ObjectModel, object_id))
 
     async def get_by_type(
         self,
@@ -47,7 +59,7 @@ class ObjectRepository(BaseRepository[Object], IObjectRepository):  # type: igno
             .limit(limit)
         )
         result = await self._session.execute(query)
-        return [ObjectModel.model_validate(obj) for obj in result.scalars().all()]
+        return to_models(ObjectModel, result.scalars().all())
 
     async def get_count(self, **filters: Any) -> int:
         """Получает количество объектов с фильтрами."""
@@ -62,7 +74,15 @@ class ObjectRepository(BaseRepository[Object], IObjectRepository):  # type: igno
         """
         Возвращает список объектов с координатами (по первому активному сенсору),
         а также location и updated_at сенсора.
+
+        Результат кэшируется на короткое время (координаты сенсоров меняются
+        часто) и сбрасывается при записи объектов и сенсоров.
         """
+        return await self._cached(
+            "map", self._load_all_for_map, ttl=get_settings().repository_cache_positions_ttl
+        )
+
+    async def _load_all_for_map(self) -> list[dict]:
         from src.sensor_track_pro.data_access.models.sensors import Sensor
         query = select(Object)
         result = await self._session.execute(query)
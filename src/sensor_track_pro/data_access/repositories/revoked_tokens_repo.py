@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from datetime import UTC
+from datetime import datetime
+
+from sqlalchemy import delete
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.sensor_track_pro.business_logic.interfaces.repository.irevoked_token_repo import IRevokedTokenRepository
+from src.sensor_track_pro.data_access.cache import INVALIDATION_CHANNEL
+from src.sensor_track_pro.data_access.cache import RepositoryCache
+from src.sensor_track_pro.data_access.cache import get_repository_cache
+from src.sensor_track_pro.data_access.models.revoked_tokens import RevokedToken
+from src.sensor_track_pro.data_access.repositories.base import BaseRepository
+
+
+# Пространство имён уведомлений об отзыве токенов
+REVOKED_TOKENS = "revoked_tokens"
+
+
+class RevokedTokenRepository(BaseRepository[RevokedToken], IRevokedTokenRepository):
+    """
+    Репозиторий отозванных токенов.
+
+    Об отзыве сообщается по каналу кэша репозиториев: пространство имён
+    REVOKED_TOKENS, текст — «jti срок_истечения» (Unix time).
+    """
+
+    def __init__(self, session: AsyncSession, cache: RepositoryCache | None = None):
+        super().__init__(session, RevokedToken, cache if cache is not None else get_repository_cache())
+
+    async def get_active(self) -> list[tuple[str, datetime]]:
+        query = select(RevokedToken.jti, RevokedToken.expires_at).where(RevokedToken.expires_at >= datetime.utcnow())
+        result = await self._session.execute(query)
+        return [(jti, expires_at) for jti, expires_at in result.all()]
+
+    async def revoke(self, jti: str, expires_at: datetime) -> bool:
+        """Вставка с ON CONFLICT: из параллельных отзывов одного токена успешен только один."""
+        try:
+            await self._session.execute(delete(RevokedToken).where(RevokedToken.expires_at < datetime.utcnow()))
+            stmt = (
+                pg_insert(RevokedToken)
+                .values(jti=jti, expires_at=expires_at)
+                .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+                .returning(RevokedToken.id)
+            )
+            result = await self._session.execute(stmt)
+            revoked = result.scalar_one_or_none() is not None
+            if revoked and self._cache is not None:
+                expires = int(expires_at.replace(tzinfo=UTC).timestamp())
+                payload = self._cache.notification(REVOKED_TOKENS, f"{jti} {expires}")
+                await self._session.execute(select(func.pg_notify(INVALIDATION_CHANNEL, payload)))
+            await self._session.commit()
+            return revoked
+        except Exception as e:
+            await self._session.rollback()
+            raise Exception(f"Ошибка отзыва токена {jti}: {e!s}") from e
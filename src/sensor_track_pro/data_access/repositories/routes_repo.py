@@ -7,12 +7,17 @@ from uuid import UUID
 from sqlalchemy import or_  # добавлен импорт true, false и or_
 from sqlalchemy import select  # добавлен импорт true, false и or_
 from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.sensor_track_pro.business_logic.interfaces.repository.irout_repo import IRouteRepository
 from src.sensor_track_pro.business_logic.models.route_model import RouteBase
 from src.sensor_track_pro.business_logic.models.route_model import RouteModel
 from src.sensor_track_pro.business_logic.models.route_model import RouteStatus
+from src.sensor_track_pro.business_logic.models.route_model import RouteTrackingState
+from src.sensor_track_pro.data_access.mapping import to_model
+from src.sensor_track_pro.data_access.mapping import to_models
+from src.sensor_track_pro.data_access.models.route_tracking import RouteTracking
 from src.sensor_track_pro.data_access.models.routes import Route
 from src.sensor_track_pro.data_access.repositories.base import BaseRepository
 
@@ -65,20 +70,7 @@ class RouteRepository(BaseRepository[Route], IRouteRepository):
         """Получает маршруты объекта."""
         query = select(Route).filter(Route.object_id == object_id).offset(skip).limit(limit)
         result = await self._session.execute(query)
-        routes = result.scalars().all()
-        route_models = []
-        for route in routes:
-            route_dict = route.__dict__.copy()
-            if hasattr(route, "metadata"):
-                if not isinstance(route.metadata, dict):
-                    try:
-                        route_dict["metadata"] = dict(route.metadata)
-                    except Exception:
-                        route_dict["metadata"] = {}
-                else:
-                    route_dict["metadata"] = route.metadata
-            route_models.append(RouteModel.model_validate(route_dict))
-        return route_models
+        return to_models(RouteModel, result.scalars().all())
 
     async def get_by_status(
         self,
@@ -89,27 +81,13 @@ class RouteRepository(BaseRepository[Route], IRouteRepository):
         """Получает маршруты по статусу."""
         query = select(Route).filter(Route.status == status).offset(skip).limit(limit)
         result = await self._session.execute(query)
-        routes = result.scalars().all()
-        route_models = []
-        for route in routes:
-            route_dict = route.__dict__.copy()
-            if hasattr(route, "metadata"):
-                # Преобразуем metadata к dict, если это не dict
-                if not isinstance(route.metadata, dict):
-                    try:
-                        route_dict["metadata"] = dict(route.metadata)
-                    except Exception:
-                        route_dict["metadata"] = {}
-                else:
-                    route_dict["metadata"] = route.metadata
-            route_models.append(RouteModel.model_validate(route_dict))
-        return route_models
+        return to_models(RouteModel, result.scalars().all())
 
     async def get_active_routes(self, skip: int = 0, limit: int = 100) -> list[RouteModel]:
         """Получает активные маршруты."""
         query = select(Route).filter(Route.status == RouteStatus.IN_PROGRESS).offset(skip).limit(limit)
         result = await self._session.execute(query)
-        return [RouteModel.model_validate(r) for r in result.scalars().all()]
+        return to_models(RouteModel, result.scalars().all())
 
     async def get_by_time_range(
         self,
@@ -132,34 +110,48 @@ class RouteRepository(BaseRepository[Route], IRouteRepository):
             .limit(limit)
         )
         result = await self._session.execute(query)
-        return [RouteModel.model_validate(route) for route in result.scalars().all()]
+        return to_models(RouteModel, result.scalars().all())
 
     async def get_by_id(self, route_id: UUID) -> RouteModel | None:  # type: ignore[override]
         db_route = await super().get_by_id(route_id)
-        # Исправление: если есть поле 'metadata', заменить его на route_metadata
-        if db_route:
-            # Принудительно подставляем route_metadata в alias metadata для Pydantic
-            data = dict(db_route.__dict__)
-            if "route_metadata" in data:
-                data["metadata"] = data["route_metadata"]
-            return RouteModel.model_validate(data)
-        return None
+        # route_metadata берётся по имени поля, а не по алиасу metadata (он занят MetaData у ORM)
+        return to_model(RouteModel, db_route) if db_route else None
 
     async def get_all(self, skip: int = 0, limit: int = 100, **filters: dict[str, Any]) -> list[RouteModel]:  # type: ignore[override]
         db_list = await super().get_all(skip, limit, **filters)
-        result = []
-        for r in db_list:
-            data = dict(r.__dict__)
-            if "route_metadata" in data:
-                data["metadata"] = data["route_metadata"]
-            result.append(RouteModel.model_validate(data))
-        return result
+        return to_models(RouteModel, db_list)
 
     async def update(self, route_id: UUID, route_data: dict[str, Any]) -> RouteModel | None:  # type: ignore[override]
         db_route = await super().update(route_id, route_data)
-        if db_route:
-            data = dict(db_route.__dict__)
-            if "route_metadata" in data:
-                data["metadata"] = data["route_metadata"]
-            return RouteModel.model_validate(data)
+        return to_model(RouteModel, db_route) if db_route else None
+
+    async def lock_route(self, route_id: UUID) -> None:
+        await self._advisory_lock(route_id)
+
+    async def get_tracking_state(self, route_id: UUID) -> RouteTrackingState | None:
+        """Получает состояние отслеживания маршрута."""
+        query = select(RouteTracking).filter(RouteTracking.route_id == route_id)
+        result = await self._session.execute(query)
+        tracking = result.scalar_one_or_none()
+        return to_model(RouteTrackingState, tracking) if tracking else None
+
+    async def save_tracking_state(
+        self,
+        route_id: UUID,
+        state: RouteTrackingState,
+        status: RouteStatus | None = None
+    ) -> RouteModel | None:
+        """Сохраняет состояние отслеживания (upsert по route_id) и новый статус одним коммитом."""
+        values = {**state.model_dump(), "updated_at": datetime.utcnow()}
+        stmt = pg_insert(RouteTracking).values(route_id=route_id, **values)
+        stmt = stmt.on_conflict_do_update(index_elements=[RouteTracking.route_id], set_=values)
+        try:
+            await self._session.execute(stmt)
+        except Exception as e:
+            await self._session.rollback()
+            raise Exception(f"Ошибка сохранения состояния маршрута {route_id}: {e!s}") from e
+        if status is not None:
+            # update фиксирует транзакцию вместе с состоянием
+            return await self.update(route_id, {"status": status})
+        await self._session.commit()
         return None
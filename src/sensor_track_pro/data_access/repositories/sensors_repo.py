@@ -3,7 +3,6 @@ from __future__ import annotations
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.sensor_track_pro.business_logic.interfaces.repository.isensor_repo import ISensorRepository
@@ -11,6 +10,9 @@ from src.sensor_track_pro.business_logic.models.sensor_model import SensorBase
 from src.sensor_track_pro.business_logic.models.sensor_model import SensorModel
 from src.sensor_track_pro.business_logic.models.sensor_model import SensorStatus
 from src.sensor_track_pro.business_logic.models.sensor_model import SensorType
+from src.sensor_track_pro.data_access.cache import RepositoryCache
+from src.sensor_track_pro.data_access.cache import get_repository_cache
+from src.sensor_track_pro.data_access.mapping import to_model
 from src.sensor_track_pro.data_access.models.sensors import Sensor
 from src.sensor_track_pro.data_access.repositories.base import BaseRepository
 
@@ -18,15 +20,19 @@ from src.sensor_track_pro.data_access.repositories.base import BaseRepository
 class SensorRepository(BaseRepository[Sensor], ISensorRepository):
     """Репозиторий для работы с сенсорами."""
 
-    def __init__(self, session: AsyncSession):
-        super().__init__(session, Sensor)
+    _cache_namespace = "sensors"
+    # Карта объектов строится по координатам сенсоров
+    _cache_invalidates = ("objects",)
+
+    def __init__(self, session: AsyncSession, cache: RepositoryCache | None = None):
+        super().__init__(session, Sensor, cache if cache is not None else get_repository_cache())
 
     async def create(self, sensor_data: SensorBase) -> SensorModel:  # type: ignore[override]
         """Создает новый сенсор."""
         data = sensor_data.model_dump()
         db_sensor = Sensor(**data)
         created_sensor = await super().create(db_sensor)  # сохраняем созданный объект
-        return SensorModel.model_validate(created_sensor)
+        return to_model(SensorModel, created_sensor)
 
     async def get_by_object_id(
         self,
@@ -36,13 +42,12 @@ class SensorRepository(BaseRepository[Sensor], ISensorRepository):
     ) -> list[SensorModel]:
         """Получает сенсоры объекта."""
         query = (
-            select(Sensor)
+            self._select_projected(SensorModel)
             .filter(Sensor.object_id == object_id)
             .offset(skip)
             .limit(limit)
         )
-        result = await self._session.execute(query)
-        return [SensorModel.model_validate(s) for s in result.scalars().all()]
+        return await self._fetch_projected(SensorModel, query)
 
     async def get_by_type(
         self,
@@ -52,13 +57,12 @@ class SensorRepository(BaseRepository[Sensor], ISensorRepository):
     ) -> list[SensorModel]:
         """Получает сенсоры определенного типа."""
         query = (
-            select(Sensor)
+            self._select_projected(SensorModel)
             .filter(Sensor.sensor_type == sensor_type)
             .offset(skip)
             .limit(limit)
         )
-        result = await self._session.execute(query)
-        return [SensorModel.model_validate(s) for s in result.scalars().all()]
+        return await self._fetch_projected(SensorModel, query)
 
     async def get_by_status(
         self,
@@ -68,21 +72,19 @@ class SensorRepository(BaseRepository[Sensor], ISensorRepository):
     ) -> list[SensorModel]:
         """Получает сенсоры в определенном статусе."""
         query = (
-            select(Sensor)
+            self._select_projected(SensorModel)
             .filter(Sensor.sensor_status == status)
             .offset(skip)
             .limit(limit)
         )
-        result = await self._session.execute(query)
-        return [SensorModel.model_validate(s) for s in result.scalars().all()]
+        return await self._fetch_projected(SensorModel, query)
 
     async def get_by_id(self, sensor_id: UUID) -> SensorModel | None:  # type: ignore[override]
-        db_sensor = await super().get_by_id(sensor_id)
-        return SensorModel.model_validate(db_sensor) if db_sensor else None
+        """Получает сенсор по идентификатору (через кэш)."""
+        return await self._cached(("id", sensor_id), lambda: self._get_by_id_projected(SensorModel, sensor_id))
 
     async def get_all(self, skip: int = 0, limit: int = 100, **filters: dict[str, Any]) -> list[SensorModel]:  # type: ignore[override]
-        db_list = await super().get_all(skip, limit, **filters)
-        return [SensorModel.model_validate(s) for s in db_list]
+        return await self._get_all_projected(SensorModel, skip, limit, filters)
 
     async def update(self, sensor_id: UUID, sensor_data: dict[str, Any]) -> SensorModel | None:  # type: ignore[override]
         # Переименовываем алиасы в реальные поля модели
@@ -91,4 +93,4 @@ class SensorRepository(BaseRepository[Sensor], ISensorRepository):
         if "status" in sensor_data:
             sensor_data["sensor_status"] = sensor_data.pop("status")
         db_sensor = await super().update(sensor_id, sensor_data)
-        return SensorModel.model_validate(db_sensor) if db_sensor else None
+        return to_model(SensorModel, db_sensor) if db_sensor else None
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from sqlalchemy import TextClause
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.sensor_track_pro.business_logic.analytics.geo import tile_bounds
+from src.sensor_track_pro.business_logic.interfaces.repository.itile_repo import ITileRepository
+from src.sensor_track_pro.data_access.profiling import instrument_repository_methods
+
+
+MVT_EXTENT = 4096
+MVT_BUFFER = 64
+
+# Геометрия обрезается и квантуется под тайл в БД; фильтр по bbox в SRID 4326
+# идёт по GiST-индексу boundary_polygon
+_ZONES_TILE_SQL = text(f"""
+    WITH mvtgeom AS (
+        SELECT
+            ST_AsMVTGeom(
+                ST_Transform(z.boundary_polygon, 3857),
+                ST_TileEnvelope(:z, :x, :y),
+                {MVT_EXTENT}, {MVT_BUFFER}, true
+            ) AS geom,
+            z.id::text AS id,
+            z.name AS name,
+            lower(z.zone_type::text) AS zone_type
+        FROM zones z
+        WHERE z.boundary_polygon && ST_MakeEnvelope(:west, :south, :east, :north, 4326)
+    )
+    SELECT ST_AsMVT(mvtgeom.*, 'zones', {MVT_EXTENT}, 'geom') FROM mvtgeom WHERE geom IS NOT NULL
+""")
+
+# Последнее положение объекта — координаты его последнего обновлённого сенсора.
+# Сначала выбирается последний сенсор каждого объекта и только потом фильтр по
+# bbox: иначе объект, ушедший из тайла, остался бы в нём по старому сенсору
+_OBJECTS_TILE_SQL = text(f"""
+    WITH latest AS (
+        SELECT DISTINCT ON (s.object_id)
+            s.object_id, s.latitude, s.longitude, s.updated_at
+        FROM sensors s
+        WHERE s.latitude IS NOT NULL AND s.longitude IS NOT NULL
+        ORDER BY s.object_id, s.updated_at DESC
+    ),
+    positions AS (
+        SELECT l.*
+        FROM latest l
+        WHERE ST_SetSRID(ST_MakePoint(l.longitude, l.latitude), 4326)
+            && ST_MakeEnvelope(:west, :south, :east, :north, 4326)
+    ),
+    mvtgeom AS (
+        SELECT
+            ST_AsMVTGeom(
+                ST_Transform(ST_SetSRID(ST_MakePoint(p.longitude, p.latitude), 4326), 3857),
+                ST_TileEnvelope(:z, :x, :y),
+                {MVT_EXTENT}, {MVT_BUFFER}, true
+            ) AS geom,
+            o.id::text AS id,
+            o.name AS name,
+            lower(o.object_type::text) AS object_type,
+            p.updated_at::text AS updated_at
+        FROM positions p
+        JOIN objects o ON o.id = p.object_id
+    )
+    SELECT ST_AsMVT(mvtgeom.*, 'objects', {MVT_EXTENT}, 'geom') FROM mvtgeom WHERE geom IS NOT NULL
+""")
+
+
+@instrument_repository_methods
+class TileRepository(ITileRepository):
+    """Репозиторий векторных тайлов: тайлы собираются в PostGIS через ST_AsMVT."""
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def _render(self, query: TextClause, z: int, x: int, y: int) -> bytes:
+        west, south, east, north = tile_bounds(z, x, y)
+        # Расширяем bbox на буфер тайла, чтобы не терять геометрию, попадающую только в буфер
+        pad_x = (east - west) * MVT_BUFFER / MVT_EXTENT
+        pad_y = (north - south) * MVT_BUFFER / MVT_EXTENT
+        west, east = max(west - pad_x, -180.0), min(east + pad_x, 180.0)
+        south, north = max(south - pad_y, -90.0), min(north + pad_y, 90.0)
+        result = await self._session.execute(
+            query, {"z": z, "x": x, "y": y, "west": west, "south": south, "east": east, "north": north}
+        )
+        tile = result.scalar_one_or_none()
+        return bytes(tile) if tile else b""
+
+    async def get_zones_tile(self, z: int, x: int, y: int) -> bytes:
+        """Получает слой зон тайла."""
+        return await self._render(_ZONES_TILE_SQL, z, x, y)
+
+    async def get_objects_tile(self, z: int, x: int, y: int) -> bytes:
+        """Получает слой объектов тайла."""
+        return await self._render(_OBJECTS_TILE_SQL, z, x, y)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import delete
+from sqlalchemy import insert
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.sensor_track_pro.business_logic.interfaces.repository.itrip_repo import ITripRepository
+from src.sensor_track_pro.business_logic.models.trip_model import TripBase
+from src.sensor_track_pro.business_logic.models.trip_model import TripKind
+from src.sensor_track_pro.business_logic.models.trip_model import TripModel
+from src.sensor_track_pro.data_access.mapping import to_model
+from src.sensor_track_pro.data_access.models.trips import Trip
+from src.sensor_track_pro.data_access.repositories.base import BaseRepository
+
+
+class TripRepository(BaseRepository[Trip], ITripRepository):
+    """Репозиторий для работы с поездками и стоянками."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, Trip)
+
+    async def get_by_sensor_id(
+        self,
+        sensor_id: UUID,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        kind: TripKind | None = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> list[TripModel]:
+        """Получает сегменты трека сенсора, пересекающиеся с временным периодом."""
+        query = self._select_projected(TripModel).filter(Trip.sensor_id == sensor_id)
+        if start_time is not None:
+            query = query.filter(Trip.end_time >= start_time)
+        if end_time is not None:
+            query = query.filter(Trip.start_time <= end_time)
+        if kind is not None:
+            query = query.filter(Trip.kind == kind)
+        query = query.order_by(Trip.start_time).offset(skip).limit(limit)
+        return await self._fetch_projected(TripModel, query)
+
+    async def lock_sensor(self, sensor_id: UUID) -> None:
+        await self._advisory_lock(sensor_id)
+
+    async def get_last_segment(self, sensor_id: UUID) -> TripModel | None:
+        """Получает последний сегмент сенсора."""
+        query = (
+            select(Trip)
+            .filter(Trip.sensor_id == sensor_id)
+            .order_by(Trip.is_closed, Trip.start_time.desc())
+            .limit(1)
+        )
+        result = await self._session.execute(query)
+        trip = result.scalar_one_or_none()
+        return to_model(TripModel, trip) if trip else None
+
+    async def replace_open_segments(self, sensor_id: UUID, segments: list[TripBase]) -> None:
+        """Удаляет открытые сегменты сенсора и сохраняет новые одним коммитом."""
+        try:
+            await self._session.execute(
+                delete(Trip).where(Trip.sensor_id == sensor_id, Trip.is_closed.is_(False))
+            )
+            if segments:
+                rows = [segment.model_dump() for segment in segments]
+                await self._session.execute(insert(Trip), rows)
+            await self._session.commit()
+        except Exception as e:
+            await self._session.rollback()
+            raise Exception(f"Ошибка сохранения поездок сенсора {sensor_id}: {e!s}") from e
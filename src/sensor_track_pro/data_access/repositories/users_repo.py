@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import hashlib
-
 from typing import Any  # добавлено
 from uuid import UUID
 
@@ -13,15 +11,20 @@ from src.sensor_track_pro.business_logic.interfaces.repository.iuser_model impor
 from src.sensor_track_pro.business_logic.models.user_model import UserAuthData
 from src.sensor_track_pro.business_logic.models.user_model import UserBase
 from src.sensor_track_pro.business_logic.models.user_model import UserModel
+from src.sensor_track_pro.data_access.mapping import to_model
+from src.sensor_track_pro.data_access.mapping import to_models
 from src.sensor_track_pro.data_access.models.users import User
+from src.sensor_track_pro.data_access.passwords import PasswordHasher
+from src.sensor_track_pro.data_access.passwords import get_password_hasher
 from src.sensor_track_pro.data_access.repositories.base import BaseRepository
 
 
 class UserRepository(BaseRepository[User], IUserRepository):
     """Репозиторий для работы с пользователями."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, hasher: PasswordHasher | None = None):
         super().__init__(session, User)
+        self._hasher = hasher if hasher is not None else get_password_hasher()
 
     async def create(self, user_data: UserBase, password: str) -> UserModel:  # type: ignore[override]
         """Создает нового пользователя."""
@@ -40,11 +43,11 @@ class UserRepository(BaseRepository[User], IUserRepository):
                 user_dict["role"] = str(role).lower()
         db_user = User(
             **user_dict,
-            password_hash=self._hash_password(password)
+            password_hash=await self._hasher.hash(password)
         )
         try:
             instance = await super().create(db_user)
-            return UserModel.model_validate(instance)
+            return to_model(UserModel, instance)
         except IntegrityError:
             raise ValueError("Пользователь с таким именем уже существует")
 
@@ -53,17 +56,26 @@ class UserRepository(BaseRepository[User], IUserRepository):
         query = select(User).filter(User.username == username)
         result = await self._session.execute(query)
         db_user = result.scalar_one_or_none()
-        return UserModel.model_validate(db_user) if db_user else None
+        return to_model(UserModel, db_user) if db_user else None
 
     async def authenticate(self, auth_data: UserAuthData) -> UserModel | None:
-        """Аутентифицирует пользователя."""
+        """
+        Аутентифицирует пользователя.
+
+        Пароль проверяется в пуле потоков (см. PasswordHasher); устаревший
+        хеш после успешной проверки заменяется новым.
+        """
         db_user = await self.get_by_username(auth_data.username)
-        if db_user and self._verify_password(
-            auth_data.password,
-            db_user.password_hash
-        ):
-            return db_user
-        return None
+        if db_user is None:
+            return None
+        verified, new_hash = await self._hasher.verify(db_user.id, auth_data.password, db_user.password_hash)
+        if not verified:
+            return None
+        if new_hash is not None:
+            updated = await super().update(db_user.id, {"password_hash": new_hash})
+            if updated is not None:
+                db_user = to_model(UserModel, updated)
+        return db_user
 
     async def change_password(
         self,
@@ -73,7 +85,7 @@ class UserRepository(BaseRepository[User], IUserRepository):
         """Меняет пароль пользователя."""
         db_user = await super().get_by_id(user_id)
         if db_user:
-            db_user.password_hash = self._hash_password(new_password)
+            db_user.password_hash = await self._hasher.hash(new_password)
             await self._session.flush()
             return True
         return False
@@ -81,12 +93,12 @@ class UserRepository(BaseRepository[User], IUserRepository):
     async def get_by_id(self, user_id: UUID) -> UserModel | None:  # type: ignore[override]
         """Получает пользователя по ID."""
         db_user = await super().get_by_id(user_id)
-        return UserModel.model_validate(db_user) if db_user else None
+        return to_model(UserModel, db_user) if db_user else None
 
     async def get_all(self, skip: int = 0, limit: int = 100, **filters: dict[str, Any]) -> list[UserModel]:  # type: ignore[override]
         """Получает всех пользователей с возможностью фильтрации."""
         db_users = await super().get_all(skip, limit, **filters)
-        return [UserModel.model_validate(u) for u in db_users]
+        return to_models(UserModel, db_users)
 
     async def update(self, user_id: UUID, user_data: dict[str, Any]) -> UserModel | None:  # type: ignore[override]
         """Обновляет данные пользователя."""
@@ -98,7 +110,7 @@ class UserRepository(BaseRepository[User], IUserRepository):
             else:
                 user_data["role"] = str(role).lower()
         db_user = await super().update(user_id, user_data)
-        return UserModel.model_validate(db_user) if db_user else None
+        return to_model(UserModel, db_user) if db_user else None
 
     # async def delete(self, user_id: UUID) -> bool:
     #     """Удаляет пользователя."""
@@ -111,11 +123,3 @@ class UserRepository(BaseRepository[User], IUserRepository):
     async def deactivate_user(self, user_id: UUID) -> bool:
         updated_user = await self.update(user_id, {"is_active": False})
         return updated_user is not None
-
-    def _hash_password(self, password: str) -> str:
-        """Хеширует пароль с использованием SHA-256."""
-        return hashlib.sha256(password.encode('utf-8')).hexdigest()
-
-    def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Проверяет пароль, сравнивая SHA-256 хеш."""
-        return self._hash_password(plain_password) == hashed_password
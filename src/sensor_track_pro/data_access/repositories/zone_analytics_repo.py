@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import CTE
+from sqlalchemy import Integer
+from sqlalchemy import case
+from sqlalchemy import func
+from sqlalchemy import literal
+from sqlalchemy import select
+from sqlalchemy import union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.sensor_track_pro.business_logic.interfaces.repository.izone_analytics_repo import IZoneAnalyticsRepository
+from src.sensor_track_pro.business_logic.models.zone_analytics_model import ZoneDwellTime
+from src.sensor_track_pro.business_logic.models.zone_analytics_model import ZoneOccupancyPoint
+from src.sensor_track_pro.business_logic.models.zone_analytics_model import ZoneOccupancySummary
+from src.sensor_track_pro.data_access.models.objects import object_zone
+from src.sensor_track_pro.data_access.profiling import instrument_repository_methods
+
+
+@instrument_repository_methods
+class ZoneAnalyticsRepository(IZoneAnalyticsRepository):
+    """
+    Репозиторий аналитики пребывания объектов в зонах.
+
+    Все агрегаты считаются на стороне БД по интервалам entered_at/exited_at
+    таблицы object_zone: в Python возвращаются только готовые строки результата.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    @staticmethod
+    def _visits(
+        start_time: datetime,
+        end_time: datetime,
+        zone_id: UUID | None = None,
+        object_id: UUID | None = None
+    ) -> CTE:
+        """Интервалы пребывания, пересекающиеся с периодом и обрезанные его границами."""
+        oz = object_zone.c
+        query = (
+            select(
+                oz.zone_id,
+                oz.object_id,
+                oz.exited_at,
+                func.greatest(oz.entered_at, start_time).label("t_in"),
+                func.least(func.coalesce(oz.exited_at, end_time), end_time).label("t_out"),
+            )
+            .filter(oz.entered_at < end_time, oz.exited_at.is_(None) | (oz.exited_at > start_time))
+        )
+        if zone_id is not None:
+            query = query.filter(oz.zone_id == zone_id)
+        if object_id is not None:
+            query = query.filter(oz.object_id == object_id)
+        return query.cte("visits")
+
+    @staticmethod
+    def _occupancy(visits: CTE, end_time: datetime) -> CTE:
+        """
+        Заполненность зон как нарастающая сумма входов (+1) и выходов (-1).
+
+        Одновременные вход и выход схлопываются в одно изменение, моменты без
+        изменения заполненности отбрасываются.
+        """
+        deltas = union_all(
+            select(visits.c.zone_id, visits.c.t_in.label("ts"), literal(1, Integer).label("delta")),
+            select(visits.c.zone_id, visits.c.t_out.label("ts"), literal(-1, Integer).label("delta"))
+            .filter(visits.c.t_out < end_time),
+        ).subquery("deltas")
+        changes = (
+            select(deltas.c.zone_id, deltas.c.ts, func.sum(deltas.c.delta).label("delta"))
+            .group_by(deltas.c.zone_id, deltas.c.ts)
+            .having(func.sum(deltas.c.delta) != 0)
+            .subquery("changes")
+        )
+        return select(
+            changes.c.zone_id,
+            changes.c.ts,
+            func.sum(changes.c.delta).over(partition_by=changes.c.zone_id, order_by=changes.c.ts).label("occupancy"),
+        ).cte("occupancy")
+
+    async def get_dwell_times(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        zone_id: UUID | None = None,
+        object_id: UUID | None = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> list[ZoneDwellTime]:
+        """Считает время пребывания объектов в зонах агрегацией на стороне БД."""
+        visits = self._visits(start_time, end_time, zone_id, object_id)
+        dwell_time = func.sum(func.extract("epoch", visits.c.t_out - visits.c.t_in))
+        query = (
+            select(
+                visits.c.zone_id,
+                visits.c.object_id,
+                func.count().label("visits"),
+                dwell_time.label("dwell_time"),
+                func.min(visits.c.t_in).label("first_entered_at"),
+                case(
+                    (func.bool_or(visits.c.exited_at.is_(None)), None),
+                    else_=func.max(visits.c.exited_at),
+                ).label("last_exited_at"),
+            )
+            .group_by(visits.c.zone_id, visits.c.object_id)
+            .order_by(visits.c.zone_id, dwell_time.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await self._session.execute(query)
+        return [ZoneDwellTime.model_validate(row, from_attributes=True) for row in result.all()]
+
+    async def get_occupancy(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        zone_id: UUID | None = None
+    ) -> list[ZoneOccupancyPoint]:
+        """Строит заполненность зон оконной функцией на стороне БД."""
+        occupancy = self._occupancy(self._visits(start_time, end_time, zone_id), end_time)
+        query = (
+            select(occupancy.c.zone_id, occupancy.c.ts.label("timestamp"), occupancy.c.occupancy)
+            .order_by(occupancy.c.zone_id, occupancy.c.ts)
+        )
+        result = await self._session.execute(query)
+        return [ZoneOccupancyPoint.model_validate(row, from_attributes=True) for row in result.all()]
+
+    async def get_occupancy_summary(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        zone_id: UUID | None = None
+    ) -> list[ZoneOccupancySummary]:
+        """Считает пиковую и среднюю заполненность зон на стороне БД."""
+        visits = self._visits(start_time, end_time, zone_id)
+        occupancy = self._occupancy(visits, end_time)
+        ranked = select(
+            occupancy.c.zone_id,
+            occupancy.c.ts,
+            occupancy.c.occupancy,
+            func.row_number().over(
+                partition_by=occupancy.c.zone_id,
+                order_by=(occupancy.c.occupancy.desc(), occupancy.c.ts),
+            ).label("rank"),
+        ).subquery("ranked")
+        # Средняя заполненность = суммарное время пребывания / длительность периода
+        totals = (
+            select(
+                visits.c.zone_id,
+                func.sum(func.extract("epoch", visits.c.t_out - visits.c.t_in)).label("dwell_time"),
+            )
+            .group_by(visits.c.zone_id)
+            .subquery("totals")
+        )
+        window = max((end_time - start_time).total_seconds(), 1.0)
+        query = (
+            select(
+                ranked.c.zone_id,
+                ranked.c.occupancy.label("peak_occupancy"),
+                ranked.c.ts.label("peak_at"),
+                (totals.c.dwell_time / window).label("average_occupancy"),
+            )
+            .join(totals, totals.c.zone_id == ranked.c.zone_id)
+            .filter(ranked.c.rank == 1)
+            .order_by(ranked.c.occupancy.desc())
+        )
+        result = await self._session.execute(query)
+        return [ZoneOccupancySummary.model_validate(row, from_attributes=True) for row in result.all()]
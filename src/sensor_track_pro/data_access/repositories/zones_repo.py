@@ -3,25 +3,88 @@ from __future__ import annotations
 from typing import Any
 from uuid import UUID
 
+import numpy as np
+
 from geoalchemy2.functions import ST_Contains
+from pydantic import TypeAdapter
+from sqlalchemy import func  # добавлено
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func  # добавлено
 
+from src.sensor_track_pro.business_logic.analytics.geo import circle_ring
+from src.sensor_track_pro.business_logic.analytics.geo import ring_wkt
 from src.sensor_track_pro.business_logic.interfaces.repository.izone_repo import IZoneRepository
 from src.sensor_track_pro.business_logic.models.zone_model import MIN_POLYGON_POINTS
+from src.sensor_track_pro.business_logic.models.zone_model import CircleZone
+from src.sensor_track_pro.business_logic.models.zone_model import PolygoneZone
+from src.sensor_track_pro.business_logic.models.zone_model import RectangleZone
 from src.sensor_track_pro.business_logic.models.zone_model import ZoneBase
 from src.sensor_track_pro.business_logic.models.zone_model import ZoneModel
 from src.sensor_track_pro.business_logic.models.zone_model import ZoneType
+from src.sensor_track_pro.compute import get_compute_pool
+from src.sensor_track_pro.data_access.cache import RepositoryCache
+from src.sensor_track_pro.data_access.cache import get_repository_cache
+from src.sensor_track_pro.data_access.mapping import to_model
+from src.sensor_track_pro.data_access.mapping import to_models
 from src.sensor_track_pro.data_access.models.zones import Zone
 from src.sensor_track_pro.data_access.repositories.base import BaseRepository
 
 
+_coordinates_adapter: TypeAdapter[CircleZone | RectangleZone | PolygoneZone] = TypeAdapter(
+    CircleZone | RectangleZone | PolygoneZone
+)
+
+
+def boundary_wkt(coordinates: Any) -> str:
+    """
+    WKT границы зоны по координатам (модели или словарю).
+
+    Проверка координат, перевод вершин в массивы и форматирование выполняются
+    одной функцией, чтобы всё преобразование уходило в пул процессов.
+    """
+    return ring_wkt(*_coordinates_to_ring(_coordinates_adapter.validate_python(coordinates)))
+
+
+def _ring_size(coordinates: Any) -> int:
+    """Число вершин полигона; круг и прямоугольник строятся на месте."""
+    points = coordinates.get("points") if isinstance(coordinates, dict) else getattr(coordinates, "points", None)
+    return len(points) if points else 0
+
+
+def _coordinates_to_ring(coordinates: Any) -> tuple[np.ndarray, np.ndarray]:
+    """Вершины границы зоны: (долготы, широты)."""
+    # coordinates - это Pydantic-модель: CircleZone, RectangleZone или PolygoneZone
+    if isinstance(coordinates, PolygoneZone):
+        points = coordinates.points
+        if not points or len(points) < MIN_POLYGON_POINTS:
+            raise ValueError(f"Для полигона требуется минимум {MIN_POLYGON_POINTS} точки")
+        longitudes = np.fromiter((p.longitude for p in points), dtype=np.float64, count=len(points))
+        latitudes = np.fromiter((p.latitude for p in points), dtype=np.float64, count=len(points))
+        return longitudes, latitudes
+    elif isinstance(coordinates, CircleZone):
+        center = coordinates.center
+        radius = coordinates.radius
+        if not center or radius is None:
+            raise ValueError("Для круга требуются центр и радиус")
+        return circle_ring(center.latitude, center.longitude, radius)
+    elif isinstance(coordinates, RectangleZone):
+        # Прямоугольник задается двумя точками: top_left и bottom_right
+        tl = coordinates.top_left
+        br = coordinates.bottom_right
+        longitudes = np.array([tl.longitude, br.longitude, br.longitude, tl.longitude])
+        latitudes = np.array([tl.latitude, tl.latitude, br.latitude, br.latitude])
+        return longitudes, latitudes
+    else:
+        raise ValueError(f"Неизвестный тип зоны: {type(coordinates)}")
+
+
 class ZoneRepository(BaseRepository[Zone], IZoneRepository):  # type: ignore[misc]
     """Репозиторий для работы с зонами."""
 
-    def __init__(self, session: AsyncSession):
-        super().__init__(session, Zone)
+    _cache_namespace = "zones"
+
+    def __init__(self, session: AsyncSession, cache: RepositoryCache | None = None):
+        super().__init__(session, Zone, cache if cache is not None else get_repository_cache())
 
     async def create_zone(self, zone_data: ZoneBase) -> ZoneModel:
         """Создает новую зону из ZoneBase по аналогии с create из user_repo."""
@@ -30,24 +93,44 @@ class ZoneRepository(BaseRepository[Zone], IZoneRepository):  # type: ignore[mis
         if not isinstance(db_zone.zone_type, ZoneType):
             db_zone.zone_type = ZoneType(db_zone.zone_type)
         db_zone.zone_type = db_zone.zone_type.value  # всегда нижний регистр для БД
-        db_zone.boundary_polygon = self._coordinates_to_geometry(zone_data.coordinates)
+        # Полигоны из тысяч точек проверяются и переводятся в WKT в пуле процессов, а не в цикле событий
+        coordinates = zone_data.coordinates
+        db_zone.boundary_polygon = await get_compute_pool().run(
+            boundary_wkt, coordinates, size=_ring_size(coordinates)
+        )
         # Используем метод create из BaseRepository
         zone = await super().create(db_zone)
-        return ZoneModel.model_validate(zone)
+        return to_model(ZoneModel, zone)
+
+    async def get_by_id(self, zone_id: UUID) -> ZoneModel | None:  # type: ignore[override]
+        """Получает зону по идентификатору (через кэш, без чтения геометрии)."""
+        return await self._cached(("id", zone_id), lambda: self._get_by_id_projected(ZoneModel, zone_id))
 
     async def get_by_type(self, zone_type: ZoneType, skip: int = 0, limit: int = 100) -> list[ZoneModel]:
         """Получает зоны по типу."""
-        query = select(Zone).filter(Zone.zone_type == zone_type).offset(skip).limit(limit)
-        result = await self._session.execute(query)
-        return [ZoneModel.model_validate(zone) for zone in result.scalars().all()]
+        query = self._select_projected(ZoneModel).filter(Zone.zone_type == zone_type).offset(skip).limit(limit)
+        return await self._fetch_projected(ZoneModel, query)
+
+    async def get_all(self, skip: int = 0, limit: int = 100, **filters: Any) -> list[ZoneModel]:  # type: ignore[override]
+        """Получает зоны с пагинацией и фильтрацией, без чтения геометрии."""
+        return await self._get_all_projected(ZoneModel, skip, limit, filters)
+
+    async def update(self, zone_id: UUID, zone_data: dict[str, Any]) -> ZoneModel | None:  # type: ignore[override]
+        """Обновляет зону; при смене координат пересчитывает границу."""
+        if "coordinates" in zone_data:
+            coordinates = zone_data["coordinates"]
+            zone_data["boundary_polygon"] = await get_compute_pool().run(
+                boundary_wkt, coordinates, size=_ring_size(coordinates)
+            )
+        db_zone = await super().update(zone_id, zone_data)
+        return to_model(ZoneModel, db_zone) if db_zone else None
 
     async def get_zones_containing_point(self, latitude: float, longitude: float) -> list[ZoneModel]:
         """Получает зоны, содержащие точку."""
         # Используем ST_SetSRID(ST_MakePoint(longitude, latitude), 4326) для создания точки
         point_geom = func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326)
-        query = select(Zone).filter(func.ST_Contains(Zone.boundary_polygon, point_geom))
-        result = await self._session.execute(query)
-        return [ZoneModel.model_validate(zone) for zone in result.scalars().all()]
+        query = self._select_projected(ZoneModel).filter(func.ST_Contains(Zone.boundary_polygon, point_geom))
+        return await self._fetch_projected(ZoneModel, query)
 
     async def get_zones_for_object(self, object_id: UUID) -> list[ZoneModel]:
         """Получает зоны для объекта."""
@@ -57,60 +140,14 @@ class ZoneRepository(BaseRepository[Zone], IZoneRepository):  # type: ignore[mis
             .filter(Zone.objects.any(id=str(object_id)))
         )
         result = await self._session.execute(query)
-        return [ZoneModel.model_validate(zone) for zone in result.scalars().all()]
+        return to_models(ZoneModel, result.scalars().all())
 
     async def get_all_for_map(self) -> list[ZoneModel]:
-        """Получить все зоны для карты."""
-        query = select(Zone)
-        result = await self._session.execute(query)
-        return [ZoneModel.model_validate(zone) for zone in result.scalars().all()]
+        """Получить все зоны для карты (через кэш)."""
+        return await self._cached(
+            "map", lambda: self._fetch_projected(ZoneModel, self._select_projected(ZoneModel))
+        )
 
     def _coordinates_to_geometry(self, coordinates: Any) -> str:
         """Преобразует координаты в WKT-формат для PostgreSQL."""
-        # coordinates - это Pydantic-модель: CircleZone, RectangleZone или PolygoneZone
-        from src.sensor_track_pro.business_logic.models.zone_model import CircleZone, RectangleZone, PolygoneZone, MIN_POLYGON_POINTS
-
-        if isinstance(coordinates, PolygoneZone):
-            points = coordinates.points
-            if not points or len(points) < MIN_POLYGON_POINTS:
-                raise ValueError(f"Для полигона требуется минимум {MIN_POLYGON_POINTS} точки")
-            # Закрываем полигон, если первая и последняя точка не совпадают
-            if (points[0].latitude != points[-1].latitude) or (points[0].longitude != points[-1].longitude):
-                points = points + [points[0]]
-            points_str = ", ".join(f"{p.longitude} {p.latitude}" for p in points)
-            return f"POLYGON(({points_str}))"
-        elif isinstance(coordinates, CircleZone):
-            center = coordinates.center
-            radius = coordinates.radius
-            if not center or radius is None:
-                raise ValueError("Для круга требуются центр и радиус")
-            import math
-            # Переводим радиус из метров в градусы (очень грубо, для малых радиусов)
-            # 1 градус широты ~ 111320 м, долгота зависит от широты
-            lat = center.latitude
-            lon = center.longitude
-            earth_radius = 6378137  # радиус Земли в метрах
-            points = []
-            num_points = 64  # больше точек — круг плавнее
-            for i in range(num_points):
-                angle = 2 * math.pi * i / num_points
-                # Считаем смещение в градусах
-                dlat = (radius / earth_radius) * (180 / math.pi) * math.sin(angle)
-                dlon = (radius / (earth_radius * math.cos(math.radians(lat)))) * (180 / math.pi) * math.cos(angle)
-                y = lat + dlat
-                x = lon + dlon
-                points.append(f"{x} {y}")
-            points.append(points[0])
-            points_str = ", ".join(points)
-            return f"POLYGON(({points_str}))"
-        elif isinstance(coordinates, RectangleZone):
-            # Прямоугольник задается двумя точками: top_left и bottom_right
-            tl = coordinates.top_left
-            br = coordinates.bottom_right
-            tr = type(tl)(latitude=tl.latitude, longitude=br.longitude)
-            bl = type(tl)(latitude=br.latitude, longitude=tl.longitude)
-            points = [tl, tr, br, bl, tl]
-            points_str = ", ".join(f"{p.longitude} {p.latitude}" for p in points)
-            return f"POLYGON(({points_str}))"
-        else:
-            raise ValueError(f"Неизвестный тип зоны: {type(coordinates)}")
+        return boundary_wkt(coordinates)
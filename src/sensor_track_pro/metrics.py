@@ -0,0 +1,134 @@
+"""
+Метрики Prometheus процесса: HTTP-запросы, запросы к БД, пул соединений, приём событий, запуск.
+
+При нескольких воркерах (src.sensor_track_pro.serve) задан PROMETHEUS_MULTIPROC_DIR:
+значения пишутся в файлы каталога, и /metrics любого воркера отдаёт сумму по всем
+воркерам (multiprocess_registry). Состояние пула в этом режиме публикуется из пульса
+воркера через POOL_COLLECTOR.publish().
+"""
+from __future__ import annotations
+
+import os
+
+from collections.abc import Callable
+from collections.abc import Iterator
+
+from prometheus_client import REGISTRY
+from prometheus_client import CollectorRegistry
+from prometheus_client import Counter
+from prometheus_client import Gauge
+from prometheus_client import Histogram
+from prometheus_client import multiprocess
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy.pool import Pool
+
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP-запроса по шаблону маршрута и статусу",
+    ("method", "route", "status"),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP-запросы, принятые, но ещё не завершённые",
+    ("method",),
+    multiprocess_mode="livesum",
+)
+DB_STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "Время выполнения SQL-запроса по методу репозитория",
+    ("operation",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+DB_STATEMENT_ROWS = Histogram(
+    "db_statement_rows",
+    "Число строк, возвращённых или изменённых SQL-запросом, по методу репозитория",
+    ("operation",),
+    buckets=(0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 50000),
+)
+DB_SLOW_STATEMENTS = Counter(
+    "db_slow_statements_total",
+    "SQL-запросы дольше порога SQL_SLOW_QUERY_MS по методу репозитория",
+    ("operation",),
+)
+HTTP_REQUEST_DB_STATEMENTS = Histogram(
+    "http_request_db_statements",
+    "Число SQL-запросов на один HTTP-запрос по шаблону маршрута",
+    ("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 200),
+)
+EVENTS_INGESTED = Counter(
+    "events_ingested_total",
+    "Принятые и сохранённые события датчиков",
+)
+APP_STARTUP_SECONDS = Gauge(
+    "app_startup_seconds",
+    "Длительность этапов запуска воркера (total — от импорта приложения до приёма трафика)",
+    ("phase",),
+    multiprocess_mode="liveall",
+)
+
+_POOL_STATS = (
+    ("db_pool_size", "Постоянный размер пула соединений", "size"),
+    ("db_pool_checked_out", "Соединения, выданные сессиям", "checkedout"),
+    ("db_pool_checked_in", "Свободные соединения в пуле", "checkedin"),
+    ("db_pool_overflow", "Соединения сверх постоянного размера пула", "overflow"),
+)
+# Копии метрик пула для многопроцессного режима: сумма по живым воркерам.
+# Не регистрируются в REGISTRY — там пул отдаёт PoolCollector на момент опроса
+_POOL_GAUGES = {
+    read: Gauge(name, documentation, registry=None, multiprocess_mode="livesum")
+    for name, documentation, read in _POOL_STATS
+}
+
+
+def multiprocess_dir() -> str | None:
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR") or None
+
+
+def multiprocess_registry() -> CollectorRegistry:
+    """Реестр, собирающий метрики всех воркеров из PROMETHEUS_MULTIPROC_DIR."""
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def pool_stats(pool: Pool) -> Iterator[tuple[str, str, str, int]]:
+    for name, documentation, read in _POOL_STATS:
+        method = getattr(pool, read, None)
+        if method is not None:
+            # QueuePool.overflow() отрицателен, пока пул не заполнен
+            yield name, documentation, read, max(method(), 0)
+
+
+class PoolCollector(Collector):
+    """Состояние пула соединений текущего движка на момент опроса."""
+
+    def __init__(self) -> None:
+        self._pool: Callable[[], Pool | None] = lambda: None
+
+    def track(self, pool: Callable[[], Pool | None]) -> None:
+        self._pool = pool
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        pool = self._pool()
+        if pool is None:
+            return
+        for name, documentation, _, value in pool_stats(pool):
+            yield GaugeMetricFamily(name, documentation, value=value)
+
+    def publish(self) -> None:
+        """Записывает состояние пула в файлы многопроцессного режима."""
+        pool = self._pool()
+        if pool is None:
+            return
+        for _, _, read, value in pool_stats(pool):
+            _POOL_GAUGES[read].set(value)
+
+
+POOL_COLLECTOR = PoolCollector()
+REGISTRY.register(POOL_COLLECTOR)
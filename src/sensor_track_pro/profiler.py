@@ -0,0 +1,157 @@
+"""
+Профилирование работающего воркера по запросу администратора.
+
+StackSampler — выборочный профилировщик в стиле py-spy: отдельный поток с
+заданным интервалом снимает стеки всех потоков процесса и считает
+одинаковые. Результат — collapsed stacks («кадр;кадр;…;кадр число»), их
+принимают flamegraph.pl, speedscope и inferno. Вызовы не трассируются,
+поэтому накладные расходы ограничены снятием стеков.
+
+profile_calls — cProfile на время одного запроса (заголовок X-Profile).
+
+Одновременно работает один профилировщик на процесс.
+"""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import pstats
+import sys
+import threading
+
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from types import FrameType
+
+
+# Кадры, на которых поток ждёт (цикл событий в select, пул потоков в очереди);
+# такие выборки по умолчанию отбрасываются
+IDLE_FRAMES = frozenset({
+    "selectors:_PollLikeSelector.select",
+    "selectors:KqueueSelector.select",
+    "selectors:SelectSelector.select",
+    "threading:Condition.wait",
+    "concurrent.futures.thread:_worker",
+})
+
+PROFILE_SORT_KEYS = ("cumulative", "tottime", "calls")
+
+_profiler_lock = threading.Lock()
+
+
+class ProfilerBusyError(RuntimeError):
+    """В процессе уже работает профилировщик."""
+
+
+def frame_label(frame: FrameType) -> str:
+    """Кадр в виде «модуль:функция», без пробелов и «;»."""
+    module = frame.f_globals.get("__name__") or frame.f_code.co_filename
+    return f"{module}:{frame.f_code.co_qualname}".replace(" ", "_").replace(";", "_")
+
+
+def frame_stack(frame: FrameType | None) -> list[str]:
+    """Стек от внешнего кадра к текущему."""
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+class StackSampler:
+    """Снимает стеки всех потоков, кроме своего, раз в interval секунд."""
+
+    def __init__(self, interval: float = 0.005, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def sample(self) -> None:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = frame_stack(frame)
+            if not stack or (not self.include_idle and stack[-1] in IDLE_FRAMES):
+                continue
+            thread = names.get(ident, f"thread-{ident}").replace(" ", "_").replace(";", "_")
+            self.stacks[";".join([thread, *stack])] += 1
+        self.samples += 1
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, по строке на стек, от частых к редким."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+
+async def sample_stacks(seconds: float, interval: float = 0.005, include_idle: bool = False) -> StackSampler:
+    """
+    Снимает стеки процесса в течение seconds секунд, не блокируя цикл событий.
+
+    Raises:
+        ProfilerBusyError: В процессе уже работает профилировщик
+    """
+    if not _profiler_lock.acquire(blocking=False):
+        raise ProfilerBusyError("Профилировщик уже запущен в этом процессе")
+    sampler = StackSampler(interval, include_idle)
+    try:
+        sampler.start()
+        await asyncio.sleep(seconds)
+    finally:
+        sampler.stop()
+        _profiler_lock.release()
+    return sampler
+
+
+@contextmanager
+def profile_calls() -> Iterator[cProfile.Profile | None]:
+    """
+    cProfile на время блока; None, если профилировщик уже занят.
+
+    Учитывается всё, что процесс выполнял в это время, в том числе
+    конкурентные запросы того же цикла событий.
+    """
+    if not _profiler_lock.acquire(blocking=False):
+        yield None
+        return
+    profiler = cProfile.Profile()
+    try:
+        try:
+            profiler.enable()
+        except ValueError:
+            # Профилирование уже занято другим инструментом (отладчик, coverage)
+            yield None
+            return
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+    finally:
+        _profiler_lock.release()
+
+
+def format_stats(profiler: cProfile.Profile, sort: str = "cumulative", limit: int = 60) -> str:
+    """Текстовый отчёт pstats: limit самых дорогих функций по ключу sort."""
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats(sort if sort in PROFILE_SORT_KEYS else "cumulative").print_stats(limit)
+    return stream.getvalue()
@@ -0,0 +1,234 @@
+"""
+Запуск API с несколькими воркерами: python -m src.sensor_track_pro.serve.
+
+Воркеры — независимые процессы uvicorn на общем слушающем сокете, у каждого
+свой цикл событий, пул соединений и кэши. Число воркеров и адрес берутся из
+Settings (WORKERS, HOST, PORT); WORKERS=0 — по одному на доступный процессор
+с учётом квоты cgroup. DB_CONNECTION_BUDGET делится между воркерами
+(database.pool_limits) с запасом на один воркер — см. pool_slots.
+
+Супервизор — uvicorn Multiprocess с дополнениями:
+- воркер, чей пульс (workers.py) устарел на WORKER_HEARTBEAT_TIMEOUT или который
+  не стал готов за WORKER_STARTUP_TIMEOUT, перезапускается;
+- SIGHUP перезапускает воркеры по одному: старый останавливается только после
+  готовности нового, поэтому контейнер не перестаёт принимать запросы;
+- SIGTTIN/SIGTTOU добавляют и убирают воркер.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import os
+import shutil
+import tempfile
+import time
+
+from collections.abc import Callable
+from pathlib import Path
+from socket import socket
+
+import uvicorn
+
+from prometheus_client import multiprocess
+from uvicorn.supervisors.multiprocess import Multiprocess
+from uvicorn.supervisors.multiprocess import Process
+
+from src.sensor_track_pro.config import get_settings
+from src.sensor_track_pro.metrics import multiprocess_dir
+from src.sensor_track_pro.workers import read_worker_state
+from src.sensor_track_pro.workers import remove_worker_state
+
+
+logger = logging.getLogger("uvicorn.error")
+
+APP = "src.sensor_track_pro.api.main:app"
+
+
+def available_cpus() -> int:
+    """Процессоры, доступные процессу: маска привязки и квота cgroup v2."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+    except (OSError, ValueError):
+        return cpus
+    if quota != "max":
+        cpus = min(cpus, max(math.ceil(int(quota) / int(period)), 1))
+    return cpus
+
+
+def resolve_workers(workers: int) -> int:
+    return workers if workers > 0 else available_cpus()
+
+
+def pool_slots(processes: int) -> int:
+    """
+    Число долей DB_CONNECTION_BUDGET для воркеров супервизора (WORKERS воркера).
+
+    Одна доля сверх числа воркеров — резерв: при поочерёдном перезапуске новый
+    воркер работает рядом со старым, а после SIGTTIN прежние воркеры держат
+    пулы, рассчитанные на меньшее число процессов. Бюджет при этом не
+    превышается: n/(n+1) + 1/(n+2) < 1.
+    """
+    return processes + 1
+
+
+def _pid(process: Process) -> int:
+    """PID запущенного воркера (до start() его нет)."""
+    pid = process.pid
+    assert pid is not None
+    return pid
+
+
+class WorkerSupervisor(Multiprocess):
+    """Multiprocess с проверкой пульса воркеров и поочерёдным перезапуском."""
+
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        target: Callable[[list[socket] | None], None],
+        sockets: list[socket],
+        state_dir: str,
+        heartbeat_timeout: float,
+        startup_timeout: float,
+    ):
+        super().__init__(config, target, sockets)
+        self.state_dir = state_dir
+        self.heartbeat_timeout = heartbeat_timeout
+        self.startup_timeout = startup_timeout
+        self._spawned: dict[int, float] = {}
+
+    def spawn(self) -> Process:
+        # Воркер читает Settings при запуске: пул рассчитывается на текущее
+        # число воркеров с учётом SIGTTIN/SIGTTOU
+        os.environ["WORKERS"] = str(pool_slots(self.processes_num))
+        process = Process(self.config, self.target, self.sockets)
+        process.start()
+        self._spawned[_pid(process)] = time.monotonic()
+        return process
+
+    def reap(self, process: Process) -> None:
+        """Дожидается завершения воркера и убирает его пульс и файлы метрик."""
+        process.join()
+        pid = _pid(process)
+        self._spawned.pop(pid, None)
+        remove_worker_state(self.state_dir, pid)
+        if multiprocess_dir():
+            multiprocess.mark_process_dead(pid)
+
+    def is_ready(self, process: Process) -> bool:
+        return read_worker_state(self.state_dir, _pid(process)) is not None
+
+    def is_healthy(self, process: Process) -> bool:
+        if not process.is_alive():
+            return False
+        pid = _pid(process)
+        state = read_worker_state(self.state_dir, pid)
+        if state is None:
+            # Воркер ещё запускается (импорт, прогрев пула)
+            return time.monotonic() - self._spawned.get(pid, time.monotonic()) <= self.startup_timeout
+        return state.is_healthy(self.heartbeat_timeout)
+
+    def wait_ready(self, process: Process) -> bool:
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline and not self.should_exit.is_set():
+            if self.is_ready(process):
+                return True
+            if not process.process.is_alive():
+                return False
+            time.sleep(0.2)
+        return False
+
+    def init_processes(self) -> None:
+        for _ in range(self.processes_num):
+            self.processes.append(self.spawn())
+
+    def join_all(self) -> None:
+        for process in self.processes:
+            self.reap(process)
+
+    def keep_subprocess_alive(self) -> None:
+        if self.should_exit.is_set():
+            return
+        for idx, process in enumerate(self.processes):
+            if self.is_healthy(process):
+                continue
+            logger.warning("Воркер [%s] не отвечает, перезапуск", process.pid)
+            process.kill()
+            self.reap(process)
+            if self.should_exit.is_set():
+                return
+            self.processes[idx] = self.spawn()
+
+    def restart_all(self) -> None:
+        """Поочерёдный перезапуск; на время замены живёт лишний воркер из резерва pool_slots."""
+        for idx, old in enumerate(list(self.processes)):
+            new = self.spawn()
+            if not self.wait_ready(new):
+                logger.error("Новый воркер [%s] не запустился, перезапуск остановлен", new.pid)
+                new.kill()
+                self.reap(new)
+                return
+            old.terminate()
+            self.reap(old)
+            self.processes[idx] = new
+        logger.info("Воркеры перезапущены: %s", ", ".join(str(process.pid) for process in self.processes))
+
+    def handle_ttin(self) -> None:
+        logger.info("Received SIGTTIN, increasing the number of processes.")
+        self.processes_num += 1
+        self.processes.append(self.spawn())
+
+    def handle_ttou(self) -> None:
+        if self.processes_num <= 1:
+            logger.info("Already reached one process, cannot decrease the number of processes anymore.")
+            return
+        logger.info("Received SIGTTOU, decreasing number of processes.")
+        self.processes_num -= 1
+        process = self.processes.pop()
+        process.terminate()
+        self.reap(process)
+
+
+def main() -> None:
+    settings = get_settings()
+    workers = resolve_workers(settings.workers)
+    # Воркеры читают Settings заново: WORKERS нужен им для деления бюджета
+    # соединений (супервизор переопределяет его при каждом запуске воркера)
+    os.environ["WORKERS"] = str(workers)
+    config = uvicorn.Config(APP, host=settings.host, port=settings.port, workers=workers)
+    if workers == 1:
+        uvicorn.Server(config).run()
+        return
+
+    # Каталоги создаются до запуска воркеров: prometheus_client читает
+    # PROMETHEUS_MULTIPROC_DIR при импорте
+    temporary = []
+    state_dir = settings.worker_state_dir
+    if not state_dir:
+        state_dir = tempfile.mkdtemp(prefix="sensortrack-workers-")
+        os.environ["WORKER_STATE_DIR"] = state_dir
+        temporary.append(state_dir)
+    if not multiprocess_dir():
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="sensortrack-metrics-")
+        temporary.append(os.environ["PROMETHEUS_MULTIPROC_DIR"])
+    try:
+        server = uvicorn.Server(config)
+        sock = config.bind_socket()
+        WorkerSupervisor(
+            config,
+            target=server.run,
+            sockets=[sock],
+            state_dir=state_dir,
+            heartbeat_timeout=settings.worker_heartbeat_timeout,
+            startup_timeout=settings.worker_startup_timeout,
+        ).run()
+    finally:
+        for directory in temporary:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
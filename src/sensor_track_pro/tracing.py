@@ -0,0 +1,403 @@
+"""
+Лёгкая трассировка запросов: спаны HTTP-запроса, сервисов, репозиториев и SQL.
+
+Формат совместим с OpenTelemetry: идентификаторы и заголовок traceparent по
+W3C Trace Context, экспорт в OTLP/JSON — строкой на пакет в файл (как
+file-экспортёр коллектора) или POST на /v1/traces коллектора. Текущий спан
+хранится в контекстной переменной, поэтому проходит через зависимости
+FastAPI, сервисы и greenlet SQLAlchemy без явной передачи.
+
+Решение о записи принимается один раз на запрос: вне запроса и в
+невыбранных запросах дочерние спаны не создаются и почти ничего не стоят.
+"""
+from __future__ import annotations
+
+import atexit
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import re
+import secrets
+import socket
+import threading
+import time
+import urllib.request
+
+from collections.abc import Callable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from dataclasses import field
+from enum import IntEnum
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+from typing import Protocol
+
+from src.sensor_track_pro.config import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT = "traceparent"
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_TRACE_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+
+class SpanKind(IntEnum):
+    """Виды спанов с номерами из OTLP."""
+
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: str | None
+    kind: SpanKind = SpanKind.INTERNAL
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_otlp(self) -> dict[str, Any]:
+        span: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": int(self.kind),
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": otlp_attributes(self.attributes),
+            "status": {"code": 2, "message": self.error} if self.error is not None else {"code": 0},
+        }
+        if self.parent_span_id is not None:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+def otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    encoded = []
+    for key, value in attributes.items():
+        typed: dict[str, Any]
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        encoded.append({"key": key, "value": typed})
+    return encoded
+
+
+def parse_traceparent(header: str | None) -> tuple[str, str, bool] | None:
+    """Разбирает traceparent W3C: (trace_id, span_id родителя, выбран ли запрос)."""
+    if not header:
+        return None
+    match = _TRACEPARENT_RE.match(header.strip().lower())
+    if match is None:
+        return None
+    trace_id, span_id, flags = match.groups()
+    if trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+        return None
+    return trace_id, span_id, bool(int(flags, 16) & 1)
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+# Трассировщик выбранного запроса: дочерние спаны создаются только под ним
+_current_tracer: ContextVar[Tracer | None] = ContextVar("current_tracer", default=None)
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def current_tracer() -> Tracer | None:
+    return _current_tracer.get()
+
+
+class SpanExporter(Protocol):
+    def export(self, spans: Sequence[Span]) -> None: ...
+
+
+class SpanProcessor(Protocol):
+    def on_end(self, span: Span) -> None: ...
+
+
+class BatchSpanProcessor:
+    """
+    Отправляет завершённые спаны экспортёру пакетами из отдельного потока.
+
+    Очередь ограничена: при отставании экспортёра новые спаны отбрасываются,
+    а не задерживают запросы.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        max_queue_size: int = 4096,
+        batch_size: int = 512,
+        interval: float = 2.0,
+    ):
+        self._exporter = exporter
+        self._queue: queue.Queue[Span | None] = queue.Queue(max_queue_size)
+        self._batch_size = batch_size
+        self._interval = interval
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="span-export", daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def on_end(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def shutdown(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        batch: list[Span] = []
+        deadline = time.monotonic() + self._interval
+        while True:
+            try:
+                span = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                pass
+            else:
+                if span is None:
+                    self._export(batch)
+                    return
+                batch.append(span)
+            if len(batch) >= self._batch_size or time.monotonic() >= deadline:
+                self._export(batch)
+                batch = []
+                deadline = time.monotonic() + self._interval
+
+    def _export(self, batch: list[Span]) -> None:
+        if not batch:
+            return
+        try:
+            self._exporter.export(batch)
+        except Exception:
+            logger.exception("Не удалось экспортировать %d спанов", len(batch))
+
+
+class _OtlpJsonEncoder:
+    def __init__(self, resource: dict[str, Any]):
+        self._resource = {"attributes": otlp_attributes(resource)}
+
+    def encode(self, spans: Sequence[Span]) -> bytes:
+        payload = {
+            "resourceSpans": [{
+                "resource": self._resource,
+                "scopeSpans": [{
+                    "scope": {"name": "sensor_track_pro"},
+                    "spans": [span.to_otlp() for span in spans],
+                }],
+            }],
+        }
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FileSpanExporter(_OtlpJsonEncoder):
+    """OTLP/JSON строкой на пакет; {pid} в пути заменяется на PID воркера."""
+
+    def __init__(self, path: str, resource: dict[str, Any]):
+        super().__init__(resource)
+        self.path = Path(path.format(pid=os.getpid()))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def export(self, spans: Sequence[Span]) -> None:
+        with self.path.open("ab") as file:
+            file.write(self.encode(spans) + b"\n")
+
+
+class OtlpHttpSpanExporter(_OtlpJsonEncoder):
+    """POST OTLP/JSON на эндпоинт коллектора (например, http://collector:4318/v1/traces)."""
+
+    def __init__(self, endpoint: str, resource: dict[str, Any], timeout: float = 5.0):
+        super().__init__(resource)
+        self.endpoint = endpoint
+        self.timeout = timeout
+
+    def export(self, spans: Sequence[Span]) -> None:
+        request = urllib.request.Request(
+            self.endpoint,
+            data=self.encode(spans),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class Tracer:
+    """Создаёт спаны и передаёт завершённые процессору; без процессора выключен."""
+
+    def __init__(self, processor: SpanProcessor | None = None, sample_ratio: float = 1.0):
+        self._processor = processor
+        self._sample_ratio = sample_ratio
+
+    @property
+    def enabled(self) -> bool:
+        return self._processor is not None
+
+    @contextmanager
+    def start_request_span(
+        self,
+        name: str,
+        traceparent: str | None = None,
+        request_id: str | None = None,
+        attributes: dict[str, Any] | None = None,
+    ) -> Iterator[Span | None]:
+        """
+        Корневой спан входящего запроса.
+
+        Родитель и решение о записи берутся из traceparent, если он есть;
+        иначе trace_id — X-Request-ID от nginx (32 hex-символа) или
+        случайный, а запрос выбирается с вероятностью sample_ratio.
+        """
+        if self._processor is None:
+            yield None
+            return
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_span_id, sampled = parent
+        else:
+            request_id = (request_id or "").replace("-", "").lower()
+            trace_id = request_id if _TRACE_ID_RE.match(request_id) else secrets.token_hex(16)
+            parent_span_id = None
+            sampled = random.random() < self._sample_ratio
+        span = None
+        if sampled:
+            span = Span(name, trace_id, secrets.token_hex(8), parent_span_id, SpanKind.SERVER)
+            if attributes:
+                span.attributes.update(attributes)
+        token = _current_tracer.set(self if sampled else None)
+        try:
+            if span is None:
+                yield None
+            else:
+                with self._activate(span):
+                    yield span
+        finally:
+            _current_tracer.reset(token)
+
+    @contextmanager
+    def start_span(
+        self, name: str, kind: SpanKind = SpanKind.INTERNAL, attributes: dict[str, Any] | None = None
+    ) -> Iterator[Span | None]:
+        """Дочерний спан текущего; без текущего спана ничего не создаёт."""
+        span = self.child_span(name, kind, attributes)
+        if span is None:
+            yield None
+            return
+        with self._activate(span):
+            yield span
+
+    def child_span(
+        self, name: str, kind: SpanKind = SpanKind.INTERNAL, attributes: dict[str, Any] | None = None
+    ) -> Span | None:
+        """Дочерний спан без активации (для событий begin/end, например SQL); завершается end()."""
+        parent = _current_span.get()
+        if parent is None:
+            return None
+        span = Span(name, parent.trace_id, secrets.token_hex(8), parent.span_id, kind)
+        if attributes:
+            span.attributes.update(attributes)
+        return span
+
+    def end(self, span: Span, error: BaseException | None = None) -> None:
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        span.end_ns = time.time_ns()
+        if self._processor is not None:
+            self._processor.on_end(span)
+
+    @contextmanager
+    def _activate(self, span: Span) -> Iterator[None]:
+        token = _current_span.set(span)
+        error: BaseException | None = None
+        try:
+            yield
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end(span, error)
+
+
+def traced_service_methods[C: type](cls: C) -> C:
+    """
+    Выполняет публичные корутины класса сервиса в спане «Класс.метод».
+    Унаследованные методы получают имя подкласса.
+    """
+    for name in dir(cls):
+        if name.startswith("_"):
+            continue
+        method = inspect.getattr_static(cls, name)
+        if not inspect.iscoroutinefunction(method):
+            continue
+        method = getattr(method, "_traced_method", method)
+        setattr(cls, name, traced(method, f"{cls.__name__}.{name}", layer="service"))
+    return cls
+
+
+def traced(method: Callable[..., Any], name: str, layer: str) -> Callable[..., Any]:
+    """Оборачивает корутину в дочерний спан name с атрибутом слоя (service, repository)."""
+    attributes = {"code.function": name, "app.layer": layer}
+
+    @functools.wraps(method)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        tracer = _current_tracer.get()
+        if tracer is None:
+            return await method(*args, **kwargs)
+        with tracer.start_span(name, attributes=attributes):
+            return await method(*args, **kwargs)
+    wrapper._traced_method = method  # type: ignore[attr-defined]
+    return wrapper
+
+
+@lru_cache
+def get_tracer() -> Tracer:
+    """Трассировщик процесса по настройкам TRACING_*."""
+    settings = get_settings()
+    resource = {
+        "service.name": settings.tracing_service_name,
+        "service.instance.id": os.environ.get("INSTANCE_NAME") or socket.gethostname(),
+        "process.pid": os.getpid(),
+    }
+    exporter: SpanExporter
+    if settings.tracing_exporter == "file":
+        exporter = FileSpanExporter(settings.tracing_file_path, resource)
+    elif settings.tracing_exporter == "otlp":
+        exporter = OtlpHttpSpanExporter(settings.tracing_otlp_endpoint, resource)
+    else:
+        return Tracer()
+    return Tracer(BatchSpanProcessor(exporter), sample_ratio=settings.tracing_sample_ratio)
@@ -0,0 +1,124 @@
+"""
+Пульс и здоровье воркеров при запуске через src.sensor_track_pro.serve.
+
+Каждый воркер из своего цикла событий раз в interval секунд записывает
+состояние в <WORKER_STATE_DIR>/<pid>.json. Пульс идёт из цикла событий,
+поэтому он останавливается, если цикл заблокирован (долгая синхронная
+работа), а не только при падении процесса. Супервизор перезапускает
+воркеры с устаревшим пульсом, /health/workers отдаёт состояние всех воркеров
+контейнера.
+
+Модуль не зависит от приложения: его импортирует и процесс-супервизор.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import time
+
+from collections.abc import Callable
+from dataclasses import asdict
+from dataclasses import dataclass
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class WorkerState:
+    """Последний пульс воркера; времена — time.time()."""
+    pid: int
+    started: float
+    heartbeat: float
+    loop_lag: float = 0.0  # задержка пробуждения цикла событий сверх интервала, секунд
+
+    def age(self, now: float | None = None) -> float:
+        return (time.time() if now is None else now) - self.heartbeat
+
+    def is_healthy(self, timeout: float, now: float | None = None) -> bool:
+        return self.age(now) <= timeout
+
+
+def state_path(directory: str | Path, pid: int) -> Path:
+    return Path(directory) / f"{pid}.json"
+
+
+def read_worker_state(directory: str | Path, pid: int) -> WorkerState | None:
+    """Состояние воркера; None, если он ещё не готов или файл повреждён."""
+    try:
+        return WorkerState(**json.loads(state_path(directory, pid).read_text()))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def read_worker_states(directory: str | Path) -> list[WorkerState]:
+    """Состояния всех воркеров, упорядоченные по PID."""
+    states = []
+    for path in Path(directory).glob("*.json"):
+        if path.stem.isdigit() and (state := read_worker_state(directory, int(path.stem))) is not None:
+            states.append(state)
+    return sorted(states, key=lambda state: state.pid)
+
+
+def remove_worker_state(directory: str | Path, pid: int) -> None:
+    state_path(directory, pid).unlink(missing_ok=True)
+
+
+class WorkerHeartbeat:
+    """
+    Фоновая задача пульса текущего процесса.
+
+    Первый пульс записывается в start(), поэтому появление файла означает
+    готовность воркера принимать трафик. on_beat вызывается перед каждой
+    записью (например, для публикации метрик процесса).
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        interval: float = 5.0,
+        on_beat: Callable[[], None] | None = None,
+    ):
+        self.directory = Path(directory)
+        self.interval = interval
+        self.on_beat = on_beat
+        self.state = WorkerState(pid=os.getpid(), started=time.time(), heartbeat=time.time())
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.beat()
+        self._task = asyncio.create_task(self._run(), name="worker-heartbeat")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        remove_worker_state(self.directory, self.state.pid)
+
+    def beat(self, loop_lag: float = 0.0) -> None:
+        if self.on_beat is not None:
+            try:
+                self.on_beat()
+            except Exception:
+                logger.exception("Ошибка в обработчике пульса воркера")
+        self.state.heartbeat = time.time()
+        self.state.loop_lag = loop_lag
+        path = state_path(self.directory, self.state.pid)
+        # Запись через временный файл: читатель не увидит половину JSON
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(asdict(self.state)))
+        os.replace(tmp, path)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.beat(max(loop.time() - started - self.interval, 0.0))
@@ -0,0 +1,90 @@
+"""Бенчмарки репозиториев и сервисов на стендах stub и postgres (фикстуры в stand.py)."""
+from __future__ import annotations
+
+import uuid
+
+from datetime import datetime
+
+import pytest
+
+from stand import EVENTS
+from stand import OBJECTS
+from stand import PROBE
+from stand import ZONES
+
+from src.sensor_track_pro.business_logic.models.event_model import EventBase
+from src.sensor_track_pro.business_logic.models.event_model import EventType
+from src.sensor_track_pro.business_logic.services.zone_service import ZoneService
+from src.sensor_track_pro.data_access.cache import RepositoryCache
+from src.sensor_track_pro.data_access.repositories.events_repo import EventRepository
+from src.sensor_track_pro.data_access.repositories.objects_repo import ObjectRepository
+from src.sensor_track_pro.data_access.repositories.zones_repo import ZoneRepository
+
+
+pytest_plugins = ["stand"]
+
+
+def no_cache() -> RepositoryCache:
+    # Нулевой TTL: каждое чтение идёт в БД
+    return RepositoryCache(ttl=0)
+
+
+@pytest.mark.benchmark(group="repository-read")
+def test_events_get_all(benchmark, runner, session):
+    repo = EventRepository(session)
+    result = benchmark(lambda: runner.run(repo.get_all(0, EVENTS)))
+    assert len(result) == EVENTS
+
+
+@pytest.mark.benchmark(group="repository-read")
+def test_zones_get_all(benchmark, runner, session):
+    repo = ZoneRepository(session, no_cache())
+    result = benchmark(lambda: runner.run(repo.get_all(0, ZONES)))
+    assert len(result) == ZONES
+
+
+@pytest.mark.benchmark(group="map")
+def test_zones_map_uncached(benchmark, runner, session):
+    service = ZoneService(ZoneRepository(session, no_cache()))
+    result = benchmark(lambda: runner.run(service.get_zones_for_map()))
+    assert len(result) == ZONES
+
+
+@pytest.mark.benchmark(group="map")
+def test_zones_map_cached(benchmark, runner, session):
+    service = ZoneService(ZoneRepository(session, RepositoryCache()))
+    result = benchmark(lambda: runner.run(service.get_zones_for_map()))
+    assert len(result) == ZONES
+
+
+@pytest.mark.benchmark(group="map")
+def test_objects_map_uncached(benchmark, runner, session):
+    repo = ObjectRepository(session, no_cache())
+    result = benchmark(lambda: runner.run(repo.get_all_for_map()))
+    assert len(result) == OBJECTS
+
+
+@pytest.mark.benchmark(group="zone-containment")
+def test_zones_containing_point(benchmark, runner, postgres):
+    async def lookup():
+        async with postgres() as session:
+            return await ZoneService(ZoneRepository(session, no_cache())).get_zones_containing_point(*PROBE)
+
+    result = benchmark(lambda: runner.run(lookup()))
+    assert result
+
+
+@pytest.mark.benchmark(group="repository-write")
+def test_event_create(benchmark, runner, postgres, dataset):
+    sensor_id = dataset["sensors"][0].id
+
+    async def create():
+        async with postgres() as session:
+            event = EventBase(
+                sensor_id=sensor_id, timestamp=datetime.utcnow(), latitude=55.0, longitude=37.0,
+                speed=10.0, event_type=EventType.MOVE, details=str(uuid.uuid4()),
+            )
+            return await EventRepository(session).create(event)
+
+    result = benchmark(lambda: runner.run(create()))
+    assert result.sensor_id == sensor_id
@@ -0,0 +1,72 @@
+"""Микробенчмарки без БД: сборка моделей из строк и сериализация ответов."""
+from __future__ import annotations
+
+import pytest
+
+from src.sensor_track_pro.api.responses import model_response
+from src.sensor_track_pro.api.routers.v2.events import EventsResponse
+from src.sensor_track_pro.api.routers.v2.zones import ZonesResponse
+from src.sensor_track_pro.business_logic.analytics.telemetry_columns import encode_arrow
+from src.sensor_track_pro.business_logic.analytics.telemetry_columns import encode_msgpack
+from src.sensor_track_pro.business_logic.analytics.telemetry_columns import to_columns
+from src.sensor_track_pro.business_logic.models.event_model import EventModel
+from src.sensor_track_pro.business_logic.models.zone_model import ZoneModel
+from src.sensor_track_pro.data_access.mapping import to_models
+
+
+pytest_plugins = ["stand"]
+
+
+@pytest.fixture(scope="module")
+def events(dataset):
+    return to_models(EventModel, dataset["events"])
+
+
+@pytest.fixture(scope="module")
+def zones(dataset):
+    return to_models(ZoneModel, dataset["zones"])
+
+
+@pytest.mark.benchmark(group="mapping")
+def test_to_models_events(benchmark, dataset):
+    result = benchmark(to_models, EventModel, dataset["events"])
+    assert len(result) == len(dataset["events"])
+
+
+@pytest.mark.benchmark(group="mapping")
+def test_model_validate_events(benchmark, dataset):
+    # Базовая линия: полная проверка каждой строки
+    rows = dataset["events"]
+    result = benchmark(lambda: [EventModel.model_validate(row, from_attributes=True) for row in rows])
+    assert len(result) == len(rows)
+
+
+@pytest.mark.benchmark(group="mapping")
+def test_to_models_zones(benchmark, dataset):
+    result = benchmark(to_models, ZoneModel, dataset["zones"])
+    assert len(result) == len(dataset["zones"])
+
+
+@pytest.mark.benchmark(group="serialization")
+def test_events_response_json(benchmark, events):
+    body = benchmark(lambda: model_response(EventsResponse, items=events, total=len(events)).body)
+    assert body.startswith(b'{"items":[')
+
+
+@pytest.mark.benchmark(group="serialization")
+def test_zones_response_json(benchmark, zones):
+    body = benchmark(lambda: model_response(ZonesResponse, items=zones, total=len(zones)).body)
+    assert body.startswith(b'{"items":[')
+
+
+@pytest.mark.benchmark(group="serialization")
+def test_track_msgpack(benchmark, events):
+    payload = benchmark(lambda: encode_msgpack(to_columns(events)))
+    assert payload
+
+
+@pytest.mark.benchmark(group="serialization")
+def test_track_arrow(benchmark, events):
+    pytest.importorskip("pyarrow")
+    payload = benchmark(lambda: encode_arrow(to_columns(events)))
+    assert payload
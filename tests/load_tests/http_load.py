@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный генератор HTTP для настоящего API (FastAPI + БД).
+
+В отличие от testing.py, который пишет в Postgres напрямую, запросы идут
+через маршрутизацию, валидацию, сервисы и репозитории — измеряется именно
+пропускная способность эндпоинтов.
+
+Нагрузка открытая (open-loop): моменты отправки задаются расписанием
+прибытий (постоянный шаг или пуассоновский поток) и не ждут ответов на
+предыдущие запросы. Задержка считается от запланированного момента, так что
+отставание сервера не прячется за замедлившимся клиентом (coordinated
+omission), см. latency.py.
+
+Операции сценария:
+- ingest:         POST /events/ — событие датчика рядом с его позицией
+- map:            GET /objects/map/all — последние позиции всех объектов
+- zone_lookup:    GET /zones/?latitude=..&longitude=.. — зоны, содержащие точку
+- events_by_time: GET /events/?start_time=..&end_time=.. — события за окно
+
+Режимы запуска (из корня проекта):
+    # приложение в том же процессе через ASGITransport (нужна доступная БД)
+    python tests/load_tests/http_load.py --scenario tests/load_tests/scenarios/mixed.json
+
+    # uvicorn поднимается локально в отдельном процессе
+    python tests/load_tests/http_load.py --serve --workers 2 --rate 200 --duration 60
+
+    # уже запущенный сервер
+    python tests/load_tests/http_load.py --base-url http://localhost:8000 --mix ingest=8,map=1,zone_lookup=1
+
+В режимах in-process и --serve приложение запускается здесь, поэтому нужен
+JWT_SECRET_KEY (без него lifespan не стартует).
+
+В режиме in-process клиент и сервер делят один цикл событий: результат
+полезен для профилирования и сравнения версий, но не как оценка ёмкости.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import contextlib
+import importlib
+import itertools
+import json
+import math
+import random
+import subprocess
+import sys
+import time
+
+from collections.abc import AsyncIterator
+from collections.abc import Awaitable
+from collections.abc import Callable
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+
+import httpx
+
+from latency import LatencyRecorder
+from latency import format_table
+
+
+OPERATIONS = ("ingest", "map", "zone_lookup", "events_by_time")
+
+
+@dataclass
+class Phase:
+    """Участок сценария с постоянной или линейно меняющейся частотой прибытий."""
+
+    name: str
+    duration: float
+    rate: float
+    ramp_to: float | None = None
+    record: bool = True
+
+    def rate_at(self, elapsed: float) -> float:
+        if self.ramp_to is None or self.duration <= 0:
+            return self.rate
+        return self.rate + (self.ramp_to - self.rate) * min(elapsed / self.duration, 1.0)
+
+
+@dataclass
+class Scenario:
+    """Описание нагрузки; загружается из JSON, поля совпадают с ключами файла."""
+
+    prefix: str = "/api/v2"
+    mix: dict[str, float] = field(default_factory=lambda: {
+        "ingest": 6, "map": 1, "zone_lookup": 2, "events_by_time": 1,
+    })
+    phases: list[Phase] = field(default_factory=lambda: [
+        Phase("warmup", 10, 20, record=False),
+        Phase("steady", 60, 100),
+    ])
+    arrivals: str = "poisson"
+    max_in_flight: int = 1000
+    timeout: float = 10.0
+    center: tuple[float, float] = (60.1699, 24.9384)
+    spread_km: float = 25.0
+    events_window: float = 300.0
+    sensors_limit: int = 1000
+    seed: int | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Scenario:
+        data = dict(data)
+        if "phases" in data:
+            data["phases"] = [Phase(**phase) for phase in data["phases"]]
+        if "center" in data:
+            data["center"] = tuple(data["center"])
+        return cls(**data)
+
+    def validate(self) -> None:
+        unknown = set(self.mix) - set(OPERATIONS)
+        if unknown:
+            raise ValueError(f"Неизвестные операции в mix: {', '.join(sorted(unknown))}")
+        if not any(weight > 0 for weight in self.mix.values()):
+            raise ValueError("В mix нет операций с положительным весом")
+        if self.arrivals not in ("poisson", "constant"):
+            raise ValueError("arrivals: ожидается poisson или constant")
+        for phase in self.phases:
+            if phase.rate <= 0 or (phase.ramp_to is not None and phase.ramp_to <= 0):
+                raise ValueError(f"Фаза {phase.name}: частота должна быть положительной")
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    """Разбирает веса вида 'ingest=6,map=1'."""
+    mix = {}
+    for part in filter(None, (item.strip() for item in text.split(","))):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight) if weight else 1.0
+    return mix
+
+
+class Fixtures:
+    """Данные из API, на которых строятся запросы: датчики и их позиции."""
+
+    def __init__(self, scenario: Scenario, rng: random.Random):
+        self._scenario = scenario
+        self._rng = rng
+        self.sensors: list[tuple[str, float, float]] = []
+
+    async def load(self, client: httpx.AsyncClient) -> None:
+        response = await client.get(
+            f"{self._scenario.prefix}/sensors/", params={"limit": self._scenario.sensors_limit}
+        )
+        response.raise_for_status()
+        for sensor in response.json()["items"]:
+            latitude = sensor.get("latitude")
+            longitude = sensor.get("longitude")
+            if latitude is None or longitude is None:
+                latitude, longitude = self.random_point()
+            self.sensors.append((sensor["id"], latitude, longitude))
+
+    def random_point(
+        self, around: tuple[float, float] | None = None, spread_km: float | None = None
+    ) -> tuple[float, float]:
+        latitude, longitude = around or self._scenario.center
+        spread_km = self._scenario.spread_km if spread_km is None else spread_km
+        angle = self._rng.uniform(0, 2 * math.pi)
+        distance = self._rng.uniform(0, spread_km)
+        latitude += distance / 111.0 * math.cos(angle)
+        longitude += distance / (111.0 * math.cos(math.radians(latitude))) * math.sin(angle)
+        return latitude, longitude
+
+
+Request = Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]
+
+
+class RequestFactory:
+    """Строит запросы операций сценария."""
+
+    def __init__(self, scenario: Scenario, fixtures: Fixtures, rng: random.Random):
+        self._scenario = scenario
+        self._fixtures = fixtures
+        self._rng = rng
+        self._builders: dict[str, Callable[[], Request]] = {
+            "ingest": self.ingest,
+            "map": self.map,
+            "zone_lookup": self.zone_lookup,
+            "events_by_time": self.events_by_time,
+        }
+
+    def build(self, operation: str) -> Request:
+        return self._builders[operation]()
+
+    def ingest(self) -> Request:
+        sensor_id, latitude, longitude = self._rng.choice(self._fixtures.sensors)
+        latitude, longitude = self._fixtures.random_point((latitude, longitude), spread_km=0.5)
+        body = {
+            "sensor_id": sensor_id,
+            "timestamp": datetime.now().isoformat(),
+            "latitude": latitude,
+            "longitude": longitude,
+            "speed": round(self._rng.uniform(0, 120), 1),
+            "event_type": "move",
+        }
+        url = f"{self._scenario.prefix}/events/"
+        return lambda client: client.post(url, json=body)
+
+    def map(self) -> Request:
+        url = f"{self._scenario.prefix}/objects/map/all"
+        return lambda client: client.get(url)
+
+    def zone_lookup(self) -> Request:
+        latitude, longitude = self._fixtures.random_point()
+        url = f"{self._scenario.prefix}/zones/"
+        params = {"latitude": latitude, "longitude": longitude}
+        return lambda client: client.get(url, params=params)
+
+    def events_by_time(self) -> Request:
+        window = timedelta(seconds=self._scenario.events_window)
+        end = datetime.now() - timedelta(seconds=self._rng.uniform(0, 3600))
+        params = {"start_time": (end - window).isoformat(), "end_time": end.isoformat()}
+        url = f"{self._scenario.prefix}/events/"
+        return lambda client: client.get(url, params=params)
+
+
+class OperationPicker:
+    """Выбор операции по весам mix."""
+
+    def __init__(self, mix: dict[str, float], rng: random.Random):
+        self._operations = [name for name, weight in mix.items() if weight > 0]
+        self._cumulative = list(itertools.accumulate(mix[name] for name in self._operations))
+        self._rng = rng
+
+    def pick(self) -> str:
+        point = self._rng.uniform(0, self._cumulative[-1])
+        return self._operations[min(bisect.bisect_left(self._cumulative, point), len(self._operations) - 1)]
+
+
+class LoadGenerator:
+    """Открытая нагрузка: расписание прибытий не зависит от ответов."""
+
+    def __init__(self, scenario: Scenario, client: httpx.AsyncClient):
+        self._scenario = scenario
+        self._client = client
+        self._rng = random.Random(scenario.seed)
+        self._fixtures = Fixtures(scenario, self._rng)
+        self._requests = RequestFactory(scenario, self._fixtures, self._rng)
+        self._in_flight = asyncio.Semaphore(scenario.max_in_flight)
+        self._tasks: set[asyncio.Task] = set()
+        self.recorder = LatencyRecorder()
+        self.measured_seconds = 0.0
+
+    async def prepare(self) -> None:
+        mix = dict(self._scenario.mix)
+        if mix.get("ingest", 0) > 0:
+            await self._fixtures.load(self._client)
+            if not self._fixtures.sensors:
+                print("В БД нет датчиков: операция ingest исключена из mix", file=sys.stderr)
+                mix["ingest"] = 0
+        self._picker = OperationPicker(mix, self._rng)
+
+    async def run(self) -> LatencyRecorder:
+        for phase in self._scenario.phases:
+            recorder = self.recorder if phase.record else LatencyRecorder()
+            started = time.perf_counter()
+            await self._run_phase(phase, recorder)
+            if phase.record:
+                self.measured_seconds += time.perf_counter() - started
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        return self.recorder
+
+    async def _run_phase(self, phase: Phase, recorder: LatencyRecorder) -> None:
+        start = time.perf_counter()
+        intended = start
+        while True:
+            elapsed = intended - start
+            rate = phase.rate_at(elapsed)
+            gap = self._rng.expovariate(rate) if self._scenario.arrivals == "poisson" else 1.0 / rate
+            intended += gap
+            if intended - start >= phase.duration:
+                break
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # Отставший диспетчер не сдвигает расписание: задержка считается
+            # от intended, поэтому очередь на стороне клиента видна в результатах
+            operation = self._picker.pick()
+            task = asyncio.create_task(self._send(operation, self._requests.build(operation), intended, recorder))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, operation: str, request: Request, intended: float, recorder: LatencyRecorder) -> None:
+        async with self._in_flight:
+            started = time.perf_counter()
+            try:
+                response = await request(self._client)
+                await response.aread()
+            except httpx.HTTPError as e:
+                recorder.record_error(operation, e, intended, started, time.perf_counter())
+                return
+            recorder.record(operation, intended, started, time.perf_counter(), response.status_code)
+
+
+def load_app(spec: str, app_dir: str = "."):
+    # Как uvicorn --app-dir: модуль приложения ищется от корня проекта
+    app_dir = str(Path(app_dir).resolve())
+    if app_dir not in sys.path:
+        sys.path.insert(0, app_dir)
+    module_name, _, attribute = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attribute or "app")
+
+
+@contextlib.asynccontextmanager
+async def in_process_client(app_spec: str, app_dir: str, timeout: float) -> AsyncIterator[httpx.AsyncClient]:
+    """Клиент, вызывающий ASGI-приложение напрямую (с его lifespan)."""
+    app = load_app(app_spec, app_dir)
+    transport = httpx.ASGITransport(app=app)
+    client = httpx.AsyncClient(transport=transport, base_url="http://loadgen", timeout=timeout)
+    async with app.router.lifespan_context(app), client:
+        yield client
+
+
+@contextlib.asynccontextmanager
+async def http_client(base_url: str, timeout: float, max_connections: int) -> AsyncIterator[httpx.AsyncClient]:
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        yield client
+
+
+@contextlib.contextmanager
+def uvicorn_server(
+    app_spec: str, app_dir: str, port: int, workers: int, health_url: str, startup_timeout: float = 30.0
+):
+    """Поднимает uvicorn в отдельном процессе и ждёт ответа health-эндпоинта."""
+    command = [
+        sys.executable, "-m", "uvicorn", app_spec, "--app-dir", app_dir,
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+        "--no-access-log", "--log-level", "warning",
+    ]
+    process = subprocess.Popen(command)
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn завершился с кодом {process.returncode}")
+            with contextlib.suppress(httpx.HTTPError):
+                if httpx.get(health_url, timeout=1.0).status_code == 200:
+                    break
+            if time.monotonic() > deadline:
+                raise RuntimeError("uvicorn не ответил на health-запрос вовремя")
+            time.sleep(0.2)
+        yield
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def execute(
+    scenario: Scenario, client_context: contextlib.AbstractAsyncContextManager
+) -> tuple[dict, float, dict]:
+    async with client_context as client:
+        generator = LoadGenerator(scenario, client)
+        await generator.prepare()
+        recorder = await generator.run()
+    return recorder.summary(), generator.measured_seconds, recorder.encode()
+
+
+def build_scenario(args: argparse.Namespace) -> Scenario:
+    scenario = Scenario()
+    if args.scenario:
+        scenario = Scenario.from_dict(json.loads(Path(args.scenario).read_text(encoding="utf-8")))
+    if args.mix:
+        scenario.mix = parse_mix(args.mix)
+    if args.rate is not None or args.duration is not None:
+        steady = [phase for phase in scenario.phases if phase.record] or [Phase("steady", 60, 100)]
+        warmup = [phase for phase in scenario.phases if not phase.record]
+        scenario.phases = [*warmup, Phase(
+            "steady",
+            args.duration if args.duration is not None else steady[0].duration,
+            args.rate if args.rate is not None else steady[0].rate,
+        )]
+    if args.arrivals:
+        scenario.arrivals = args.arrivals
+    if args.seed is not None:
+        scenario.seed = args.seed
+    scenario.validate()
+    return scenario
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Открытая HTTP-нагрузка на API с HDR-гистограммами задержек")
+    parser.add_argument("--scenario", help="JSON-файл сценария (см. scenarios/)")
+    parser.add_argument("--mix", help="Веса операций, например ingest=6,map=1,zone_lookup=2,events_by_time=1")
+    parser.add_argument("--rate", type=float, help="Частота прибытий измеряемой фазы, запросов/с")
+    parser.add_argument("--duration", type=float, help="Длительность измеряемой фазы, с")
+    parser.add_argument("--arrivals", choices=("poisson", "constant"))
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--app", default="src.sensor_track_pro.api.main:app", help="ASGI-приложение module:attr")
+    parser.add_argument("--app-dir", default=".", help="Каталог, от которого импортируется приложение")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--base-url", help="Адрес уже запущенного сервера")
+    target.add_argument("--serve", action="store_true", help="Запустить uvicorn локально")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--output", help="Сохранить сводку и закодированные гистограммы в JSON")
+    args = parser.parse_args()
+
+    try:
+        scenario = build_scenario(args)
+    except (ValueError, TypeError) as e:
+        parser.error(str(e))
+
+    if args.serve:
+        base_url = f"http://127.0.0.1:{args.port}"
+        with uvicorn_server(args.app, args.app_dir, args.port, args.workers, f"{base_url}{scenario.prefix}/health"):
+            client = http_client(base_url, scenario.timeout, scenario.max_in_flight)
+            summary, duration, histograms = asyncio.run(execute(scenario, client))
+        target_name = f"uvicorn x{args.workers}"
+    elif args.base_url:
+        client = http_client(args.base_url, scenario.timeout, scenario.max_in_flight)
+        summary, duration, histograms = asyncio.run(execute(scenario, client))
+        target_name = args.base_url
+    else:
+        client = in_process_client(args.app, args.app_dir, scenario.timeout)
+        summary, duration, histograms = asyncio.run(execute(scenario, client))
+        target_name = "in-process"
+
+    print(f"Цель: {target_name}, измерено {duration:.1f} с, задержки в мс от запланированного момента отправки")
+    print(format_table(summary, duration))
+    if args.output:
+        report = {
+            "target": target_name,
+            "scenario": asdict(scenario),
+            "duration": duration,
+            "summary": summary,
+            "histograms": histograms,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
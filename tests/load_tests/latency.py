@@ -0,0 +1,190 @@
+"""
+Запись задержек в HDR-гистограммы с учётом coordinated omission.
+
+Задержка запроса считается от *запланированного* момента отправки, а не от
+фактического: если генератор или сервер отстали и запрос ушёл позже, время
+ожидания в очереди входит в результат. Отдельно ведётся время обслуживания
+(от фактической отправки до ответа) — разница между двумя распределениями
+показывает, сколько задержки набежало из-за очереди. Ошибки и таймауты
+входят в оба распределения со временем до отказа — иначе самые медленные
+исходы выпали бы из перцентилей — и отдельно попадают в распределение ошибок.
+
+Значения хранятся в микросекундах; гистограммы сериализуются в стандартный
+сжатый base64-формат HdrHistogram и могут объединяться между прогонами.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from dataclasses import field
+
+from hdrh.histogram import HdrHistogram
+
+
+LOWEST_US = 1
+HIGHEST_US = 120_000_000
+SIGNIFICANT_FIGURES = 3
+PERCENTILES = (50.0, 90.0, 99.0, 99.9, 99.99)
+
+
+def new_histogram() -> HdrHistogram:
+    return HdrHistogram(LOWEST_US, HIGHEST_US, SIGNIFICANT_FIGURES)
+
+
+def _clamp_us(seconds: float) -> int:
+    return min(max(int(seconds * 1_000_000), LOWEST_US), HIGHEST_US)
+
+
+@dataclass
+class OperationStats:
+    """Распределения и счётчики одной операции."""
+
+    response: HdrHistogram = field(default_factory=new_histogram)
+    service: HdrHistogram = field(default_factory=new_histogram)
+    error: HdrHistogram = field(default_factory=new_histogram)
+    statuses: Counter[str] = field(default_factory=Counter)
+    errors: int = 0
+
+    def summary(self) -> dict:
+        return {
+            "count": self.response.get_total_count(),
+            "errors": self.errors,
+            "statuses": dict(self.statuses),
+            "response_ms": histogram_summary(self.response),
+            "service_ms": histogram_summary(self.service),
+            "error_ms": histogram_summary(self.error),
+        }
+
+    def encode(self) -> dict[str, str]:
+        return {
+            "response": self.response.encode().decode(),
+            "service": self.service.encode().decode(),
+            "error": self.error.encode().decode(),
+        }
+
+
+def histogram_summary(histogram: HdrHistogram) -> dict[str, float]:
+    """Перцентили, среднее и максимум гистограммы в миллисекундах."""
+    if histogram.get_total_count() == 0:
+        return {}
+    summary = {f"p{p:g}": histogram.get_value_at_percentile(p) / 1000 for p in PERCENTILES}
+    summary["mean"] = histogram.get_mean_value() / 1000
+    summary["max"] = histogram.get_max_value() / 1000
+    return summary
+
+
+class LatencyRecorder:
+    """Гистограммы по операциям и общая сводная."""
+
+    def __init__(self) -> None:
+        self.operations: dict[str, OperationStats] = {}
+        self.total = OperationStats()
+
+    def _stats(self, operation: str) -> OperationStats:
+        stats = self.operations.get(operation)
+        if stats is None:
+            stats = self.operations[operation] = OperationStats()
+        return stats
+
+    def record(self, operation: str, intended: float, started: float, finished: float, status: int) -> None:
+        """
+        Учитывает завершённый запрос; статус 400 и выше — ошибка.
+
+        Args:
+            operation: Имя операции сценария
+            intended: Запланированный момент отправки (time.perf_counter)
+            started: Фактический момент отправки
+            finished: Момент получения ответа
+            status: HTTP-статус ответа
+        """
+        self._record(operation, str(status), status >= 400, intended, started, finished)
+
+    def record_error(
+        self, operation: str, error: BaseException, intended: float, started: float, finished: float
+    ) -> None:
+        """
+        Учитывает запрос, не получивший ответа (таймаут, обрыв соединения).
+
+        Задержка — до момента отказа, для таймаута это не меньше самого таймаута.
+        """
+        self._record(operation, type(error).__name__, True, intended, started, finished)
+
+    def _record(
+        self, operation: str, outcome: str, failed: bool, intended: float, started: float, finished: float
+    ) -> None:
+        response_us = _clamp_us(finished - intended)
+        for stats in (self._stats(operation), self.total):
+            stats.statuses[outcome] += 1
+            stats.response.record_value(response_us)
+            stats.service.record_value(_clamp_us(finished - started))
+            if failed:
+                stats.errors += 1
+                stats.error.record_value(response_us)
+
+    def summary(self) -> dict:
+        return {
+            "total": self.total.summary(),
+            "operations": {name: stats.summary() for name, stats in sorted(self.operations.items())},
+        }
+
+    def encode(self) -> dict:
+        return {
+            "total": self.total.encode(),
+            "operations": {name: stats.encode() for name, stats in sorted(self.operations.items())},
+        }
+
+
+def decode_histogram(encoded: str) -> HdrHistogram:
+    return HdrHistogram.decode(encoded)
+
+
+def format_table(summary: dict, duration: float) -> str:
+    """Текстовая таблица перцентилей времени ответа по операциям."""
+    width = max(16, *(len(name) + 2 for name in summary["operations"]))
+    header = f"{'operation':<{width}}{'count':>9}{'err':>7}{'rps':>9}" + "".join(
+        f"{'p' + format(p, 'g'):>10}" for p in PERCENTILES
+    ) + f"{'max':>10}"
+    lines = [header, "-" * len(header)]
+    rows = [*summary["operations"].items(), ("TOTAL", summary["total"])]
+    for name, stats in rows:
+        response = stats["response_ms"]
+        rps = stats["count"] / duration if duration > 0 else 0.0
+        cells = "".join(f"{response.get(f'p{p:g}', 0.0):>10.2f}" for p in PERCENTILES)
+        lines.append(
+            f"{name:<{width}}{stats['count']:>9}{stats['errors']:>7}{rps:>9.1f}{cells}{response.get('max', 0.0):>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(baseline: dict, current: dict, percentiles: tuple[float, ...] = (50.0, 99.0, 99.9)) -> str:
+    """
+    Сравнение двух сводок (summary) по операциям: значения базового и текущего
+    прогона и изменение в процентах. Операции, которых нет в одной из сводок,
+    показываются с прочерком.
+    """
+    keys = [f"p{p:g}" for p in percentiles]
+    names = sorted(set(baseline["operations"]) | set(current["operations"]))
+    width = max(16, *(len(name) + 2 for name in names))
+    header = f"{'operation':<{width}}{'count':>14}" + "".join(f"{key:>26}" for key in keys)
+    lines = [header, "-" * len(header)]
+    rows = [(name, baseline["operations"].get(name), current["operations"].get(name)) for name in names]
+    rows.append(("TOTAL", baseline["total"], current["total"]))
+    for name, before, after in rows:
+        counts = f"{_count(before)}/{_count(after)}"
+        cells = "".join(f"{_delta(before, after, key):>26}" for key in keys)
+        lines.append(f"{name:<{width}}{counts:>14}{cells}")
+    return "\n".join(lines)
+
+
+def _count(stats: dict | None) -> str:
+    return "-" if stats is None else str(stats["count"])
+
+
+def _delta(before: dict | None, after: dict | None, key: str) -> str:
+    old = (before or {}).get("response_ms", {}).get(key)
+    new = (after or {}).get("response_ms", {}).get(key)
+    if old is None or new is None:
+        return "-"
+    change = f"{(new - old) / old * 100:+.1f}%" if old > 0 else "n/a"
+    return f"{old:.2f} -> {new:.2f} ({change})"
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Воспроизведение записанного трафика API с исходными интервалами.
+
+Журнал пишет TrafficCaptureMiddleware (API_CAPTURE_PATH, см. api/config.py):
+по строке JSONL на запрос. Здесь запросы отправляются заново в моменты,
+соответствующие исходным (--speed 1), или в N раз чаще (--speed N) —
+так сравниваются изменения на реальной смеси запросов, а не на
+синтетической. Отправка открытая: расписание не ждёт ответов, задержка
+считается от запланированного момента (см. latency.py).
+
+Запросы группируются в операции «МЕТОД путь», где UUID и числа в пути
+заменены на {id}. Результат сравнивается:
+- с --compare: с сохранённым ранее прогоном (--output), например до изменения;
+- иначе — с длительностями из журнала (время обработки на сервере при записи).
+
+Запуск из корня проекта:
+    python tests/load_tests/replay.py capture/traffic-*.jsonl --serve --speed 2 --output after.json
+    python tests/load_tests/replay.py capture/traffic-*.jsonl --base-url http://localhost:8000 --compare after.json
+
+Заголовки Authorization в журнал не попадают; для защищённых эндпоинтов
+передайте их через --header. Запросы с обрезанным или скрытым телом
+(учётные данные, см. body_redacted) пропускаются.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import re
+import sys
+import time
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+
+from http_load import http_client
+from http_load import in_process_client
+from http_load import uvicorn_server
+from latency import LatencyRecorder
+from latency import format_comparison
+from latency import format_table
+
+
+_ID_SEGMENT = re.compile(r"/(?:[0-9a-fA-F]{8}(?:-?[0-9a-fA-F]{4}){3}-?[0-9a-fA-F]{12}|\d+)(?=/|$)")
+
+
+def operation_name(method: str, path: str) -> str:
+    return f"{method} {_ID_SEGMENT.sub('/{id}', path)}"
+
+
+@dataclass
+class CapturedRequest:
+    offset: float
+    method: str
+    path: str
+    query: str
+    headers: dict[str, str]
+    body: bytes | None
+    status: int
+    duration_ms: float
+
+    @property
+    def operation(self) -> str:
+        return operation_name(self.method, self.path)
+
+
+def decode_body(record: dict) -> bytes | None:
+    """Тело запроса из записи журнала (см. capture.encode_body)."""
+    if "body" not in record:
+        return None
+    if record.get("body_encoding") == "base64":
+        return base64.b64decode(record["body"])
+    return record["body"].encode("utf-8")
+
+
+def load_capture(paths: list[str]) -> tuple[list[CapturedRequest], int]:
+    """
+    Читает журналы (например, по файлу на воркер) и сортирует запросы по
+    времени прихода. Возвращает запросы и число пропущенных записей с
+    обрезанным или скрытым телом.
+    """
+    records = []
+    skipped = 0
+    for path in paths:
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record.get("body_truncated") or record.get("body_redacted"):
+                    skipped += 1
+                    continue
+                records.append(record)
+    records.sort(key=lambda record: record["ts"])
+    start = records[0]["ts"] if records else 0.0
+    requests = [
+        CapturedRequest(
+            offset=record["ts"] - start,
+            method=record["method"],
+            path=record["path"],
+            query=record.get("query", ""),
+            headers=record.get("headers", {}),
+            body=decode_body(record),
+            status=record.get("status", 0),
+            duration_ms=record.get("duration_ms", 0.0),
+        )
+        for record in records
+    ]
+    return requests, skipped
+
+
+def captured_recorder(requests: list[CapturedRequest]) -> LatencyRecorder:
+    """Распределения длительностей, измеренных сервером при записи."""
+    recorder = LatencyRecorder()
+    for request in requests:
+        recorder.record(request.operation, 0.0, 0.0, request.duration_ms / 1000, request.status)
+    return recorder
+
+
+class Replayer:
+    """Открытое воспроизведение журнала с ускорением speed."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        requests: list[CapturedRequest],
+        speed: float = 1.0,
+        max_in_flight: int = 1000,
+        extra_headers: dict[str, str] | None = None,
+    ):
+        self._client = client
+        self._requests = requests
+        self._speed = speed
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._extra_headers = extra_headers or {}
+        self.recorder = LatencyRecorder()
+
+    async def run(self) -> float:
+        """Отправляет все запросы и возвращает длительность воспроизведения."""
+        tasks = []
+        start = time.perf_counter()
+        for request in self._requests:
+            intended = start + request.offset / self._speed
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self._send(request, intended)))
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - start
+
+    async def _send(self, request: CapturedRequest, intended: float) -> None:
+        url = f"{request.path}?{request.query}" if request.query else request.path
+        headers = {**request.headers, **self._extra_headers}
+        async with self._in_flight:
+            started = time.perf_counter()
+            try:
+                response = await self._client.request(request.method, url, content=request.body, headers=headers)
+            except httpx.HTTPError as e:
+                self.recorder.record_error(request.operation, e, intended, started, time.perf_counter())
+                return
+            self.recorder.record(request.operation, intended, started, time.perf_counter(), response.status_code)
+
+
+async def replay(client_context, requests: list[CapturedRequest], args: argparse.Namespace) -> tuple[dict, float, dict]:
+    async with client_context as client:
+        replayer = Replayer(client, requests, args.speed, args.max_in_flight, parse_headers(args.header))
+        duration = await replayer.run()
+    return replayer.recorder.summary(), duration, replayer.recorder.encode()
+
+
+def parse_headers(values: list[str]) -> dict[str, str]:
+    headers = {}
+    for value in values:
+        name, _, content = value.partition(":")
+        headers[name.strip()] = content.strip()
+    return headers
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Воспроизведение записанного трафика API")
+    parser.add_argument("capture", nargs="+", help="JSONL-журналы TrafficCaptureMiddleware")
+    parser.add_argument("--speed", type=float, default=1.0, help="Ускорение относительно записи (1 — как было)")
+    parser.add_argument("--limit", type=int, help="Воспроизвести только первые N запросов")
+    parser.add_argument("--header", action="append", default=[], help="Дополнительный заголовок 'Имя: значение'")
+    parser.add_argument("--max-in-flight", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--app", default="src.sensor_track_pro.api.main:app", help="ASGI-приложение module:attr")
+    parser.add_argument("--app-dir", default=".", help="Каталог, от которого импортируется приложение")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--base-url", help="Адрес уже запущенного сервера")
+    target.add_argument("--serve", action="store_true", help="Запустить uvicorn локально")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--compare", help="JSON прошлого прогона (--output) для сравнения")
+    parser.add_argument("--output", help="Сохранить сводку и закодированные гистограммы в JSON")
+    args = parser.parse_args()
+    if args.speed <= 0:
+        parser.error("--speed должен быть положительным")
+
+    requests, skipped = load_capture(args.capture)
+    if args.limit is not None:
+        requests = requests[:args.limit]
+    if not requests:
+        parser.error("В журнале нет запросов для воспроизведения")
+    if skipped:
+        print(f"Пропущено запросов с обрезанным или скрытым телом: {skipped}", file=sys.stderr)
+
+    if args.serve:
+        base_url = f"http://127.0.0.1:{args.port}"
+        with uvicorn_server(args.app, args.app_dir, args.port, args.workers, f"{base_url}/api/v2/health"):
+            client = http_client(base_url, args.timeout, args.max_in_flight)
+            summary, duration, histograms = asyncio.run(replay(client, requests, args))
+        target_name = f"uvicorn x{args.workers}"
+    elif args.base_url:
+        client = http_client(args.base_url, args.timeout, args.max_in_flight)
+        summary, duration, histograms = asyncio.run(replay(client, requests, args))
+        target_name = args.base_url
+    else:
+        client = in_process_client(args.app, args.app_dir, args.timeout)
+        summary, duration, histograms = asyncio.run(replay(client, requests, args))
+        target_name = "in-process"
+
+    recorded = requests[-1].offset
+    print(
+        f"Цель: {target_name}, {len(requests)} запросов, запись {recorded:.1f} с, "
+        f"воспроизведение x{args.speed:g} за {duration:.1f} с"
+    )
+    print(format_table(summary, duration))
+    print()
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        print(f"Сравнение с {args.compare} ({baseline.get('target', '?')}), мс от запланированного момента:")
+        print(format_comparison(baseline["summary"], summary))
+    else:
+        print("Сравнение с длительностями из журнала (время на сервере при записи -> ответ при воспроизведении):")
+        print(format_comparison(captured_recorder(requests).summary(), summary))
+
+    if args.output:
+        report = {
+            "target": target_name,
+            "capture": args.capture,
+            "speed": args.speed,
+            "duration": duration,
+            "summary": summary,
+            "histograms": histograms,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Сравнение пропускной способности сериализации списков событий и зон.
+
+Три варианта одного и того же ответа {items, total}:
+- baseline: response_model + JSONResponse (повторная проверка, jsonable_encoder, json.dumps)
+- orjson:   response_model + ORJSONResponse (повторная проверка, jsonable_encoder, orjson)
+- fast:     model_response (model_construct + сериализация pydantic-core без проверки)
+
+Запуск из корня проекта:
+    python tests/load_tests/serialization_benchmark.py --sizes 100 1000 10000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from datetime import datetime, timedelta
+
+import httpx
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from src.sensor_track_pro.api.responses import model_response
+from src.sensor_track_pro.api.routers.v2.events import EventsResponse
+from src.sensor_track_pro.api.routers.v2.zones import ZonesResponse
+from src.sensor_track_pro.business_logic.models.event_model import EventModel, EventType
+from src.sensor_track_pro.business_logic.models.zone_model import PolygoneZone, Point, ZoneModel, ZoneType
+
+
+def make_events(n: int) -> list[EventModel]:
+    now = datetime(2025, 1, 1)
+    return [
+        EventModel(
+            id=uuid.uuid4(), sensor_id=uuid.uuid4(), timestamp=now + timedelta(seconds=i),
+            latitude=55.0 + i * 1e-5, longitude=37.0 + i * 1e-5, speed=40.0,
+            event_type=EventType.MOVE, details=None, created_at=now, updated_at=now,
+        )
+        for i in range(n)
+    ]
+
+
+def make_zones(n: int) -> list[ZoneModel]:
+    polygon = PolygoneZone(points=[Point(55.0, 37.0), Point(55.1, 37.0), Point(55.1, 37.1), Point(55.0, 37.1)])
+    return [
+        ZoneModel(name=f"zone-{i}", zone_type=ZoneType.POLYGON, coordinates=polygon, description=None)
+        for i in range(n)
+    ]
+
+
+def validated_endpoint(response_type: type, items: list):
+    async def endpoint():
+        return response_type(items=items, total=len(items))
+    return endpoint
+
+
+def fast_endpoint(response_type: type, items: list):
+    async def endpoint():
+        return model_response(response_type, items=items, total=len(items))
+    return endpoint
+
+
+def build_app(events: list[EventModel], zones: list[ZoneModel]) -> FastAPI:
+    app = FastAPI()
+    for name, response_type, items in (("events", EventsResponse, events), ("zones", ZonesResponse, zones)):
+        app.add_api_route(f"/baseline/{name}", validated_endpoint(response_type, items),
+                          response_model=response_type, response_class=JSONResponse)
+        app.add_api_route(f"/orjson/{name}", validated_endpoint(response_type, items),
+                          response_model=response_type, response_class=ORJSONResponse)
+        app.add_api_route(f"/fast/{name}", fast_endpoint(response_type, items), response_model=response_type)
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, duration: float) -> tuple[float, int]:
+    body = (await client.get(path)).content  # прогрев
+    count = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < duration:
+        response = await client.get(path)
+        assert response.status_code == 200
+        count += 1
+    return count / (time.perf_counter() - started), len(body)
+
+
+async def main(sizes: list[int], duration: float) -> None:
+    print(f"{'payload':<8} {'items':>6} {'variant':<9} {'req/s':>9} {'items/s':>11} {'speedup':>8} {'bytes':>10}")
+    for size in sizes:
+        app = build_app(make_events(size), make_zones(size))
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            for name in ("events", "zones"):
+                baseline = None
+                for variant in ("baseline", "orjson", "fast"):
+                    rps, size_bytes = await measure(client, f"/{variant}/{name}", duration)
+                    baseline = baseline or rps
+                    print(f"{name:<8} {size:>6} {variant:<9} {rps:>9.1f} {rps * size:>11.0f} "
+                          f"{rps / baseline:>7.2f}x {size_bytes:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк сериализации ответов API")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--duration", type=float, default=3.0, help="Секунд на каждый вариант")
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.duration))
@@ -0,0 +1,151 @@
+import unittest
+import uuid
+import allure
+import httpx
+from datetime import datetime
+from unittest.mock import AsyncMock
+from conftest import record_pid
+
+from fastapi import FastAPI
+
+from src.sensor_track_pro.api.routers.v1 import sensors as sensors_v1
+from src.sensor_track_pro.api.routers.v1 import zones as zones_v1
+from src.sensor_track_pro.api.routers.v2 import zones as zones_v2
+from src.sensor_track_pro.api.versions import LazyApp
+from src.sensor_track_pro.api.versions import mount_versions
+from src.sensor_track_pro.business_logic.models.common_types import EntityVersion
+from src.sensor_track_pro.business_logic.models.sensor_model import SensorModel
+from src.sensor_track_pro.business_logic.models.sensor_model import SensorStatus
+from src.sensor_track_pro.business_logic.models.sensor_model import SensorType
+from src.sensor_track_pro.business_logic.services.sensor_service import SensorService
+from src.sensor_track_pro.business_logic.services.zone_service import ZoneService
+
+
+def make_sensor(sensor_type: SensorType, status: SensorStatus) -> SensorModel:
+    return SensorModel(
+        id=uuid.uuid4(),
+        object_id=uuid.uuid4(),
+        type=sensor_type,
+        location="cab",
+        status=status,
+        created_at=datetime(2025, 1, 1),
+        updated_at=datetime(2025, 1, 1),
+    )
+
+
+@allure.epic("API")
+@allure.feature("Versions")
+class TestVersionAdapters(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.zone_repo = AsyncMock()
+        self.zone_repo.get_all.return_value = []
+        self.zone_repo.get_version.return_value = EntityVersion(1, None)
+
+        app = FastAPI()
+        app.include_router(zones_v1.router, prefix="/v1/zones")
+        app.include_router(zones_v2.router, prefix="/v2/zones")
+        # Обе версии используют один провайдер сервиса из общего слоя
+        app.dependency_overrides[zones_v1.get_zone_service] = lambda: ZoneService(self.zone_repo)
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+        record_pid()
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    @allure.story("Shared Handlers")
+    async def test_same_handler_with_version_flags(self):
+        v1 = await self.client.get("/v1/zones/")
+        v2 = await self.client.get("/v2/zones/")
+        self.assertEqual(v1.json(), v2.json())
+        self.assertNotIn("etag", v1.headers)
+        self.assertIn("etag", v2.headers)
+        self.assertIs(zones_v1.get_zone_service, zones_v2.get_zone_service)
+
+    @allure.story("Version Routes")
+    async def test_v2_only_routes_not_in_v1(self):
+        response = await self.client.get("/v1/zones/analytics/dwell", params={"start_time": "2025-01-01T00:00:00"})
+        self.assertEqual(response.status_code, 404)
+        v2_paths = {route.path for route in zones_v2.router.routes}
+        self.assertIn("/analytics/dwell", v2_paths)
+        self.assertNotIn("/analytics/dwell", {route.path for route in zones_v1.router.routes})
+
+
+@allure.epic("API")
+@allure.feature("Versions")
+class TestSharedHandlers(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.sensor_repo = AsyncMock()
+        app = FastAPI()
+        app.include_router(sensors_v1.router, prefix="/v1/sensors")
+        app.dependency_overrides[sensors_v1.get_sensor_service] = lambda: SensorService(self.sensor_repo)
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+        record_pid()
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    @allure.story("Sensor Filters")
+    async def test_sensors_filtered_by_type_and_status(self):
+        wanted = make_sensor(SensorType.GPS, SensorStatus.ACTIVE)
+        self.sensor_repo.get_all.return_value = [
+            wanted,
+            make_sensor(SensorType.FUEL, SensorStatus.ACTIVE),
+            make_sensor(SensorType.GPS, SensorStatus.INACTIVE),
+        ]
+        response = await self.client.get("/v1/sensors/", params={"sensor_type": "gps", "status": "active"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["id"] for item in response.json()["items"]], [str(wanted.id)])
+
+    @allure.story("Partial Update")
+    async def test_update_passes_only_sent_fields(self):
+        sensor = make_sensor(SensorType.GPS, SensorStatus.ACTIVE)
+        self.sensor_repo.update.return_value = sensor
+        response = await self.client.put(
+            f"/v1/sensors/{sensor.id}",
+            json={"object_id": str(sensor.object_id), "type": "gps", "location": "cab"},
+        )
+        self.assertEqual(response.status_code, 200)
+        _, values = self.sensor_repo.update.await_args.args
+        self.assertEqual(values, {"object_id": sensor.object_id, "sensor_type": SensorType.GPS, "location": "cab"})
+
+
+@allure.epic("API")
+@allure.feature("Versions")
+class TestLazyMount(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        record_pid()
+
+    @allure.story("Lazy Loading")
+    async def test_sub_app_built_on_first_request(self):
+        calls = []
+
+        def factory() -> FastAPI:
+            calls.append(1)
+            sub_app = FastAPI()
+
+            @sub_app.get("/ping")
+            async def ping() -> dict:
+                return {"ok": True}
+
+            return sub_app
+
+        lazy = LazyApp(factory)
+        app = FastAPI()
+        app.mount("/api/test", lazy)
+        self.assertFalse(lazy.loaded)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            first = await client.get("/api/test/ping")
+            second = await client.get("/api/test/ping")
+        self.assertEqual(first.json(), {"ok": True})
+        self.assertEqual(second.status_code, 200)
+        self.assertTrue(lazy.loaded)
+        self.assertEqual(calls, [1])
+
+    @allure.story("Mounted Versions")
+    def test_only_listed_versions_mounted(self):
+        app = FastAPI()
+        mounted = mount_versions(app, ["v2"])
+        self.assertEqual(list(mounted), ["v2"])
+        self.assertFalse(mounted["v2"].loaded)
+        with self.assertRaises(ValueError):
+            mount_versions(FastAPI(), ["v3"])
@@ -0,0 +1,115 @@
+import gzip
+import unittest
+import zlib
+import allure
+import httpx
+from conftest import record_pid
+
+from fastapi import FastAPI
+from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
+
+from src.sensor_track_pro.api.middleware.compression import CompressionMiddleware
+from src.sensor_track_pro.api.middleware.compression import zstandard
+from src.sensor_track_pro.api.middleware.compression import select_encoding
+
+
+PAYLOAD = b'{"latitude": 55.75, "longitude": 37.62}' * 200
+
+
+def build_app(chunks_seen: list[int]) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/small")
+    async def small() -> Response:
+        return Response(b"ok", media_type="application/json")
+
+    @app.get("/large")
+    async def large() -> Response:
+        return Response(PAYLOAD, media_type="application/json")
+
+    @app.get("/image")
+    async def image() -> Response:
+        return Response(PAYLOAD, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def body():
+            for i in range(3):
+                chunks_seen.append(i)
+                yield PAYLOAD
+        return StreamingResponse(body(), media_type="application/x-ndjson")
+
+    return app
+
+
+@allure.epic("API")
+@allure.feature("Compression Middleware")
+class TestCompressionMiddleware(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.chunks_seen: list[int] = []
+        transport = httpx.ASGITransport(app=build_app(self.chunks_seen))
+        self.client = httpx.AsyncClient(transport=transport, base_url="http://test")
+        record_pid()
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    async def get_raw(self, path: str, accept_encoding: str) -> tuple[httpx.Response, bytes]:
+        request = self.client.build_request("GET", path, headers={"Accept-Encoding": accept_encoding})
+        response = await self.client.send(request, stream=True)
+        body = b"".join([chunk async for chunk in response.aiter_raw()])
+        return response, body
+
+    @allure.story("Below Threshold")
+    async def test_small_not_compressed(self):
+        response, body = await self.get_raw("/small", "gzip")
+        self.assertNotIn("content-encoding", response.headers)
+        self.assertEqual(body, b"ok")
+
+    @allure.story("Gzip")
+    async def test_large_gzip(self):
+        response, body = await self.get_raw("/large", "gzip")
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["vary"])
+        self.assertEqual(int(response.headers["content-length"]), len(body))
+        self.assertEqual(gzip.decompress(body), PAYLOAD)
+
+    @allure.story("Server Preference")
+    @unittest.skipIf(zstandard is None, "zstandard не установлен")
+    async def test_zstd_preferred(self):
+        response, body = await self.get_raw("/large", "gzip, zstd, br;q=0")
+        self.assertEqual(response.headers["content-encoding"], "zstd")
+        self.assertEqual(zstandard.ZstdDecompressor().decompressobj().decompress(body), PAYLOAD)
+
+    @allure.story("Incompressible Types")
+    async def test_image_passthrough(self):
+        response, _ = await self.get_raw("/image", "gzip")
+        self.assertNotIn("content-encoding", response.headers)
+
+    @allure.story("Streaming")
+    async def test_streaming_gzip(self):
+        request = self.client.build_request("GET", "/stream", headers={"Accept-Encoding": "gzip"})
+        response = await self.client.send(request, stream=True)
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertNotIn("content-length", response.headers)
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        body = b""
+        async for chunk in response.aiter_raw():
+            # Каждая часть сжата с flush и распаковывается сразу, без конца потока
+            body += decompressor.decompress(chunk)
+        self.assertEqual(body, PAYLOAD * 3)
+        self.assertEqual(self.chunks_seen, [0, 1, 2])
+
+    @allure.story("Accept-Encoding Parsing")
+    def test_select_encoding(self):
+        self.assertEqual(select_encoding("gzip;q=0.5, br", ("zstd", "br", "gzip")), "br")
+        self.assertEqual(select_encoding("*", ("zstd", "gzip")), "zstd")
+        self.assertEqual(select_encoding("*, zstd;q=0", ("zstd", "gzip")), "gzip")
+        self.assertIsNone(select_encoding("identity", ("gzip",)))
+        self.assertIsNone(select_encoding("", ("gzip",)))
+
+
+if __name__ == '__main__':
+    unittest.main()
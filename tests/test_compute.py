@@ -0,0 +1,102 @@
+import math
+import os
+import unittest
+import uuid
+import allure
+import numpy as np
+from datetime import datetime
+from datetime import timedelta
+from unittest.mock import AsyncMock
+from conftest import record_pid
+
+from src.sensor_track_pro.business_logic.analytics.geo import circle_ring
+from src.sensor_track_pro.business_logic.analytics.geo import ring_wkt
+from src.sensor_track_pro.business_logic.analytics.track_simplification import simplify_indices
+from src.sensor_track_pro.business_logic.models.trip_model import TrackPoint
+from src.sensor_track_pro.business_logic.services.event_service import EventService
+from src.sensor_track_pro.compute import ComputePool
+
+
+def make_track(n: int) -> list[TrackPoint]:
+    # Зигзаг вдоль долготы: каждая вершина отклоняется примерно на 110 м
+    start = datetime(2025, 1, 1)
+    return [
+        TrackPoint(start + timedelta(seconds=i), 55.0 + (0.001 if i % 10 == 5 else 0.0), 37.0 + i * 1e-4, None)
+        for i in range(n)
+    ]
+
+
+def chunk_sum(values: np.ndarray) -> float:
+    return float(values.sum())
+
+
+@allure.epic("Analytics")
+@allure.feature("Geometry")
+class TestGeometryKernels(unittest.TestCase):
+    def setUp(self):
+        record_pid()
+
+    @allure.story("Zone Polygons")
+    def test_ring_closed_once(self):
+        wkt = ring_wkt(np.array([37.0, 37.1, 37.1]), np.array([55.0, 55.0, 55.1]))
+        self.assertEqual(wkt, "POLYGON((37.0 55.0, 37.1 55.0, 37.1 55.1, 37.0 55.0))")
+        closed = ring_wkt(np.array([37.0, 37.1, 37.1, 37.0]), np.array([55.0, 55.0, 55.1, 55.0]))
+        self.assertEqual(closed, wkt)
+
+    @allure.story("Zone Polygons")
+    def test_circle_ring_radius(self):
+        longitudes, latitudes = circle_ring(55.0, 37.0, 1000.0)
+        self.assertEqual(len(longitudes), 64)
+        north = (latitudes.max() - 55.0) * math.radians(1.0) * 6378137.0
+        self.assertAlmostEqual(north, 1000.0, delta=1.0)
+
+    @allure.story("Track Simplification")
+    def test_simplification_keeps_deviations_above_tolerance(self):
+        track = make_track(101)
+        latitudes = np.array([p.latitude for p in track])
+        longitudes = np.array([p.longitude for p in track])
+        coarse = simplify_indices(latitudes, longitudes, 500.0)
+        fine = simplify_indices(latitudes, longitudes, 50.0)
+        self.assertEqual(coarse.tolist(), [0, 100])
+        self.assertTrue(set(range(5, 100, 10)) <= set(fine.tolist()))
+        self.assertEqual(simplify_indices(latitudes[:2], longitudes[:2], 1.0).tolist(), [0, 1])
+
+
+@allure.epic("Compute")
+@allure.feature("Process Pool")
+class TestComputePool(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        record_pid()
+
+    @allure.story("Chunks")
+    async def test_chunks_overlap_and_offsets(self):
+        pool = ComputePool(workers=0, chunk_size=4)
+        values = np.arange(10, dtype=np.float64)
+        chunks = await pool.map_chunks(chunk_sum, values, overlap=1)
+        self.assertEqual([offset for offset, _ in chunks], [0, 4, 8])
+        self.assertEqual([total for _, total in chunks], [10.0, 30.0, 17.0])
+
+    @allure.story("Inline Threshold")
+    async def test_small_work_runs_in_place(self):
+        pool = ComputePool(workers=1, chunk_size=100)
+        await pool.start()
+        try:
+            self.assertEqual(await pool.run(os.getpid, size=10), os.getpid())
+            self.assertNotEqual(await pool.run(os.getpid, size=100), os.getpid())
+        finally:
+            await pool.stop()
+        self.assertFalse(pool.started)
+
+    @allure.story("Track Simplification")
+    async def test_service_simplifies_track_in_chunks(self):
+        repo = AsyncMock()
+        repo.get_track.return_value = make_track(1000)
+        service = EventService(repo, ComputePool(workers=0, chunk_size=64))
+        sensor_id = uuid.uuid4()
+        full = await service.get_track(sensor_id)
+        simplified = await service.get_track(sensor_id, tolerance=50.0)
+        self.assertEqual(len(full), 1000)
+        self.assertLess(len(simplified), 250)
+        self.assertEqual((simplified[0], simplified[-1]), (full[0], full[-1]))
+        # Вершины зигзага сохраняются и на границах кусков
+        self.assertTrue({p.timestamp for p in full[5::10]} <= {p.timestamp for p in simplified})
@@ -1,9 +1,18 @@
+import math
 import unittest
 from unittest.mock import AsyncMock
 from uuid import uuid4
 from datetime import datetime
 from conftest import record_pid
 
+from src.sensor_track_pro.api.responses import ARROW_STREAM_MEDIA_TYPE
+from src.sensor_track_pro.api.responses import MSGPACK_MEDIA_TYPE
+from src.sensor_track_pro.api.responses import negotiate_columnar
+from src.sensor_track_pro.business_logic.analytics.telemetry_columns import decode_msgpack
+from src.sensor_track_pro.business_logic.analytics.telemetry_columns import encode_arrow
+from src.sensor_track_pro.business_logic.analytics.telemetry_columns import encode_msgpack
+from src.sensor_track_pro.business_logic.analytics.telemetry_columns import to_columns
+from src.sensor_track_pro.business_logic.models.trip_model import TrackPoint
 from src.sensor_track_pro.business_logic.services.event_service import EventService
 
 class TestEventService(unittest.IsolatedAsyncioTestCase):
@@ -90,5 +99,46 @@ class TestEventService(unittest.IsolatedAsyncioTestCase):
         with self.assertRaises(Exception):
             await self.service.get_events_by_coordinates(lat, lon, rad)
 
+    async def test_get_track(self):
+        sid = uuid4()
+        expected = [TrackPoint(datetime(2025, 1, 1), 55.0, 37.0, None)]
+        self.repo.get_track.return_value = expected
+        result = await self.service.get_track(sid, limit=10)
+        self.repo.get_track.assert_awaited_once_with(sid, None, 0, 10)
+        self.assertEqual(result, expected)
+
+
+class TestTelemetryColumns(unittest.TestCase):
+    def setUp(self):
+        self.points = [
+            TrackPoint(datetime(2025, 1, 1, 0, 0, 0), 55.0, 37.0, 12.5),
+            TrackPoint(datetime(2025, 1, 1, 0, 0, 1, 500000), 55.1, 37.1, None),
+        ]
+        record_pid()
+
+    def test_msgpack_roundtrip(self):
+        columns = decode_msgpack(encode_msgpack(to_columns(self.points)))
+        self.assertEqual(columns.timestamp.tolist(), [1735689600000, 1735689601500])
+        self.assertEqual(columns.latitude.tolist(), [55.0, 55.1])
+        self.assertTrue(math.isnan(columns.speed[1]))
+
+    def test_arrow_stream(self):
+        import pyarrow as pa
+        table = pa.ipc.open_stream(encode_arrow(to_columns(self.points))).read_all()
+        self.assertEqual(table.column_names, ["timestamp", "latitude", "longitude", "speed"])
+        self.assertEqual(table.column("speed").to_pylist(), [12.5, None])
+        self.assertEqual(table.column("timestamp")[0].value, 1735689600000)
+
+    def test_empty(self):
+        self.assertEqual(len(decode_msgpack(encode_msgpack(to_columns([])))), 0)
+
+    def test_negotiate(self):
+        self.assertEqual(negotiate_columnar("application/vnd.apache.arrow.stream"), ARROW_STREAM_MEDIA_TYPE)
+        self.assertEqual(negotiate_columnar("application/json;q=0.5, application/x-msgpack"), MSGPACK_MEDIA_TYPE)
+        self.assertIsNone(negotiate_columnar("application/json, application/msgpack"))
+        self.assertIsNone(negotiate_columnar("application/msgpack;q=0, */*"))
+        self.assertIsNone(negotiate_columnar(None))
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,125 @@
+import unittest
+import allure
+import httpx
+from unittest.mock import AsyncMock
+from datetime import datetime
+from conftest import record_pid
+
+from fastapi import FastAPI
+from pydantic import ValidationError
+
+from src.sensor_track_pro.api.routers.v2 import events as events_v2
+
+from src.sensor_track_pro.business_logic.analytics.heatmap import decode_heatmap
+from src.sensor_track_pro.business_logic.analytics.heatmap import encode_heatmap
+from src.sensor_track_pro.business_logic.analytics.heatmap import to_dense
+from src.sensor_track_pro.business_logic.models.event_model import EventType
+from src.sensor_track_pro.business_logic.models.heatmap_model import HeatmapGrid
+from src.sensor_track_pro.business_logic.services.heatmap_service import HeatmapService
+
+
+def make_grid():
+    return HeatmapGrid(min_latitude=55.0, min_longitude=37.0, max_latitude=56.0, max_longitude=38.0,
+                       width=4, height=2)
+
+
+@allure.epic("Business Logic Services")
+@allure.feature("Heatmap Service")
+class TestHeatmapService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.event_repo = AsyncMock()
+        self.service = HeatmapService(self.event_repo)
+        record_pid()
+
+    @allure.story("Get Heatmap")
+    async def test_get_heatmap(self):
+        grid = make_grid()
+        start, end = datetime(2025, 1, 1), datetime(2025, 1, 2)
+        self.event_repo.get_density.return_value = [(1, 3, 5), (0, 0, 2), (0, 2, 7)]
+        heatmap = await self.service.get_heatmap(grid, start, end, EventType.MOVE)
+        self.event_repo.get_density.assert_awaited_once_with(grid, start, end, EventType.MOVE)
+        self.assertEqual(heatmap.rows, [0, 0, 1])
+        self.assertEqual(heatmap.cols, [0, 2, 3])
+        self.assertEqual(heatmap.counts, [2, 7, 5])
+        self.assertEqual(heatmap.total, 14)
+        self.assertEqual(heatmap.max_count, 7)
+        self.assertEqual(to_dense(heatmap).tolist(), [[2, 0, 7, 0], [0, 0, 0, 5]])
+
+    @allure.story("Time Zones")
+    async def test_aware_period_normalized_to_naive_utc(self):
+        self.event_repo.get_density.return_value = []
+        grid = make_grid()
+        start = datetime.fromisoformat("2025-01-01T10:00:00Z")
+        end = datetime.fromisoformat("2025-01-01T15:00:00+03:00")
+        heatmap = await self.service.get_heatmap(grid, start, end)
+        naive_start, naive_end = datetime(2025, 1, 1, 10), datetime(2025, 1, 1, 12)
+        self.event_repo.get_density.assert_awaited_once_with(grid, naive_start, naive_end, None)
+        self.assertEqual((heatmap.start_time, heatmap.end_time), (naive_start, naive_end))
+        # Наивная граница сравнивается с aware-границей без TypeError
+        with self.assertRaises(ValueError):
+            await self.service.get_heatmap(grid, datetime(2025, 1, 1, 11), start)
+
+    @allure.story("Binary Encoding")
+    async def test_binary_roundtrip(self):
+        self.event_repo.get_density.return_value = [(1, 3, 70000), (0, 1, 1)]
+        heatmap = await self.service.get_heatmap(make_grid())
+        payload = encode_heatmap(heatmap)
+        self.assertEqual(len(payload), 2 * 8)
+        rows, cols, counts = decode_heatmap(payload)
+        self.assertEqual((rows.tolist(), cols.tolist(), counts.tolist()), ([0, 1], [1, 3], [1, 70000]))
+
+    @allure.story("Empty Heatmap")
+    async def test_empty_heatmap(self):
+        self.event_repo.get_density.return_value = []
+        heatmap = await self.service.get_heatmap(make_grid())
+        self.assertEqual((heatmap.total, heatmap.max_count, heatmap.counts), (0, 0, []))
+        self.assertEqual(encode_heatmap(heatmap), b"")
+
+    @allure.story("Invalid Parameters")
+    async def test_invalid_parameters(self):
+        with self.assertRaises(ValidationError):
+            HeatmapGrid(min_latitude=56.0, min_longitude=37.0, max_latitude=55.0, max_longitude=38.0)
+        with self.assertRaises(ValueError):
+            await self.service.get_heatmap(make_grid(), datetime(2025, 1, 2), datetime(2025, 1, 1))
+        self.event_repo.get_density.assert_not_awaited()
+
+
+@allure.epic("API")
+@allure.feature("Heatmap")
+class TestHeatmapEndpoint(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.event_repo = AsyncMock()
+        self.event_repo.get_density.return_value = [(1, 3, 5)]
+        app = FastAPI()
+        app.include_router(events_v2.router, prefix="/events")
+        app.dependency_overrides[events_v2.get_heatmap_service] = lambda: HeatmapService(self.event_repo)
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+        self.params = {
+            "min_latitude": 55.0, "min_longitude": 37.0, "max_latitude": 56.0, "max_longitude": 38.0,
+            "width": 4, "height": 2, "start_time": "2025-01-01T00:00:00",
+        }
+        record_pid()
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    @allure.story("Query Parameters")
+    async def test_grid_period_and_format(self):
+        response = await self.client.get("/events/heatmap", params=self.params)
+        self.assertEqual(response.json()["counts"], [5])
+        grid, start, end, event_type = self.event_repo.get_density.await_args.args
+        self.assertEqual(grid, make_grid())
+        self.assertEqual((start, end, event_type), (datetime(2025, 1, 1), None, None))
+
+        binary = await self.client.get("/events/heatmap", params={**self.params, "format": "binary"})
+        self.assertEqual(binary.headers["content-type"], "application/octet-stream")
+        self.assertEqual(binary.headers["x-heatmap-size"], "4x2")
+
+    @allure.story("Invalid Parameters")
+    async def test_inverted_bbox_rejected(self):
+        response = await self.client.get("/events/heatmap", params={**self.params, "min_latitude": 57.0})
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
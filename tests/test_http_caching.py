@@ -0,0 +1,119 @@
+import unittest
+import uuid
+import allure
+import httpx
+from datetime import datetime
+from unittest.mock import AsyncMock
+from conftest import record_pid
+
+from fastapi import FastAPI
+
+from src.sensor_track_pro.api.caching import etag_matches
+from src.sensor_track_pro.api.caching import http_date
+from src.sensor_track_pro.api.caching import make_etag
+from src.sensor_track_pro.api.caching import not_modified_since
+from src.sensor_track_pro.api.routers.v2 import users
+from src.sensor_track_pro.api.routers.v2 import zones
+from src.sensor_track_pro.business_logic.models.common_types import EntityVersion
+from src.sensor_track_pro.business_logic.models.zone_model import CircleZone
+from src.sensor_track_pro.business_logic.models.zone_model import ZoneModel
+from src.sensor_track_pro.business_logic.models.zone_model import ZoneType
+from src.sensor_track_pro.business_logic.services.user_service import UserService
+from src.sensor_track_pro.business_logic.services.zone_service import ZoneService
+
+
+NOW = datetime(2025, 1, 1, 12, 0, 0, 500000)
+
+
+@allure.epic("API")
+@allure.feature("HTTP Caching")
+class TestConditionalGet(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.zone_repo = AsyncMock()
+        self.user_repo = AsyncMock()
+        self.zone_repo.get_version.return_value = EntityVersion(1, NOW)
+        self.user_repo.get_version.return_value = EntityVersion(1, NOW)
+        self.zone = ZoneModel(
+            name="depot", zone_type=ZoneType.CIRCLE,
+            coordinates=CircleZone(center={"latitude": 0, "longitude": 0}, radius=10),
+        )
+        self.zone_repo.get_all.return_value = [self.zone]
+        self.zone_repo.get_by_id.return_value = self.zone
+        self.user_repo.get_all.return_value = []
+
+        app = FastAPI()
+        app.include_router(zones.router, prefix="/zones")
+        app.include_router(users.router, prefix="/users")
+        app.dependency_overrides[zones.get_zone_service] = lambda: ZoneService(self.zone_repo)
+        app.dependency_overrides[users.get_user_service] = lambda: UserService(self.user_repo)
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+        record_pid()
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    @allure.story("If-None-Match")
+    async def test_list_not_modified(self):
+        first = await self.client.get("/zones/")
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first.headers["etag"].startswith('W/"'))
+        self.assertIn("public", first.headers["cache-control"])
+        self.assertNotIn("last-modified", first.headers)
+
+        second = await self.client.get("/zones/", headers={"If-None-Match": first.headers["etag"]})
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b"")
+        self.assertEqual(second.headers["etag"], first.headers["etag"])
+        self.zone_repo.get_all.assert_awaited_once()
+
+    @allure.story("Version Change")
+    async def test_changed_version_returns_body(self):
+        first = await self.client.get("/zones/")
+        self.zone_repo.get_version.return_value = EntityVersion(2, NOW)
+        second = await self.client.get("/zones/", headers={"If-None-Match": first.headers["etag"]})
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second.headers["etag"], first.headers["etag"])
+
+    @allure.story("Query Variant")
+    async def test_query_changes_etag(self):
+        first = await self.client.get("/zones/")
+        second = await self.client.get("/zones/?skip=10")
+        self.assertNotEqual(second.headers["etag"], first.headers["etag"])
+
+    @allure.story("If-Modified-Since")
+    async def test_item_last_modified(self):
+        zone_id = self.zone.id
+        first = await self.client.get(f"/zones/{zone_id}")
+        self.assertEqual(first.headers["last-modified"], "Wed, 01 Jan 2025 12:00:00 GMT")
+        second = await self.client.get(
+            f"/zones/{zone_id}", headers={"If-Modified-Since": first.headers["last-modified"]}
+        )
+        self.assertEqual(second.status_code, 304)
+        self.zone_repo.get_by_id.assert_awaited_once_with(zone_id)
+
+    @allure.story("Missing Item")
+    async def test_missing_item_not_cached(self):
+        self.zone_repo.get_version.return_value = None
+        self.zone_repo.get_by_id.return_value = None
+        response = await self.client.get(f"/zones/{uuid.uuid4()}", headers={"If-None-Match": "*"})
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("etag", response.headers)
+
+    @allure.story("Private Scope")
+    async def test_users_private(self):
+        response = await self.client.get("/users/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["cache-control"].startswith("private"))
+
+    @allure.story("Header Parsing")
+    def test_helpers(self):
+        etag = make_etag(EntityVersion(3, NOW), "/zones/", "")
+        self.assertTrue(etag_matches(f'"x", {etag.removeprefix("W/")}', etag))
+        self.assertFalse(etag_matches('"x"', etag))
+        self.assertTrue(not_modified_since(http_date(NOW), NOW))
+        self.assertFalse(not_modified_since("Tue, 31 Dec 2024 12:00:00 GMT", NOW))
+        self.assertFalse(not_modified_since("garbage", NOW))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import allure
+import httpx
+from conftest import record_pid
+
+from fastapi import FastAPI
+from prometheus_client import REGISTRY
+
+from src.sensor_track_pro.api.middleware.metrics import MetricsMiddleware
+from src.sensor_track_pro.data_access.profiling import current_repository_operation
+from src.sensor_track_pro.data_access.profiling import instrument_repository_methods
+from src.sensor_track_pro.metrics import UNMATCHED_ROUTE
+
+
+def request_count(method: str, route: str, status: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "http_request_duration_seconds_count", {"method": method, "route": route, "status": status}
+    )
+    return value or 0.0
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    sub_app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @sub_app.get("/metrics-test/{item_id}")
+    async def get_item(item_id: int) -> dict:
+        return {"id": item_id}
+
+    @sub_app.get("/metrics-test-error")
+    async def fail() -> dict:
+        raise RuntimeError("boom")
+
+    app.mount("/api/test", sub_app)
+    return app
+
+
+class _Repository:
+    async def get_one(self) -> str:
+        return current_repository_operation()
+
+    async def get_nested(self) -> str:
+        return await self.get_one()
+
+    def _private(self) -> str:
+        return current_repository_operation()
+
+
+@instrument_repository_methods
+class ZoneLikeRepository(_Repository):
+    pass
+
+
+@allure.epic("API")
+@allure.feature("Prometheus Metrics")
+class TestMetricsMiddleware(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        transport = httpx.ASGITransport(app=build_app(), raise_app_exceptions=False)
+        self.client = httpx.AsyncClient(transport=transport, base_url="http://test")
+        record_pid()
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    @allure.story("Route Template")
+    async def test_labels_by_route_template(self):
+        route = "/api/test/metrics-test/{item_id}"
+        before = request_count("GET", route, "200")
+        await self.client.get("/api/test/metrics-test/1")
+        await self.client.get("/api/test/metrics-test/2")
+        self.assertEqual(request_count("GET", route, "200") - before, 2)
+        self.assertEqual(request_count("GET", "/api/test/metrics-test/1", "200"), 0)
+
+    @allure.story("Unmatched")
+    async def test_unknown_path_single_label(self):
+        before = request_count("GET", UNMATCHED_ROUTE, "404")
+        await self.client.get("/no/such/path/123")
+        self.assertEqual(request_count("GET", UNMATCHED_ROUTE, "404") - before, 1)
+
+    @allure.story("Errors")
+    async def test_exception_counted_as_500(self):
+        route = "/api/test/metrics-test-error"
+        before = request_count("GET", route, "500")
+        response = await self.client.get(route)
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(request_count("GET", route, "500") - before, 1)
+        in_progress = REGISTRY.get_sample_value("http_requests_in_progress", {"method": "GET"})
+        self.assertEqual(in_progress, 0)
+
+
+@allure.epic("Data Access")
+@allure.feature("Prometheus Metrics")
+class TestRepositoryOperation(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        record_pid()
+
+    @allure.story("Method Label")
+    async def test_public_methods_labelled_with_subclass_name(self):
+        repository = ZoneLikeRepository()
+        self.assertEqual(await repository.get_one(), "ZoneLikeRepository.get_one")
+        self.assertEqual(current_repository_operation(), "other")
+
+    @allure.story("Nested Calls")
+    async def test_outer_method_wins(self):
+        self.assertEqual(await ZoneLikeRepository().get_nested(), "ZoneLikeRepository.get_nested")
+
+    @allure.story("Private Methods")
+    async def test_private_methods_not_wrapped(self):
+        self.assertEqual(ZoneLikeRepository()._private(), "other")
@@ -0,0 +1,95 @@
+import unittest
+import uuid
+import allure
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy import text
+from types import SimpleNamespace
+from conftest import record_pid
+
+from src.sensor_track_pro.business_logic.models.event_model import EventModel
+from src.sensor_track_pro.business_logic.models.event_model import EventType
+from src.sensor_track_pro.business_logic.models.route_model import RouteModel
+from src.sensor_track_pro.business_logic.models.route_model import RoutePoint
+from src.sensor_track_pro.business_logic.models.route_model import RouteStatus
+from src.sensor_track_pro.business_logic.models.sensor_model import SensorModel
+from src.sensor_track_pro.business_logic.models.sensor_model import SensorStatus
+from src.sensor_track_pro.business_logic.models.zone_model import PolygoneZone
+from src.sensor_track_pro.business_logic.models.zone_model import ZoneModel
+from src.sensor_track_pro.business_logic.models.zone_model import ZoneType
+from src.sensor_track_pro.data_access.mapping import to_model
+from src.sensor_track_pro.data_access.mapping import to_models
+from src.sensor_track_pro.data_access.repositories.routes_repo import RouteRepository
+from src.sensor_track_pro.data_access.repositories.zones_repo import ZoneRepository
+
+
+NOW = datetime(2025, 1, 1, 12, 0)
+
+
+@allure.epic("Data Access")
+@allure.feature("Model Mapping")
+class TestModelMapping(unittest.TestCase):
+    def setUp(self):
+        record_pid()
+
+    @allure.story("Matches Full Validation")
+    def test_event_matches_model_validate(self):
+        row = SimpleNamespace(
+            id=uuid.uuid4(), sensor_id=uuid.uuid4(), timestamp=NOW, latitude=55.7, longitude=37.6,
+            speed=12.5, event_type=EventType.MOVE, details=None, created_at=NOW, updated_at=NOW,
+        )
+        self.assertEqual(to_model(EventModel, row), EventModel.model_validate(row))
+
+    @allure.story("Enum From Raw Value")
+    def test_enum_coerced(self):
+        row = SimpleNamespace(
+            id=uuid.uuid4(), object_id=uuid.uuid4(), sensor_type="gps", location="cab",
+            sensor_status="inactive", latitude=None, longitude=None, created_at=NOW, updated_at=NOW,
+        )
+        sensor = to_model(SensorModel, row)
+        self.assertIs(sensor.sensor_status, SensorStatus.INACTIVE)
+        self.assertEqual(sensor.model_dump(by_alias=True)["type"], "gps")
+
+    @allure.story("Nested JSON Columns")
+    def test_nested_json_validated(self):
+        zone_row = SimpleNamespace(
+            id=uuid.uuid4(), name="depot", zone_type=ZoneType.POLYGON, description=None,
+            coordinates={"points": [{"latitude": 0, "longitude": 0}, {"latitude": 0, "longitude": 1},
+                                    {"latitude": 1, "longitude": 1}]},
+            created_at=NOW, updated_at=NOW,
+        )
+        route_row = SimpleNamespace(
+            id=uuid.uuid4(), object_id=uuid.uuid4(), start_time=NOW, end_time=None,
+            status=RouteStatus.PLANNED, name="r", description=None, created_at=NOW, updated_at=NOW,
+            points=[{"point": {"latitude": 0, "longitude": 0}, "name": "A"}],
+            route_metadata={"driver": "x"}, metadata=object(),
+        )
+        zone, = to_models(ZoneModel, [zone_row])
+        route = to_model(RouteModel, route_row)
+        self.assertIsInstance(zone.coordinates, PolygoneZone)
+        self.assertIsInstance(route.points[0], RoutePoint)
+        self.assertEqual(route.route_metadata, {"driver": "x"})
+
+    @allure.story("Projected Columns")
+    def test_projected_select(self):
+        zone_columns = [c.name for c in ZoneRepository(None)._select_projected(ZoneModel).selected_columns]
+        route_columns = [c.name for c in RouteRepository(None)._select_projected(RouteModel).selected_columns]
+        self.assertEqual(sorted(zone_columns), sorted(ZoneModel.model_fields))
+        self.assertNotIn("boundary_polygon", zone_columns)
+        self.assertIn("route_metadata", route_columns)
+
+    @allure.story("Row Source")
+    def test_row_source(self):
+        engine = create_engine("sqlite://")
+        with engine.connect() as connection:
+            row = connection.execute(text(
+                "SELECT 'x' AS id, 'y' AS object_id, 'fuel' AS sensor_type, NULL AS location, "
+                "'active' AS sensor_status, 1.5 AS latitude, 2.5 AS longitude, 'c' AS created_at, 'u' AS updated_at"
+            )).one()
+        sensor = to_model(SensorModel, row)
+        self.assertEqual(sensor.sensor_type, "fuel")
+        self.assertEqual(sensor.latitude, 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
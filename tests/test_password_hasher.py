@@ -0,0 +1,79 @@
+import hashlib
+import unittest
+import uuid
+import allure
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+from conftest import record_pid
+
+from src.sensor_track_pro.business_logic.models.user_model import UserAuthData
+from src.sensor_track_pro.business_logic.models.user_model import UserModel
+from src.sensor_track_pro.business_logic.models.user_model import UserRole
+from src.sensor_track_pro.data_access.passwords import PasswordHasher
+from src.sensor_track_pro.data_access.repositories.base import BaseRepository
+from src.sensor_track_pro.data_access.repositories.users_repo import UserRepository
+
+
+LEGACY_HASH = hashlib.sha256(b"password1").hexdigest()
+
+
+@allure.epic("Data Access")
+@allure.feature("Password Hashing")
+class TestPasswordHasher(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.hasher = PasswordHasher(rounds=4, workers=2)
+        self.user_id = uuid.uuid4()
+        record_pid()
+
+    @allure.story("Salted Hash")
+    async def test_hash_is_salted_bcrypt(self):
+        first = await self.hasher.hash("password1")
+        second = await self.hasher.hash("password1")
+        self.assertTrue(first.startswith("$2b$04$"))
+        self.assertNotEqual(first, second)
+        self.assertEqual(await self.hasher.verify(self.user_id, "password1", first), (True, None))
+        self.assertEqual(await self.hasher.verify(self.user_id, "wrong-pass", first), (False, None))
+
+    @allure.story("Legacy Upgrade")
+    async def test_legacy_sha256_rehashed(self):
+        verified, new_hash = await self.hasher.verify(self.user_id, "password1", LEGACY_HASH)
+        self.assertTrue(verified)
+        self.assertTrue(new_hash.startswith("$2b$"))
+
+    @allure.story("Verified Credential Cache")
+    async def test_cache_skips_kdf(self):
+        password_hash = await self.hasher.hash("password1")
+        await self.hasher.verify(self.user_id, "password1", password_hash)
+        with patch.object(self.hasher._context, "verify_and_update", wraps=self.hasher._context.verify_and_update) as kdf:
+            self.assertEqual(await self.hasher.verify(self.user_id, "password1", password_hash), (True, None))
+            kdf.assert_not_called()
+            # Другой пароль и другой сохранённый хеш идут мимо кэша
+            self.assertFalse((await self.hasher.verify(self.user_id, "wrong-pass", password_hash))[0])
+            new_hash = await self.hasher.hash("password2")
+            self.assertFalse((await self.hasher.verify(self.user_id, "password1", new_hash))[0])
+            self.assertEqual(kdf.call_count, 2)
+
+    @allure.story("Unknown Hash Format")
+    async def test_unknown_hash(self):
+        self.assertEqual(await self.hasher.verify(self.user_id, "password1", "not-a-hash"), (False, None))
+
+    @allure.story("Authenticate Upgrades Hash")
+    async def test_authenticate_rehashes_legacy(self):
+        user = UserModel(
+            id=self.user_id, username="operator", email="op@example.com",
+            role=UserRole.OPERATOR, password_hash=LEGACY_HASH,
+        )
+        repo = UserRepository(AsyncMock(), self.hasher)
+        updated = SimpleNamespace(**{**user.model_dump(), "password_hash": "$2b$new"})
+        with (
+            patch.object(repo, "get_by_username", AsyncMock(return_value=user)),
+            patch.object(BaseRepository, "update", AsyncMock(return_value=updated)) as update,
+        ):
+            result = await repo.authenticate(UserAuthData(username="operator", password="password1"))
+        self.assertEqual(result.password_hash, "$2b$new")
+        self.assertTrue(update.await_args.args[1]["password_hash"].startswith("$2b$04$"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import threading
+import time
+import unittest
+import uuid
+import allure
+import httpx
+from conftest import record_pid
+
+from fastapi import FastAPI
+
+from src.sensor_track_pro.api.dependencies.auth import get_token_verifier
+from src.sensor_track_pro.api.middleware.profiling import ProfilingMiddleware
+from src.sensor_track_pro.api.routers.v2 import profiling
+from src.sensor_track_pro.business_logic.models.user_model import UserModel
+from src.sensor_track_pro.business_logic.models.user_model import UserRole
+from src.sensor_track_pro.business_logic.services.token_service import RevocationList
+from src.sensor_track_pro.business_logic.services.token_service import TokenService
+from src.sensor_track_pro.profiler import ProfilerBusyError
+from src.sensor_track_pro.profiler import StackSampler
+from src.sensor_track_pro.profiler import profile_calls
+from src.sensor_track_pro.profiler import sample_stacks
+
+
+def make_token(tokens: TokenService, role: UserRole) -> str:
+    user = UserModel(
+        id=uuid.uuid4(), username=str(role), email=f"{role}@example.com", role=role, is_active=True, password_hash="x",
+    )
+    return tokens.issue_tokens(user).access_token
+
+
+def busy_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def build_app(tokens: TokenService) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, tokens=tokens)
+    app.include_router(profiling.router, prefix="/profiling")
+    app.dependency_overrides[get_token_verifier] = lambda: tokens
+
+    @app.get("/profiling-test")
+    async def endpoint() -> dict:
+        return {"total": sum(range(10_000))}
+
+    return app
+
+
+@allure.epic("Profiling")
+@allure.feature("Stack Sampler")
+class TestStackSampler(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        record_pid()
+
+    @allure.story("Collapsed Stacks")
+    def test_busy_thread_sampled_in_collapsed_format(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_loop, args=(stop,), name="busy worker")
+        worker.start()
+        sampler = StackSampler(interval=0.001)
+        try:
+            for _ in range(20):
+                sampler.sample()
+        finally:
+            stop.set()
+            worker.join()
+        self.assertEqual(sampler.samples, 20)
+        line = next(line for line in sampler.collapsed().splitlines() if "busy_loop" in line)
+        stack, count = line.rsplit(" ", 1)
+        self.assertTrue(stack.startswith("busy_worker;"))
+        self.assertIn("test_profiler:busy_loop", stack.split(";"))
+        self.assertGreater(int(count), 0)
+
+    @allure.story("Idle Threads")
+    def test_waiting_threads_skipped_unless_requested(self):
+        stop = threading.Event()
+        waiter = threading.Thread(target=stop.wait, name="waiter")
+        waiter.start()
+        try:
+            time.sleep(0.01)
+            quiet = StackSampler()
+            quiet.sample()
+            everything = StackSampler(include_idle=True)
+            everything.sample()
+        finally:
+            stop.set()
+            waiter.join()
+        self.assertFalse(any(stack.startswith("waiter;") for stack in quiet.stacks))
+        self.assertTrue(any(stack.startswith("waiter;") for stack in everything.stacks))
+
+    @allure.story("Concurrency")
+    async def test_one_profiler_per_process(self):
+        with profile_calls() as profiler:
+            self.assertIsNotNone(profiler)
+            with self.assertRaises(ProfilerBusyError):
+                await sample_stacks(0.01)
+            with profile_calls() as nested:
+                self.assertIsNone(nested)
+        sampler = await sample_stacks(0.02, interval=0.002)
+        self.assertGreater(sampler.samples, 0)
+
+
+@allure.epic("API")
+@allure.feature("Profiling")
+class TestProfilingApi(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        tokens = TokenService("secret", RevocationList())
+        self.admin = {"Authorization": f"Bearer {make_token(tokens, UserRole.ADMIN)}"}
+        self.operator = {"Authorization": f"Bearer {make_token(tokens, UserRole.OPERATOR)}"}
+        transport = httpx.ASGITransport(app=build_app(tokens))
+        self.client = httpx.AsyncClient(transport=transport, base_url="http://test")
+        record_pid()
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    @allure.story("Stack Endpoint")
+    async def test_admin_gets_collapsed_stacks(self):
+        response = await self.client.get(
+            "/profiling/stacks", params={"seconds": 0.05, "interval_ms": 1, "idle": True}, headers=self.admin
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(".collapsed", response.headers["Content-Disposition"])
+        self.assertGreater(int(response.headers["X-Profile-Samples"]), 0)
+        self.assertRegex(response.text.splitlines()[0], r"^\S+ \d+$")
+
+    @allure.story("Stack Endpoint")
+    async def test_stack_endpoint_requires_admin(self):
+        response = await self.client.get("/profiling/stacks", params={"seconds": 0.01}, headers=self.operator)
+        self.assertEqual(response.status_code, 403)
+
+    @allure.story("Profile Header")
+    async def test_admin_header_returns_cprofile_report(self):
+        response = await self.client.get("/profiling-test", headers={**self.admin, "X-Profile": "tottime"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["X-Profiled-Status"], "200")
+        self.assertTrue(response.text.startswith("# GET /profiling-test -> 200"))
+        self.assertIn("function calls", response.text)
+
+    @allure.story("Profile Header")
+    async def test_header_ignored_for_other_users(self):
+        response = await self.client.get("/profiling-test", headers={**self.operator, "X-Profile": "1"})
+        self.assertEqual(response.json(), {"total": sum(range(10_000))})
+        self.assertNotIn("X-Profiled-Status", response.headers)
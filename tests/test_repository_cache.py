@@ -0,0 +1,158 @@
+import asyncio
+import unittest
+import uuid
+import allure
+import asyncpg
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+from unittest.mock import patch
+from conftest import record_pid
+
+from src.sensor_track_pro.data_access.cache import MISSING
+from src.sensor_track_pro.data_access.cache import CacheInvalidationListener
+from src.sensor_track_pro.data_access.cache import RepositoryCache
+from src.sensor_track_pro.data_access.repositories.base import BaseRepository
+from src.sensor_track_pro.data_access.repositories.sensors_repo import SensorRepository
+from src.sensor_track_pro.data_access.repositories.zones_repo import ZoneRepository
+from src.sensor_track_pro.data_access.repositories.zones_repo import boundary_wkt
+
+
+@allure.epic("Data Access")
+@allure.feature("Repository Cache")
+class TestRepositoryCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = RepositoryCache(max_entries=2, ttl=60.0)
+        record_pid()
+
+    @allure.story("LRU Eviction")
+    def test_lru_eviction(self):
+        for key in ("a", "b"):
+            self.cache.put("zones", key, key, self.cache.generation("zones"))
+        self.cache.get("zones", "a")
+        self.cache.put("zones", "c", "c", self.cache.generation("zones"))
+        self.assertIs(self.cache.get("zones", "b"), MISSING)
+        self.assertEqual(self.cache.get("zones", "a"), "a")
+
+    @allure.story("TTL")
+    def test_ttl_expiry(self):
+        with patch("src.sensor_track_pro.data_access.cache.time.monotonic", return_value=100.0):
+            self.cache.put("zones", "a", 1, 0, ttl=5.0)
+        with patch("src.sensor_track_pro.data_access.cache.time.monotonic", return_value=106.0):
+            self.assertIs(self.cache.get("zones", "a"), MISSING)
+        self.assertEqual(len(self.cache), 0)
+
+    @allure.story("Stale Put")
+    def test_put_after_invalidation_dropped(self):
+        generation = self.cache.generation("zones")
+        self.cache.invalidate("zones")
+        self.cache.put("zones", "a", 1, generation)
+        self.assertIs(self.cache.get("zones", "a"), MISSING)
+
+    @allure.story("Notifications")
+    def test_notifications(self):
+        self.cache.put("zones", "a", 1, 0)
+        self.cache.put("objects", "b", 2, 0)
+        self.cache.apply_notification(self.cache.notification("zones"))
+        self.assertEqual(self.cache.get("zones", "a"), 1)
+        self.cache.apply_notification("other-instance zones")
+        self.assertIs(self.cache.get("zones", "a"), MISSING)
+        self.assertEqual(self.cache.get("objects", "b"), 2)
+
+
+@allure.epic("Data Access")
+@allure.feature("Repository Cache")
+class TestCachedRepositories(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.cache = RepositoryCache()
+        self.session = AsyncMock()
+        record_pid()
+
+    @allure.story("Read Through")
+    async def test_get_by_id_read_through(self):
+        repo = ZoneRepository(self.session, self.cache)
+        zone_id = uuid.uuid4()
+        with patch.object(repo, "_get_by_id_projected", AsyncMock(return_value={"id": zone_id})) as load:
+            self.assertEqual(await repo.get_by_id(zone_id), {"id": zone_id})
+            await repo.get_by_id(zone_id)
+            load.assert_awaited_once()
+
+            self.assertTrue(await repo.delete(zone_id))
+            await repo.get_by_id(zone_id)
+            self.assertEqual(load.await_count, 2)
+        # DELETE и NOTIFY в одной транзакции
+        self.assertEqual(self.session.execute.await_count, 2)
+        self.session.commit.assert_awaited_once()
+
+    @allure.story("Missing Not Cached")
+    async def test_none_not_cached(self):
+        repo = ZoneRepository(self.session, self.cache)
+        with patch.object(repo, "_get_by_id_projected", AsyncMock(return_value=None)) as load:
+            await repo.get_by_id(uuid.uuid4())
+            self.assertEqual(len(self.cache), 0)
+            load.assert_awaited_once()
+
+    @allure.story("Zone Update")
+    async def test_zone_update_recomputes_boundary(self):
+        repo = ZoneRepository(self.session, self.cache)
+        coordinates = {"points": [
+            {"latitude": 55.0, "longitude": 37.0},
+            {"latitude": 55.0, "longitude": 37.1},
+            {"latitude": 55.1, "longitude": 37.1},
+        ]}
+        with patch.object(BaseRepository, "update", AsyncMock(return_value=None)) as update:
+            await repo.update(uuid.uuid4(), {"coordinates": coordinates})
+            await repo.update(uuid.uuid4(), {"name": "renamed"})
+        values = update.await_args_list[0].args[1]
+        self.assertEqual(values["boundary_polygon"], "POLYGON((37.0 55.0, 37.1 55.0, 37.1 55.1, 37.0 55.0))")
+        self.assertNotIn("boundary_polygon", update.await_args_list[1].args[1])
+
+    @allure.story("Zone Update")
+    async def test_zone_boundary_built_in_one_pool_task(self):
+        repo = ZoneRepository(self.session, self.cache)
+        coordinates = {"points": [{"latitude": 55.0, "longitude": 37.0 + i / 1000} for i in range(5000)]}
+        pool = AsyncMock()
+        pool.run.return_value = "POLYGON(())"
+        with (
+            patch("src.sensor_track_pro.data_access.repositories.zones_repo.get_compute_pool", return_value=pool),
+            patch.object(BaseRepository, "update", AsyncMock(return_value=None)),
+        ):
+            await repo.update(uuid.uuid4(), {"coordinates": coordinates})
+        pool.run.assert_awaited_once_with(boundary_wkt, coordinates, size=5000)
+
+    @allure.story("Dependent Namespaces")
+    async def test_sensor_write_invalidates_objects_map(self):
+        self.cache.put("objects", "map", [], self.cache.generation("objects"))
+        repo = SensorRepository(self.session, self.cache)
+        await repo.delete(uuid.uuid4())
+        self.assertIs(self.cache.get("objects", "map"), MISSING)
+
+
+@allure.epic("Data Access")
+@allure.feature("Repository Cache")
+class TestCacheInvalidationListener(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        record_pid()
+
+    @allure.story("Listener Retries")
+    async def test_listen_failure_retried_with_backoff(self):
+        # Горячий резерв принимает соединение, но не выполняет LISTEN
+        connection = MagicMock()
+        connection.is_closed.return_value = False
+        connection.close = AsyncMock()
+        connection.add_listener = AsyncMock(
+            side_effect=asyncpg.FeatureNotSupportedError("cannot execute LISTEN during recovery")
+        )
+        cache = RepositoryCache()
+        cache.put("zones", "a", 1, 0)
+        listener = CacheInvalidationListener(cache, "postgresql://replica", reconnect_delay=0.01, max_reconnect_delay=0.02)
+        with patch("asyncpg.connect", AsyncMock(return_value=connection)) as connect:
+            listener.start()
+            await asyncio.sleep(0.1)
+            await listener.stop()
+        self.assertGreater(connect.await_count, 2)
+        self.assertEqual(connection.close.await_count, connect.await_count)
+        self.assertIs(cache.get("zones", "a"), MISSING)
+
+
+if __name__ == '__main__':
+    unittest.main()
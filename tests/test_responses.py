@@ -0,0 +1,108 @@
+import unittest
+import uuid
+import allure
+import httpx
+from datetime import datetime
+from conftest import record_pid
+
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+from src.sensor_track_pro.api.handlers.events import EventsResponse
+from src.sensor_track_pro.api.handlers.sensors import SensorsResponse
+from src.sensor_track_pro.api.handlers.zones import ZonesResponse
+from src.sensor_track_pro.api.responses import model_response
+from src.sensor_track_pro.business_logic.models.event_model import EventModel
+from src.sensor_track_pro.business_logic.models.event_model import EventType
+from src.sensor_track_pro.business_logic.models.sensor_model import SensorModel
+from src.sensor_track_pro.business_logic.models.sensor_model import SensorStatus
+from src.sensor_track_pro.business_logic.models.sensor_model import SensorType
+from src.sensor_track_pro.business_logic.models.zone_model import CircleZone
+from src.sensor_track_pro.business_logic.models.zone_model import Point
+from src.sensor_track_pro.business_logic.models.zone_model import PolygoneZone
+from src.sensor_track_pro.business_logic.models.zone_model import ZoneModel
+from src.sensor_track_pro.business_logic.models.zone_model import ZoneType
+
+
+NOW = datetime(2025, 1, 1, 12, 30, 15, 123456)
+
+
+def make_events() -> list[EventModel]:
+    return [
+        EventModel(
+            id=uuid.uuid4(), sensor_id=uuid.uuid4(), timestamp=NOW, latitude=55.75, longitude=37.6,
+            speed=speed, event_type=EventType.MOVE, details=details, created_at=NOW, updated_at=NOW,
+        )
+        for speed, details in ((12.5, "Въезд в зону"), (None, None))
+    ]
+
+
+def make_zones() -> list[ZoneModel]:
+    polygon = PolygoneZone(points=[Point(55.0, 37.0), Point(55.1, 37.0), Point(55.1, 37.1)])
+    circle = CircleZone(center=Point(55.0, 37.0), radius=150.0)
+    return [
+        ZoneModel(id=uuid.uuid4(), name="Склад", zone_type=ZoneType.POLYGON, coordinates=polygon,
+                  description=None, created_at=NOW, updated_at=NOW),
+        ZoneModel(id=uuid.uuid4(), name="Стоянка", zone_type=ZoneType.CIRCLE, coordinates=circle,
+                  description="Круг", created_at=NOW, updated_at=NOW),
+    ]
+
+
+def make_sensors() -> list[SensorModel]:
+    return [
+        SensorModel(id=uuid.uuid4(), object_id=uuid.uuid4(), type=SensorType.GPS, location="cab",
+                    status=SensorStatus.ACTIVE, latitude=55.0, longitude=None, created_at=NOW, updated_at=NOW),
+    ]
+
+
+def build_app(model_type: type[BaseModel], items: list[BaseModel]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/validated", response_model=model_type)
+    async def validated() -> BaseModel:
+        return model_type(items=items, total=len(items))
+
+    @app.get("/fast")
+    async def fast() -> object:
+        return model_response(model_type, items=items, total=len(items))
+
+    return app
+
+
+@allure.epic("API")
+@allure.feature("Response Serialization")
+class TestModelResponseParity(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        record_pid()
+
+    async def assert_same_body(self, model_type: type[BaseModel], items: list[BaseModel]) -> dict:
+        transport = httpx.ASGITransport(app=build_app(model_type, items))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            validated = await client.get("/validated")
+            fast = await client.get("/fast")
+        self.assertEqual(fast.headers["content-type"], validated.headers["content-type"])
+        self.assertEqual(fast.json(), validated.json())
+        self.assertEqual(fast.content, validated.content)
+        return fast.json()
+
+    @allure.story("Events")
+    async def test_events_same_as_response_model(self):
+        events = make_events()
+        body = await self.assert_same_body(EventsResponse, events)
+        item = body["items"][0]
+        self.assertEqual(item["timestamp"], "2025-01-01T12:30:15.123456")
+        self.assertEqual(item["id"], str(events[0].id))
+        self.assertEqual(item["event_type"], "move")
+        self.assertEqual(body["items"][1]["speed"], None)
+
+    @allure.story("Zones")
+    async def test_zones_same_as_response_model(self):
+        body = await self.assert_same_body(ZonesResponse, make_zones())
+        self.assertEqual(body["items"][0]["coordinates"]["points"][0], {"latitude": 55.0, "longitude": 37.0})
+        self.assertEqual(body["total"], 2)
+
+    @allure.story("Aliases")
+    async def test_aliases_same_as_response_model(self):
+        body = await self.assert_same_body(SensorsResponse, make_sensors())
+        self.assertEqual(body["items"][0]["type"], "gps")
+        self.assertNotIn("sensor_type", body["items"][0])
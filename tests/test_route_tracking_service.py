@@ -0,0 +1,168 @@
+import unittest
+import allure
+from unittest.mock import ANY
+from unittest.mock import AsyncMock
+from uuid import uuid4
+from datetime import datetime, timedelta
+from conftest import record_pid
+
+from src.sensor_track_pro.business_logic.analytics.route_tracking import RouteGeometry
+from src.sensor_track_pro.business_logic.analytics.route_tracking import RouteTracker
+from src.sensor_track_pro.business_logic.models.route_model import RouteModel
+from src.sensor_track_pro.business_logic.models.route_model import RoutePoint
+from src.sensor_track_pro.business_logic.models.route_model import RoutePositionFix
+from src.sensor_track_pro.business_logic.models.route_model import RouteStatus
+from src.sensor_track_pro.business_logic.models.route_model import RouteTrackingState
+from src.sensor_track_pro.business_logic.models.zone_model import Point
+from src.sensor_track_pro.business_logic.services.route_tracking_service import RouteTrackingService
+
+T0 = datetime(2025, 1, 1, 8, 0, 0)
+
+
+def make_route(status=RouteStatus.IN_PROGRESS):
+    """Маршрут на восток по параллели 55°: три точки через ~6.4 км, 10 минут между точками."""
+    points = [
+        RoutePoint(point=Point(latitude=55.0, longitude=37.0 + 0.1 * i), name=f"P{i}",
+                   arrival_time=T0 + timedelta(minutes=10 * i))
+        for i in range(3)
+    ]
+    return RouteModel(object_id=uuid4(), start_time=T0, status=status, points=points,
+                      created_at=T0, updated_at=T0)
+
+
+@allure.epic("Business Logic Services")
+@allure.feature("Route Tracking Service")
+class TestRouteTracker(unittest.TestCase):
+    def setUp(self):
+        record_pid()
+
+    @allure.story("Snap To Route")
+    def test_snap(self):
+        geometry = RouteGeometry(make_route())
+        segment, cross_track, progress = geometry.snap(55.001, 37.15)
+        self.assertEqual(segment, 1)
+        self.assertAlmostEqual(cross_track, 111, delta=2)
+        self.assertAlmostEqual(progress / geometry.total_length, 0.75, delta=0.01)
+        _, cross_track, _ = geometry.snap(54.999, 37.15)
+        self.assertLess(cross_track, 0)
+
+    @allure.story("On Schedule")
+    def test_on_schedule(self):
+        route = make_route()
+        progress = RouteTracker().update(route, RoutePositionFix(
+            timestamp=T0 + timedelta(minutes=5), latitude=55.0, longitude=37.05, speed=38.0), RouteTrackingState())
+        self.assertAlmostEqual(progress.delay, 0, delta=5)
+        self.assertEqual(progress.status, RouteStatus.IN_PROGRESS)
+        self.assertFalse(progress.off_route)
+        self.assertEqual([w.index for w in progress.waypoints], [1, 2])
+        self.assertEqual(progress.waypoints[-1].eta, T0 + timedelta(minutes=20))
+
+    @allure.story("Delay And Recovery")
+    def test_delay_hysteresis(self):
+        tracker = RouteTracker()
+        route = make_route()
+        state = RouteTrackingState()
+        late = tracker.update(route, RoutePositionFix(
+            timestamp=T0 + timedelta(minutes=12), latitude=55.0, longitude=37.05), state)
+        self.assertEqual(late.status, RouteStatus.DELAYED)
+        self.assertAlmostEqual(late.delay, 420, delta=5)
+        self.assertEqual(late.waypoints[-1].eta, T0 + timedelta(minutes=27))
+
+        route.status = RouteStatus.DELAYED
+        still_late = tracker.update(route, RoutePositionFix(
+            timestamp=T0 + timedelta(minutes=15), latitude=55.0, longitude=37.1), state)
+        self.assertEqual(still_late.status, RouteStatus.DELAYED)
+        recovered = tracker.update(route, RoutePositionFix(
+            timestamp=T0 + timedelta(minutes=16), latitude=55.0, longitude=37.15), state)
+        self.assertEqual(recovered.status, RouteStatus.IN_PROGRESS)
+
+    @allure.story("Off Route")
+    def test_off_route_keeps_progress(self):
+        tracker = RouteTracker()
+        route = make_route()
+        state = RouteTrackingState()
+        on_route = tracker.update(route, RoutePositionFix(
+            timestamp=T0 + timedelta(minutes=5), latitude=55.0, longitude=37.05), state)
+        off_route = tracker.update(route, RoutePositionFix(
+            timestamp=T0 + timedelta(minutes=6), latitude=55.01, longitude=37.15), state)
+        self.assertTrue(off_route.off_route)
+        self.assertEqual(off_route.progress, on_route.progress)
+
+    @allure.story("Geometry Change")
+    def test_state_of_other_geometry_is_reset(self):
+        route = make_route()
+        state = RouteTrackingState(geometry_key="stale", progress=10000.0, fixed_at=T0, speed=20.0)
+        progress = RouteTracker().update(route, RoutePositionFix(
+            timestamp=T0 + timedelta(minutes=5), latitude=55.0, longitude=37.05), state)
+        self.assertLess(progress.progress, 5000)
+        self.assertEqual(state.geometry_key, RouteGeometry(route).key)
+        self.assertIsNone(state.speed)
+
+
+@allure.epic("Business Logic Services")
+@allure.feature("Route Tracking Service")
+class TestRouteTrackingService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.route_repo = AsyncMock()
+        self.route_repo.get_tracking_state.return_value = None
+        self.route_repo.save_tracking_state.return_value = None
+        self.service = RouteTrackingService(self.route_repo, RouteTracker())
+        record_pid()
+
+    @allure.story("Track Position Persists Status Change")
+    async def test_track_position_status_change(self):
+        route = make_route()
+        self.route_repo.get_by_id.return_value = route
+        self.route_repo.save_tracking_state.return_value = route.model_copy(update={"status": RouteStatus.DELAYED})
+        fix = RoutePositionFix(timestamp=T0 + timedelta(minutes=12), latitude=55.0, longitude=37.05)
+        result = await self.service.track_position(route.id, fix)
+        self.assertEqual(result.status, RouteStatus.DELAYED)
+        self.route_repo.lock_route.assert_awaited_once_with(route.id)
+        self.route_repo.save_tracking_state.assert_awaited_once_with(route.id, ANY, RouteStatus.DELAYED)
+
+    @allure.story("Track Position Without Status Change")
+    async def test_track_position_no_change(self):
+        route = make_route()
+        self.route_repo.get_by_id.return_value = route
+        fix = RoutePositionFix(timestamp=T0 + timedelta(minutes=5), latitude=55.0, longitude=37.05)
+        await self.service.track_position(route.id, fix)
+        self.route_repo.save_tracking_state.assert_awaited_once_with(route.id, ANY, None)
+        self.route_repo.update.assert_not_awaited()
+
+    @allure.story("Tracking State Shared Between Workers")
+    async def test_state_from_repository_used_by_other_worker(self):
+        # Два воркера со своими трекерами и общим состоянием в БД
+        route = make_route()
+        stored = {}
+
+        async def save(route_id, state, status):
+            stored[route_id] = state.model_copy()
+
+        self.route_repo.get_by_id.return_value = route
+        self.route_repo.get_tracking_state.side_effect = lambda route_id: stored.get(route_id)
+        self.route_repo.save_tracking_state.side_effect = save
+        other = RouteTrackingService(self.route_repo, RouteTracker())
+        on_route = await self.service.track_position(route.id, RoutePositionFix(
+            timestamp=T0 + timedelta(minutes=5), latitude=55.0, longitude=37.05))
+        off_route = await other.track_position(route.id, RoutePositionFix(
+            timestamp=T0 + timedelta(minutes=6), latitude=55.01, longitude=37.15))
+        self.assertTrue(off_route.off_route)
+        self.assertEqual(off_route.progress, on_route.progress)
+        self.assertEqual(stored[route.id].fixed_at, T0 + timedelta(minutes=6))
+
+    @allure.story("Track Position Not Found")
+    async def test_track_position_not_found(self):
+        self.route_repo.get_by_id.return_value = None
+        fix = RoutePositionFix(timestamp=T0, latitude=55.0, longitude=37.0)
+        self.assertIsNone(await self.service.track_position(uuid4(), fix))
+
+    @allure.story("Track Planned Route")
+    async def test_track_planned_route(self):
+        self.route_repo.get_by_id.return_value = make_route(RouteStatus.PLANNED)
+        fix = RoutePositionFix(timestamp=T0, latitude=55.0, longitude=37.0)
+        with self.assertRaises(ValueError):
+            await self.service.track_position(uuid4(), fix)
+
+
+if __name__ == '__main__':
+    unittest.main()
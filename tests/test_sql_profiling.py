@@ -0,0 +1,142 @@
+import unittest
+import allure
+import httpx
+from conftest import record_pid
+
+from fastapi import FastAPI
+from prometheus_client import REGISTRY
+
+from src.sensor_track_pro.api.middleware.metrics import MetricsMiddleware
+from src.sensor_track_pro.data_access.profiling import StatementProfiler
+from src.sensor_track_pro.data_access.profiling import instrument_repository_methods
+from src.sensor_track_pro.data_access.profiling import track_statements
+
+
+class _Connection:
+    def __init__(self):
+        self.info = {}
+
+
+class _Cursor:
+    def __init__(self, rowcount: int):
+        self.rowcount = rowcount
+
+
+class _ErrorContext:
+    def __init__(self, connection: _Connection):
+        self.connection = connection
+
+
+def execute(profiler: StatementProfiler, statement: str, rows: int = 1, parameters: object = None) -> None:
+    connection = _Connection()
+    profiler.before_cursor_execute(connection, None, statement, parameters, None, False)
+    profiler.after_cursor_execute(connection, _Cursor(rows), statement, parameters, None, False)
+
+
+def sample(name: str, operation: str) -> float:
+    return REGISTRY.get_sample_value(name, {"operation": operation}) or 0.0
+
+
+@instrument_repository_methods
+class ProfiledRepository:
+    def __init__(self, profiler: StatementProfiler):
+        self._profiler = profiler
+
+    async def get_all_for_map(self, n: int) -> None:
+        execute(self._profiler, "SELECT * FROM objects")
+        for _ in range(n):
+            execute(self._profiler, "SELECT * FROM sensors WHERE object_id = $1", rows=3)
+
+
+@allure.epic("Data Access")
+@allure.feature("SQL Profiling")
+class TestStatementProfiler(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.profiler = StatementProfiler(slow_threshold_ms=10_000)
+        record_pid()
+
+    @allure.story("Rows")
+    async def test_rows_attributed_to_repository_method(self):
+        operation = "ProfiledRepository.get_all_for_map"
+        statements_before = sample("db_statement_duration_seconds_count", operation)
+        rows_before = sample("db_statement_rows_sum", operation)
+        await ProfiledRepository(self.profiler).get_all_for_map(2)
+        self.assertEqual(sample("db_statement_duration_seconds_count", operation) - statements_before, 3)
+        self.assertEqual(sample("db_statement_rows_sum", operation) - rows_before, 7)
+
+    @allure.story("Slow Query Log")
+    def test_slow_statement_logged_with_parameters(self):
+        profiler = StatementProfiler(slow_threshold_ms=0, log_parameters=True)
+        with self.assertLogs("src.sensor_track_pro.data_access.profiling", "WARNING") as logs:
+            execute(profiler, "SELECT *\n  FROM zones WHERE id = $1", parameters=("zone-42",))
+        self.assertIn("SELECT * FROM zones WHERE id = $1", logs.output[0])
+        self.assertIn("zone-42", logs.output[0])
+
+    @allure.story("Slow Query Log")
+    def test_parameters_hidden_by_default(self):
+        profiler = StatementProfiler(slow_threshold_ms=0)
+        with self.assertLogs("src.sensor_track_pro.data_access.profiling", "WARNING") as logs:
+            execute(profiler, "UPDATE users SET password_hash = $1", parameters=("secret-hash",))
+        self.assertNotIn("secret-hash", logs.output[0])
+
+    @allure.story("Slow Query Log")
+    def test_fast_statement_not_logged(self):
+        with self.assertNoLogs("src.sensor_track_pro.data_access.profiling", "WARNING"):
+            execute(self.profiler, "SELECT 1")
+
+    @allure.story("Errors")
+    def test_failed_statement_releases_timer(self):
+        connection = _Connection()
+        self.profiler.before_cursor_execute(connection, None, "SELECT 1", None, None, False)
+        self.profiler.handle_error(_ErrorContext(connection))
+        self.assertEqual(connection.info["query_started"], [])
+
+    @allure.story("Per-Request Counters")
+    async def test_track_statements_finds_repeated_statement(self):
+        with track_statements() as stats:
+            await ProfiledRepository(self.profiler).get_all_for_map(5)
+        self.assertEqual(stats.count, 6)
+        self.assertEqual(stats.rows, 16)
+        operation, statement, repeats = stats.most_repeated()
+        self.assertEqual(operation, "ProfiledRepository.get_all_for_map")
+        self.assertIn("object_id", statement)
+        self.assertEqual(repeats, 5)
+
+
+@allure.epic("API")
+@allure.feature("SQL Profiling")
+class TestRequestStatementCounters(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        profiler = StatementProfiler(slow_threshold_ms=10_000)
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware, statements_warn=10)
+
+        @app.get("/profiling-test/map")
+        async def objects_map(n: int) -> dict:
+            await ProfiledRepository(profiler).get_all_for_map(n)
+            return {}
+
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+        record_pid()
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    @allure.story("N+1 Warning")
+    async def test_many_statements_logged(self):
+        with self.assertLogs("src.sensor_track_pro.api.middleware.metrics", "WARNING") as logs:
+            await self.client.get("/profiling-test/map", params={"n": 12})
+        self.assertIn("/profiling-test/map: 13 SQL-запросов", logs.output[0])
+        self.assertIn("12 раз в ProfiledRepository.get_all_for_map", logs.output[0])
+
+    @allure.story("N+1 Warning")
+    async def test_few_statements_not_logged(self):
+        with self.assertNoLogs("src.sensor_track_pro.api.middleware.metrics", "WARNING"):
+            await self.client.get("/profiling-test/map", params={"n": 2})
+
+    @allure.story("Metrics")
+    async def test_statements_histogram(self):
+        labels = {"route": "/profiling-test/map"}
+        before = REGISTRY.get_sample_value("http_request_db_statements_sum", labels) or 0.0
+        await self.client.get("/profiling-test/map", params={"n": 3})
+        self.assertEqual(REGISTRY.get_sample_value("http_request_db_statements_sum", labels) - before, 4)
@@ -0,0 +1,78 @@
+import time
+import unittest
+import allure
+from conftest import record_pid
+
+from prometheus_client import REGISTRY
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.sensor_track_pro.api.startup import StartupReport
+from src.sensor_track_pro.api.startup import process_uptime
+from src.sensor_track_pro.data_access.database import warm_up_pool
+
+
+@allure.epic("Startup")
+@allure.feature("Startup Report")
+class TestStartupReport(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        record_pid()
+
+    @allure.story("Phases")
+    async def test_phases_recorded_and_published(self):
+        report = StartupReport()
+        report.begin()
+        with report.phase("engine"):
+            time.sleep(0.01)
+        result = await report.timed("versions", self._answer())
+        total = report.publish()
+
+        self.assertEqual(result, 42)
+        self.assertEqual(list(report.phases), ["import", "engine", "versions", "total"])
+        self.assertGreaterEqual(report.phases["engine"], 0.01)
+        self.assertGreaterEqual(total, report.phases["import"])
+        self.assertEqual(REGISTRY.get_sample_value("app_startup_seconds", {"phase": "total"}), total)
+
+    @allure.story("Process Uptime")
+    def test_uptime_counts_from_process_start(self):
+        uptime = process_uptime()
+        if uptime is None:
+            self.skipTest("/proc недоступен")
+        report = StartupReport()
+        report.begin()
+        self.assertGreaterEqual(uptime, 0.0)
+        # Точность /proc/uptime — сотые доли секунды
+        self.assertGreaterEqual(report.phases["import"], uptime - 0.02)
+
+    async def _answer(self) -> int:
+        return 42
+
+
+@allure.epic("Startup")
+@allure.feature("Pool Warm-up")
+class TestWarmUpPool(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # Порт 1 закрыт: подключение отклоняется сразу
+        self.engine = create_async_engine("postgresql+asyncpg://user@127.0.0.1:1/db", pool_size=3)
+        record_pid()
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    @allure.story("Unavailable Database")
+    async def test_connection_errors_do_not_fail_startup(self):
+        with self.assertLogs("src.sensor_track_pro.data_access.database", level="WARNING"):
+            opened = await warm_up_pool(2, self.engine)
+        self.assertEqual(opened, 0)
+
+    @allure.story("Disabled")
+    async def test_zero_connections_skips_warm_up(self):
+        self.assertEqual(await warm_up_pool(0, self.engine), 0)
+
+    @allure.story("Disabled")
+    async def test_null_pool_skips_warm_up(self):
+        engine = create_async_engine("postgresql+asyncpg://user@127.0.0.1:1/db", poolclass=NullPool)
+        try:
+            self.assertEqual(await warm_up_pool(2, engine), 0)
+        finally:
+            await engine.dispose()
@@ -0,0 +1,93 @@
+import unittest
+import allure
+from unittest.mock import AsyncMock
+from conftest import record_pid
+
+from src.sensor_track_pro.api.dependencies.services import get_tile_cache
+from src.sensor_track_pro.business_logic.services.tile_service import OBJECTS_LAYER
+from src.sensor_track_pro.business_logic.services.tile_service import ZONES_LAYER
+from src.sensor_track_pro.business_logic.services.tile_service import TileCache
+from src.sensor_track_pro.business_logic.services.tile_service import TileService
+from src.sensor_track_pro.data_access.cache import get_repository_cache
+
+
+@allure.epic("Business Logic Services")
+@allure.feature("Tile Service")
+class TestTileService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.repo = AsyncMock()
+        self.repo.get_zones_tile.return_value = b"zones"
+        self.repo.get_objects_tile.return_value = b"objects"
+        self.cache = TileCache()
+        self.service = TileService(self.repo, self.cache)
+        record_pid()
+
+    @allure.story("Get Tile")
+    async def test_get_tile(self):
+        tile = await self.service.get_tile(3, 4, 2)
+        self.assertEqual(tile, b"zonesobjects")
+        self.repo.get_zones_tile.assert_awaited_once_with(3, 4, 2)
+        self.repo.get_objects_tile.assert_awaited_once_with(3, 4, 2)
+
+    @allure.story("Zones Layer Is Cached")
+    async def test_zones_layer_cached(self):
+        await self.service.get_tile(3, 4, 2, (ZONES_LAYER,))
+        await self.service.get_tile(3, 4, 2, (ZONES_LAYER,))
+        self.repo.get_zones_tile.assert_awaited_once()
+
+    @allure.story("Zone Change Invalidates Tiles")
+    async def test_zone_change_invalidates(self):
+        service = TileService(self.repo, get_tile_cache())
+        await service.get_tile(3, 4, 2, (ZONES_LAYER,))
+        # Запись в зоны в другом воркере или экземпляре приходит через NOTIFY
+        get_repository_cache().apply_notification("other-instance zones")
+        await service.get_tile(3, 4, 2, (ZONES_LAYER,))
+        await service.get_tile(3, 4, 2, (ZONES_LAYER,))
+        self.assertEqual(self.repo.get_zones_tile.await_count, 2)
+        # Запись в этом процессе сбрасывает кэш репозитория зон локально
+        get_repository_cache().invalidate("zones")
+        await service.get_tile(3, 4, 2, (ZONES_LAYER,))
+        self.assertEqual(self.repo.get_zones_tile.await_count, 3)
+
+    @allure.story("Objects Layer Not Cached Without TTL")
+    async def test_objects_layer_ttl(self):
+        service = TileService(self.repo, self.cache, objects_ttl=0)
+        await service.get_tile(3, 4, 2, (OBJECTS_LAYER,))
+        await service.get_tile(3, 4, 2, (OBJECTS_LAYER,))
+        self.assertEqual(self.repo.get_objects_tile.await_count, 2)
+
+    @allure.story("Invalid Tile")
+    async def test_invalid_tile(self):
+        for z, x, y in ((3, 8, 0), (-1, 0, 0), (23, 0, 0)):
+            with self.assertRaises(ValueError):
+                await self.service.get_tile(z, x, y)
+        with self.assertRaises(ValueError):
+            await self.service.get_tile(0, 0, 0, ("roads",))
+        self.repo.get_zones_tile.assert_not_awaited()
+
+
+@allure.epic("Business Logic Services")
+@allure.feature("Tile Service")
+class TestTileCache(unittest.TestCase):
+    def setUp(self):
+        record_pid()
+
+    @allure.story("Stale Result Is Not Cached")
+    def test_stale_generation(self):
+        cache = TileCache()
+        generation = cache.generation(ZONES_LAYER)
+        cache.invalidate(ZONES_LAYER)
+        cache.put((ZONES_LAYER, 0, 0, 0), b"stale", 60, generation)
+        self.assertIsNone(cache.get((ZONES_LAYER, 0, 0, 0)))
+
+    @allure.story("LRU Eviction")
+    def test_lru_eviction(self):
+        cache = TileCache(max_entries=2)
+        for x in range(3):
+            cache.put((ZONES_LAYER, 2, x, 0), b"tile", 60, 0)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get((ZONES_LAYER, 2, 0, 0)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,213 @@
+import unittest
+import uuid
+from datetime import datetime
+from functools import partial
+import allure
+import httpx
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+from conftest import record_pid
+
+from fastapi import FastAPI
+
+from src.sensor_track_pro.api.dependencies.auth import _apply_revocation
+from src.sensor_track_pro.api.dependencies.auth import get_token_service
+from src.sensor_track_pro.api.dependencies.auth import get_token_verifier
+from src.sensor_track_pro.api.dependencies.auth import jwt_secret_key
+from src.sensor_track_pro.api.dependencies.auth import load_revocations
+from src.sensor_track_pro.api.routers.v2 import auth
+from src.sensor_track_pro.business_logic.interfaces.repository.irevoked_token_repo import IRevokedTokenRepository
+from src.sensor_track_pro.business_logic.models.user_model import TokenType
+from src.sensor_track_pro.business_logic.models.user_model import UserModel
+from src.sensor_track_pro.business_logic.models.user_model import UserRole
+from src.sensor_track_pro.business_logic.services.token_service import InvalidTokenError
+from src.sensor_track_pro.business_logic.services.token_service import RevocationList
+from src.sensor_track_pro.business_logic.services.token_service import TokenService
+from src.sensor_track_pro.business_logic.services.user_service import UserService
+from src.sensor_track_pro.config import Settings
+from src.sensor_track_pro.data_access.cache import RepositoryCache
+from src.sensor_track_pro.data_access.repositories.revoked_tokens_repo import REVOKED_TOKENS
+
+
+class MemoryRevocations(IRevokedTokenRepository):
+    """Таблица отозванных токенов в памяти; общая для нескольких сервисов, как БД для экземпляров."""
+
+    def __init__(self):
+        self.revoked: dict[str, datetime] = {}
+
+    async def get_active(self) -> list[tuple[str, datetime]]:
+        return list(self.revoked.items())
+
+    async def revoke(self, jti: str, expires_at: datetime) -> bool:
+        if jti in self.revoked:
+            return False
+        self.revoked[jti] = expires_at
+        return True
+
+
+def make_user(is_active: bool = True) -> UserModel:
+    return UserModel(
+        id=uuid.uuid4(), username="operator", email="op@example.com",
+        role=UserRole.OPERATOR, is_active=is_active, password_hash="x",
+    )
+
+
+@allure.epic("Business Logic Services")
+@allure.feature("Token Service")
+class TestTokenService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.revocations = MemoryRevocations()
+        self.service = TokenService("secret", RevocationList(), self.revocations, access_ttl=60, refresh_ttl=600)
+        self.user = make_user()
+        record_pid()
+
+    @allure.story("Issue And Verify")
+    async def test_access_token_claims(self):
+        tokens = self.service.issue_tokens(self.user)
+        claims = self.service.verify(tokens.access_token)
+        self.assertEqual(claims.sub, self.user.id)
+        self.assertIs(claims.role, UserRole.OPERATOR)
+        self.assertEqual(claims.exp - claims.iat, 60)
+        self.assertEqual(tokens.refresh_expires_in, 600)
+
+    @allure.story("Token Type")
+    async def test_refresh_not_accepted_as_access(self):
+        tokens = self.service.issue_tokens(self.user)
+        with self.assertRaises(InvalidTokenError):
+            self.service.verify(tokens.refresh_token)
+        claims = self.service.verify(tokens.refresh_token, TokenType.REFRESH)
+        self.assertIs(claims.type, TokenType.REFRESH)
+
+    @allure.story("Signature")
+    async def test_foreign_key_rejected(self):
+        token = TokenService("other", RevocationList()).issue_tokens(self.user).access_token
+        with self.assertRaises(InvalidTokenError):
+            self.service.verify(token)
+
+    @allure.story("Expiry")
+    async def test_expired_rejected(self):
+        with patch("src.sensor_track_pro.business_logic.services.token_service.time.time", return_value=1000.0):
+            token = self.service.issue_tokens(self.user).access_token
+        with self.assertRaises(InvalidTokenError):
+            self.service.verify(token)
+
+    @allure.story("Revocation")
+    async def test_revoked_rejected_without_repository(self):
+        token = self.service.issue_tokens(self.user).access_token
+        claims = self.service.verify(token)
+        self.assertTrue(await self.service.revoke(claims))
+        self.assertFalse(await self.service.revoke(claims))
+        self.assertEqual(self.revocations.revoked[claims.jti], datetime.utcfromtimestamp(claims.exp))
+        with patch.object(self.revocations, "get_active") as get_active:
+            with self.assertRaises(InvalidTokenError):
+                self.service.verify(token)
+            get_active.assert_not_called()
+
+    @allure.story("Revocation")
+    async def test_revocation_propagated_by_notification(self):
+        # Другой экземпляр с тем же ключом узнаёт об отзыве по NOTIFY
+        revoked = RevocationList()
+        other = TokenService("secret", revoked)
+        listener_cache = RepositoryCache()
+        listener_cache.on_message(REVOKED_TOKENS, partial(_apply_revocation, revoked))
+        token = self.service.issue_tokens(self.user).access_token
+        claims = self.service.verify(token)
+        other.verify(token)
+        listener_cache.apply_notification(RepositoryCache().notification(REVOKED_TOKENS, f"{claims.jti} {claims.exp}"))
+        with self.assertRaises(InvalidTokenError):
+            other.verify(token)
+        with self.assertRaises(RuntimeError):
+            await other.revoke(claims)
+
+    @allure.story("Revocation")
+    async def test_revocations_loaded_from_table(self):
+        token = self.service.issue_tokens(self.user).access_token
+        claims = self.service.verify(token)
+        await self.service.revoke(claims)
+        revoked = RevocationList()
+        module = "src.sensor_track_pro.api.dependencies.auth"
+        with (
+            patch(f"{module}.open_session", return_value=AsyncMock()),
+            patch(f"{module}.RevokedTokenRepository", return_value=self.revocations),
+            patch(f"{module}.get_revocation_list", return_value=revoked),
+        ):
+            await load_revocations()
+        with self.assertRaises(InvalidTokenError):
+            TokenService("secret", revoked).verify(token)
+
+    @allure.story("Revocation")
+    def test_expired_revocations_pruned(self):
+        revoked = RevocationList(prune_interval=0)
+        revoked.update([("old", 1000.0), ("new", 4000.0)])
+        with patch("src.sensor_track_pro.business_logic.services.token_service.time.time", return_value=2000.0):
+            self.assertIn("new", revoked)
+            self.assertNotIn("old", revoked)
+        self.assertEqual(len(revoked), 1)
+
+    @allure.story("Shared Secret")
+    def test_missing_secret_key_fails(self):
+        with patch("src.sensor_track_pro.api.dependencies.auth.get_settings", return_value=Settings(jwt_secret_key="")):
+            with self.assertRaises(RuntimeError):
+                jwt_secret_key()
+        with patch("src.sensor_track_pro.api.dependencies.auth.get_settings", return_value=Settings(jwt_secret_key="k")):
+            self.assertEqual(jwt_secret_key(), "k")
+
+
+@allure.epic("API")
+@allure.feature("Authentication")
+class TestAuthRouter(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.user = make_user()
+        self.repo = AsyncMock()
+        self.repo.authenticate.return_value = self.user
+        self.repo.get_by_id.return_value = self.user
+        self.tokens = TokenService("secret", RevocationList(), MemoryRevocations())
+        app = FastAPI()
+        app.include_router(auth.router, prefix="/auth")
+        app.dependency_overrides[auth.get_user_service] = lambda: UserService(self.repo)
+        app.dependency_overrides[get_token_service] = lambda: self.tokens
+        app.dependency_overrides[get_token_verifier] = lambda: self.tokens
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+        record_pid()
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    @allure.story("Login, Refresh, Logout")
+    async def test_token_lifecycle(self):
+        login = await self.client.post("/auth/login", json={"username": "operator", "password": "password1"})
+        self.assertEqual(login.status_code, 200)
+        pair = login.json()
+        self.assertEqual(pair["user"]["id"], str(self.user.id))
+        self.assertNotIn("password_hash", pair["user"])
+        bearer = {"Authorization": f"Bearer {pair['access_token']}"}
+
+        self.repo.get_by_id.reset_mock()
+        me = await self.client.get("/auth/me", headers=bearer)
+        self.assertEqual(me.json()["role"], "operator")
+        self.repo.get_by_id.assert_not_awaited()
+
+        refreshed = await self.client.post("/auth/refresh", json={"refresh_token": pair["refresh_token"]})
+        self.assertEqual(refreshed.status_code, 200)
+        reused = await self.client.post("/auth/refresh", json={"refresh_token": pair["refresh_token"]})
+        self.assertEqual(reused.status_code, 401)
+
+        logout = await self.client.post("/auth/logout", headers=bearer)
+        self.assertEqual(logout.status_code, 204)
+        self.assertEqual((await self.client.get("/auth/me", headers=bearer)).status_code, 401)
+
+    @allure.story("Missing Token")
+    async def test_me_requires_token(self):
+        response = await self.client.get("/auth/me")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.headers["www-authenticate"], "Bearer")
+
+    @allure.story("Inactive User")
+    async def test_inactive_user_rejected(self):
+        self.repo.authenticate.return_value = make_user(is_active=False)
+        login = await self.client.post("/auth/login", json={"username": "operator", "password": "password1"})
+        self.assertEqual(login.status_code, 401)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import allure
+import httpx
+from conftest import record_pid
+
+from fastapi import Depends
+from fastapi import FastAPI
+
+from src.sensor_track_pro.api.middleware.tracing import TracingMiddleware
+from src.sensor_track_pro.business_logic.services.base_service import BaseService
+from src.sensor_track_pro.data_access.profiling import StatementProfiler
+from src.sensor_track_pro.data_access.profiling import instrument_repository_methods
+from src.sensor_track_pro.tracing import BatchSpanProcessor
+from src.sensor_track_pro.tracing import FileSpanExporter
+from src.sensor_track_pro.tracing import Span
+from src.sensor_track_pro.tracing import SpanKind
+from src.sensor_track_pro.tracing import Tracer
+from src.sensor_track_pro.tracing import parse_traceparent
+
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_SPAN_ID = "00f067aa0ba902b7"
+
+
+class _Collector:
+    def __init__(self):
+        self.spans: list[Span] = []
+
+    def on_end(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def by_name(self, name: str) -> Span:
+        return next(span for span in self.spans if span.name == name)
+
+
+class _Connection:
+    def __init__(self):
+        self.info = {}
+
+
+class _Cursor:
+    rowcount = 2
+
+
+@instrument_repository_methods
+class TracedRepository:
+    def __init__(self, profiler: StatementProfiler):
+        self._profiler = profiler
+
+    async def get_all(self, skip: int = 0, limit: int = 100) -> list[str]:
+        connection = _Connection()
+        statement = "SELECT * FROM zones"
+        self._profiler.before_cursor_execute(connection, None, statement, None, None, False)
+        self._profiler.after_cursor_execute(connection, _Cursor(), statement, None, None, False)
+        return ["zone"]
+
+
+class TracedService(BaseService[str]):
+    pass
+
+
+def build_app(tracer: Tracer) -> FastAPI:
+    app = FastAPI()
+    sub_app = FastAPI()
+    app.add_middleware(TracingMiddleware, tracer=tracer)
+    profiler = StatementProfiler(slow_threshold_ms=10_000)
+
+    def get_service() -> TracedService:
+        return TracedService(TracedRepository(profiler))
+
+    @sub_app.get("/tracing-test/{zone_id}")
+    async def list_zones(zone_id: int, service: TracedService = Depends(get_service)) -> list[str]:
+        return await service.get_all()
+
+    @sub_app.get("/tracing-test-error")
+    async def fail() -> dict:
+        raise RuntimeError("boom")
+
+    app.mount("/api/test", sub_app)
+    return app
+
+
+@allure.epic("Tracing")
+@allure.feature("Trace Context")
+class TestTraceparent(unittest.TestCase):
+    def setUp(self):
+        record_pid()
+
+    @allure.story("Parsing")
+    def test_valid_header(self):
+        parsed = parse_traceparent(f"00-{TRACE_ID}-{PARENT_SPAN_ID}-01")
+        self.assertEqual(parsed, (TRACE_ID, PARENT_SPAN_ID, True))
+
+    @allure.story("Parsing")
+    def test_invalid_headers_ignored(self):
+        for header in (None, "", "garbage", f"00-{'0' * 32}-{PARENT_SPAN_ID}-01", f"01-{TRACE_ID}-{PARENT_SPAN_ID}"):
+            self.assertIsNone(parse_traceparent(header))
+
+
+@allure.epic("Tracing")
+@allure.feature("Request Spans")
+class TestTracingMiddleware(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.collector = _Collector()
+        transport = httpx.ASGITransport(app=build_app(Tracer(self.collector)), raise_app_exceptions=False)
+        self.client = httpx.AsyncClient(transport=transport, base_url="http://test")
+        record_pid()
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    @allure.story("Span Tree")
+    async def test_request_service_repository_and_sql_spans_nested(self):
+        response = await self.client.get("/api/test/tracing-test/7")
+        self.assertEqual(response.status_code, 200)
+
+        server = self.collector.by_name("GET /api/test/tracing-test/{zone_id}")
+        service = self.collector.by_name("TracedService.get_all")
+        repository = self.collector.by_name("TracedRepository.get_all")
+        statement = self.collector.by_name("SELECT")
+        self.assertEqual(server.kind, SpanKind.SERVER)
+        self.assertIsNone(server.parent_span_id)
+        self.assertEqual(server.attributes["http.response.status_code"], 200)
+        self.assertEqual(server.attributes["code.function"], "build_app.<locals>.list_zones")
+        self.assertEqual(service.parent_span_id, server.span_id)
+        self.assertEqual(repository.parent_span_id, service.span_id)
+        self.assertEqual(statement.parent_span_id, repository.span_id)
+        self.assertEqual(statement.kind, SpanKind.CLIENT)
+        self.assertEqual(statement.attributes["db.rows"], 2)
+        self.assertEqual(statement.attributes["app.operation"], "TracedRepository.get_all")
+        self.assertEqual({span.trace_id for span in self.collector.spans}, {server.trace_id})
+        self.assertEqual(response.headers["X-Trace-Id"], server.trace_id)
+
+    @allure.story("Propagation")
+    async def test_incoming_traceparent_continued(self):
+        await self.client.get("/api/test/tracing-test/1", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_SPAN_ID}-01"})
+        server = self.collector.by_name("GET /api/test/tracing-test/{zone_id}")
+        self.assertEqual(server.trace_id, TRACE_ID)
+        self.assertEqual(server.parent_span_id, PARENT_SPAN_ID)
+
+    @allure.story("Propagation")
+    async def test_unsampled_traceparent_not_recorded(self):
+        response = await self.client.get(
+            "/api/test/tracing-test/1", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_SPAN_ID}-00"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.collector.spans, [])
+        self.assertNotIn("X-Trace-Id", response.headers)
+
+    @allure.story("Propagation")
+    async def test_nginx_request_id_used_as_trace_id(self):
+        await self.client.get("/api/test/tracing-test/1", headers={"X-Request-ID": TRACE_ID})
+        self.assertEqual(self.collector.by_name("GET /api/test/tracing-test/{zone_id}").trace_id, TRACE_ID)
+
+    @allure.story("Errors")
+    async def test_exception_marks_span_as_error(self):
+        response = await self.client.get("/api/test/tracing-test-error")
+        self.assertEqual(response.status_code, 500)
+        server = self.collector.by_name("GET /api/test/tracing-test-error")
+        self.assertEqual(server.error, "RuntimeError: boom")
+
+    @allure.story("Outside Requests")
+    async def test_no_spans_outside_request(self):
+        await TracedService(TracedRepository(StatementProfiler())).get_all()
+        self.assertEqual(self.collector.spans, [])
+
+
+@allure.epic("Tracing")
+@allure.feature("Export")
+class TestFileSpanExporter(unittest.TestCase):
+    def setUp(self):
+        record_pid()
+
+    @allure.story("OTLP JSON")
+    def test_batch_written_as_otlp_json_line(self):
+        with tempfile.TemporaryDirectory() as directory:
+            exporter = FileSpanExporter(str(Path(directory) / "spans-{pid}.jsonl"), {"service.name": "test"})
+            processor = BatchSpanProcessor(exporter, interval=60)
+            tracer = Tracer(processor)
+            with tracer.start_request_span("GET /zones", request_id=TRACE_ID):
+                with tracer.start_span("ZoneService.get_all", attributes={"app.layer": "service"}):
+                    pass
+            processor.shutdown()
+
+            lines = exporter.path.read_text().splitlines()
+            self.assertEqual(len(lines), 1)
+            resource_spans = json.loads(lines[0])["resourceSpans"][0]
+            resource = resource_spans["resource"]["attributes"]
+            self.assertIn({"key": "service.name", "value": {"stringValue": "test"}}, resource)
+            spans = resource_spans["scopeSpans"][0]["spans"]
+            self.assertEqual([span["name"] for span in spans], ["ZoneService.get_all", "GET /zones"])
+            self.assertEqual(spans[0]["parentSpanId"], spans[1]["spanId"])
+            self.assertEqual(spans[1]["traceId"], TRACE_ID)
+            self.assertNotIn("parentSpanId", spans[1])
@@ -0,0 +1,130 @@
+import base64
+import json
+import tempfile
+import unittest
+from pathlib import Path
+import allure
+import httpx
+from conftest import record_pid
+
+from fastapi import FastAPI
+from fastapi import Request
+from fastapi.responses import Response
+
+from src.sensor_track_pro.api.middleware.capture import JsonlWriter
+from src.sensor_track_pro.api.middleware.capture import TrafficCaptureMiddleware
+
+
+def build_app(path: Path, **options) -> tuple[FastAPI, JsonlWriter]:
+    writer = JsonlWriter(path)
+    app = FastAPI()
+    app.add_middleware(TrafficCaptureMiddleware, path=str(path), writer=writer, **options)
+
+    @app.post("/api/v2/events/")
+    async def create(request: Request) -> Response:
+        return Response(await request.body(), status_code=201, media_type="application/json")
+
+    @app.post("/api/v2/auth/login")
+    async def login(request: Request) -> dict:
+        await request.body()
+        return {"access_token": "issued"}
+
+    @app.get("/api/v2/zones/{zone_id}")
+    async def get_zone(zone_id: str) -> dict:
+        return {"id": zone_id}
+
+    @app.get("/health")
+    async def health() -> dict:
+        return {"status": "ok"}
+
+    return app, writer
+
+
+@allure.epic("API")
+@allure.feature("Traffic Capture")
+class TestTrafficCaptureMiddleware(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / "traffic.jsonl"
+        record_pid()
+
+    async def asyncTearDown(self):
+        self.directory.cleanup()
+
+    async def capture(self, requests: list[tuple[str, str, dict]], **options) -> list[dict]:
+        app, writer = build_app(self.path, **options)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            for method, url, kwargs in requests:
+                await client.request(method, url, **kwargs)
+        writer.close()
+        if not self.path.exists():
+            return []
+        return [json.loads(line) for line in self.path.read_text(encoding="utf-8").splitlines()]
+
+    @allure.story("Request Record")
+    async def test_records_request_and_response(self):
+        body = b'{"latitude": 55.75}'
+        records = await self.capture([
+            ("POST", "/api/v2/events/?source=gps", {
+                "content": body,
+                "headers": {"Content-Type": "application/json", "Authorization": "Bearer secret"},
+            }),
+        ])
+        self.assertEqual(len(records), 1)
+        record = records[0]
+        self.assertEqual(record["method"], "POST")
+        self.assertEqual(record["path"], "/api/v2/events/")
+        self.assertEqual(record["query"], "source=gps")
+        self.assertEqual(record["body"], body.decode())
+        self.assertEqual(record["body_encoding"], "utf-8")
+        self.assertEqual(record["status"], 201)
+        self.assertEqual(record["response_bytes"], len(body))
+        self.assertGreaterEqual(record["duration_ms"], 0)
+        self.assertEqual(record["headers"]["content-type"], "application/json")
+        self.assertNotIn("authorization", record["headers"])
+
+    @allure.story("Credentials")
+    async def test_login_body_not_captured(self):
+        records = await self.capture([
+            ("POST", "/api/v2/auth/login", {"json": {"username": "admin", "password": "s3cret-pass"}}),
+        ])
+        self.assertEqual(records[0]["path"], "/api/v2/auth/login")
+        self.assertTrue(records[0]["body_redacted"])
+        self.assertNotIn("body", records[0])
+        self.assertNotIn("s3cret-pass", self.path.read_text(encoding="utf-8"))
+
+    @allure.story("Credentials")
+    async def test_secret_fields_redacted_in_json(self):
+        body = {"name": "probe", "meta": [{"refresh_token": "r-token"}], "password": "s3cret-pass"}
+        records = await self.capture([("POST", "/api/v2/events/", {"json": body})])
+        captured = json.loads(records[0]["body"])
+        self.assertTrue(records[0]["body_redacted"])
+        self.assertEqual(captured["name"], "probe")
+        self.assertEqual(captured["password"], "***")
+        self.assertEqual(captured["meta"][0]["refresh_token"], "***")
+
+    @allure.story("Binary Body")
+    async def test_binary_body_base64(self):
+        body = b"\xff\x00\x81"
+        records = await self.capture([("POST", "/api/v2/events/", {"content": body})])
+        self.assertEqual(records[0]["body_encoding"], "base64")
+        self.assertEqual(base64.b64decode(records[0]["body"]), body)
+
+    @allure.story("Body Limit")
+    async def test_large_body_truncated(self):
+        records = await self.capture([("POST", "/api/v2/events/", {"content": b"x" * 100})], max_body=10)
+        self.assertTrue(records[0]["body_truncated"])
+        self.assertNotIn("body", records[0])
+
+    @allure.story("Filtering")
+    async def test_only_api_paths_captured(self):
+        records = await self.capture([
+            ("GET", "/health", {}),
+            ("GET", "/api/v2/zones/42", {}),
+        ])
+        self.assertEqual([record["path"] for record in records], ["/api/v2/zones/42"])
+
+    @allure.story("Sampling")
+    async def test_zero_sample_rate_skips_everything(self):
+        records = await self.capture([("GET", "/api/v2/zones/1", {})] * 5, sample_rate=0.0)
+        self.assertEqual(records, [])
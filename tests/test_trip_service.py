@@ -0,0 +1,126 @@
+import unittest
+import allure
+from unittest.mock import AsyncMock
+from uuid import uuid4
+from datetime import datetime, timedelta
+from conftest import record_pid
+
+from src.sensor_track_pro.business_logic.analytics.trip_segmentation import TripSegmenter
+from src.sensor_track_pro.business_logic.analytics.trip_segmentation import segment_track
+from src.sensor_track_pro.business_logic.models.trip_model import TrackPoint
+from src.sensor_track_pro.business_logic.models.trip_model import TripKind
+from src.sensor_track_pro.business_logic.models.trip_model import TripModel
+from src.sensor_track_pro.business_logic.services.trip_service import TripService
+
+T0 = datetime(2025, 1, 1, 8, 0, 0)
+
+
+def make_track():
+    """Стоянка 10 мин, поездка 10 мин на восток, стоянка 6 мин."""
+    points = []
+    for i in range(10):
+        points.append(TrackPoint(T0 + timedelta(minutes=i), 55.0, 37.0, 0.0))
+    for i in range(10):
+        points.append(TrackPoint(T0 + timedelta(minutes=10 + i), 55.0, 37.0 + 0.01 * (i + 1), 40.0))
+    for i in range(6):
+        points.append(TrackPoint(T0 + timedelta(minutes=20 + i), 55.0, 37.1, 0.5))
+    return points
+
+
+@allure.epic("Business Logic Services")
+@allure.feature("Trip Service")
+class TestTripSegmentation(unittest.TestCase):
+    def setUp(self):
+        record_pid()
+
+    @allure.story("Segment Track")
+    def test_segment_track(self):
+        segments = segment_track(uuid4(), make_track())
+        self.assertEqual([s.kind for s in segments], [TripKind.STOP, TripKind.TRIP, TripKind.STOP])
+        self.assertEqual([s.is_closed for s in segments], [True, True, False])
+        trip = segments[1]
+        self.assertEqual(trip.start_time, T0 + timedelta(minutes=9))
+        self.assertEqual(trip.end_time, T0 + timedelta(minutes=20))
+        self.assertEqual(trip.max_speed, 40.0)
+        self.assertAlmostEqual(trip.distance, 6378, delta=10)
+
+    @allure.story("Short Stop Stays In Trip")
+    def test_short_stop_is_part_of_trip(self):
+        points = [TrackPoint(T0 + timedelta(minutes=i), 55.0, 37.0 + 0.01 * i, 40.0) for i in range(5)]
+        points.append(TrackPoint(T0 + timedelta(minutes=5), 55.0, 37.04, 0.0))
+        points += [TrackPoint(T0 + timedelta(minutes=6 + i), 55.0, 37.05 + 0.01 * i, 40.0) for i in range(5)]
+        segments = segment_track(uuid4(), points)
+        self.assertEqual(len(segments), 1)
+        self.assertEqual(segments[0].kind, TripKind.TRIP)
+        self.assertEqual(segments[0].points_count, len(points))
+
+    @allure.story("Incremental Feed")
+    def test_incremental_feed_matches_batch(self):
+        sensor_id = uuid4()
+        points = make_track()
+        segmenter = TripSegmenter(sensor_id)
+        closed = []
+        for i in range(0, len(points), 4):
+            closed += segmenter.feed_many(points[i:i + 4])
+        self.assertEqual(closed + [segmenter.open_segment()], segment_track(sensor_id, points))
+
+
+@allure.epic("Business Logic Services")
+@allure.feature("Trip Service")
+class TestTripService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.trip_repo = AsyncMock()
+        self.event_repo = AsyncMock()
+        self.service = TripService(self.trip_repo, self.event_repo)
+        record_pid()
+
+    @allure.story("Refresh Trips From Scratch")
+    async def test_refresh_trips_from_scratch(self):
+        sensor_id = uuid4()
+        self.trip_repo.get_last_segment.return_value = None
+        self.event_repo.get_track.return_value = make_track()
+        result = await self.service.refresh_trips(sensor_id)
+        self.event_repo.get_track.assert_awaited_once()
+        self.assertEqual(self.event_repo.get_track.await_args.args[1], None)
+        self.assertEqual(result.processed_points, 26)
+        self.assertEqual(result.closed_segments, 2)
+        saved = self.trip_repo.replace_open_segments.await_args.args[1]
+        self.assertEqual(len(saved), 3)
+        self.assertFalse(saved[-1].is_closed)
+
+    @allure.story("Refresh Resumes From Open Segment")
+    async def test_refresh_resumes_from_open_segment(self):
+        sensor_id = uuid4()
+        open_segment = TripModel(
+            id=uuid4(), sensor_id=sensor_id, kind=TripKind.STOP,
+            start_time=T0 + timedelta(minutes=20), end_time=T0 + timedelta(minutes=25),
+            start_latitude=55.0, start_longitude=37.1, end_latitude=55.0, end_longitude=37.1,
+            is_closed=False, created_at=T0, updated_at=T0,
+        )
+        self.trip_repo.get_last_segment.return_value = open_segment
+        self.event_repo.get_track.return_value = make_track()[20:]
+        await self.service.refresh_trips(sensor_id)
+        self.assertEqual(self.event_repo.get_track.await_args.args[1], open_segment.start_time)
+
+    @allure.story("Serialized Refresh")
+    async def test_refresh_locks_sensor_before_reading_last_segment(self):
+        sensor_id = uuid4()
+        calls = []
+        self.trip_repo.lock_sensor.side_effect = lambda sid: calls.append(("lock", sid))
+        self.trip_repo.get_last_segment.side_effect = lambda sid: calls.append(("last", sid))
+        self.event_repo.get_track.return_value = []
+        await self.service.refresh_trips(sensor_id)
+        self.assertEqual(calls, [("lock", sensor_id), ("last", sensor_id)])
+
+    @allure.story("Get Trips")
+    async def test_get_trips(self):
+        sensor_id = uuid4()
+        expected = [{'result': 'trip'}]
+        self.trip_repo.get_by_sensor_id.return_value = expected
+        result = await self.service.get_trips(sensor_id, None, None, TripKind.TRIP, 0, 10)
+        self.trip_repo.get_by_sensor_id.assert_awaited_once_with(sensor_id, None, None, TripKind.TRIP, 0, 10)
+        self.assertEqual(result, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
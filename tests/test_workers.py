@@ -0,0 +1,102 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+import allure
+import httpx
+from unittest.mock import patch
+from conftest import record_pid
+
+from src.sensor_track_pro.api.main import app
+from src.sensor_track_pro.config import Settings
+from src.sensor_track_pro.data_access.database import pool_limits
+from src.sensor_track_pro.serve import pool_slots
+from src.sensor_track_pro.serve import resolve_workers
+from src.sensor_track_pro.workers import WorkerHeartbeat
+from src.sensor_track_pro.workers import WorkerState
+from src.sensor_track_pro.workers import read_worker_states
+from src.sensor_track_pro.workers import state_path
+
+
+@allure.epic("Serving")
+@allure.feature("Workers")
+class TestWorkerSettings(unittest.TestCase):
+    def setUp(self):
+        record_pid()
+
+    @allure.story("Pool Sizing")
+    def test_connection_budget_split_between_workers(self):
+        settings = Settings(db_pool_size=5, db_max_overflow=10, workers=4, db_connection_budget=24)
+        self.assertEqual(pool_limits(settings), (2, 4))
+        settings = Settings(db_pool_size=5, db_max_overflow=10, workers=16, db_connection_budget=8)
+        self.assertEqual(pool_limits(settings), (1, 0))
+
+    @allure.story("Pool Sizing")
+    def test_pool_settings_used_without_budget(self):
+        self.assertEqual(pool_limits(Settings(db_pool_size=5, db_max_overflow=10, workers=4)), (5, 10))
+
+    @allure.story("Pool Sizing")
+    def test_budget_kept_during_restart_and_scale_up(self):
+        def pool(workers: int) -> int:
+            size, overflow = pool_limits(Settings(db_connection_budget=60, workers=pool_slots(workers)))
+            return size + overflow
+
+        # Поочерёдный перезапуск: старые воркеры и один новый
+        self.assertLessEqual(3 * pool(3) + pool(3), 60)
+        # SIGTTIN: прежние пулы рассчитаны на 3 воркера, новый — на 4
+        self.assertLessEqual(3 * pool(3) + pool(4), 60)
+
+    @allure.story("Worker Count")
+    def test_zero_workers_means_available_cpus(self):
+        self.assertEqual(resolve_workers(3), 3)
+        self.assertGreaterEqual(resolve_workers(0), 1)
+        self.assertLessEqual(resolve_workers(0), os.cpu_count())
+
+
+@allure.epic("Serving")
+@allure.feature("Workers")
+class TestWorkerHeartbeat(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        record_pid()
+
+    async def asyncTearDown(self):
+        self.directory.cleanup()
+
+    @allure.story("Heartbeat")
+    async def test_heartbeat_written_until_stopped(self):
+        beats = []
+        heartbeat = WorkerHeartbeat(self.directory.name, interval=0.01, on_beat=lambda: beats.append(1))
+        await heartbeat.start()
+        first = read_worker_states(self.directory.name)
+        await asyncio.sleep(0.05)
+        later = read_worker_states(self.directory.name)
+        await heartbeat.stop()
+        self.assertEqual([state.pid for state in first], [os.getpid()])
+        self.assertGreater(later[0].heartbeat, first[0].heartbeat)
+        self.assertGreater(len(beats), 1)
+        self.assertEqual(read_worker_states(self.directory.name), [])
+
+    @allure.story("Heartbeat")
+    def test_stale_heartbeat_is_unhealthy(self):
+        now = time.time()
+        state = WorkerState(pid=1, started=now - 100, heartbeat=now - 40)
+        self.assertFalse(state.is_healthy(30.0, now))
+        self.assertTrue(state.is_healthy(60.0, now))
+
+    @allure.story("Health Endpoint")
+    async def test_health_reports_every_worker(self):
+        now = time.time()
+        for pid, heartbeat in ((101, now), (102, now - 120)):
+            state_path(self.directory.name, pid).write_text(
+                f'{{"pid": {pid}, "started": {now - 200}, "heartbeat": {heartbeat}, "loop_lag": 0.0}}'
+            )
+        settings = Settings(worker_state_dir=self.directory.name, worker_heartbeat_timeout=30.0)
+        transport = httpx.ASGITransport(app=app)
+        with patch("src.sensor_track_pro.api.main.get_settings", return_value=settings):
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.get("/health/workers")
+        self.assertEqual(response.status_code, 503)
+        workers = response.json()["workers"]
+        self.assertEqual([(worker["pid"], worker["healthy"]) for worker in workers], [(101, True), (102, False)])
@@ -0,0 +1,66 @@
+import unittest
+import allure
+from unittest.mock import AsyncMock
+from uuid import uuid4
+from datetime import UTC, datetime, timedelta
+from conftest import record_pid
+
+from src.sensor_track_pro.business_logic.services.zone_analytics_service import ZoneAnalyticsService
+
+T0 = datetime(2025, 1, 1, 8, 0, 0)
+
+
+@allure.epic("Business Logic Services")
+@allure.feature("Zone Analytics Service")
+class TestZoneAnalyticsService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.repo = AsyncMock()
+        self.service = ZoneAnalyticsService(self.repo)
+        record_pid()
+
+    @allure.story("Get Dwell Times")
+    async def test_get_dwell_times(self):
+        zone_id, object_id = uuid4(), uuid4()
+        expected = [{'result': 'dwell'}]
+        self.repo.get_dwell_times.return_value = expected
+        result = await self.service.get_dwell_times(T0, T0 + timedelta(hours=1), zone_id, object_id, 0, 10)
+        self.repo.get_dwell_times.assert_awaited_once_with(
+            T0, T0 + timedelta(hours=1), zone_id, object_id, 0, 10
+        )
+        self.assertEqual(result, expected)
+
+    @allure.story("Get Occupancy")
+    async def test_get_occupancy(self):
+        zone_id = uuid4()
+        expected = [{'result': 'occupancy'}]
+        self.repo.get_occupancy.return_value = expected
+        result = await self.service.get_occupancy(T0, T0 + timedelta(hours=1), zone_id)
+        self.repo.get_occupancy.assert_awaited_once_with(T0, T0 + timedelta(hours=1), zone_id)
+        self.assertEqual(result, expected)
+
+    @allure.story("Get Occupancy Summary Until Now")
+    async def test_get_occupancy_summary_until_now(self):
+        self.repo.get_occupancy_summary.return_value = []
+        await self.service.get_occupancy_summary(T0)
+        start_time, end_time, zone_id = self.repo.get_occupancy_summary.await_args.args
+        self.assertEqual(start_time, T0)
+        self.assertLessEqual(end_time, datetime.utcnow())
+        self.assertIsNone(zone_id)
+
+    @allure.story("Aware Datetimes Are Normalized")
+    async def test_aware_datetimes(self):
+        start = datetime(2025, 1, 1, 11, 0, 0, tzinfo=UTC).astimezone()
+        await self.service.get_occupancy(start, start + timedelta(hours=1))
+        start_time, end_time, _ = self.repo.get_occupancy.await_args.args
+        self.assertEqual(start_time, datetime(2025, 1, 1, 11, 0, 0))
+        self.assertIsNone(end_time.tzinfo)
+
+    @allure.story("Invalid Window")
+    async def test_invalid_window(self):
+        with self.assertRaises(ValueError):
+            await self.service.get_occupancy(T0, T0 - timedelta(hours=1))
+        self.repo.get_occupancy.assert_not_awaited()
+
+
+if __name__ == '__main__':
+    unittest.main()